@@ -1,7 +1,7 @@
 """Application configuration using pydantic-settings."""
 
 from functools import lru_cache
-from typing import List
+from typing import Any, Dict, List
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -31,10 +31,107 @@ class Settings(BaseSettings):
     supabase_anon_key: str = ""
     supabase_service_role_key: str = ""
 
+    # Supabase HTTP pool (shared by every client in the process)
+    supabase_max_connections: int = 100
+    supabase_max_keepalive_connections: int = 20
+    supabase_keepalive_expiry: float = 30.0  # seconds an idle connection is kept
+    supabase_http_timeout: float = 30.0
+    # Max blocking Supabase calls in flight (threads in the DB executor)
+    db_max_concurrency: int = 32
+
+    # Local JWT verification (skips the Supabase Auth round trip per request)
+    auth_local_jwt_verification: bool = True
+    supabase_jwt_secret: str = ""  # Legacy HS256 secret; asymmetric keys come from JWKS
+    supabase_jwt_audience: str = "authenticated"
+    jwt_jwks_cache_ttl: int = 600  # seconds
+    jwt_leeway_seconds: int = 10
+    jwt_denylist_ttl: int = 3600  # must cover the access token lifetime
+
+    # Profile cache (per-request identity map + process-level TTL cache)
+    profile_cache_ttl: float = 30.0  # seconds; 0 disables the process cache
+    profile_cache_max_entries: int = 10000
+
+    # global_config cache (tier limits, referral bonus)
+    global_config_cache_ttl: float = 300.0  # seconds
+    global_config_listen_dsn: str = ""  # Postgres DSN for LISTEN/NOTIFY refresh (needs asyncpg)
+
+    # Credit reservations held longer than this are released automatically
+    credit_reservation_ttl: int = 600  # seconds
+
+    # Background resume parsing (app/services/resume_ingest.py)
+    resume_parse_workers: int = 4  # 0 parses inside the upload request
+    resume_parse_queue_size: int = 200  # jobs held in memory; the rest wait in resume_parse_jobs
+    resume_parse_max_attempts: int = 3
+    resume_parse_stale_after: int = 900  # seconds before a running job is assumed orphaned
+    resume_parse_sweep_interval: float = 60.0  # seconds between checks for jobs left in the table
+    resume_parse_poll_interval: float = 2.0  # seconds between status checks on the events stream
+    resume_parse_events_timeout: float = 120.0  # seconds an events stream stays open
+
+    # PDF text extraction (app/services/pdf_parser.py)
+    pdf_extract_engine: str = "pdfium"  # pdfium | pdfminer | pdfplumber; others fall back to pdfplumber
+    pdf_extract_workers: int = 2  # processes; 0 extracts in a thread of the API process
+    pdf_max_pages: int = 20  # pages read per document
+    pdf_extract_timeout: float = 20.0  # seconds per document
+    pdf_extract_memory_mb: int = 1024  # address-space limit per extraction process; 0 = none
+
+    # Cover letter PDF rendering (app/services/pdf_service.py)
+    pdf_render_workers: int = 1  # warmed WeasyPrint processes; 0 renders in a thread
+    pdf_render_timeout: float = 30.0  # seconds per render
+    pdf_render_cache_ttl: float = 3600.0  # seconds; 0 disables
+    pdf_render_cache_max_entries: int = 200
+
+    # Cross-user cache of extracted resume text by file hash (app/db/text_cache.py)
+    resume_text_cache_ttl: float = 0.0  # seconds; 0 disables
+    resume_text_cache_max_entries: int = 1000  # in-process LRU size
+    resume_text_cache_persistent: bool = False  # also keep texts in the resume_text_cache table
+
+    # Match analysis result cache (content-addressed, see app/db/match_cache.py)
+    match_cache_ttl: float = 86400.0  # seconds; 0 disables
+    match_cache_max_entries: int = 5000  # in-process LRU size
+    match_cache_persistent: bool = False  # also keep results in the match_results table
+    match_cache_hit_credits: int = 0  # credits charged for a cache hit (0 = free)
+
+    # Batch match analysis (POST /v1/ai/match/batch)
+    match_batch_max_jobs: int = 100
+    match_batch_concurrency: int = 4  # provider calls in flight per batch
+
+    # Local match estimates (app/services/quick_match.py)
+    quick_match_rank_max_jobs: int = 500  # jobs scored when listing with sort=match
+
+    # Job description tokens sent to the AI (see app/services/job_text.py). One
+    # shared budget keeps the cached prompt prefix identical across operations;
+    # a per-operation entry, e.g. {"match": 3000}, gives that operation its own prefix.
+    job_description_token_budget: int = 2500
+    job_description_token_budgets: Dict[str, int] = {}
+
     # AI Providers (for later stories)
     openai_api_key: str = ""
     anthropic_api_key: str = ""
 
+    # AI execution engine (see app/services/ai/engine.py)
+    ai_execution_mode: str = ""  # sequential | hedged | race; empty keeps per-operation defaults
+    ai_request_deadline: float = 30.0  # seconds across all attempts of one operation
+    # Per-operation overrides as JSON, e.g. {"cover_letter": {"mode": "hedged", "timeout": 12}}
+    ai_operation_policies: Dict[str, Dict[str, Any]] = {}
+    # Hedged mode fires the fallback once the primary runs past this latency percentile
+    ai_hedge_percentile: float = 0.95
+    ai_hedge_min_samples: int = 20  # until then the policy's static hedge_delay is used
+    ai_hedge_min_delay: float = 1.0  # seconds; floor for the observed threshold
+    ai_latency_window: int = 200  # recent samples kept per provider and operation
+    # Circuit breaker per provider and operation (sliding time window)
+    ai_breaker_window: float = 60.0  # seconds
+    ai_breaker_min_calls: int = 10  # calls in the window before the breaker may open
+    ai_breaker_failure_rate: float = 0.5
+    ai_breaker_slow_call_rate: float = 0.8
+    ai_breaker_slow_call_fraction: float = 0.8  # of the attempt timeout; slower calls count as slow
+    ai_breaker_open_seconds: float = 30.0  # before letting half-open probes through
+    ai_breaker_half_open_probes: int = 1
+    # USD per million tokens by model, for usage_events.cost_usd (see app/services/ai/metering.py)
+    ai_token_prices: Dict[str, Dict[str, float]] = {
+        "claude-sonnet-4-20250514": {"input": 3.0, "cached_input": 0.3, "output": 15.0},
+        "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.6},
+    }
+
     # Stripe (subscription billing)
     stripe_mock_mode: bool = True  # MVP default
     stripe_secret_key: str | None = None  # For future real integration
@@ -0,0 +1,67 @@
+"""Per-request context shared by dependencies and services.
+
+Services are constructed independently per request (auth dependency, usage
+service, AI service, ...), so without a shared place to put state each of
+them re-reads the same rows. RequestContextMiddleware opens a fresh
+RequestContext for every HTTP request and exposes it through a ContextVar;
+code outside a request (scripts, tests) simply sees None.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+@dataclass
+class RequestContext:
+    """State scoped to a single HTTP request.
+
+    Attributes:
+        profiles: Identity map of profile rows keyed by user id.
+    """
+
+    profiles: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """Get the context of the request being handled.
+
+    Returns:
+        The current RequestContext, or None outside a request.
+    """
+    return _request_context.get()
+
+
+class RequestContextMiddleware:
+    """ASGI middleware that opens a RequestContext per HTTP request.
+
+    Implemented as plain ASGI (not BaseHTTPMiddleware) so the context is
+    visible to dependencies and streaming responses alike.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Wrap an ASGI app.
+
+        Args:
+            app: The downstream ASGI application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the downstream app inside a fresh RequestContext."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_context.set(RequestContext())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_context.reset(token)
@@ -0,0 +1,48 @@
+"""Server-Sent Events responses for streaming endpoints."""
+
+import json
+from typing import Any, AsyncIterator, Dict
+
+import anyio
+from fastapi.responses import StreamingResponse
+
+
+class EventStreamResponse(StreamingResponse):
+    """StreamingResponse that always closes its event source when it ends.
+
+    The streaming services reserve credits and open the provider stream
+    before the response exists. Closing the source once the response is
+    done (sent, failed, or cancelled before the body started) releases an
+    unsettled reservation even if the body was never iterated.
+    """
+
+    def __init__(self, events: Any, **kwargs: Any):
+        self._events = events
+        super().__init__(self._encode(), **kwargs)
+
+    async def _encode(self) -> AsyncIterator[str]:
+        async for event in self._events:
+            yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self._events.aclose()
+
+
+def sse_response(events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """Wrap service events as a Server-Sent Events response.
+
+    Args:
+        events: Async iterator of {"event", "data"} dictionaries with aclose().
+
+    Returns:
+        text/event-stream response with JSON-encoded data lines.
+    """
+    return EventStreamResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
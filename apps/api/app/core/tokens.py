@@ -0,0 +1,206 @@
+"""Local verification of Supabase access tokens.
+
+Verifying a JWT against Supabase Auth (`auth.get_user`) costs a network round
+trip on every authenticated request. Supabase tokens are signed JWTs, so the
+signature, expiry and audience can be checked locally instead:
+
+- Asymmetric tokens (RS256/ES256) are verified against the project's JWKS,
+  cached for `jwt_jwks_cache_ttl` seconds. An unknown `kid` triggers a refetch,
+  so signing key rotation is picked up automatically.
+- Legacy HS256 tokens are verified with `SUPABASE_JWT_SECRET` when it is set.
+
+When a token cannot be checked locally (HS256 without a secret, JWKS endpoint
+unreachable) the verifier returns None and callers fall back to Supabase Auth.
+
+Signed tokens stay valid until they expire, so logout records the user in a
+short-TTL in-process denylist and tokens issued before the logout are rejected.
+The denylist is not shared: other workers and instances keep accepting a
+logged-out token that they verify locally until it expires (at most the
+access token lifetime).
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import jwt
+from jwt import PyJWKClient
+
+from app.core.config import settings
+from app.core.exceptions import InvalidTokenError
+from app.db.executor import run_sync
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+SYMMETRIC_ALGORITHMS = ("HS256",)
+
+
+class TokenDenylist:
+    """In-process record of users whose tokens were revoked by logout.
+
+    Entries live for `ttl` seconds, which only needs to cover the access
+    token lifetime: after that every revoked token has expired anyway.
+
+    Revocations are only seen by the process that recorded them; they are
+    not propagated to other workers or instances.
+    """
+
+    def __init__(self, ttl: int):
+        """Initialize an empty denylist.
+
+        Args:
+            ttl: Seconds a revocation is remembered.
+        """
+        self.ttl = ttl
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def revoke_user(self, user_id: str) -> None:
+        """Reject every token issued to user_id up to now.
+
+        Args:
+            user_id: The user's ID (`sub` claim).
+        """
+        now = time.time()
+        with self._lock:
+            # Whole seconds, like `iat`: a token from a login right after this
+            # logout (same second) must stay valid
+            self._revoked[user_id] = int(now)
+            self._prune(now)
+
+    def is_revoked(self, user_id: str, issued_at: Optional[float]) -> bool:
+        """Check whether a token was issued before the user's last logout.
+
+        Args:
+            user_id: The user's ID (`sub` claim).
+            issued_at: The token's `iat` claim (None is treated as revoked).
+
+        Returns:
+            True if the token must be rejected.
+        """
+        revoked_at = self._revoked.get(user_id)
+        if revoked_at is None:
+            return False
+        if time.time() - revoked_at > self.ttl:
+            with self._lock:
+                self._revoked.pop(user_id, None)
+            return False
+        return issued_at is None or issued_at < revoked_at
+
+    def clear(self) -> None:
+        """Drop all revocations."""
+        with self._lock:
+            self._revoked.clear()
+
+    def _prune(self, now: float) -> None:
+        """Remove expired revocations (caller holds the lock)."""
+        expired = [uid for uid, ts in self._revoked.items() if now - ts > self.ttl]
+        for uid in expired:
+            del self._revoked[uid]
+
+
+class TokenVerifier:
+    """Verifies Supabase access tokens without calling Supabase Auth."""
+
+    def __init__(self):
+        """Initialize the verifier from settings."""
+        self.issuer = f"{settings.supabase_url}/auth/v1"
+        self.audience = settings.supabase_jwt_audience
+        self.jwt_secret = settings.supabase_jwt_secret
+        self._jwks_client = PyJWKClient(
+            f"{self.issuer}/.well-known/jwks.json",
+            cache_keys=True,
+            lifespan=settings.jwt_jwks_cache_ttl,
+            headers={"apikey": settings.supabase_anon_key},
+            timeout=settings.supabase_http_timeout,
+        )
+
+    async def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verify a token locally and return its claims.
+
+        Args:
+            token: The JWT access token.
+
+        Returns:
+            Verified claims, or None if the token cannot be checked locally.
+
+        Raises:
+            InvalidTokenError: If the token is malformed, expired or forged.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError as e:
+            raise InvalidTokenError(message=f"Token verification failed: {e}")
+
+        algorithm = header.get("alg")
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            if not self.jwt_secret:
+                return None
+            key: Any = self.jwt_secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            try:
+                signing_key = await run_sync(self._jwks_client.get_signing_key_from_jwt, token)
+            except jwt.PyJWKClientConnectionError as e:
+                logger.warning(f"JWKS fetch failed, falling back to Supabase Auth: {e}")
+                return None
+            except jwt.PyJWKClientError as e:
+                raise InvalidTokenError(message=f"Token verification failed: {e}")
+            key = signing_key.key
+        else:
+            raise InvalidTokenError(message=f"Unsupported token algorithm: {algorithm}")
+
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=settings.jwt_leeway_seconds,
+                options={"require": ["exp", "iat", "sub"]},
+            )
+        except jwt.ExpiredSignatureError:
+            raise InvalidTokenError(message="Token has expired")
+        except jwt.InvalidTokenError as e:
+            raise InvalidTokenError(message=f"Token verification failed: {e}")
+
+
+def unverified_claims(token: str) -> Dict[str, Any]:
+    """Read a token's claims without checking the signature.
+
+    Only for tokens already validated by Supabase Auth.
+
+    Args:
+        token: The JWT access token.
+
+    Returns:
+        Claims dictionary (empty if the token cannot be decoded).
+    """
+    try:
+        return jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return {}
+
+
+_verifier_lock = threading.Lock()
+_verifier: Optional[TokenVerifier] = None
+
+# Per process: a logout is only enforced by the worker that handled it (see
+# the module docstring)
+token_denylist = TokenDenylist(ttl=settings.jwt_denylist_ttl)
+
+
+def get_token_verifier() -> TokenVerifier:
+    """Get the process-wide token verifier (shares its JWKS cache).
+
+    Returns:
+        TokenVerifier instance.
+    """
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                _verifier = TokenVerifier()
+    return _verifier
@@ -1,29 +1,132 @@
-"""Supabase client initialization and management."""
+"""Supabase client initialization and management.
 
-from supabase import Client, create_client
+All clients share one process-wide httpx connection pool so requests reuse
+keep-alive connections instead of paying TCP/TLS setup on every service
+construction. The pool is opened by the app lifespan (see app.main) and
+closed on shutdown; getters fall back to lazy creation so scripts and tests
+work without a running lifespan.
+"""
+
+import logging
+import threading
+from typing import Dict, Optional
+
+import httpx
+from postgrest import SyncPostgrestClient
+from supabase import Client, ClientOptions, create_client
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
 
-def get_supabase_client() -> Client:
-    """Get the Supabase client with anon key.
+_lock = threading.RLock()
+_http_client: Optional[httpx.Client] = None
+_clients: Dict[str, Client] = {}
 
-    This client is used for RLS-enforced queries where
-    the user's session determines access.
-    
-    WARNING: Do not cache this client. It may hold session state.
+
+def _get_http_client() -> httpx.Client:
+    """Get the shared keep-alive HTTP pool, creating it on first use.
 
     Returns:
-        Supabase client configured with anon key.
+        Process-wide httpx client used by every Supabase sub-client.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        with _lock:
+            if _http_client is None or _http_client.is_closed:
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=settings.supabase_max_connections,
+                        max_keepalive_connections=settings.supabase_max_keepalive_connections,
+                        keepalive_expiry=settings.supabase_keepalive_expiry,
+                    ),
+                    timeout=settings.supabase_http_timeout,
+                    follow_redirects=True,
+                )
+    return _http_client
+
+
+def _build_client(api_key: str) -> Client:
+    """Create a Supabase client bound to the shared HTTP pool.
+
+    Args:
+        api_key: Anon or service role key.
+
+    Returns:
+        Supabase client that does not persist or refresh sessions.
     """
     return create_client(
         settings.supabase_url,
-        settings.supabase_anon_key,
+        api_key,
+        options=ClientOptions(
+            httpx_client=_get_http_client(),
+            auto_refresh_token=False,
+            persist_session=False,
+        ),
+    )
+
+
+def _get_shared_client(name: str, api_key: str) -> Client:
+    """Get (or lazily create) a named process-wide client.
+
+    Args:
+        name: Registry key ("anon" or "admin").
+        api_key: Key used when the client has to be created.
+
+    Returns:
+        Shared Supabase client.
+    """
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _build_client(api_key)
+                _clients[name] = client
+    return client
+
+
+def init_supabase_clients() -> None:
+    """Open the shared pool and create the anon/admin clients.
+
+    Called once from the app lifespan so the first request does not pay
+    client construction.
+    """
+    _get_shared_client("anon", settings.supabase_anon_key)
+    _get_shared_client("admin", settings.supabase_service_role_key)
+    logger.info(
+        f"Supabase client pool ready (max_connections={settings.supabase_max_connections}, "
+        f"max_keepalive={settings.supabase_max_keepalive_connections})"
     )
 
 
+def close_supabase_clients() -> None:
+    """Drop the shared clients and close the underlying connection pool."""
+    global _http_client
+    with _lock:
+        _clients.clear()
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+    logger.info("Supabase client pool closed")
+
+
+def get_supabase_client() -> Client:
+    """Get the shared Supabase client with anon key.
+
+    This client never holds a user session (auto refresh and persistence
+    are disabled), so it is safe to share across requests. Use
+    get_supabase_user_client() for RLS-enforced queries and
+    get_supabase_auth_client() for flows that store session state.
+
+    Returns:
+        Supabase client configured with anon key.
+    """
+    return _get_shared_client("anon", settings.supabase_anon_key)
+
+
 def get_supabase_admin_client() -> Client:
-    """Get the Supabase admin client with service role key.
+    """Get the shared Supabase admin client with service role key.
 
     This client bypasses RLS and should be used only for
     admin operations like profile creation.
@@ -31,7 +134,40 @@ def get_supabase_admin_client() -> Client:
     Returns:
         Supabase client configured with service role key.
     """
-    return create_client(
-        settings.supabase_url,
-        settings.supabase_service_role_key,
+    return _get_shared_client("admin", settings.supabase_service_role_key)
+
+
+def get_supabase_auth_client() -> Client:
+    """Get a fresh anon client for auth flows that store session state.
+
+    OAuth code exchange signs the client in, which rewrites its
+    Authorization header. Those flows get their own client so the shared
+    anon client never carries a user's JWT. The HTTP pool is still shared.
+
+    Returns:
+        New Supabase client configured with anon key.
+    """
+    return _build_client(settings.supabase_anon_key)
+
+
+def get_supabase_user_client(access_token: str) -> SyncPostgrestClient:
+    """Get a request-scoped PostgREST session for a user's JWT.
+
+    Queries run with the user's role, so RLS policies apply. The session
+    is a thin header wrapper over the shared pool and is cheap to create
+    per request.
+
+    Args:
+        access_token: The user's Supabase access token.
+
+    Returns:
+        PostgREST client authenticated as the user.
+    """
+    return SyncPostgrestClient(
+        f"{settings.supabase_url}/rest/v1",
+        headers={
+            "apiKey": settings.supabase_anon_key,
+            "Authorization": f"Bearer {access_token}",
+        },
+        http_client=_get_http_client(),
     )
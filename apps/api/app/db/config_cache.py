@@ -0,0 +1,157 @@
+"""Process-level cache for global_config.
+
+`tier_limits` and `referral_bonus_credits` change a few times a year but were
+read on every credit check, balance call and usage record. The whole table
+(a handful of rows) is loaded in one query and kept for
+`global_config_cache_ttl` seconds.
+
+Refresh paths:
+- TTL expiry (always on).
+- invalidate_config() after writing global_config from this process.
+- Optional Postgres LISTEN/NOTIFY: when GLOBAL_CONFIG_LISTEN_DSN is set and
+  asyncpg is installed, start_config_listener() subscribes to the
+  `global_config_changed` channel (see migration
+  20260201000000_global_config_notify) and invalidates the cache in every
+  worker as soon as a row changes.
+
+If a refresh fails after a successful load, the stale values keep being
+served and the failure is logged.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.db.client import get_supabase_admin_client
+from app.db.executor import execute
+from app.models.usage import DEFAULT_TIER_LIMITS, TierLimits
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "global_config_changed"
+DEFAULT_REFERRAL_BONUS_CREDITS = 5
+
+_values: Dict[str, Any] = {}
+_tier_limits: Optional[TierLimits] = None
+_loaded_at: Optional[float] = None
+_listener_conn: Any = None
+
+
+def _is_fresh() -> bool:
+    """Whether the cached values are within their TTL."""
+    return _loaded_at is not None and (
+        time.monotonic() - _loaded_at < settings.global_config_cache_ttl
+    )
+
+
+async def _refresh() -> None:
+    """Reload every global_config row.
+
+    Raises:
+        Exception: If the query fails and nothing was loaded before.
+    """
+    global _values, _tier_limits, _loaded_at
+    try:
+        response = await execute(
+            get_supabase_admin_client().table("global_config").select("key, value")
+        )
+    except Exception as e:
+        if _loaded_at is None:
+            raise
+        logger.warning(f"global_config refresh failed, serving cached values: {e}")
+        _loaded_at = time.monotonic()
+        return
+
+    values = {row["key"]: row["value"] for row in response.data or []}
+    raw_limits = values.get("tier_limits")
+    if raw_limits is None:
+        logger.warning("tier_limits not found in global_config, using defaults")
+        tier_limits = DEFAULT_TIER_LIMITS
+    else:
+        tier_limits = TierLimits.model_validate(raw_limits)
+
+    _values, _tier_limits, _loaded_at = values, tier_limits, time.monotonic()
+
+
+async def get_config_value(key: str, default: Any = None) -> Any:
+    """Get a raw global_config value.
+
+    Args:
+        key: Config key.
+        default: Value returned when the key does not exist.
+
+    Returns:
+        The JSON value stored for key, or default.
+    """
+    if not _is_fresh():
+        await _refresh()
+    return _values.get(key, default)
+
+
+async def get_tier_limits() -> TierLimits:
+    """Get the typed tier limits.
+
+    Returns:
+        TierLimits from global_config (defaults if the row is missing).
+    """
+    if not _is_fresh() or _tier_limits is None:
+        await _refresh()
+    return _tier_limits
+
+
+async def get_referral_bonus_credits() -> int:
+    """Get the referral bonus amount.
+
+    Returns:
+        Bonus credits from global_config, or the default of 5.
+    """
+    value = await get_config_value("referral_bonus_credits")
+    return int(value) if value is not None else DEFAULT_REFERRAL_BONUS_CREDITS
+
+
+def invalidate_config() -> None:
+    """Force the next read to reload global_config."""
+    global _loaded_at
+    _loaded_at = None
+
+
+async def start_config_listener() -> None:
+    """Subscribe to global_config change notifications (optional).
+
+    No-op unless GLOBAL_CONFIG_LISTEN_DSN is set. Requires asyncpg, which
+    is not a hard dependency; without it the TTL alone applies.
+    """
+    global _listener_conn
+    dsn = settings.global_config_listen_dsn
+    if not dsn or _listener_conn is not None:
+        return
+
+    try:
+        import asyncpg
+    except ImportError:
+        logger.warning(
+            "GLOBAL_CONFIG_LISTEN_DSN is set but asyncpg is not installed; "
+            "global_config refreshes on TTL only"
+        )
+        return
+
+    def _on_notify(connection: Any, pid: int, channel: str, payload: str) -> None:
+        logger.info(f"global_config changed ({payload or 'unknown key'}), invalidating cache")
+        invalidate_config()
+
+    try:
+        _listener_conn = await asyncpg.connect(dsn)
+        await _listener_conn.add_listener(NOTIFY_CHANNEL, _on_notify)
+        logger.info(f"Listening for global_config changes on '{NOTIFY_CHANNEL}'")
+    except Exception as e:
+        logger.warning(f"global_config listener failed to start: {e}")
+        _listener_conn = None
+
+
+async def stop_config_listener() -> None:
+    """Close the LISTEN connection if one is open."""
+    global _listener_conn
+    if _listener_conn is not None:
+        await _listener_conn.close()
+        _listener_conn = None
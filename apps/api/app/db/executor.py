@@ -0,0 +1,80 @@
+"""Async execution of blocking Supabase calls.
+
+supabase-py is synchronous, so calling `.execute()` inside an async handler
+stalls the event loop for the whole round trip. These helpers run the call on
+a bounded thread pool instead, letting one worker keep hundreds of requests in
+flight while capping concurrent PostgREST/Storage calls at
+`settings.db_max_concurrency`.
+
+Usage:
+    response = await execute(
+        self.admin_client.table("profiles").select("*").eq("id", user_id)
+    )
+    url = await run_sync(bucket.create_signed_url, path=path, expires_in=3600)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared DB thread pool, creating it on first use.
+
+    Returns:
+        Thread pool sized to the configured DB concurrency limit.
+    """
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.db_max_concurrency,
+                    thread_name_prefix="supabase-db",
+                )
+    return _executor
+
+
+async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking Supabase call off the event loop.
+
+    Args:
+        func: Blocking callable (e.g. a storage or auth admin method).
+        *args: Positional arguments for func.
+        **kwargs: Keyword arguments for func.
+
+    Returns:
+        Whatever func returns. Exceptions propagate unchanged.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), partial(func, *args, **kwargs))
+
+
+async def execute(query: Any) -> Any:
+    """Execute a PostgREST query builder off the event loop.
+
+    Args:
+        query: Query builder (anything with a blocking `.execute()`).
+
+    Returns:
+        The APIResponse from `.execute()`.
+    """
+    return await run_sync(query.execute)
+
+
+def shutdown_db_executor() -> None:
+    """Shut down the DB thread pool (called from the app lifespan)."""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
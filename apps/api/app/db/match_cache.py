@@ -0,0 +1,171 @@
+"""Content-addressed cache for match analysis results.
+
+The same parsed resume is re-analyzed against the same unchanged job
+description constantly (extension re-opens, double clicks, re-checks after
+a status change). Results are keyed by a hash of the resume digest, job
+description, requested provider and match prompt version, so any change to
+those inputs is a miss and nothing needs explicit invalidation.
+
+Tiers:
+- In-process LRU with a TTL (`match_cache_ttl`, `match_cache_max_entries`).
+- Optional persistent tier in the `match_results` table (migration
+  20260201003000_create_match_results) when `match_cache_persistent` is on,
+  shared by every worker.
+
+Entries are stored per user; account deletion removes them.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.db.client import get_supabase_admin_client
+from app.db.executor import execute
+from app.services.ai.prompts import MATCH_PROMPT_VERSION, ResumeInput
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def match_cache_key(resume_data: ResumeInput, job_description: str, provider: str) -> str:
+    """Hash the inputs that determine a match analysis.
+
+    Args:
+        resume_data: Resume prompt digest (or parsed data) as sent to the AI.
+        job_description: Job description text as sent to the AI.
+        provider: Requested (primary) provider.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    payload = json.dumps(
+        {
+            "resume": resume_data,
+            "job": job_description,
+            "provider": provider,
+            "prompt": MATCH_PROMPT_VERSION,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _get_local(user_id: str, key: str) -> Optional[Dict[str, Any]]:
+    """Get a fresh in-process entry and mark it recently used."""
+    with _lock:
+        entry = _entries.get((user_id, key))
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del _entries[(user_id, key)]
+            return None
+        _entries.move_to_end((user_id, key))
+        return result
+
+
+def _set_local(user_id: str, key: str, result: Dict[str, Any], ttl: float) -> None:
+    """Store an in-process entry, evicting the least recently used."""
+    with _lock:
+        _entries[(user_id, key)] = (time.monotonic() + ttl, result)
+        _entries.move_to_end((user_id, key))
+        while len(_entries) > settings.match_cache_max_entries:
+            _entries.popitem(last=False)
+
+
+async def get_cached_match(user_id: str, key: str) -> Optional[Dict[str, Any]]:
+    """Look up a cached analysis.
+
+    Args:
+        user_id: User's UUID.
+        key: Key from match_cache_key().
+
+    Returns:
+        Cached analysis (match fields plus ai_provider_used), or None.
+    """
+    if settings.match_cache_ttl <= 0:
+        return None
+
+    result = _get_local(user_id, key)
+    if result is not None or not settings.match_cache_persistent:
+        return result
+
+    try:
+        response = await execute(
+            get_supabase_admin_client()
+            .table("match_results")
+            .select("result, expires_at")
+            .eq("user_id", user_id)
+            .eq("cache_key", key)
+            .gt("expires_at", datetime.now(timezone.utc).isoformat())
+            .maybe_single()
+        )
+    except Exception as e:
+        logger.warning(f"match_results lookup failed, treating as miss: {e}")
+        return None
+
+    if not response or not response.data:
+        return None
+    result = response.data["result"]
+    _set_local(user_id, key, result, settings.match_cache_ttl)
+    return result
+
+
+async def store_match(user_id: str, key: str, result: Dict[str, Any]) -> None:
+    """Cache an analysis in both tiers.
+
+    Args:
+        user_id: User's UUID.
+        key: Key from match_cache_key().
+        result: Analysis to cache (match fields plus ai_provider_used).
+    """
+    ttl = settings.match_cache_ttl
+    if ttl <= 0:
+        return
+    _set_local(user_id, key, result, ttl)
+
+    if not settings.match_cache_persistent:
+        return
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+    try:
+        await execute(
+            get_supabase_admin_client()
+            .table("match_results")
+            .upsert(
+                {
+                    "user_id": user_id,
+                    "cache_key": key,
+                    "result": result,
+                    "expires_at": expires_at.isoformat(),
+                }
+            )
+        )
+    except Exception as e:
+        logger.warning(f"match_results write failed: {e}")
+
+
+def forget_user_matches(user_id: str) -> None:
+    """Drop a user's in-process entries (account deletion).
+
+    Args:
+        user_id: User's UUID.
+    """
+    with _lock:
+        for entry_key in [k for k in _entries if k[0] == user_id]:
+            del _entries[entry_key]
+
+
+def clear_match_cache() -> None:
+    """Drop every in-process entry."""
+    with _lock:
+        _entries.clear()
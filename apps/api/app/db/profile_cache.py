@@ -0,0 +1,119 @@
+"""Cached profile reads.
+
+A single AI request used to read the caller's `profiles` row four or five
+times (auth, credit check, AI service, resume lookup, usage recording).
+get_cached_profile() reads it once per request through the RequestContext
+identity map, backed by an optional process-level TTL cache
+(`profile_cache_ttl` seconds, 0 disables it).
+
+Every write to `profiles` must call invalidate_profile() so neither layer
+serves stale tier, active resume or deletion state. Other workers only see
+the change once their TTL entry expires, so keep the TTL short.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.request_context import get_request_context
+from app.db.client import get_supabase_admin_client
+from app.db.executor import execute
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_process_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _get_process_cached(user_id: str) -> Optional[Dict[str, Any]]:
+    """Get a profile from the process TTL cache if still fresh.
+
+    Args:
+        user_id: The user's UUID.
+
+    Returns:
+        Profile row, or None on miss/expiry.
+    """
+    entry = _process_cache.get(user_id)
+    if entry is None:
+        return None
+    expires_at, profile = entry
+    if time.monotonic() >= expires_at:
+        with _lock:
+            _process_cache.pop(user_id, None)
+        return None
+    return profile
+
+
+def _set_process_cached(user_id: str, profile: Dict[str, Any]) -> None:
+    """Store a profile in the process TTL cache (no-op when disabled).
+
+    Args:
+        user_id: The user's UUID.
+        profile: Profile row.
+    """
+    ttl = settings.profile_cache_ttl
+    if ttl <= 0:
+        return
+    with _lock:
+        if len(_process_cache) >= settings.profile_cache_max_entries:
+            # Drop the entry closest to expiry to bound memory
+            oldest = min(_process_cache, key=lambda uid: _process_cache[uid][0])
+            del _process_cache[oldest]
+        _process_cache[user_id] = (time.monotonic() + ttl, profile)
+
+
+async def get_cached_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    """Get a user's full profile row, fetching it at most once per request.
+
+    Lookup order: request identity map, process TTL cache, database.
+    Missing profiles are not cached.
+
+    Args:
+        user_id: The user's UUID.
+
+    Returns:
+        Profile row (all columns), or None if the user has no profile.
+    """
+    context = get_request_context()
+    if context is not None and user_id in context.profiles:
+        return context.profiles[user_id]
+
+    profile = _get_process_cached(user_id)
+    if profile is None:
+        response = await execute(
+            get_supabase_admin_client()
+            .table("profiles")
+            .select("*")
+            .eq("id", user_id)
+            .maybe_single()
+        )
+        profile = response.data if response and response.data else None
+        if profile is None:
+            return None
+        _set_process_cached(user_id, profile)
+
+    if context is not None:
+        context.profiles[user_id] = profile
+    return profile
+
+
+def invalidate_profile(user_id: str) -> None:
+    """Forget a user's cached profile after it was written.
+
+    Args:
+        user_id: The user's UUID.
+    """
+    context = get_request_context()
+    if context is not None:
+        context.profiles.pop(user_id, None)
+    with _lock:
+        _process_cache.pop(user_id, None)
+
+
+def clear_profile_cache() -> None:
+    """Drop every process-level cached profile."""
+    with _lock:
+        _process_cache.clear()
@@ -3,6 +3,8 @@
 from typing import Any, Dict, Optional
 
 from app.db.client import get_supabase_admin_client
+from app.db.executor import execute
+from app.db.profile_cache import get_cached_profile, invalidate_profile
 
 
 async def get_profile_by_id(user_id: str) -> Optional[Dict[str, Any]]:
@@ -14,9 +16,7 @@ async def get_profile_by_id(user_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Profile data or None if not found.
     """
-    client = get_supabase_admin_client()
-    result = client.table("profiles").select("*").eq("id", user_id).single().execute()
-    return result.data if result.data else None
+    return await get_cached_profile(user_id)
 
 
 async def update_profile(user_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -30,10 +30,10 @@ async def update_profile(user_id: str, data: Dict[str, Any]) -> Optional[Dict[st
         Updated profile data or None if update failed.
     """
     client = get_supabase_admin_client()
-    result = (
+    result = await execute(
         client.table("profiles")
         .update(data)
         .eq("id", user_id)
-        .execute()
     )
+    invalidate_profile(user_id)
     return result.data[0] if result.data else None
@@ -0,0 +1,138 @@
+"""Cross-user cache of extracted resume text, keyed by the PDF's SHA-256.
+
+Popular templates, shared sample resumes and the same person signing up
+twice all produce byte-identical PDFs. Their extracted text depends only on
+the bytes, so one extraction can serve every upload of them. Parsed data
+is NOT shared: each upload still gets its own AI parse and credit, and
+per-user duplicates are caught earlier by resumes.content_hash.
+
+Off by default (`resume_text_cache_ttl` = 0). Tiers:
+- In-process LRU with a TTL (`resume_text_cache_max_entries`).
+- Optional persistent tier in the `resume_text_cache` table (migration
+  20260201010000_add_resume_content_hash) when
+  `resume_text_cache_persistent` is on, shared by every worker.
+
+Account deletion removes the entries for the user's resume hashes.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.db.client import get_supabase_admin_client
+from app.db.executor import execute
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+
+def _get_local(content_hash: str) -> Optional[str]:
+    """Get a fresh in-process entry and mark it recently used."""
+    with _lock:
+        entry = _entries.get(content_hash)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if time.monotonic() >= expires_at:
+            del _entries[content_hash]
+            return None
+        _entries.move_to_end(content_hash)
+        return text
+
+
+def _set_local(content_hash: str, text: str, ttl: float) -> None:
+    """Store an in-process entry, evicting the least recently used."""
+    with _lock:
+        _entries[content_hash] = (time.monotonic() + ttl, text)
+        _entries.move_to_end(content_hash)
+        while len(_entries) > settings.resume_text_cache_max_entries:
+            _entries.popitem(last=False)
+
+
+async def get_cached_text(content_hash: str) -> Optional[str]:
+    """Look up the extracted text of a PDF.
+
+    Args:
+        content_hash: Hex SHA-256 of the PDF bytes.
+
+    Returns:
+        Extracted text, or None on a miss (or when the cache is off).
+    """
+    if settings.resume_text_cache_ttl <= 0:
+        return None
+
+    text = _get_local(content_hash)
+    if text is not None or not settings.resume_text_cache_persistent:
+        return text
+
+    try:
+        response = await execute(
+            get_supabase_admin_client()
+            .table("resume_text_cache")
+            .select("extracted_text")
+            .eq("content_hash", content_hash)
+            .gt("expires_at", datetime.now(timezone.utc).isoformat())
+            .maybe_single()
+        )
+    except Exception as e:
+        logger.warning(f"resume_text_cache lookup failed, treating as miss: {e}")
+        return None
+
+    if not response or not response.data:
+        return None
+    text = response.data["extracted_text"]
+    _set_local(content_hash, text, settings.resume_text_cache_ttl)
+    return text
+
+
+async def store_text(content_hash: str, text: str) -> None:
+    """Cache a PDF's extracted text in both tiers.
+
+    Args:
+        content_hash: Hex SHA-256 of the PDF bytes.
+        text: Extracted text.
+    """
+    ttl = settings.resume_text_cache_ttl
+    if ttl <= 0:
+        return
+    _set_local(content_hash, text, ttl)
+
+    if not settings.resume_text_cache_persistent:
+        return
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+    try:
+        await execute(
+            get_supabase_admin_client()
+            .table("resume_text_cache")
+            .upsert({"content_hash": content_hash, "extracted_text": text, "expires_at": expires_at.isoformat()})
+        )
+    except Exception as e:
+        logger.warning(f"resume_text_cache write failed: {e}")
+
+
+async def forget_texts(content_hashes: Iterable[str]) -> None:
+    """Drop cached texts from both tiers (account deletion).
+
+    Args:
+        content_hashes: Hashes of the deleted user's resumes.
+    """
+    hashes = [content_hash for content_hash in content_hashes if content_hash]
+    if not hashes:
+        return
+    with _lock:
+        for content_hash in hashes:
+            _entries.pop(content_hash, None)
+    # Also when the persistent tier is off now: it may have been on before
+    await execute(get_supabase_admin_client().table("resume_text_cache").delete().in_("content_hash", hashes))
+
+
+def clear_text_cache() -> None:
+    """Drop every in-process entry."""
+    with _lock:
+        _entries.clear()
@@ -8,8 +8,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 
 from app.core.config import settings
+from app.core.request_context import RequestContextMiddleware
 from app.core.security import register_exception_handlers
+from app.db.client import close_supabase_clients, init_supabase_clients
+from app.db.config_cache import start_config_listener, stop_config_listener
+from app.db.executor import shutdown_db_executor
 from app.routers import ai, auth, autofill, feedback, jobs, privacy, resumes, subscriptions, usage, webhooks
+from app.services.ai.engine import get_engine
+from app.services.ai.factory import close_providers
+from app.services.pdf_parser import shutdown_pdf_pool, start_pdf_pool
+from app.services.pdf_service import shutdown_render_pool, start_render_pool
+from app.services.resume_ingest import stop_parse_pool
+from app.services.resume_service import start_resume_parsing
 
 # Configure logging
 logging.basicConfig(
@@ -30,9 +40,24 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Jobswyft API v1.0.0")
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"CORS origins: {settings.allowed_origins}")
+    start_pdf_pool()
+    start_render_pool()
+    if settings.supabase_url:
+        init_supabase_clients()
+        await start_config_listener()
+        start_resume_parsing()
+    else:
+        logger.warning("SUPABASE_URL not set, Supabase clients will be created lazily")
     yield
-    # Shutdown (if needed in future)
+    # Shutdown
     logger.info("Shutting down Jobswyft API")
+    await stop_config_listener()
+    await stop_parse_pool()
+    shutdown_pdf_pool()
+    shutdown_render_pool()
+    await close_providers()
+    shutdown_db_executor()
+    close_supabase_clients()
 
 
 # Create FastAPI app
@@ -52,6 +77,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Open a per-request context (profile identity map, ...)
+app.add_middleware(RequestContextMiddleware)
+
 # Register exception handlers (replaces middleware approach)
 register_exception_handlers(app)
 
@@ -105,6 +133,10 @@ async def health_check():
     """Health check endpoint.
 
     Returns:
-        Health status and version.
+        Health status, version and AI circuit breaker states.
     """
-    return {"status": "ok", "version": "1.0.0"}
+    return {
+        "status": "ok",
+        "version": "1.0.0",
+        "ai_providers": get_engine().breakers.snapshot(),
+    }
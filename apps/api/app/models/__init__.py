@@ -3,13 +3,18 @@
 from app.models.ai import (
     AnswerRequest,
     AnswerResponse,
+    BatchMatchRequest,
     CoverLetterPDFRequest,
     CoverLetterRequest,
     CoverLetterResponse,
+    GeneratedContent,
     MatchAnalysisRequest,
     MatchAnalysisResponse,
+    MatchAnalysisResult,
     OutreachRequest,
     OutreachResponse,
+    QuickMatchRequest,
+    QuickMatchResponse,
 )
 from app.models.autofill import (
     AutofillDataResponse,
@@ -55,6 +60,8 @@ from app.models.privacy import (
     UsageOperationBreakdown,
 )
 from app.models.usage import (
+    TierConfig,
+    TierLimits,
     UsageByType,
     UsageEventItem,
     UsageHistoryResponse,
@@ -66,10 +73,12 @@ __all__ = [
     "AnswerRequest",
     "AnswerResponse",
     "AutofillDataResponse",
+    "BatchMatchRequest",
     "CancelDeleteResponse",
     "FeedbackCategory",
     "FeedbackRequest",
     "FeedbackResponse",
+    "GeneratedContent",
     "CheckoutRequest",
     "CheckoutResponse",
     "ConfirmDeleteRequest",
@@ -93,15 +102,20 @@ __all__ = [
     "JobUpdateRequest",
     "MatchAnalysisRequest",
     "MatchAnalysisResponse",
+    "MatchAnalysisResult",
     "MockCancelRequest",
     "OutreachRequest",
     "OutreachResponse",
     "PersonalData",
     "PortalResponse",
     "ProfileStorageInfo",
+    "QuickMatchRequest",
+    "QuickMatchResponse",
     "ResumeData",
     "ResumeStorageInfo",
     "SubscriptionTier",
+    "TierConfig",
+    "TierLimits",
     "UsageByType",
     "UsageEventItem",
     "UsageHistoryResponse",
@@ -5,6 +5,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
+from app.models.job import JobStatus
+
 
 class MatchAnalysisRequest(BaseModel):
     """Request model for POST /v1/ai/match."""
@@ -17,16 +19,60 @@ class MatchAnalysisRequest(BaseModel):
     )
 
 
-class MatchAnalysisResponse(BaseModel):
-    """Response model for match analysis result."""
+class BatchMatchRequest(BaseModel):
+    """Request model for POST /v1/ai/match/batch.
+
+    Give either job_ids, or status to analyze every job with that status.
+    """
+
+    job_ids: Optional[list[UUID]] = Field(None, min_length=1)
+    status: Optional[JobStatus] = None
+    resume_id: Optional[UUID] = None
+    ai_provider: Optional[Literal["claude", "gpt"]] = None
+
+    @model_validator(mode="after")
+    def validate_one_job_selector(self):
+        """Validate that exactly one of job_ids and status is given."""
+        if (self.job_ids is None) == (self.status is None):
+            raise ValueError("Provide either job_ids or status")
+        return self
+
+
+class MatchAnalysisResult(BaseModel):
+    """How well a resume matches a job, as generated by the AI."""
 
     match_score: int = Field(..., ge=0, le=100, description="Match score 0-100")
     strengths: list[str] = Field(..., description="List of matching qualifications")
     gaps: list[str] = Field(..., description="List of missing requirements")
     recommendations: list[str] = Field(..., description="Actionable suggestions")
+
+
+class MatchAnalysisResponse(MatchAnalysisResult):
+    """Response model for match analysis result."""
+
     ai_provider_used: str = Field(..., description="AI provider that generated the analysis")
 
 
+class QuickMatchRequest(BaseModel):
+    """Request model for a local match estimate (no AI, no credits)."""
+
+    job_id: UUID
+    resume_id: Optional[UUID] = None
+
+
+class QuickMatchResponse(BaseModel):
+    """Response model for a local match estimate."""
+
+    match_score: int = Field(..., ge=0, le=100, description="Estimated match score 0-100")
+    matched_skills: list[str] = Field(..., description="Resume skills the job description mentions")
+    missing_terms: list[str] = Field(..., description="Heaviest job terms the resume lacks")
+
+
+class GeneratedContent(BaseModel):
+    """Cover letter, application answer or outreach message text, as generated by the AI."""
+
+    content: str = Field(..., description="The generated text, ready to send")
+
 
 class CoverLetterRequest(BaseModel):
     """Request model for POST /v1/ai/cover-letter."""
@@ -62,6 +62,7 @@ class JobResponse(BaseModel):
     source_url: Optional[str] = None
     status: str
     notes: Optional[str] = None
+    skills: list[str] = Field(default_factory=list, description="Canonical skills found in the description")
     created_at: datetime
     updated_at: datetime
 
@@ -74,6 +75,7 @@ class JobListItem(BaseModel):
     company: str
     status: str
     notes_preview: Optional[str] = None
+    match_score: Optional[int] = None  # Local match estimate, only when sorted by match
     created_at: datetime
     updated_at: datetime
 
@@ -63,6 +63,7 @@ class ResumeUploadResponse(BaseModel):
 
     resume: ResumeResponse
     ai_provider_used: Optional[str] = None
+    duplicate: bool = False  # an existing resume with the same file was returned
 
 
 class ResumeListItem(BaseModel):
@@ -1,10 +1,48 @@
 """Usage models for credit tracking endpoints."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, RootModel, field_validator
+
+
+class TierConfig(BaseModel):
+    """Credit configuration for one subscription tier."""
+
+    type: Literal["lifetime", "monthly"]
+    credits: int  # -1 means unlimited
+    max_resumes: int = 5
+
+    @property
+    def is_unlimited(self) -> bool:
+        """Whether the tier has no credit cap."""
+        return self.credits == -1
+
+
+class TierLimits(RootModel[Dict[str, TierConfig]]):
+    """Typed `tier_limits` value from global_config, keyed by tier name."""
+
+    def for_tier(self, tier: str) -> TierConfig:
+        """Get a tier's config, falling back to the free tier.
+
+        Args:
+            tier: Tier name (free, pro, unlimited).
+
+        Returns:
+            The tier's configuration.
+        """
+        return self.root.get(tier) or self.root["free"]
+
+
+# Used only when global_config has no tier_limits row (mirrors the seed data)
+DEFAULT_TIER_LIMITS = TierLimits.model_validate(
+    {
+        "free": {"type": "lifetime", "credits": 5, "max_resumes": 5},
+        "pro": {"type": "monthly", "credits": 100, "max_resumes": 10},
+        "unlimited": {"type": "monthly", "credits": -1, "max_resumes": 25},
+    }
+)
 
 
 class UsageByType(BaseModel):
@@ -3,12 +3,14 @@
 import logging
 
 from fastapi import APIRouter, Depends
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 
 from app.core.deps import CurrentUser
+from app.core.sse import sse_response
 from app.models.ai import (
     AnswerRequest,
     AnswerResponse,
+    BatchMatchRequest,
     CoverLetterPDFRequest,
     CoverLetterRequest,
     CoverLetterResponse,
@@ -16,6 +18,8 @@ from app.models.ai import (
     MatchAnalysisResponse,
     OutreachRequest,
     OutreachResponse,
+    QuickMatchRequest,
+    QuickMatchResponse,
 )
 from app.models.base import ok
 from app.services.answer_service import AnswerService
@@ -101,6 +105,87 @@ async def generate_match_analysis(
     return ok(response_data.model_dump())
 
 
+@router.post("/match/quick")
+async def generate_quick_match(
+    request: QuickMatchRequest,
+    user: CurrentUser,
+    match_service: MatchService = Depends(get_match_service),
+) -> dict:
+    """Estimate the match between resume and job instantly, for free.
+
+    Scores the resume's skills and experience against the job description
+    locally (no AI call, no credits). Use POST /match for the full analysis.
+
+    Args:
+        request: Quick match request with job_id and optional resume_id.
+        user: Authenticated user from dependency.
+        match_service: Match service instance.
+
+    Returns:
+        Estimated score, the resume skills the job mentions, and the
+        heaviest job terms the resume lacks.
+
+    Raises:
+        AUTH_REQUIRED (401): No authentication token.
+        VALIDATION_ERROR (400): No resume selected or other validation issue.
+        RESUME_NOT_FOUND (404): Resume doesn't exist or belongs to another user.
+        JOB_NOT_FOUND (404): Job doesn't exist or belongs to another user.
+    """
+    estimate = await match_service.generate_quick_match(
+        user_id=user["id"],
+        job_id=str(request.job_id),
+        resume_id=str(request.resume_id) if request.resume_id else None,
+    )
+
+    # Validate response with Pydantic model
+    response_data = QuickMatchResponse(**estimate)
+
+    return ok(response_data.model_dump())
+
+
+@router.post("/match/batch")
+async def generate_batch_match_analysis(
+    request: BatchMatchRequest,
+    user: CurrentUser,
+    match_service: MatchService = Depends(get_match_service),
+) -> StreamingResponse:
+    """Score one resume against many saved jobs as Server-Sent Events.
+
+    Takes either `job_ids` or a job `status` filter. Credits for every job
+    are reserved up front; only analyses that ran are charged (cache hits
+    cost `MATCH_CACHE_HIT_CREDITS`, free by default).
+
+    Events:
+    - `start`: `{"total"}`
+    - `result`: `{"job_id", "match_score", "strengths", "gaps", "recommendations", "ai_provider_used", "cached"}`
+      per job, in completion order
+    - `error`: `{"job_id", "code", "message"}` for a job that could not be analyzed
+    - `done`: `{"completed", "failed", "credits_used"}`
+
+    Args:
+        request: Batch request with job_ids or status, and optional resume_id/ai_provider.
+        user: Authenticated user from dependency.
+        match_service: Match service instance.
+
+    Returns:
+        text/event-stream response.
+
+    Raises:
+        AUTH_REQUIRED (401): No authentication token.
+        VALIDATION_ERROR (400): No resume selected, no jobs, or too many jobs.
+        RESUME_NOT_FOUND (404): Resume doesn't exist or belongs to another user.
+        JOB_NOT_FOUND (404): None of the jobs exist for this user.
+        CREDIT_EXHAUSTED (422): Not enough credits for the whole batch.
+    """
+    events = await match_service.generate_batch_match_analysis(
+        user_id=user["id"],
+        job_ids=[str(job_id) for job_id in request.job_ids] if request.job_ids else None,
+        status=request.status.value if request.status else None,
+        resume_id=str(request.resume_id) if request.resume_id else None,
+        ai_provider=request.ai_provider,
+    )
+    return sse_response(events)
+
 
 @router.post("/cover-letter")
 async def generate_cover_letter(
@@ -160,6 +245,44 @@ async def generate_cover_letter(
     return ok(response_data.model_dump())
 
 
+@router.post("/cover-letter/stream")
+async def stream_cover_letter(
+    request: CoverLetterRequest,
+    user: CurrentUser,
+    cover_letter_service: CoverLetterService = Depends(get_cover_letter_service),
+) -> StreamingResponse:
+    """Stream an AI-powered cover letter as it is generated.
+
+    Same request body, validation and errors as POST /ai/cover-letter; errors
+    raised before the first token are returned as the usual JSON envelope.
+
+    Events (`data` is JSON):
+    - `start`: `{"ai_provider_used"}` once a provider has produced its first token
+    - `delta`: `{"text"}` for each chunk of generated text
+    - `done`: `{"content", "ai_provider_used", "tokens_used"}`; the credit is charged here
+    - `error`: `{"code", "message"}` if the provider fails mid-stream (credit released)
+
+    Args:
+        request: Cover letter request with job_id, tone, and optional parameters.
+        user: Authenticated user from dependency.
+        cover_letter_service: Cover letter service instance.
+
+    Returns:
+        text/event-stream of start, delta, done (or error) events.
+    """
+    events = await cover_letter_service.stream_cover_letter(
+        user_id=user["id"],
+        job_id=str(request.job_id),
+        resume_id=str(request.resume_id) if request.resume_id else None,
+        tone=request.tone,
+        custom_instructions=request.custom_instructions,
+        feedback=request.feedback,
+        previous_content=request.previous_content,
+        ai_provider=request.ai_provider,
+    )
+    return sse_response(events)
+
+
 @router.post("/cover-letter/pdf")
 async def export_cover_letter_pdf(
     request: CoverLetterPDFRequest,
@@ -175,6 +298,9 @@ async def export_cover_letter_pdf(
     - Proper paragraph spacing
     - Current date at top
 
+    Rendering runs off the event loop (in the warmed WeasyPrint pool when
+    it is running); the same content is served from cache for the day.
+
     Note: This endpoint does NOT count against usage balance.
 
     Args:
@@ -190,7 +316,7 @@ async def export_cover_letter_pdf(
         VALIDATION_ERROR (400): Empty content.
     """
     # Generate PDF
-    pdf_bytes = pdf_service.generate_cover_letter_pdf(
+    pdf_bytes = await pdf_service.render_cover_letter_pdf(
         content=request.content,
         file_name=request.file_name,
     )
@@ -264,6 +390,44 @@ async def generate_answer(
     return ok(response_data.model_dump())
 
 
+@router.post("/answer/stream")
+async def stream_answer(
+    request: AnswerRequest,
+    user: CurrentUser,
+    answer_service: AnswerService = Depends(get_answer_service),
+) -> StreamingResponse:
+    """Stream an AI-powered application answer as it is generated.
+
+    Same request body, validation and errors as POST /ai/answer; errors
+    raised before the first token are returned as the usual JSON envelope.
+
+    Events (`data` is JSON):
+    - `start`: `{"ai_provider_used"}` once a provider has produced its first token
+    - `delta`: `{"text"}` for each chunk of generated text
+    - `done`: `{"content", "ai_provider_used", "tokens_used"}`; the credit is charged here
+    - `error`: `{"code", "message"}` if the provider fails mid-stream (credit released)
+
+    Args:
+        request: Answer request with job_id, question, and optional parameters.
+        user: Authenticated user from dependency.
+        answer_service: Answer service instance.
+
+    Returns:
+        text/event-stream of start, delta, done (or error) events.
+    """
+    events = await answer_service.stream_answer(
+        user_id=user["id"],
+        job_id=str(request.job_id),
+        question=request.question,
+        resume_id=str(request.resume_id) if request.resume_id else None,
+        max_length=request.max_length,
+        feedback=request.feedback,
+        previous_content=request.previous_content,
+        ai_provider=request.ai_provider,
+    )
+    return sse_response(events)
+
+
 @router.post("/outreach")
 async def generate_outreach(
     request: OutreachRequest,
@@ -324,3 +488,42 @@ async def generate_outreach(
     response_data = OutreachResponse(**outreach)
 
     return ok(response_data.model_dump())
+
+
+@router.post("/outreach/stream")
+async def stream_outreach(
+    request: OutreachRequest,
+    user: CurrentUser,
+    outreach_service: OutreachService = Depends(get_outreach_service),
+) -> StreamingResponse:
+    """Stream an AI-powered outreach message as it is generated.
+
+    Same request body, validation and errors as POST /ai/outreach; errors
+    raised before the first token are returned as the usual JSON envelope.
+
+    Events (`data` is JSON):
+    - `start`: `{"ai_provider_used"}` once a provider has produced its first token
+    - `delta`: `{"text"}` for each chunk of generated text
+    - `done`: `{"content", "ai_provider_used", "tokens_used"}`; the credit is charged here
+    - `error`: `{"code", "message"}` if the provider fails mid-stream (credit released)
+
+    Args:
+        request: Outreach request with job_id, recipient_type, platform, and optional parameters.
+        user: Authenticated user from dependency.
+        outreach_service: Outreach service instance.
+
+    Returns:
+        text/event-stream of start, delta, done (or error) events.
+    """
+    events = await outreach_service.stream_outreach(
+        user_id=user["id"],
+        job_id=str(request.job_id),
+        recipient_type=request.recipient_type,
+        platform=request.platform,
+        resume_id=str(request.resume_id) if request.resume_id else None,
+        recipient_name=request.recipient_name,
+        feedback=request.feedback,
+        previous_content=request.previous_content,
+        ai_provider=request.ai_provider,
+    )
+    return sse_response(events)
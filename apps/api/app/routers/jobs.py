@@ -3,13 +3,14 @@
 import logging
 from uuid import UUID
 
-from typing import Optional
+from typing import Annotated, Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query
 from fastapi.responses import JSONResponse
 
 from app.core.deps import CurrentUser
-from app.core.exceptions import JobNotFoundError
+from app.core.exceptions import JobNotFoundError, ValidationError
+from app.db.profile_cache import get_cached_profile
 from app.models.base import ok
 from app.models.job import (
     JobCreateRequest,
@@ -20,17 +21,42 @@ from app.models.job import (
     JobUpdateRequest,
 )
 from app.services.job_service import JobService
+from app.services.resume_service import ResumeService
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/jobs")
 
 
-def get_job_service() -> JobService:
-    """Dependency to get job service instance."""
+def get_job_service(
+    authorization: Annotated[Optional[str], Header()] = None,
+) -> JobService:
+    """Dependency to get job service instance.
+
+    The bearer token (if any) scopes queries to a per-request RLS session on
+    the shared connection pool. Missing/invalid headers are rejected by
+    CurrentUser, not here.
+    """
+    parts = authorization.split() if authorization else []
+    if len(parts) == 2 and parts[0].lower() == "bearer":
+        return JobService(access_token=parts[1])
     return JobService()
 
 
+async def _active_resume_data(user_id: str) -> Dict[str, Any]:
+    """Parsed data of the user's active resume, for ranking jobs by match.
+
+    Raises:
+        ValidationError: If there is no active resume or it is unparsed.
+    """
+    profile = await get_cached_profile(user_id) or {}
+    resume_id = profile.get("active_resume_id")
+    resume = await ResumeService().get_resume(user_id, resume_id) if resume_id else None
+    if not resume or not resume.get("parsed_data"):
+        raise ValidationError("Sorting by match needs a parsed active resume.")
+    return resume["parsed_data"]
+
+
 @router.post("/scan")
 async def create_scanned_job(
     job_data: JobCreateRequest,
@@ -112,16 +138,23 @@ async def create_job(
 async def list_jobs(
     user: CurrentUser,
     status: Optional[str] = Query(None, description="Filter by job status"),
+    skills: Optional[List[str]] = Query(None, description="Only jobs requiring any of these skills"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    sort: str = Query("updated_at", description="Sort field"),
+    sort: str = Query("updated_at", description="Sort field, or 'match' to rank by estimated match"),
     job_service: JobService = Depends(get_job_service),
 ) -> dict:
     """List jobs with pagination and optional filtering.
 
+    sort=match ranks jobs by a local match estimate against the active
+    resume (free, no AI call) and includes each job's match_score. Only the
+    QUICK_MATCH_RANK_MAX_JOBS most recently updated jobs are ranked, and
+    total is capped at that number.
+
     Args:
         user: Authenticated user from dependency.
         status: Optional status filter.
+        skills: Optional skills filter (synonyms such as "k8s" are accepted).
         page: Page number (1-indexed).
         page_size: Number of items per page.
         sort: Field to sort by.
@@ -132,15 +165,19 @@ async def list_jobs(
 
     Raises:
         AUTH_REQUIRED (401): No authentication token.
+        VALIDATION_ERROR (400): sort=match without a parsed active resume.
     """
     user_id = user["id"]
 
     filters = {
         "status": status,
+        "skills": skills,
         "page": page,
         "page_size": page_size,
         "sort": sort,
     }
+    if sort == "match":
+        filters["resume_data"] = await _active_resume_data(user_id)
 
     result = await job_service.list_jobs(user_id, filters)
 
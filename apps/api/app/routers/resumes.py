@@ -3,10 +3,12 @@
 import logging
 
 from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 from uuid import UUID
 
 from app.core.deps import CurrentUser
 from app.core.exceptions import ApiException, ErrorCode, ResumeNotFoundError
+from app.core.sse import sse_response
 from app.models.base import ok, paginated
 from app.models.resume import ResumeListItem, ResumeDetailResponse
 from app.services.resume_service import ResumeService
@@ -37,13 +39,21 @@ async def upload_resume(
     (Claude primary, GPT fallback). Credits are consumed only on
     successful parse.
 
+    With background parsing enabled (RESUME_PARSE_WORKERS > 0) the resume
+    is stored and 202 is returned with parse_status "pending"; follow the
+    parse with GET /v1/resumes/{id} or GET /v1/resumes/{id}/events.
+
+    Re-uploading a file the user already has (byte-identical, parsed or
+    pending) returns that resume with duplicate=true and uses no credit.
+
     Args:
         user: Authenticated user from dependency.
         file: Uploaded PDF file.
         resume_service: Resume service instance.
 
     Returns:
-        Created resume with parsed data and ai_provider_used.
+        Created resume with parsed data and ai_provider_used (200), or the
+        pending resume (202).
 
     Raises:
         VALIDATION_ERROR (400): File is not PDF or exceeds 10MB.
@@ -87,6 +97,8 @@ async def upload_resume(
         file_name=file.filename or "resume.pdf",
     )
 
+    if result["resume"]["parse_status"] == "pending":
+        return JSONResponse(content=ok(result), status_code=202)
     return ok(result)
 
 
@@ -163,6 +175,42 @@ async def get_resume(
     return ok(detail_response.model_dump())
 
 
+@router.get("/{resume_id}/events")
+async def stream_resume_parse(
+    resume_id: UUID,
+    user: CurrentUser,
+    resume_service: ResumeService = Depends(get_resume_service),
+) -> StreamingResponse:
+    """Stream a resume's parse status as Server-Sent Events.
+
+    Events:
+    - status: {"parse_status": "pending"} while the parse is queued or running
+    - completed / failed: {"id", "parse_status", "parsed_data"} when it settles
+
+    A settled resume gets its final event immediately. The stream closes
+    after RESUME_PARSE_EVENTS_TIMEOUT seconds if the parse is still pending.
+
+    Args:
+        resume_id: Resume UUID.
+        user: Authenticated user from dependency.
+        resume_service: Resume service instance.
+
+    Returns:
+        text/event-stream response.
+
+    Raises:
+        AUTH_REQUIRED (401): No authentication token.
+        RESUME_NOT_FOUND (404): Resume doesn't exist or belongs to another user.
+    """
+    user_id = user["id"]
+
+    if not await resume_service.get_resume(user_id, str(resume_id)):
+        logger.warning(f"Resume {resume_id} not found for user {user_id[:8]}...")
+        raise ResumeNotFoundError()
+
+    return sse_response(resume_service.parse_events(user_id, str(resume_id)))
+
+
 @router.put("/{resume_id}/active")
 async def set_active_resume(
     resume_id: UUID,
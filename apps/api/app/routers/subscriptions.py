@@ -10,6 +10,8 @@ from app.core.config import settings
 from app.core.deps import CurrentUser
 from app.core.exceptions import MockModeDisabledError
 from app.db.client import get_supabase_admin_client
+from app.db.executor import execute
+from app.db.profile_cache import invalidate_profile
 from app.models.base import ok
 from app.models.subscriptions import (
     CheckoutRequest,
@@ -105,13 +107,16 @@ async def mock_cancel_subscription(
     logger.info(f"Mock cancel requested - user: {user_id[:8]}...")
 
     admin_client = get_supabase_admin_client()
-    admin_client.table("profiles").update(
-        {
-            "subscription_tier": "free",
-            "subscription_status": "canceled",
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-        }
-    ).eq("id", user_id).execute()
+    await execute(
+        admin_client.table("profiles").update(
+            {
+                "subscription_tier": "free",
+                "subscription_status": "canceled",
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+        ).eq("id", user_id)
+    )
+    invalidate_profile(user_id)
 
     # Audit log for subscription cancellations (critical for billing reconciliation)
     logger.warning(
@@ -0,0 +1,201 @@
+"""Circuit breakers per AI provider and operation.
+
+A breaker watches the outcomes of one (provider, operation) pair over a
+sliding time window. When enough calls fail or run slow it opens, and the
+engine skips that provider and goes straight to the healthy one. After
+`ai_breaker_open_seconds` it turns half-open and lets a limited number of
+probe calls through: a successful probe closes it, a failed one reopens it.
+
+State is per process, like the latency history it sits next to.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a breaker refuses a call."""
+
+
+class CircuitBreaker:
+    """Sliding-window circuit breaker for one provider and operation."""
+
+    def __init__(self, name: str, clock: Callable[[], float] = time.monotonic):
+        """Initialize a closed breaker.
+
+        Args:
+            name: Label used in logs, e.g. "claude:match".
+            clock: Monotonic time source (injectable for tests).
+        """
+        self.name = name
+        self._clock = clock
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self._outcomes: Deque[Tuple[float, bool, bool]] = deque()  # (at, ok, slow)
+        self._probes_in_flight = 0
+
+    def _prune(self, now: float) -> None:
+        """Drop outcomes older than the window."""
+        horizon = now - settings.ai_breaker_window
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            self._outcomes.popleft()
+
+    def _rates(self) -> Tuple[int, float, float]:
+        """Calls, failure rate and slow-call rate in the current window."""
+        calls = len(self._outcomes)
+        if not calls:
+            return 0, 0.0, 0.0
+        failures = sum(1 for _, ok, _ in self._outcomes if not ok)
+        slow = sum(1 for _, _, is_slow in self._outcomes if is_slow)
+        return calls, failures / calls, slow / calls
+
+    def _cooled_down(self, now: float) -> bool:
+        """Whether an open breaker has waited long enough to probe."""
+        return self.opened_at is not None and now - self.opened_at >= settings.ai_breaker_open_seconds
+
+    def allows_requests(self) -> bool:
+        """Whether a call could be let through right now (does not reserve a probe)."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and not self._cooled_down(self._clock()):
+            return False
+        return self._probes_in_flight < settings.ai_breaker_half_open_probes
+
+    def acquire(self) -> bool:
+        """Reserve the right to make a call.
+
+        Returns:
+            True if the call may proceed. In half-open state this takes one
+            of the probe slots, which record_*() or release() gives back.
+        """
+        if self.state == CLOSED:
+            return True
+        now = self._clock()
+        if self.state == OPEN:
+            if not self._cooled_down(now):
+                return False
+            self.state = HALF_OPEN
+            logger.info(f"Circuit {self.name} half-open, probing")
+        if self._probes_in_flight >= settings.ai_breaker_half_open_probes:
+            return False
+        self._probes_in_flight += 1
+        return True
+
+    def release(self) -> None:
+        """Give back a probe slot without recording an outcome (cancelled call)."""
+        if self.state == HALF_OPEN and self._probes_in_flight:
+            self._probes_in_flight -= 1
+
+    def record_slow(self) -> None:
+        """Record a call cancelled after running past the slow-call threshold.
+
+        A hedged-out call has no result, but its time still counts against
+        the provider. In half-open state the probe slot is just given back.
+        """
+        if self.state == HALF_OPEN:
+            self.release()
+            return
+        self._record(ok=True, slow=True)
+
+    def record_success(self, slow: bool = False) -> None:
+        """Record a successful call.
+
+        Args:
+            slow: Whether the call exceeded the slow-call threshold.
+        """
+        if self.state == HALF_OPEN:
+            self._close()
+            return
+        self._record(ok=True, slow=slow)
+
+    def record_failure(self) -> None:
+        """Record a failed or timed-out call."""
+        if self.state == HALF_OPEN:
+            self._open(self._clock(), reason="probe failed")
+            return
+        self._record(ok=False, slow=False)
+
+    def _record(self, ok: bool, slow: bool) -> None:
+        """Add an outcome and open the breaker if the window is unhealthy."""
+        now = self._clock()
+        self._outcomes.append((now, ok, slow))
+        self._prune(now)
+        if self.state != CLOSED:
+            return
+
+        calls, failure_rate, slow_rate = self._rates()
+        if calls < settings.ai_breaker_min_calls:
+            return
+        if failure_rate >= settings.ai_breaker_failure_rate:
+            self._open(now, reason=f"failure rate {failure_rate:.0%} over {calls} calls")
+        elif slow_rate >= settings.ai_breaker_slow_call_rate:
+            self._open(now, reason=f"slow-call rate {slow_rate:.0%} over {calls} calls")
+
+    def _open(self, now: float, reason: str) -> None:
+        """Move to open."""
+        self.state = OPEN
+        self.opened_at = now
+        self._probes_in_flight = 0
+        logger.warning(f"Circuit {self.name} opened: {reason}")
+
+    def _close(self) -> None:
+        """Move to closed with a fresh window."""
+        self.state = CLOSED
+        self.opened_at = None
+        self._probes_in_flight = 0
+        self._outcomes.clear()
+        logger.info(f"Circuit {self.name} closed")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state and window statistics."""
+        self._prune(self._clock())
+        calls, failure_rate, slow_rate = self._rates()
+        return {
+            "state": self.state,
+            "calls": calls,
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_rate, 3),
+        }
+
+
+class BreakerRegistry:
+    """Lazily created breakers keyed by (provider, operation)."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """Initialize an empty registry.
+
+        Args:
+            clock: Time source passed to every breaker.
+        """
+        self._clock = clock
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, provider: str, operation: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a provider and operation."""
+        key = (provider, operation)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(f"{provider}:{operation}", self._clock)
+        return breaker
+
+    def open_circuits(self) -> List[str]:
+        """Names of breakers that are not closed."""
+        return [b.name for b in self._breakers.values() if b.state != CLOSED]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """State of every breaker, keyed "provider:operation"."""
+        return {b.name: b.snapshot() for b in self._breakers.values()}
+
+    def clear(self) -> None:
+        """Forget every breaker."""
+        self._breakers.clear()
@@ -1,17 +1,118 @@
 """Claude AI provider implementation."""
 
-import json
 import logging
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
 from anthropic import AsyncAnthropic
 
-from app.services.ai.prompts import RESUME_PARSE_PROMPT, format_match_prompt
-from app.services.ai.provider import AIProvider
+from app.services.ai.metering import token_count
+from app.services.ai.prompts import RESUME_PARSE_PROMPT, ChatPrompt, ResumeInput, format_match_prompt
+from app.services.ai.provider import AIProvider, TokenUsage
+from app.services.ai.structured import CONTENT_SCHEMA, MATCH_SCHEMA, RESUME_SCHEMA, OutputSchema
 
 logger = logging.getLogger(__name__)
 
 
+def _prompt_params(prompt: ChatPrompt) -> Dict[str, Any]:
+    """Build system/messages with cache breakpoints after the shared prefixes.
+
+    The system prompt and resume/job context come first. The resume block
+    and the job block each carry cache_control, so matching one resume
+    against many jobs reads the system+resume prefix from Anthropic's
+    prompt cache, and consecutive operations on the same resume and job
+    read the whole context. Prefixes shorter than the model's minimum
+    cacheable length are simply not cached.
+
+    Args:
+        prompt: Generation prompt.
+
+    Returns:
+        Keyword arguments for messages.create() / messages.stream().
+    """
+    return {
+        "system": prompt.system,
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt.resume_context, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": prompt.job_context, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": prompt.task},
+                ],
+            }
+        ],
+    }
+
+
+def _fill_usage(usage: Optional[TokenUsage], reported: Any) -> TokenUsage:
+    """Copy Anthropic usage metadata into a TokenUsage.
+
+    Anthropic reports cache reads and writes separately from input_tokens;
+    both are counted as input here, with cache reads as cached input.
+
+    Args:
+        usage: TokenUsage to fill, or None to create one.
+        reported: response.usage (or the final stream message's usage).
+
+    Returns:
+        The filled TokenUsage.
+    """
+    usage = usage if usage is not None else TokenUsage()
+    if reported:
+        cache_read = token_count(getattr(reported, "cache_read_input_tokens", None))
+        cache_write = token_count(getattr(reported, "cache_creation_input_tokens", None))
+        usage.input_tokens = token_count(reported.input_tokens) + cache_read + cache_write
+        usage.output_tokens = token_count(reported.output_tokens)
+        usage.cached_input_tokens = cache_read
+    return usage
+
+
+def _tool_params(schema: OutputSchema) -> Dict[str, Any]:
+    """Force a structured result through a single tool.
+
+    The tool's input_schema is the operation's output schema and
+    tool_choice requires the call, so the result arrives as a validated
+    JSON object instead of free text. Tool definitions are part of the
+    cached prefix: the text operations share one tool, match has its own.
+
+    Args:
+        schema: Output schema of the operation.
+
+    Returns:
+        Keyword arguments for messages.create().
+    """
+    return {
+        "tools": [
+            {"name": schema.name, "description": schema.description, "input_schema": schema.json_schema}
+        ],
+        "tool_choice": {"type": "tool", "name": schema.name},
+    }
+
+
+def _structured_result(response: Any, schema: OutputSchema) -> Dict[str, Any]:
+    """Read the forced tool call, repairing text blocks if there is none.
+
+    Args:
+        response: messages.create() response.
+        schema: Output schema the tool was built from.
+
+    Returns:
+        The validated result.
+
+    Raises:
+        ValueError: If the result does not match the schema.
+    """
+    texts = []
+    for block in response.content:
+        if getattr(block, "type", None) == "tool_use" and getattr(block, "name", None) == schema.name:
+            return schema.parse(block.input)
+        text = getattr(block, "text", None)
+        if isinstance(text, str):
+            texts.append(text)
+    logger.warning(f"Claude answered without calling {schema.name}, parsing its text")
+    return schema.parse_text("".join(texts))
+
+
 class ClaudeProvider(AIProvider):
     """Claude AI provider using Anthropic API."""
 
@@ -29,17 +130,18 @@ class ClaudeProvider(AIProvider):
         """Provider name."""
         return "claude"
 
-    async def parse_resume(self, text: str) -> Dict[str, Any]:
+    async def parse_resume(self, text: str, usage: Optional[TokenUsage] = None) -> Dict[str, Any]:
         """Parse resume using Claude 3.5 Sonnet.
 
         Args:
             text: Raw resume text.
+            usage: Filled with the reported token counts.
 
         Returns:
             Parsed resume data as dictionary.
 
         Raises:
-            ValueError: If AI returns invalid JSON.
+            ValueError: If the response does not match the resume schema.
         """
         prompt = RESUME_PARSE_PROMPT.format(resume_text=text)
 
@@ -49,32 +151,29 @@ class ClaudeProvider(AIProvider):
             model=self.model,
             max_tokens=2000,
             messages=[{"role": "user", "content": prompt}],
+            **_tool_params(RESUME_SCHEMA),
         )
 
-        response_text = response.content[0].text
-
-        try:
-            parsed = json.loads(response_text)
-            logger.info("Successfully parsed resume with Claude")
-            return parsed
-        except json.JSONDecodeError as e:
-            logger.error(f"Claude returned invalid JSON: {e}")
-            raise ValueError(f"AI returned invalid JSON: {e}") from e
+        usage = _fill_usage(usage, response.usage)
+        parsed = _structured_result(response, RESUME_SCHEMA)
+        logger.info("Successfully parsed resume with Claude")
+        return parsed
 
     async def generate_match_analysis(
-        self, resume_data: Dict[str, Any], job_description: str
+        self, resume_data: ResumeInput, job_description: str, usage: Optional[TokenUsage] = None
     ) -> Dict[str, Any]:
         """Generate match analysis using Claude.
 
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job posting description.
+            usage: Filled with the reported token counts.
 
         Returns:
             Match analysis dictionary with match_score, strengths, gaps, recommendations.
 
         Raises:
-            ValueError: If AI returns invalid JSON or missing required fields.
+            ValueError: If the response does not match the operation's output schema.
         """
         prompt = format_match_prompt(resume_data, job_description)
 
@@ -84,61 +183,46 @@ class ClaudeProvider(AIProvider):
             response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=1500,
-                messages=[{"role": "user", "content": prompt}],
+                **_prompt_params(prompt),
+                **_tool_params(MATCH_SCHEMA),
                 timeout=10.0,
             )
         except Exception as e:
             logger.error(f"Claude API error during match analysis: {e}")
             raise ValueError(f"Claude API error: {e}") from e
 
-        response_text = response.content[0].text
-
-        try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"Claude returned invalid JSON for match analysis: {e}")
-            raise ValueError(f"AI returned invalid JSON: {e}") from e
-
-        # Validate required fields
-        required_fields = ["match_score", "strengths", "gaps", "recommendations"]
-        for field in required_fields:
-            if field not in parsed:
-                logger.error(f"Claude response missing required field: {field}")
-                raise ValueError(f"AI response missing required field: {field}")
-
-        # Validate match_score is an integer 0-100
-        if not isinstance(parsed["match_score"], int) or not 0 <= parsed["match_score"] <= 100:
-            logger.error(f"Invalid match_score: {parsed['match_score']}")
-            raise ValueError("match_score must be an integer between 0 and 100")
+        usage = _fill_usage(usage, response.usage)
+        parsed = _structured_result(response, MATCH_SCHEMA)
 
         logger.info(f"Successfully generated match analysis with Claude, score: {parsed['match_score']}")
         return parsed
 
-
     async def generate_cover_letter(
         self,
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         tone: str,
         custom_instructions: Optional[str] = None,
         feedback: Optional[str] = None,
         previous_content: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int]:
         """Generate cover letter using Claude.
 
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job posting description.
             tone: Desired tone for the cover letter.
             custom_instructions: Optional user instructions.
             feedback: Optional feedback for regeneration.
             previous_content: Previous cover letter (required with feedback).
+            usage: Filled with the reported token counts.
 
         Returns:
-            Tuple of (content, tokens_used).
+            Tuple of (content, tokens_used), tokens_used being the reported output tokens.
 
         Raises:
-            ValueError: If AI returns invalid JSON or missing required fields.
+            ValueError: If the response does not match the operation's output schema.
         """
         from .prompts import format_cover_letter_prompt
 
@@ -152,61 +236,48 @@ class ClaudeProvider(AIProvider):
             response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=2000,  # Cover letters need more tokens than match analysis
-                messages=[{"role": "user", "content": prompt}],
+                **_prompt_params(prompt),
+                **_tool_params(CONTENT_SCHEMA),
                 timeout=15.0,  # Longer timeout for cover letter generation
             )
         except Exception as e:
             logger.error(f"Claude API error during cover letter generation: {e}")
             raise ValueError(f"Claude API error: {e}") from e
 
-        response_text = response.content[0].text
-
-        try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"Claude returned invalid JSON for cover letter: {e}")
-            raise ValueError(f"AI returned invalid JSON: {e}") from e
-
-        # Validate required fields
-        if "content" not in parsed:
-            logger.error("Claude response missing required field: content")
-            raise ValueError("AI response missing required field: content")
-
-        if "tokens_used" not in parsed:
-            logger.warning("Claude response missing tokens_used, using estimate")
-            # Estimate based on response length
-            parsed["tokens_used"] = len(response_text) // 4
-
-        content = parsed["content"]
-        tokens_used = parsed["tokens_used"]
+        usage = _fill_usage(usage, response.usage)
+        content = _structured_result(response, CONTENT_SCHEMA)["content"]
+        # Reported output tokens; the length estimate covers responses without usage
+        tokens_used = usage.output_tokens or len(content) // 4
 
         logger.info(f"Successfully generated cover letter with Claude, tokens: {tokens_used}")
         return content, tokens_used
 
     async def generate_answer(
         self,
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         question: str,
         max_length: int,
         feedback: Optional[str] = None,
         previous_content: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int]:
         """Generate answer to application question using Claude.
 
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             question: Application question to answer.
             max_length: Target character length.
             feedback: Optional feedback for regeneration.
             previous_content: Previous answer (required with feedback).
+            usage: Filled with the reported token counts.
 
         Returns:
-            Tuple of (content, tokens_used).
+            Tuple of (content, tokens_used), tokens_used being the reported output tokens.
 
         Raises:
-            ValueError: If AI returns invalid JSON or missing required fields.
+            ValueError: If the response does not match the operation's output schema.
         """
         from .prompts import format_answer_prompt
 
@@ -220,63 +291,50 @@ class ClaudeProvider(AIProvider):
             response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=1500,  # Sufficient for all answer lengths
-                messages=[{"role": "user", "content": prompt}],
+                **_prompt_params(prompt),
+                **_tool_params(CONTENT_SCHEMA),
                 timeout=10.0,  # Shorter timeout for answers
             )
         except Exception as e:
             logger.error(f"Claude API error during answer generation: {e}")
             raise ValueError(f"Claude API error: {e}") from e
 
-        response_text = response.content[0].text
-
-        try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"Claude returned invalid JSON for answer: {e}")
-            raise ValueError(f"AI returned invalid JSON: {e}") from e
-
-        # Validate required fields
-        if "content" not in parsed:
-            logger.error("Claude response missing required field: content")
-            raise ValueError("AI response missing required field: content")
-
-        if "tokens_used" not in parsed:
-            logger.warning("Claude response missing tokens_used, using estimate")
-            # Estimate based on response length
-            parsed["tokens_used"] = len(response_text) // 4
-
-        content = parsed["content"]
-        tokens_used = parsed["tokens_used"]
+        usage = _fill_usage(usage, response.usage)
+        content = _structured_result(response, CONTENT_SCHEMA)["content"]
+        # Reported output tokens; the length estimate covers responses without usage
+        tokens_used = usage.output_tokens or len(content) // 4
 
         logger.info(f"Successfully generated answer with Claude, tokens: {tokens_used}")
         return content, tokens_used
 
     async def generate_outreach(
         self,
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         recipient_type: str,
         platform: str,
         recipient_name: Optional[str] = None,
         feedback: Optional[str] = None,
         previous_content: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int]:
         """Generate outreach message using Claude.
 
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             recipient_type: Type of recipient (recruiter, hiring_manager, referral).
             platform: Target platform (linkedin, email, twitter).
             recipient_name: Optional recipient name for personalized greeting.
             feedback: Optional feedback for regeneration.
             previous_content: Previous message (required with feedback).
+            usage: Filled with the reported token counts.
 
         Returns:
-            Tuple of (content, tokens_used).
+            Tuple of (content, tokens_used), tokens_used being the reported output tokens.
 
         Raises:
-            ValueError: If AI returns invalid JSON or missing required fields.
+            ValueError: If the response does not match the operation's output schema.
         """
         from .prompts import format_outreach_prompt
 
@@ -290,33 +348,58 @@ class ClaudeProvider(AIProvider):
             response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=1500,  # Sufficient for all platforms
-                messages=[{"role": "user", "content": prompt}],
+                **_prompt_params(prompt),
+                **_tool_params(CONTENT_SCHEMA),
                 timeout=10.0,  # Shorter timeout for outreach
             )
         except Exception as e:
             logger.error(f"Claude API error during outreach generation: {e}")
             raise ValueError(f"Claude API error: {e}") from e
 
-        response_text = response.content[0].text
+        usage = _fill_usage(usage, response.usage)
+        content = _structured_result(response, CONTENT_SCHEMA)["content"]
+        # Reported output tokens; the length estimate covers responses without usage
+        tokens_used = usage.output_tokens or len(content) // 4
 
-        try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"Claude returned invalid JSON for outreach: {e}")
-            raise ValueError(f"AI returned invalid JSON: {e}") from e
+        logger.info(f"Successfully generated outreach with Claude, tokens: {tokens_used}")
+        return content, tokens_used
 
-        # Validate required fields
-        if "content" not in parsed:
-            logger.error("Claude response missing required field: content")
-            raise ValueError("AI response missing required field: content")
+    async def stream_text(
+        self,
+        prompt: ChatPrompt,
+        max_tokens: int,
+        timeout: float,
+        usage: Optional[TokenUsage] = None,
+    ) -> AsyncIterator[str]:
+        """Stream a plain-text completion using Claude.
 
-        if "tokens_used" not in parsed:
-            logger.warning("Claude response missing tokens_used, using estimate")
-            # Estimate based on response length
-            parsed["tokens_used"] = len(response_text) // 4
+        Args:
+            prompt: Generation prompt asking for plain text.
+            max_tokens: Maximum tokens to generate.
+            timeout: Request timeout in seconds.
+            usage: Filled with input/output and cache-read token counts at the end.
 
-        content = parsed["content"]
-        tokens_used = parsed["tokens_used"]
+        Yields:
+            Text deltas.
 
-        logger.info(f"Successfully generated outreach with Claude, tokens: {tokens_used}")
-        return content, tokens_used
+        Raises:
+            ValueError: If the Claude API call fails.
+        """
+        logger.info(f"Streaming completion with Claude ({self.model})")
+
+        try:
+            async with self.client.messages.stream(
+                model=self.model,
+                max_tokens=max_tokens,
+                **_prompt_params(prompt),
+                timeout=timeout,
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                final = await stream.get_final_message()
+        except Exception as e:
+            logger.error(f"Claude API error during streaming: {e}")
+            raise ValueError(f"Claude API error: {e}") from e
+
+        if usage is not None:
+            _fill_usage(usage, final.usage)
@@ -0,0 +1,482 @@
+"""Provider execution engine shared by every AI operation.
+
+Each operation (resume parse, match, cover letter, answer, outreach) runs as
+a call against an ordered list of providers under an OperationPolicy:
+
+- sequential: try providers one after another (the original behaviour).
+- hedged: start the primary; if it has not answered within its observed
+  p95 latency for this operation (AI_HEDGE_PERCENTILE; the static
+  `hedge_delay` until enough samples exist), or fails, start the next
+  provider. The first valid result wins and the slower call is cancelled,
+  so only the winner is charged.
+- race: start every provider at once and keep the first valid result.
+  Costs a second AI call on every request, so only use it for operations
+  where latency matters more than spend.
+
+Every attempt is bounded by the policy `timeout` and the whole operation by
+`deadline`. Streaming calls (open_stream) fall back only until the first
+token arrives; after that the stream is committed to its provider.
+Providers whose circuit breaker is open are skipped (see breaker.py).
+Policies come from DEFAULT_POLICIES, the AI_EXECUTION_MODE setting and
+per-operation AI_OPERATION_POLICIES overrides, so changing strategy is a
+config change.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from app.core.config import settings
+from app.services.ai.breaker import BreakerRegistry, CircuitBreaker, CircuitOpenError
+from app.services.ai.latency import LatencyTracker
+from app.services.ai.prompts import ChatPrompt
+from app.services.ai.provider import AIProvider, TokenUsage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+EXECUTION_MODES = ("sequential", "hedged", "race")
+
+# (display label, provider or None when its API key is missing)
+ProviderSlot = Tuple[str, Optional[AIProvider]]
+# Performs the operation on one provider, filling the TokenUsage it is given
+ProviderCall = Callable[[AIProvider, TokenUsage], Awaitable[T]]
+
+
+@dataclass(frozen=True)
+class OperationPolicy:
+    """How one AI operation is executed across providers."""
+
+    mode: str = "sequential"
+    timeout: float = 10.0  # seconds per provider attempt
+    hedge_delay: float = 4.0  # hedged mode: seconds before the next provider, until p95 is known
+    deadline: Optional[float] = None  # seconds for the whole operation; None = AI_REQUEST_DEADLINE
+
+
+# Timeouts match the per-call SDK timeouts the providers already use. Resume
+# parsing stays sequential: it is charged per upload and not latency-critical.
+DEFAULT_POLICIES: Dict[str, OperationPolicy] = {
+    "parse": OperationPolicy(mode="sequential", timeout=30.0, hedge_delay=10.0),
+    "match": OperationPolicy(mode="hedged", timeout=10.0, hedge_delay=4.0),
+    "cover_letter": OperationPolicy(mode="hedged", timeout=15.0, hedge_delay=6.0),
+    "answer": OperationPolicy(mode="hedged", timeout=10.0, hedge_delay=4.0),
+    "outreach": OperationPolicy(mode="hedged", timeout=10.0, hedge_delay=4.0),
+}
+
+_POLICY_FIELDS = {f.name for f in fields(OperationPolicy)}
+
+
+def get_policy(operation: str) -> OperationPolicy:
+    """Resolve the effective policy for an operation.
+
+    Args:
+        operation: Operation name (parse, match, cover_letter, answer, outreach).
+
+    Returns:
+        Default policy with AI_EXECUTION_MODE and any per-operation
+        overrides applied. Unknown override keys and modes are ignored.
+    """
+    policy = DEFAULT_POLICIES.get(operation, OperationPolicy())
+    if settings.ai_execution_mode in EXECUTION_MODES:
+        policy = replace(policy, mode=settings.ai_execution_mode)
+
+    overrides = {
+        key: value
+        for key, value in (settings.ai_operation_policies.get(operation) or {}).items()
+        if key in _POLICY_FIELDS
+    }
+    if overrides.get("mode", policy.mode) not in EXECUTION_MODES:
+        logger.warning(f"Ignoring unknown AI execution mode for {operation}: {overrides['mode']}")
+        overrides.pop("mode")
+    return replace(policy, **overrides)
+
+
+class ProviderEngine:
+    """Runs AI operations against providers according to their policy."""
+
+    def __init__(self):
+        """Initialize the engine with empty latency history and breakers."""
+        self.latency = LatencyTracker(settings.ai_latency_window)
+        self.breakers = BreakerRegistry()
+
+    async def run(
+        self,
+        operation: str,
+        providers: Sequence[ProviderSlot],
+        call: ProviderCall[T],
+        usage: Optional[TokenUsage] = None,
+    ) -> Tuple[T, str]:
+        """Run one operation.
+
+        Args:
+            operation: Operation name, used to pick the policy and in logs.
+            providers: Providers in priority order (primary first).
+            call: Coroutine function performing the operation on a provider.
+            usage: Filled with the winning call's token counts and model and
+                the operation's wall time (hedging and fallbacks included).
+
+        Returns:
+            Tuple of (result, provider_name) from the winning provider.
+
+        Raises:
+            ValueError: If every provider fails, times out or is not configured.
+        """
+        policy = get_policy(operation)
+        deadline = policy.deadline or settings.ai_request_deadline
+        errors: List[str] = []
+        started = time.monotonic()
+        available = self._available(operation, providers, errors)
+
+        if available:
+            try:
+                if policy.mode == "sequential":
+                    winner = await asyncio.wait_for(
+                        self._run_sequential(operation, policy, available, call, errors), deadline
+                    )
+                else:
+                    winner = await asyncio.wait_for(
+                        self._run_concurrent(operation, policy, available, call, errors), deadline
+                    )
+            except asyncio.TimeoutError:
+                errors.append(f"deadline of {deadline:g}s exceeded")
+                winner = None
+
+            if winner is not None:
+                result, attempt_usage, provider = winner
+                attempt_usage.latency_ms = int((time.monotonic() - started) * 1000)
+                logger.info(
+                    f"{operation} via {provider.name} ({attempt_usage.model}): "
+                    f"{attempt_usage.input_tokens} in ({attempt_usage.cached_input_tokens} cached), "
+                    f"{attempt_usage.output_tokens} out, {attempt_usage.latency_ms}ms"
+                )
+                if usage is not None:
+                    for field in fields(TokenUsage):
+                        setattr(usage, field.name, getattr(attempt_usage, field.name))
+                return result, provider.name
+
+        error_msg = "; ".join(errors)
+        logger.error(f"All AI providers failed for {operation}: {error_msg}")
+        raise ValueError(f"All AI providers failed: {error_msg}")
+
+    def _available(
+        self, operation: str, providers: Sequence[ProviderSlot], errors: List[str]
+    ) -> List[AIProvider]:
+        """Drop unconfigured providers and those with an open circuit."""
+        available: List[AIProvider] = []
+        for label, provider in providers:
+            if provider is None:
+                logger.warning(f"{label} provider not configured (missing API key)")
+                errors.append(f"{label}: Not configured")
+            elif not self.breakers.get(provider.name, operation).allows_requests():
+                logger.warning(f"Skipping {provider.name} for {operation}: circuit open")
+                errors.append(f"{provider.name}: circuit open")
+            else:
+                available.append(provider)
+        return available
+
+    async def open_stream(
+        self,
+        operation: str,
+        providers: Sequence[ProviderSlot],
+        prompt: ChatPrompt,
+        max_tokens: int,
+    ) -> "ProviderStream":
+        """Open a text stream, falling back until a provider produces its first token.
+
+        Args:
+            operation: Operation name, used to pick the policy and in logs.
+            providers: Providers in priority order (primary first).
+            prompt: Generation prompt asking for plain text.
+            max_tokens: Maximum tokens to generate.
+
+        Returns:
+            ProviderStream positioned at the first token.
+
+        Raises:
+            ValueError: If no provider produced a first token.
+        """
+        policy = get_policy(operation)
+        errors: List[str] = []
+
+        for index, provider in enumerate(self._available(operation, providers, errors)):
+            breaker = self.breakers.get(provider.name, operation)
+            if not breaker.acquire():
+                errors.append(f"{provider.name}: circuit open")
+                continue
+
+            role = "primary" if index == 0 else "fallback"
+            logger.info(f"Streaming {operation} with {provider.name} ({role})")
+            usage = TokenUsage(model=getattr(provider, "model", None))
+            iterator = provider.stream_text(prompt, max_tokens, policy.timeout, usage).__aiter__()
+            started = time.monotonic()
+            try:
+                async with asyncio.timeout(policy.timeout):
+                    first = await iterator.__anext__()
+            except StopAsyncIteration:
+                breaker.record_failure()
+                self._record_failure(provider, policy, ValueError("empty response"), errors)
+                continue
+            except asyncio.CancelledError:
+                breaker.release()
+                await iterator.aclose()
+                raise
+            except Exception as e:
+                breaker.record_failure()
+                self._record_failure(provider, policy, e, errors)
+                await iterator.aclose()
+                continue
+
+            logger.info(
+                f"{operation}: first token from {provider.name} after {time.monotonic() - started:.2f}s"
+            )
+            return ProviderStream(provider.name, first, iterator, usage, breaker, policy.timeout, started)
+
+        error_msg = "; ".join(errors)
+        logger.error(f"All AI providers failed to stream {operation}: {error_msg}")
+        raise ValueError(f"All AI providers failed: {error_msg}")
+
+    async def _attempt(
+        self,
+        operation: str,
+        policy: OperationPolicy,
+        provider: AIProvider,
+        call: ProviderCall[T],
+        role: str,
+    ) -> Tuple[T, TokenUsage]:
+        """Run the operation on one provider within the attempt timeout.
+
+        Successful and cancelled (hedged-out) attempts feed the latency
+        history; a cancelled attempt's time is a lower bound, which keeps
+        the p95 from drifting down as slow calls get hedged away. Outcomes
+        also feed the provider's circuit breaker; a cancellation counts as
+        a slow call once it has run past the slow-call threshold, so a
+        provider that is always hedged away still opens its breaker.
+
+        Returns:
+            Tuple of (result, the attempt's TokenUsage).
+
+        Raises:
+            CircuitOpenError: If the breaker refuses the call.
+        """
+        breaker = self.breakers.get(provider.name, operation)
+        if not breaker.acquire():
+            raise CircuitOpenError("circuit open")
+
+        logger.info(f"Attempting {operation} with {provider.name} ({role})")
+        slow_after = policy.timeout * settings.ai_breaker_slow_call_fraction
+        usage = TokenUsage(model=getattr(provider, "model", None))
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(call(provider, usage), policy.timeout)
+        except asyncio.CancelledError:
+            elapsed = time.monotonic() - started
+            self.latency.record(provider.name, operation, elapsed)
+            if elapsed >= slow_after:
+                breaker.record_slow()
+            else:
+                breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+
+        elapsed = time.monotonic() - started
+        self.latency.record(provider.name, operation, elapsed)
+        breaker.record_success(slow=elapsed >= slow_after)
+        return result, usage
+
+    def hedge_delay(self, operation: str, policy: OperationPolicy, provider: AIProvider) -> float:
+        """Seconds to wait on a provider before hedging.
+
+        Args:
+            operation: Operation name.
+            policy: Effective policy for the operation.
+            provider: Provider currently running.
+
+        Returns:
+            Observed latency percentile for the provider, clamped to
+            [AI_HEDGE_MIN_DELAY, policy.timeout], or policy.hedge_delay
+            while there are fewer than AI_HEDGE_MIN_SAMPLES samples.
+        """
+        observed = self.latency.percentile(
+            provider.name, operation, settings.ai_hedge_percentile, settings.ai_hedge_min_samples
+        )
+        if observed is None:
+            return policy.hedge_delay
+        return min(max(observed, settings.ai_hedge_min_delay), policy.timeout)
+
+    @staticmethod
+    def _record_failure(
+        provider: AIProvider, policy: OperationPolicy, exc: BaseException, errors: List[str]
+    ) -> None:
+        """Log a failed attempt and add it to the error summary."""
+        if isinstance(exc, asyncio.TimeoutError):
+            reason = f"timed out after {policy.timeout:g}s"
+        else:
+            reason = str(exc)
+        logger.warning(f"{provider.name} failed: {reason}")
+        errors.append(f"{provider.name}: {reason}")
+
+    async def _run_sequential(
+        self,
+        operation: str,
+        policy: OperationPolicy,
+        providers: List[AIProvider],
+        call: ProviderCall[T],
+        errors: List[str],
+    ) -> Optional[Tuple[T, TokenUsage, AIProvider]]:
+        """Try providers one after another."""
+        for index, provider in enumerate(providers):
+            role = "primary" if index == 0 else "fallback"
+            try:
+                result, usage = await self._attempt(operation, policy, provider, call, role)
+                return result, usage, provider
+            except Exception as e:
+                self._record_failure(provider, policy, e, errors)
+        return None
+
+    async def _run_concurrent(
+        self,
+        operation: str,
+        policy: OperationPolicy,
+        providers: List[AIProvider],
+        call: ProviderCall[T],
+        errors: List[str],
+    ) -> Optional[Tuple[T, TokenUsage, AIProvider]]:
+        """Hedged or race execution: first successful provider wins."""
+        waiting = list(providers)
+        pending: Dict["asyncio.Task[Any]", AIProvider] = {}
+        delay = self.hedge_delay(operation, policy, providers[0])
+
+        def launch() -> None:
+            provider = waiting.pop(0)
+            role = "primary" if provider is providers[0] else policy.mode
+            task = asyncio.create_task(self._attempt(operation, policy, provider, call, role))
+            pending[task] = provider
+
+        launch()
+        if policy.mode == "race":
+            while waiting:
+                launch()
+
+        try:
+            while pending:
+                hedge_timeout = delay if waiting else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=hedge_timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    slow = ", ".join(p.name for p in pending.values())
+                    logger.info(
+                        f"{operation}: {slow} slower than {delay:.2f}s, "
+                        f"hedging with {waiting[0].name}"
+                    )
+                    launch()
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    exc = task.exception()
+                    if exc is None:
+                        result, usage = task.result()
+                        return result, usage, provider
+                    self._record_failure(provider, policy, exc, errors)
+
+                # A fast failure starts the next provider without waiting out the delay
+                if waiting and not pending:
+                    launch()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+class ProviderStream:
+    """Text stream from the provider that won open_stream().
+
+    Iterate it once. Each delta must arrive within `idle_timeout` seconds.
+    The outcome is recorded on the provider's circuit breaker; an abandoned
+    stream (client disconnect) frees its probe slot without counting.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        first: str,
+        iterator: AsyncIterator[str],
+        usage: TokenUsage,
+        breaker: CircuitBreaker,
+        idle_timeout: float,
+        started: float,
+    ):
+        """Wrap an open provider stream.
+
+        Args:
+            provider: Provider name (claude, gpt).
+            first: First delta, already received.
+            iterator: Remaining deltas.
+            usage: Token counts, filled when the stream completes.
+            breaker: Breaker for this provider and operation.
+            idle_timeout: Max seconds between deltas.
+            started: time.monotonic() when the provider call began.
+        """
+        self.provider = provider
+        self.usage = usage
+        self._first = first
+        self._iterator = iterator
+        self._breaker = breaker
+        self._idle_timeout = idle_timeout
+        self._call_started = started
+        self._started = False
+
+    async def aclose(self) -> None:
+        """Abandon a stream that was never iterated.
+
+        Frees the breaker probe slot and closes the provider connection.
+        Once iteration has started, closing the iterator does this instead.
+        """
+        if self._started:
+            return
+        self._started = True
+        self._breaker.release()
+        await self._iterator.aclose()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        """Yield text deltas, starting with the first one."""
+        self._started = True
+        outcome: Optional[bool] = None
+        try:
+            yield self._first
+            while True:
+                try:
+                    async with asyncio.timeout(self._idle_timeout):
+                        delta = await self._iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                yield delta
+            outcome = True
+        except Exception:
+            outcome = False
+            raise
+        finally:
+            if outcome is True:
+                self.usage.latency_ms = int((time.monotonic() - self._call_started) * 1000)
+                self._breaker.record_success()
+            elif outcome is False:
+                self._breaker.record_failure()
+            else:
+                self._breaker.release()
+            await self._iterator.aclose()
+
+
+_engine = ProviderEngine()
+
+
+def get_engine() -> ProviderEngine:
+    """Get the process-wide provider engine."""
+    return _engine
@@ -1,15 +1,22 @@
 """AI provider factory with fallback support."""
 
 import logging
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
 
 from app.core.config import settings
 from app.services.ai.claude import ClaudeProvider
+from app.services.ai.engine import ProviderCall, ProviderSlot, ProviderStream, get_engine
 from app.services.ai.openai import OpenAIProvider
-from app.services.ai.provider import AIProvider
+from app.services.ai.prompts import ChatPrompt, ResumeInput
+from app.services.ai.provider import AIProvider, TokenUsage
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Providers hold SDK clients (and their HTTP pools), so build each once per API key.
+_providers: Dict[Tuple[str, str], AIProvider] = {}
+
 
 class AIProviderFactory:
     """Factory for creating AI providers with fallback support."""
@@ -19,10 +26,13 @@ class AIProviderFactory:
         """Get Claude provider if API key is configured.
 
         Returns:
-            ClaudeProvider instance or None if not configured.
+            Shared ClaudeProvider instance or None if not configured.
         """
         if settings.anthropic_api_key:
-            return ClaudeProvider(settings.anthropic_api_key)
+            key = ("claude", settings.anthropic_api_key)
+            if key not in _providers:
+                _providers[key] = ClaudeProvider(settings.anthropic_api_key)
+            return _providers[key]
         return None
 
     @staticmethod
@@ -30,18 +40,104 @@ class AIProviderFactory:
         """Get OpenAI provider if API key is configured.
 
         Returns:
-            OpenAIProvider instance or None if not configured.
+            Shared OpenAIProvider instance or None if not configured.
         """
         if settings.openai_api_key:
-            return OpenAIProvider(settings.openai_api_key)
+            key = ("gpt", settings.openai_api_key)
+            if key not in _providers:
+                _providers[key] = OpenAIProvider(settings.openai_api_key)
+            return _providers[key]
         return None
 
     @staticmethod
-    async def parse_with_fallback(text: str) -> Tuple[Dict[str, Any], str]:
+    def get_providers(
+        preferred_provider: Optional[str] = None,
+        user_preference: Optional[str] = None,
+    ) -> List[ProviderSlot]:
+        """Get providers in priority order.
+
+        Provider resolution order:
+        1. preferred_provider (from request)
+        2. user_preference (from user profile)
+        3. "claude" (system default)
+
+        Args:
+            preferred_provider: Provider override from request (highest priority).
+            user_preference: User's preferred provider from profile.
+
+        Returns:
+            List of (label, provider) with the primary first. Provider is
+            None when its API key is not configured.
+        """
+        claude = ("Claude", AIProviderFactory.get_claude_provider())
+        openai = ("OpenAI", AIProviderFactory.get_openai_provider())
+        resolved_provider = preferred_provider or user_preference or "claude"
+        if resolved_provider == "gpt":
+            return [openai, claude]
+        return [claude, openai]
+
+    @staticmethod
+    async def run(
+        operation: str,
+        call: ProviderCall[T],
+        preferred_provider: Optional[str] = None,
+        user_preference: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
+    ) -> Tuple[T, str]:
+        """Run an AI operation through the provider engine.
+
+        Args:
+            operation: Operation name (parse, match, cover_letter, answer, outreach).
+            call: Coroutine function performing the operation on a provider,
+                filling the TokenUsage it is given.
+            preferred_provider: Provider override from request (highest priority).
+            user_preference: User's preferred provider from profile.
+            usage: Filled with the winning call's token counts, model and wall time.
+
+        Returns:
+            Tuple of (result, provider_name).
+
+        Raises:
+            ValueError: If all providers fail.
+        """
+        providers = AIProviderFactory.get_providers(preferred_provider, user_preference)
+        return await get_engine().run(operation, providers, call, usage)
+
+    @staticmethod
+    async def stream(
+        operation: str,
+        prompt: ChatPrompt,
+        max_tokens: int,
+        preferred_provider: Optional[str] = None,
+        user_preference: Optional[str] = None,
+    ) -> ProviderStream:
+        """Open a plain-text stream with fallback until the first token.
+
+        Args:
+            operation: Operation name (cover_letter, answer, outreach).
+            prompt: Generation prompt asking for plain text.
+            max_tokens: Maximum tokens to generate.
+            preferred_provider: Provider override from request (highest priority).
+            user_preference: User's preferred provider from profile.
+
+        Returns:
+            ProviderStream to iterate for text deltas.
+
+        Raises:
+            ValueError: If no provider could start streaming.
+        """
+        providers = AIProviderFactory.get_providers(preferred_provider, user_preference)
+        return await get_engine().open_stream(operation, providers, prompt, max_tokens)
+
+    @staticmethod
+    async def parse_with_fallback(
+        text: str, usage: Optional[TokenUsage] = None
+    ) -> Tuple[Dict[str, Any], str]:
         """Parse resume with Claude as primary, GPT as fallback.
 
         Args:
             text: Resume text to parse.
+            usage: Filled with the winning call's token counts, model and wall time.
 
         Returns:
             Tuple of (parsed_data, provider_name).
@@ -49,61 +145,24 @@ class AIProviderFactory:
         Raises:
             ValueError: If both providers fail.
         """
-        primary = AIProviderFactory.get_claude_provider()
-        fallback = AIProviderFactory.get_openai_provider()
-
-        errors: list[str] = []
-
-        # Try primary provider (Claude)
-        if primary:
-            try:
-                logger.info("Attempting resume parse with Claude (primary)")
-                result = await primary.parse_resume(text)
-                return result, primary.name
-            except Exception as e:
-                logger.warning(f"Claude failed: {e}")
-                errors.append(f"Claude: {e}")
-        else:
-            logger.warning("Claude provider not configured (missing API key)")
-            errors.append("Claude: Not configured")
-
-        # Try fallback provider (GPT)
-        if fallback:
-            try:
-                logger.info("Attempting resume parse with OpenAI (fallback)")
-                result = await fallback.parse_resume(text)
-                return result, fallback.name
-            except Exception as e:
-                logger.warning(f"OpenAI failed: {e}")
-                errors.append(f"OpenAI: {e}")
-        else:
-            logger.warning("OpenAI provider not configured (missing API key)")
-            errors.append("OpenAI: Not configured")
-
-        # Both failed
-        error_msg = "; ".join(errors)
-        logger.error(f"All AI providers failed: {error_msg}")
-        raise ValueError(f"All AI providers failed: {error_msg}")
+        return await AIProviderFactory.run("parse", lambda p, u: p.parse_resume(text, usage=u), usage=usage)
 
     @staticmethod
     async def match_with_fallback(
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         preferred_provider: Optional[str] = None,
         user_preference: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[Dict[str, Any], str]:
         """Generate match analysis with fallback support.
 
-        Provider resolution order:
-        1. preferred_provider (from request)
-        2. user_preference (from user profile)
-        3. "claude" (system default)
-
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             preferred_provider: Provider override from request (highest priority).
             user_preference: User's preferred provider from profile.
+            usage: Filled with the winning call's token counts, model and wall time.
 
         Returns:
             Tuple of (analysis_dict, provider_name).
@@ -111,55 +170,17 @@ class AIProviderFactory:
         Raises:
             ValueError: If both providers fail.
         """
-        # Determine primary provider based on resolution order
-        resolved_provider = preferred_provider or user_preference or "claude"
-
-        if resolved_provider == "gpt":
-            primary = AIProviderFactory.get_openai_provider()
-            fallback = AIProviderFactory.get_claude_provider()
-        else:
-            # Default to Claude as primary
-            primary = AIProviderFactory.get_claude_provider()
-            fallback = AIProviderFactory.get_openai_provider()
-
-        errors: list[str] = []
-
-        # Try primary provider
-        if primary:
-            try:
-                logger.info(f"Attempting match analysis with {primary.name} (primary)")
-                result = await primary.generate_match_analysis(resume_data, job_description)
-                return result, primary.name
-            except Exception as e:
-                logger.warning(f"{primary.name} failed: {e}")
-                errors.append(f"{primary.name}: {e}")
-        else:
-            provider_name = "OpenAI" if resolved_provider == "gpt" else "Claude"
-            logger.warning(f"{provider_name} provider not configured (missing API key)")
-            errors.append(f"{provider_name}: Not configured")
-
-        # Try fallback provider
-        if fallback:
-            try:
-                logger.info(f"Attempting match analysis with {fallback.name} (fallback)")
-                result = await fallback.generate_match_analysis(resume_data, job_description)
-                return result, fallback.name
-            except Exception as e:
-                logger.warning(f"{fallback.name} failed: {e}")
-                errors.append(f"{fallback.name}: {e}")
-        else:
-            fallback_name = "Claude" if resolved_provider == "gpt" else "OpenAI"
-            logger.warning(f"{fallback_name} provider not configured (missing API key)")
-            errors.append(f"{fallback_name}: Not configured")
-
-        # Both failed
-        error_msg = "; ".join(errors)
-        logger.error(f"All AI providers failed for match analysis: {error_msg}")
-        raise ValueError(f"All AI providers failed: {error_msg}")
+        return await AIProviderFactory.run(
+            "match",
+            lambda p, u: p.generate_match_analysis(resume_data, job_description, usage=u),
+            preferred_provider,
+            user_preference,
+            usage,
+        )
 
     @staticmethod
     async def cover_letter_with_fallback(
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         tone: str,
         custom_instructions: Optional[str] = None,
@@ -167,16 +188,12 @@ class AIProviderFactory:
         previous_content: Optional[str] = None,
         preferred_provider: Optional[str] = None,
         user_preference: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int, str]:
         """Generate cover letter with fallback support.
 
-        Provider resolution order:
-        1. preferred_provider (from request)
-        2. user_preference (from user profile)
-        3. "claude" (system default)
-
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             tone: Desired tone for cover letter.
             custom_instructions: Optional user instructions.
@@ -184,6 +201,7 @@ class AIProviderFactory:
             previous_content: Previous cover letter (required with feedback).
             preferred_provider: Provider override from request (highest priority).
             user_preference: User's preferred provider from profile.
+            usage: Filled with the winning call's token counts, model and wall time.
 
         Returns:
             Tuple of (content: str, tokens_used: int, provider_name: str).
@@ -191,59 +209,20 @@ class AIProviderFactory:
         Raises:
             ValueError: If both providers fail.
         """
-        # Determine primary provider based on resolution order
-        resolved_provider = preferred_provider or user_preference or "claude"
-
-        if resolved_provider == "gpt":
-            primary = AIProviderFactory.get_openai_provider()
-            fallback = AIProviderFactory.get_claude_provider()
-        else:
-            # Default to Claude as primary
-            primary = AIProviderFactory.get_claude_provider()
-            fallback = AIProviderFactory.get_openai_provider()
-
-        errors: list[str] = []
-
-        # Try primary provider
-        if primary:
-            try:
-                logger.info(f"Attempting cover letter generation with {primary.name} (primary)")
-                content, tokens_used = await primary.generate_cover_letter(
-                    resume_data, job_description, tone, custom_instructions, feedback, previous_content
-                )
-                return content, tokens_used, primary.name
-            except Exception as e:
-                logger.warning(f"{primary.name} failed: {e}")
-                errors.append(f"{primary.name}: {e}")
-        else:
-            provider_name = "OpenAI" if resolved_provider == "gpt" else "Claude"
-            logger.warning(f"{provider_name} provider not configured (missing API key)")
-            errors.append(f"{provider_name}: Not configured")
-
-        # Try fallback provider
-        if fallback:
-            try:
-                logger.info(f"Attempting cover letter generation with {fallback.name} (fallback)")
-                content, tokens_used = await fallback.generate_cover_letter(
-                    resume_data, job_description, tone, custom_instructions, feedback, previous_content
-                )
-                return content, tokens_used, fallback.name
-            except Exception as e:
-                logger.warning(f"{fallback.name} failed: {e}")
-                errors.append(f"{fallback.name}: {e}")
-        else:
-            fallback_name = "Claude" if resolved_provider == "gpt" else "OpenAI"
-            logger.warning(f"{fallback_name} provider not configured (missing API key)")
-            errors.append(f"{fallback_name}: Not configured")
-
-        # Both failed
-        error_msg = "; ".join(errors)
-        logger.error(f"All AI providers failed for cover letter generation: {error_msg}")
-        raise ValueError(f"All AI providers failed: {error_msg}")
+        (content, tokens_used), provider_name = await AIProviderFactory.run(
+            "cover_letter",
+            lambda p, u: p.generate_cover_letter(
+                resume_data, job_description, tone, custom_instructions, feedback, previous_content, usage=u
+            ),
+            preferred_provider,
+            user_preference,
+            usage,
+        )
+        return content, tokens_used, provider_name
 
     @staticmethod
     async def answer_with_fallback(
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         question: str,
         max_length: int,
@@ -251,16 +230,12 @@ class AIProviderFactory:
         previous_content: Optional[str] = None,
         preferred_provider: Optional[str] = None,
         user_preference: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int, str]:
         """Generate answer with fallback support.
 
-        Provider resolution order:
-        1. preferred_provider (from request)
-        2. user_preference (from user profile)
-        3. "claude" (system default)
-
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             question: Application question to answer.
             max_length: Target character length.
@@ -268,6 +243,7 @@ class AIProviderFactory:
             previous_content: Previous answer (required with feedback).
             preferred_provider: Provider override from request (highest priority).
             user_preference: User's preferred provider from profile.
+            usage: Filled with the winning call's token counts, model and wall time.
 
         Returns:
             Tuple of (content: str, tokens_used: int, provider_name: str).
@@ -275,59 +251,20 @@ class AIProviderFactory:
         Raises:
             ValueError: If both providers fail.
         """
-        # Determine primary provider based on resolution order
-        resolved_provider = preferred_provider or user_preference or "claude"
-
-        if resolved_provider == "gpt":
-            primary = AIProviderFactory.get_openai_provider()
-            fallback = AIProviderFactory.get_claude_provider()
-        else:
-            # Default to Claude as primary
-            primary = AIProviderFactory.get_claude_provider()
-            fallback = AIProviderFactory.get_openai_provider()
-
-        errors: list[str] = []
-
-        # Try primary provider
-        if primary:
-            try:
-                logger.info(f"Attempting answer generation with {primary.name} (primary)")
-                content, tokens_used = await primary.generate_answer(
-                    resume_data, job_description, question, max_length, feedback, previous_content
-                )
-                return content, tokens_used, primary.name
-            except Exception as e:
-                logger.warning(f"{primary.name} failed: {e}")
-                errors.append(f"{primary.name}: {e}")
-        else:
-            provider_name = "OpenAI" if resolved_provider == "gpt" else "Claude"
-            logger.warning(f"{provider_name} provider not configured (missing API key)")
-            errors.append(f"{provider_name}: Not configured")
-
-        # Try fallback provider
-        if fallback:
-            try:
-                logger.info(f"Attempting answer generation with {fallback.name} (fallback)")
-                content, tokens_used = await fallback.generate_answer(
-                    resume_data, job_description, question, max_length, feedback, previous_content
-                )
-                return content, tokens_used, fallback.name
-            except Exception as e:
-                logger.warning(f"{fallback.name} failed: {e}")
-                errors.append(f"{fallback.name}: {e}")
-        else:
-            fallback_name = "Claude" if resolved_provider == "gpt" else "OpenAI"
-            logger.warning(f"{fallback_name} provider not configured (missing API key)")
-            errors.append(f"{fallback_name}: Not configured")
-
-        # Both failed
-        error_msg = "; ".join(errors)
-        logger.error(f"All AI providers failed for answer generation: {error_msg}")
-        raise ValueError(f"All AI providers failed: {error_msg}")
+        (content, tokens_used), provider_name = await AIProviderFactory.run(
+            "answer",
+            lambda p, u: p.generate_answer(
+                resume_data, job_description, question, max_length, feedback, previous_content, usage=u
+            ),
+            preferred_provider,
+            user_preference,
+            usage,
+        )
+        return content, tokens_used, provider_name
 
     @staticmethod
     async def outreach_with_fallback(
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         recipient_type: str,
         platform: str,
@@ -336,16 +273,12 @@ class AIProviderFactory:
         previous_content: Optional[str] = None,
         preferred_provider: Optional[str] = None,
         user_preference: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int, str]:
         """Generate outreach message with fallback support.
 
-        Provider resolution order:
-        1. preferred_provider (from request)
-        2. user_preference (from user profile)
-        3. "claude" (system default)
-
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             recipient_type: Type of recipient (recruiter, hiring_manager, referral).
             platform: Target platform (linkedin, email, twitter).
@@ -354,6 +287,7 @@ class AIProviderFactory:
             previous_content: Previous message (required with feedback).
             preferred_provider: Provider override from request (highest priority).
             user_preference: User's preferred provider from profile.
+            usage: Filled with the winning call's token counts, model and wall time.
 
         Returns:
             Tuple of (content: str, tokens_used: int, provider_name: str).
@@ -361,52 +295,30 @@ class AIProviderFactory:
         Raises:
             ValueError: If both providers fail.
         """
-        # Determine primary provider based on resolution order
-        resolved_provider = preferred_provider or user_preference or "claude"
-
-        if resolved_provider == "gpt":
-            primary = AIProviderFactory.get_openai_provider()
-            fallback = AIProviderFactory.get_claude_provider()
-        else:
-            # Default to Claude as primary
-            primary = AIProviderFactory.get_claude_provider()
-            fallback = AIProviderFactory.get_openai_provider()
-
-        errors: list[str] = []
-
-        # Try primary provider
-        if primary:
-            try:
-                logger.info(f"Attempting outreach generation with {primary.name} (primary)")
-                content, tokens_used = await primary.generate_outreach(
-                    resume_data, job_description, recipient_type, platform, recipient_name, feedback, previous_content
-                )
-                return content, tokens_used, primary.name
-            except Exception as e:
-                logger.warning(f"{primary.name} failed: {e}")
-                errors.append(f"{primary.name}: {e}")
-        else:
-            provider_name = "OpenAI" if resolved_provider == "gpt" else "Claude"
-            logger.warning(f"{provider_name} provider not configured (missing API key)")
-            errors.append(f"{provider_name}: Not configured")
-
-        # Try fallback provider
-        if fallback:
-            try:
-                logger.info(f"Attempting outreach generation with {fallback.name} (fallback)")
-                content, tokens_used = await fallback.generate_outreach(
-                    resume_data, job_description, recipient_type, platform, recipient_name, feedback, previous_content
-                )
-                return content, tokens_used, fallback.name
-            except Exception as e:
-                logger.warning(f"{fallback.name} failed: {e}")
-                errors.append(f"{fallback.name}: {e}")
-        else:
-            fallback_name = "Claude" if resolved_provider == "gpt" else "OpenAI"
-            logger.warning(f"{fallback_name} provider not configured (missing API key)")
-            errors.append(f"{fallback_name}: Not configured")
-
-        # Both failed
-        error_msg = "; ".join(errors)
-        logger.error(f"All AI providers failed for outreach generation: {error_msg}")
-        raise ValueError(f"All AI providers failed: {error_msg}")
+        (content, tokens_used), provider_name = await AIProviderFactory.run(
+            "outreach",
+            lambda p, u: p.generate_outreach(
+                resume_data,
+                job_description,
+                recipient_type,
+                platform,
+                recipient_name,
+                feedback,
+                previous_content,
+                usage=u,
+            ),
+            preferred_provider,
+            user_preference,
+            usage,
+        )
+        return content, tokens_used, provider_name
+
+
+async def close_providers() -> None:
+    """Close the shared provider SDK clients (app shutdown)."""
+    for provider in list(_providers.values()):
+        try:
+            await provider.client.close()
+        except Exception as e:
+            logger.warning(f"Error closing {provider.name} client: {e}")
+    _providers.clear()
@@ -0,0 +1,62 @@
+"""Rolling latency samples per provider and operation.
+
+Feeds the hedged execution mode: the hedge fires once the primary has run
+longer than its recently observed percentile (p95 by default) instead of a
+fixed guess.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+class LatencyTracker:
+    """Keeps the last `window` latencies for each (provider, operation)."""
+
+    def __init__(self, window: int = 200):
+        """Initialize the tracker.
+
+        Args:
+            window: Number of recent samples kept per provider and operation.
+        """
+        self.window = window
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+
+    def record(self, provider: str, operation: str, seconds: float) -> None:
+        """Add a latency sample.
+
+        Args:
+            provider: Provider name (claude, gpt).
+            operation: Operation name.
+            seconds: Wall time of the call.
+        """
+        key = (provider, operation)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(
+        self, provider: str, operation: str, q: float, min_samples: int = 1
+    ) -> Optional[float]:
+        """Get a latency percentile (nearest-rank).
+
+        Args:
+            provider: Provider name.
+            operation: Operation name.
+            q: Percentile as a fraction, e.g. 0.95.
+            min_samples: Return None until at least this many samples exist.
+
+        Returns:
+            Latency in seconds, or None if there are too few samples.
+        """
+        samples = self._samples.get((provider, operation))
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        rank = max(1, math.ceil(q * len(ordered)))
+        return ordered[rank - 1]
+
+    def clear(self) -> None:
+        """Drop every sample."""
+        self._samples.clear()
@@ -0,0 +1,72 @@
+"""Token and cost metering for AI calls.
+
+Providers report token counts from each response's usage metadata (see
+TokenUsage); the engine adds the model and wall time. Committed
+reservations persist the numbers on usage_events, and the ai_usage_summary
+view (migration 20260201006000_add_usage_metering) aggregates them per
+operation, provider and model.
+
+Prices come from AI_TOKEN_PRICES (USD per million tokens, per model).
+Models without a price are metered without a cost.
+"""
+
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.services.ai.provider import TokenUsage
+
+TOKENS_PER_PRICE_UNIT = 1_000_000
+
+
+def token_count(value: Any) -> int:
+    """A token count from SDK usage metadata (missing or non-integer values are 0)."""
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def estimate_cost_usd(usage: TokenUsage) -> Optional[float]:
+    """Estimate the cost of a call from its token counts.
+
+    Args:
+        usage: Metered call.
+
+    Returns:
+        Cost in USD, or None if the model has no configured price.
+    """
+    prices = settings.ai_token_prices.get(usage.model or "")
+    if not prices:
+        return None
+    uncached = max(usage.input_tokens - usage.cached_input_tokens, 0)
+    cost = (
+        uncached * prices.get("input", 0.0)
+        + usage.cached_input_tokens * prices.get("cached_input", prices.get("input", 0.0))
+        + usage.output_tokens * prices.get("output", 0.0)
+    ) / TOKENS_PER_PRICE_UNIT
+    return round(cost, 6)
+
+
+def usage_columns(usage: Optional[TokenUsage]) -> Dict[str, Any]:
+    """Metering columns for a usage_events row.
+
+    Args:
+        usage: Metered call, or None when nothing was measured.
+
+    Returns:
+        Column values (all None without usage).
+    """
+    if usage is None:
+        return {
+            "input_tokens": None,
+            "output_tokens": None,
+            "cached_input_tokens": None,
+            "latency_ms": None,
+            "model": None,
+            "cost_usd": None,
+        }
+    return {
+        "input_tokens": usage.input_tokens,
+        "output_tokens": usage.output_tokens,
+        "cached_input_tokens": usage.cached_input_tokens,
+        "latency_ms": usage.latency_ms,
+        "model": usage.model,
+        "cost_usd": estimate_cost_usd(usage),
+    }
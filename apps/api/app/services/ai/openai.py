@@ -1,17 +1,106 @@
 """OpenAI provider implementation."""
 
-import json
 import logging
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
 from openai import AsyncOpenAI
 
-from app.services.ai.prompts import RESUME_PARSE_PROMPT, format_match_prompt
-from app.services.ai.provider import AIProvider
+from app.services.ai.metering import token_count
+from app.services.ai.prompts import RESUME_PARSE_PROMPT, ChatPrompt, ResumeInput, format_match_prompt
+from app.services.ai.provider import AIProvider, TokenUsage
+from app.services.ai.structured import CONTENT_SCHEMA, MATCH_SCHEMA, RESUME_SCHEMA, OutputSchema
 
 logger = logging.getLogger(__name__)
 
 
+def _prompt_params(prompt: ChatPrompt) -> Dict[str, Any]:
+    """Build messages with the shared prefix first for automatic caching.
+
+    OpenAI caches the longest previously seen prompt prefix, so the system
+    prompt and resume/job context lead and the per-operation task comes
+    last. prompt_cache_key routes requests for the same resume together
+    (every operation and every job starts with the system+resume prefix);
+    it is sent through extra_body so SDK versions that predate the
+    parameter still accept it.
+
+    Args:
+        prompt: Generation prompt.
+
+    Returns:
+        Keyword arguments for chat.completions.create().
+    """
+    return {
+        "messages": [
+            {"role": "system", "content": prompt.system},
+            {"role": "user", "content": f"{prompt.context}\n\n{prompt.task}"},
+        ],
+        "extra_body": {"prompt_cache_key": prompt.resume_key},
+    }
+
+
+def _fill_usage(usage: Optional[TokenUsage], reported: Any) -> TokenUsage:
+    """Copy OpenAI usage metadata into a TokenUsage.
+
+    Args:
+        usage: TokenUsage to fill, or None to create one.
+        reported: response.usage (or the final stream chunk's usage).
+
+    Returns:
+        The filled TokenUsage.
+    """
+    usage = usage if usage is not None else TokenUsage()
+    if reported:
+        details = getattr(reported, "prompt_tokens_details", None)
+        usage.input_tokens = token_count(reported.prompt_tokens)
+        usage.output_tokens = token_count(reported.completion_tokens)
+        usage.cached_input_tokens = token_count(getattr(details, "cached_tokens", None))
+    return usage
+
+
+def _response_format(schema: OutputSchema) -> Dict[str, Any]:
+    """Strict json_schema response format for a structured operation.
+
+    Args:
+        schema: Output schema of the operation.
+
+    Returns:
+        response_format for chat.completions.create().
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.name,
+            "description": schema.description,
+            "schema": schema.strict_json_schema,
+            "strict": True,
+        },
+    }
+
+
+def _structured_result(response: Any, schema: OutputSchema) -> Dict[str, Any]:
+    """Validate the structured result of a completion.
+
+    Args:
+        response: chat.completions.create() response.
+        schema: Output schema the response format asked for.
+
+    Returns:
+        The validated result.
+
+    Raises:
+        ValueError: If the model refused, returned nothing, or the result
+            does not match the schema.
+    """
+    message = response.choices[0].message
+    refusal = getattr(message, "refusal", None)
+    if isinstance(refusal, str) and refusal:
+        logger.error(f"OpenAI refused {schema.name}: {refusal}")
+        raise ValueError(f"OpenAI refused the request: {refusal}")
+    if not message.content:
+        raise ValueError("OpenAI returned empty response")
+    return schema.parse_text(message.content)
+
+
 class OpenAIProvider(AIProvider):
     """OpenAI provider using GPT API."""
 
@@ -29,17 +118,18 @@ class OpenAIProvider(AIProvider):
         """Provider name."""
         return "gpt"
 
-    async def parse_resume(self, text: str) -> Dict[str, Any]:
+    async def parse_resume(self, text: str, usage: Optional[TokenUsage] = None) -> Dict[str, Any]:
         """Parse resume using GPT-4o-mini.
 
         Args:
             text: Raw resume text.
+            usage: Filled with the reported token counts.
 
         Returns:
             Parsed resume data as dictionary.
 
         Raises:
-            ValueError: If AI returns invalid JSON.
+            ValueError: If the response does not match the resume schema.
         """
         prompt = RESUME_PARSE_PROMPT.format(resume_text=text)
 
@@ -48,37 +138,30 @@ class OpenAIProvider(AIProvider):
         response = await self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
+            response_format=_response_format(RESUME_SCHEMA),
             max_tokens=2000,
         )
 
-        response_text = response.choices[0].message.content
-
-        if not response_text:
-            raise ValueError("OpenAI returned empty response")
-
-        try:
-            parsed = json.loads(response_text)
-            logger.info("Successfully parsed resume with OpenAI")
-            return parsed
-        except json.JSONDecodeError as e:
-            logger.error(f"OpenAI returned invalid JSON: {e}")
-            raise ValueError(f"AI returned invalid JSON: {e}") from e
+        usage = _fill_usage(usage, response.usage)
+        parsed = _structured_result(response, RESUME_SCHEMA)
+        logger.info("Successfully parsed resume with OpenAI")
+        return parsed
 
     async def generate_match_analysis(
-        self, resume_data: Dict[str, Any], job_description: str
+        self, resume_data: ResumeInput, job_description: str, usage: Optional[TokenUsage] = None
     ) -> Dict[str, Any]:
         """Generate match analysis using GPT.
 
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job posting description.
+            usage: Filled with the reported token counts.
 
         Returns:
             Match analysis dictionary with match_score, strengths, gaps, recommendations.
 
         Raises:
-            ValueError: If AI returns invalid JSON or missing required fields.
+            ValueError: If the response does not match the operation's output schema.
         """
         prompt = format_match_prompt(resume_data, job_description)
 
@@ -87,8 +170,8 @@ class OpenAIProvider(AIProvider):
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
+                **_prompt_params(prompt),
+                response_format=_response_format(MATCH_SCHEMA),
                 max_tokens=1500,
                 timeout=10.0,
             )
@@ -96,28 +179,8 @@ class OpenAIProvider(AIProvider):
             logger.error(f"OpenAI API error during match analysis: {e}")
             raise ValueError(f"OpenAI API error: {e}") from e
 
-        response_text = response.choices[0].message.content
-
-        if not response_text:
-            raise ValueError("OpenAI returned empty response")
-
-        try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"OpenAI returned invalid JSON for match analysis: {e}")
-            raise ValueError(f"AI returned invalid JSON: {e}") from e
-
-        # Validate required fields
-        required_fields = ["match_score", "strengths", "gaps", "recommendations"]
-        for field in required_fields:
-            if field not in parsed:
-                logger.error(f"OpenAI response missing required field: {field}")
-                raise ValueError(f"AI response missing required field: {field}")
-
-        # Validate match_score is an integer 0-100
-        if not isinstance(parsed["match_score"], int) or not 0 <= parsed["match_score"] <= 100:
-            logger.error(f"Invalid match_score: {parsed['match_score']}")
-            raise ValueError("match_score must be an integer between 0 and 100")
+        usage = _fill_usage(usage, response.usage)
+        parsed = _structured_result(response, MATCH_SCHEMA)
 
         logger.info(f"Successfully generated match analysis with OpenAI, score: {parsed['match_score']}")
         return parsed
@@ -125,28 +188,30 @@ class OpenAIProvider(AIProvider):
 
     async def generate_cover_letter(
         self,
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         tone: str,
         custom_instructions: Optional[str] = None,
         feedback: Optional[str] = None,
         previous_content: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int]:
         """Generate cover letter using GPT.
 
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job posting description.
             tone: Desired tone for the cover letter.
             custom_instructions: Optional user instructions.
             feedback: Optional feedback for regeneration.
             previous_content: Previous cover letter (required with feedback).
+            usage: Filled with the reported token counts.
 
         Returns:
-            Tuple of (content, tokens_used).
+            Tuple of (content, tokens_used), tokens_used being the reported output tokens.
 
         Raises:
-            ValueError: If AI returns invalid JSON or missing required fields.
+            ValueError: If the response does not match the operation's output schema.
         """
         from .prompts import format_cover_letter_prompt
 
@@ -159,8 +224,8 @@ class OpenAIProvider(AIProvider):
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
+                **_prompt_params(prompt),
+                response_format=_response_format(CONTENT_SCHEMA),
                 max_tokens=2000,  # Cover letters need more tokens than match analysis
                 timeout=15.0,  # Longer timeout for cover letter generation
             )
@@ -168,57 +233,40 @@ class OpenAIProvider(AIProvider):
             logger.error(f"OpenAI API error during cover letter generation: {e}")
             raise ValueError(f"OpenAI API error: {e}") from e
 
-        response_text = response.choices[0].message.content
-
-        if not response_text:
-            raise ValueError("OpenAI returned empty response")
-
-        try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"OpenAI returned invalid JSON for cover letter: {e}")
-            raise ValueError(f"AI returned invalid JSON: {e}") from e
-
-        # Validate required fields
-        if "content" not in parsed:
-            logger.error("OpenAI response missing required field: content")
-            raise ValueError("AI response missing required field: content")
-
-        if "tokens_used" not in parsed:
-            logger.warning("OpenAI response missing tokens_used, using estimate")
-            # Estimate based on response length
-            parsed["tokens_used"] = len(response_text) // 4
-
-        content = parsed["content"]
-        tokens_used = parsed["tokens_used"]
+        usage = _fill_usage(usage, response.usage)
+        content = _structured_result(response, CONTENT_SCHEMA)["content"]
+        # Reported output tokens; the length estimate covers responses without usage
+        tokens_used = usage.output_tokens or len(content) // 4
 
         logger.info(f"Successfully generated cover letter with OpenAI, tokens: {tokens_used}")
         return content, tokens_used
 
     async def generate_answer(
         self,
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         question: str,
         max_length: int,
         feedback: Optional[str] = None,
         previous_content: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int]:
         """Generate answer to application question using GPT.
 
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             question: Application question to answer.
             max_length: Target character length.
             feedback: Optional feedback for regeneration.
             previous_content: Previous answer (required with feedback).
+            usage: Filled with the reported token counts.
 
         Returns:
-            Tuple of (content, tokens_used).
+            Tuple of (content, tokens_used), tokens_used being the reported output tokens.
 
         Raises:
-            ValueError: If AI returns invalid JSON or missing required fields.
+            ValueError: If the response does not match the operation's output schema.
         """
         from .prompts import format_answer_prompt
 
@@ -231,8 +279,8 @@ class OpenAIProvider(AIProvider):
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
+                **_prompt_params(prompt),
+                response_format=_response_format(CONTENT_SCHEMA),
                 max_tokens=1500,  # Sufficient for all answer lengths
                 timeout=10.0,  # Shorter timeout for answers
             )
@@ -240,59 +288,42 @@ class OpenAIProvider(AIProvider):
             logger.error(f"OpenAI API error during answer generation: {e}")
             raise ValueError(f"OpenAI API error: {e}") from e
 
-        response_text = response.choices[0].message.content
-
-        if not response_text:
-            raise ValueError("OpenAI returned empty response")
-
-        try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"OpenAI returned invalid JSON for answer: {e}")
-            raise ValueError(f"AI returned invalid JSON: {e}") from e
-
-        # Validate required fields
-        if "content" not in parsed:
-            logger.error("OpenAI response missing required field: content")
-            raise ValueError("AI response missing required field: content")
-
-        if "tokens_used" not in parsed:
-            logger.warning("OpenAI response missing tokens_used, using estimate")
-            # Estimate based on response length
-            parsed["tokens_used"] = len(response_text) // 4
-
-        content = parsed["content"]
-        tokens_used = parsed["tokens_used"]
+        usage = _fill_usage(usage, response.usage)
+        content = _structured_result(response, CONTENT_SCHEMA)["content"]
+        # Reported output tokens; the length estimate covers responses without usage
+        tokens_used = usage.output_tokens or len(content) // 4
 
         logger.info(f"Successfully generated answer with OpenAI, tokens: {tokens_used}")
         return content, tokens_used
 
     async def generate_outreach(
         self,
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         recipient_type: str,
         platform: str,
         recipient_name: Optional[str] = None,
         feedback: Optional[str] = None,
         previous_content: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int]:
         """Generate outreach message using GPT.
 
         Args:
-            resume_data: Parsed resume data.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             recipient_type: Type of recipient (recruiter, hiring_manager, referral).
             platform: Target platform (linkedin, email, twitter).
             recipient_name: Optional recipient name for personalized greeting.
             feedback: Optional feedback for regeneration.
             previous_content: Previous message (required with feedback).
+            usage: Filled with the reported token counts.
 
         Returns:
-            Tuple of (content, tokens_used).
+            Tuple of (content, tokens_used), tokens_used being the reported output tokens.
 
         Raises:
-            ValueError: If AI returns invalid JSON or missing required fields.
+            ValueError: If the response does not match the operation's output schema.
         """
         from .prompts import format_outreach_prompt
 
@@ -305,8 +336,8 @@ class OpenAIProvider(AIProvider):
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
+                **_prompt_params(prompt),
+                response_format=_response_format(CONTENT_SCHEMA),
                 max_tokens=1500,  # Sufficient for all platforms
                 timeout=10.0,  # Shorter timeout for outreach
             )
@@ -314,29 +345,51 @@ class OpenAIProvider(AIProvider):
             logger.error(f"OpenAI API error during outreach generation: {e}")
             raise ValueError(f"OpenAI API error: {e}") from e
 
-        response_text = response.choices[0].message.content
+        usage = _fill_usage(usage, response.usage)
+        content = _structured_result(response, CONTENT_SCHEMA)["content"]
+        # Reported output tokens; the length estimate covers responses without usage
+        tokens_used = usage.output_tokens or len(content) // 4
 
-        if not response_text:
-            raise ValueError("OpenAI returned empty response")
+        logger.info(f"Successfully generated outreach with OpenAI, tokens: {tokens_used}")
+        return content, tokens_used
 
-        try:
-            parsed = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"OpenAI returned invalid JSON for outreach: {e}")
-            raise ValueError(f"AI returned invalid JSON: {e}") from e
+    async def stream_text(
+        self,
+        prompt: ChatPrompt,
+        max_tokens: int,
+        timeout: float,
+        usage: Optional[TokenUsage] = None,
+    ) -> AsyncIterator[str]:
+        """Stream a plain-text completion using GPT.
 
-        # Validate required fields
-        if "content" not in parsed:
-            logger.error("OpenAI response missing required field: content")
-            raise ValueError("AI response missing required field: content")
+        Args:
+            prompt: Generation prompt asking for plain text.
+            max_tokens: Maximum tokens to generate.
+            timeout: Request timeout in seconds.
+            usage: Filled with prompt/completion and cached token counts at the end.
 
-        if "tokens_used" not in parsed:
-            logger.warning("OpenAI response missing tokens_used, using estimate")
-            # Estimate based on response length
-            parsed["tokens_used"] = len(response_text) // 4
+        Yields:
+            Text deltas.
 
-        content = parsed["content"]
-        tokens_used = parsed["tokens_used"]
+        Raises:
+            ValueError: If the OpenAI API call fails.
+        """
+        logger.info(f"Streaming completion with OpenAI ({self.model})")
 
-        logger.info(f"Successfully generated outreach with OpenAI, tokens: {tokens_used}")
-        return content, tokens_used
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                **_prompt_params(prompt),
+                max_tokens=max_tokens,
+                timeout=timeout,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if chunk.usage and usage is not None:
+                    _fill_usage(usage, chunk.usage)
+        except Exception as e:
+            logger.error(f"OpenAI API error during streaming: {e}")
+            raise ValueError(f"OpenAI API error: {e}") from e
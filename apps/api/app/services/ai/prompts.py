@@ -1,4 +1,27 @@
-"""AI prompts for resume parsing."""
+"""AI prompts for resume parsing and generation.
+
+Generation prompts (match, cover letter, answer, outreach) are built as a
+ChatPrompt: a system prompt shared by every operation, the resume, the job
+description, and the operation-specific task. The system+resume prefix is
+byte-identical for the same resume (so a batch of matches against many
+jobs shares it) and the system+resume+job prefix for the same resume and
+job, so back-to-back operations hit the provider prompt cache (explicit
+cache_control breakpoints on Claude, automatic prefix caching on OpenAI).
+Keep anything that varies per request in the task.
+
+The resume is rendered as its compact prompt digest (see resume_digest.py),
+not as JSON.
+"""
+
+import hashlib
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Union
+
+from app.services.ai.resume_digest import build_resume_digest
+
+# What generation prompts accept for the resume: the digest stored at upload,
+# or parsed resume data to digest on the fly (rows parsed before digests).
+ResumeInput = Union[str, Dict[str, Any]]
 
 RESUME_PARSE_PROMPT = """You are a resume parser. Extract structured data from the following resume text.
 
@@ -44,9 +67,81 @@ Resume text:
 {resume_text}"""
 
 
-MATCH_ANALYSIS_PROMPT = """You are a career advisor analyzing how well a candidate's resume matches a job posting.
+GENERATION_SYSTEM_PROMPT = """You are an expert career advisor and professional writer helping a job seeker.
+
+Each request starts with a digest of the candidate's resume and the description of the job they are targeting, followed by the task to perform. Ground everything you write in that resume and job description, never invent experience the resume does not show, and follow the task's output format exactly."""
+
+RESUME_CONTEXT = """RESUME:
+{resume}"""
+
+JOB_CONTEXT = """JOB DESCRIPTION:
+{job_description}"""
+
+
+@dataclass(frozen=True)
+class ChatPrompt:
+    """A generation prompt split into a cacheable prefix and a task.
+
+    Attributes:
+        system: System prompt, identical for every generation operation.
+        resume_context: Resume data, identical for every operation on the
+            same resume (including a batch of matches against many jobs).
+        job_context: Job description, identical for every operation on the
+            same job.
+        task: Operation-specific instructions and parameters.
+    """
+
+    system: str
+    resume_context: str
+    job_context: str
+    task: str
+
+    @property
+    def context(self) -> str:
+        """Resume and job context, identical for every operation on the same resume and job."""
+        return f"{self.resume_context}\n\n{self.job_context}"
+
+    @property
+    def prefix_key(self) -> str:
+        """Stable identifier of the shared system+context prefix."""
+        return hashlib.sha256(f"{self.system}\0{self.context}".encode()).hexdigest()[:32]
+
+    @property
+    def resume_key(self) -> str:
+        """Stable identifier of the system+resume prefix shared across jobs."""
+        return hashlib.sha256(f"{self.system}\0{self.resume_context}".encode()).hexdigest()[:32]
+
 
-Analyze the resume data and job description, then return ONLY valid JSON with this exact structure:
+def format_generation_context(resume_data: ResumeInput, job_description: str) -> str:
+    """Format the resume/job context block shared by generation prompts.
+
+    Args:
+        resume_data: Resume prompt digest, or parsed resume data to digest.
+        job_description: Job posting description text.
+
+    Returns:
+        Context block text.
+    """
+    return _generation_prompt(resume_data, job_description, "").context
+
+
+def _generation_prompt(resume_data: ResumeInput, job_description: str, task: str) -> ChatPrompt:
+    """Assemble a ChatPrompt around an operation's task text."""
+    if not isinstance(resume_data, str):
+        resume_data = build_resume_digest(resume_data)
+    return ChatPrompt(
+        system=GENERATION_SYSTEM_PROMPT,
+        resume_context=RESUME_CONTEXT.format(resume=resume_data),
+        job_context=JOB_CONTEXT.format(job_description=job_description),
+        task=task,
+    )
+
+
+# Part of the match result cache key: bump when the match prompt, model or
+# output schema changes so cached analyses are not reused.
+MATCH_PROMPT_VERSION = "3"
+
+MATCH_ANALYSIS_PROMPT = """Analyze how well the candidate's resume above matches the job posting, then return ONLY valid JSON with this exact structure:
 
 {{
   "match_score": <integer 0-100>,
@@ -77,43 +172,23 @@ Important rules:
 - match_score must be an integer between 0 and 100
 - strengths: 3-5 specific, concrete items that align with job requirements
 - gaps: 2-4 specific requirements or preferences not met
-- recommendations: 2-3 actionable suggestions for the candidate
-
-RESUME DATA:
-{resume_data}
+- recommendations: 2-3 actionable suggestions for the candidate"""
 
-JOB DESCRIPTION:
-{job_description}"""
 
-
-def format_match_prompt(resume_data: dict, job_description: str) -> str:
+def format_match_prompt(resume_data: ResumeInput, job_description: str) -> ChatPrompt:
     """Format the match analysis prompt with resume data and job description.
 
     Args:
-        resume_data: Parsed resume data dictionary.
+        resume_data: Resume prompt digest, or parsed resume data to digest.
         job_description: Job posting description text.
 
     Returns:
-        Formatted prompt string.
+        Formatted prompt.
     """
-    import json
-
-    resume_str = json.dumps(resume_data, indent=2)
-    return MATCH_ANALYSIS_PROMPT.format(
-        resume_data=resume_str,
-        job_description=job_description,
-    )
-
-
-
-COVER_LETTER_PROMPT = """You are a professional cover letter writer. Generate a compelling, tailored cover letter based on the candidate's resume and the job description.
+    return _generation_prompt(resume_data, job_description, MATCH_ANALYSIS_PROMPT.format())
 
-Return ONLY valid JSON with this exact structure:
 
-{{
-  "content": "string containing the complete cover letter text",
-  "tokens_used": <integer token count>
-}}
+COVER_LETTER_PROMPT = """Generate a compelling, tailored cover letter based on the candidate's resume and the job description above.
 
 **Tone: {tone}**
 
@@ -146,32 +221,24 @@ Tone characteristics:
 - No placeholders like [Your Name] - leave signature line blank
 
 **IMPORTANT RULES:**
-- Return ONLY the JSON object, no markdown code blocks or extra text
-- content must be the complete, ready-to-use cover letter
+- Write the complete, ready-to-use cover letter
 - Preserve paragraph breaks with \\n\\n
-- tokens_used should be approximate count of tokens in the response
 - Do NOT include date, salutation, or signature - just the letter content
-- Follow the specified tone closely
-
-RESUME DATA:
-{resume_data}
-
-JOB DESCRIPTION:
-{job_description}"""
+- Follow the specified tone closely"""
 
 
 def format_cover_letter_prompt(
-    resume_data: dict,
+    resume_data: ResumeInput,
     job_description: str,
     tone: str,
     custom_instructions: str | None = None,
     feedback: str | None = None,
     previous_content: str | None = None,
-) -> str:
+) -> ChatPrompt:
     """Format the cover letter prompt with all parameters.
 
     Args:
-        resume_data: Parsed resume data dictionary.
+        resume_data: Resume prompt digest, or parsed resume data to digest.
         job_description: Job posting description text.
         tone: Desired tone (confident, friendly, enthusiastic, professional, executive).
         custom_instructions: Optional user instructions to incorporate.
@@ -179,12 +246,8 @@ def format_cover_letter_prompt(
         previous_content: Previous cover letter content (required with feedback).
 
     Returns:
-        Formatted prompt string.
+        Formatted prompt.
     """
-    import json
-
-    resume_str = json.dumps(resume_data, indent=2)
-    
     # Format custom instructions text
     if custom_instructions:
         custom_instructions_text = f"User wants you to: {custom_instructions}"
@@ -204,13 +267,12 @@ Instructions: Revise the previous cover letter based on the feedback above. Main
     else:
         feedback_instructions = ""
     
-    return COVER_LETTER_PROMPT.format(
+    task = COVER_LETTER_PROMPT.format(
         tone=tone,
         custom_instructions_text=custom_instructions_text,
         feedback_instructions=feedback_instructions,
-        resume_data=resume_str,
-        job_description=job_description,
     )
+    return _generation_prompt(resume_data, job_description, task)
 
 
 # Platform-specific length constraints
@@ -221,13 +283,7 @@ PLATFORM_LENGTHS = {
 }
 
 
-ANSWER_PROMPT = """You are an expert career advisor helping a job applicant craft a compelling answer to an application question.
-
-## Resume Data:
-{resume_data}
-
-## Job Description:
-{job_description}
+ANSWER_PROMPT = """Help the applicant craft a compelling answer to an application question for this job, drawing on the resume above.
 
 ## Application Question:
 {question}
@@ -239,30 +295,21 @@ Generate an answer of approximately {max_length} characters.
 - 500 chars: Standard with 2-3 supporting points
 - 1000 chars: Detailed with examples and context
 
-{feedback_instructions}
-
-## Output Format:
-Return ONLY valid JSON with this exact structure:
-{{
-  "content": "Your generated answer here",
-  "tokens_used": <integer estimate of tokens in your response>
-}}
-
-Do not include any text outside the JSON object."""
+{feedback_instructions}"""
 
 
 def format_answer_prompt(
-    resume_data: dict,
+    resume_data: ResumeInput,
     job_description: str,
     question: str,
     max_length: int,
     feedback: str | None = None,
     previous_content: str | None = None,
-) -> str:
+) -> ChatPrompt:
     """Format the answer prompt with all parameters.
 
     Args:
-        resume_data: Parsed resume data dictionary.
+        resume_data: Resume prompt digest, or parsed resume data to digest.
         job_description: Job description text.
         question: The application question to answer.
         max_length: Target character length (150, 300, 500, 1000).
@@ -270,12 +317,8 @@ def format_answer_prompt(
         previous_content: Previous answer (required with feedback).
 
     Returns:
-        Formatted prompt string.
+        Formatted prompt.
     """
-    import json
-
-    resume_str = json.dumps(resume_data, indent=2)
-
     # Format feedback instructions
     if feedback and previous_content:
         feedback_instructions = f"""**REGENERATION MODE - Revise based on feedback:**
@@ -289,22 +332,15 @@ Instructions: Revise the previous answer based on the feedback above. Maintain t
     else:
         feedback_instructions = ""
 
-    return ANSWER_PROMPT.format(
-        resume_data=resume_str,
-        job_description=job_description,
+    task = ANSWER_PROMPT.format(
         question=question,
         max_length=max_length,
         feedback_instructions=feedback_instructions,
     )
+    return _generation_prompt(resume_data, job_description, task)
 
 
-OUTREACH_PROMPT = """You are an expert career coach helping a job seeker craft a professional outreach message.
-
-## Resume Data:
-{resume_data}
-
-## Job Description:
-{job_description}
+OUTREACH_PROMPT = """Help the job seeker craft a professional outreach message about this job, drawing on the resume above.
 
 ## Message Parameters:
 - Recipient Type: {recipient_type}
@@ -323,15 +359,6 @@ OUTREACH_PROMPT = """You are an expert career coach helping a job seeker craft a
 
 {feedback_instructions}
 
-## Output Format:
-Return ONLY valid JSON with this exact structure:
-{{
-  "content": "Your generated message here",
-  "tokens_used": <integer estimate of tokens in your response>
-}}
-
-Do not include any text outside the JSON object.
-
 ## Important Notes:
 - If recipient_name is provided, include a personalized greeting (e.g., "Hi Sarah,")
 - If recipient_name is NOT provided, start directly with the opening statement (no greeting, no placeholder like "[Name]")
@@ -339,18 +366,18 @@ Do not include any text outside the JSON object.
 
 
 def format_outreach_prompt(
-    resume_data: dict,
+    resume_data: ResumeInput,
     job_description: str,
     recipient_type: str,
     platform: str,
     recipient_name: str | None = None,
     feedback: str | None = None,
     previous_content: str | None = None,
-) -> str:
+) -> ChatPrompt:
     """Format the outreach prompt with all parameters.
 
     Args:
-        resume_data: Parsed resume data dictionary.
+        resume_data: Resume prompt digest, or parsed resume data to digest.
         job_description: Job description text.
         recipient_type: Type of recipient (recruiter, hiring_manager, referral).
         platform: Target platform (linkedin, email, twitter).
@@ -359,12 +386,8 @@ def format_outreach_prompt(
         previous_content: Previous message (required with feedback).
 
     Returns:
-        Formatted prompt string.
+        Formatted prompt.
     """
-    import json
-
-    resume_str = json.dumps(resume_data, indent=2)
-
     # Format recipient name
     if recipient_name:
         name_str = recipient_name
@@ -384,11 +407,32 @@ Instructions: Revise the previous message based on the feedback above. Maintain
     else:
         feedback_instructions = ""
 
-    return OUTREACH_PROMPT.format(
-        resume_data=resume_str,
-        job_description=job_description,
+    task = OUTREACH_PROMPT.format(
         recipient_type=recipient_type,
         platform=platform,
         recipient_name=name_str,
         feedback_instructions=feedback_instructions,
     )
+    return _generation_prompt(resume_data, job_description, task)
+
+
+PLAIN_TEXT_OUTPUT = """
+
+## Output Format Override:
+Respond with ONLY the {kind} itself, exactly as the user should see it: no JSON, no markdown code fences, no preamble or closing commentary."""
+
+
+def as_plain_text_prompt(prompt: ChatPrompt, kind: str) -> ChatPrompt:
+    """Adapt a generation prompt for streaming plain text.
+
+    Only the task changes, so the cached prefix is shared with the
+    non-streaming operations.
+
+    Args:
+        prompt: Formatted cover letter, answer or outreach prompt.
+        kind: What is being written, e.g. "cover letter".
+
+    Returns:
+        Prompt that asks for the bare text so deltas can be shown as they arrive.
+    """
+    return replace(prompt, task=prompt.task + PLAIN_TEXT_OUTPUT.format(kind=kind))
@@ -1,7 +1,25 @@
 """Abstract AI provider base class."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.services.ai.prompts import ChatPrompt, ResumeInput
+
+
+@dataclass
+class TokenUsage:
+    """Token counts and timing reported for one provider call.
+
+    Providers fill the token counts from the API response's usage metadata;
+    the engine adds the model and wall time.
+    """
+
+    input_tokens: int = 0  # all prompt tokens, including cached ones
+    output_tokens: int = 0
+    cached_input_tokens: int = 0  # input tokens read from the prompt cache
+    model: Optional[str] = None
+    latency_ms: int = 0  # wall time of the operation
 
 
 class AIProvider(ABC):
@@ -14,11 +32,12 @@ class AIProvider(ABC):
         pass
 
     @abstractmethod
-    async def parse_resume(self, text: str) -> Dict[str, Any]:
+    async def parse_resume(self, text: str, usage: Optional[TokenUsage] = None) -> Dict[str, Any]:
         """Parse resume text and extract structured data.
 
         Args:
             text: Raw text extracted from resume PDF.
+            usage: Filled with the provider-reported token counts.
 
         Returns:
             Dictionary with parsed resume fields:
@@ -35,13 +54,14 @@ class AIProvider(ABC):
 
     @abstractmethod
     async def generate_match_analysis(
-        self, resume_data: Dict[str, Any], job_description: str
+        self, resume_data: ResumeInput, job_description: str, usage: Optional[TokenUsage] = None
     ) -> Dict[str, Any]:
         """Generate match analysis between resume and job description.
 
         Args:
-            resume_data: Parsed resume data dictionary.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job posting description text.
+            usage: Filled with the provider-reported token counts.
 
         Returns:
             Dictionary with match analysis:
@@ -58,25 +78,28 @@ class AIProvider(ABC):
     @abstractmethod
     async def generate_cover_letter(
         self,
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         tone: str,
         custom_instructions: Optional[str] = None,
         feedback: Optional[str] = None,
         previous_content: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int]:
         """Generate a tailored cover letter.
 
         Args:
-            resume_data: Parsed resume data dictionary.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             tone: Desired tone (confident, friendly, enthusiastic, professional, executive).
             custom_instructions: Optional user instructions to incorporate.
             feedback: Optional feedback for regeneration.
             previous_content: Previous cover letter content (required with feedback).
+            usage: Filled with the provider-reported token counts.
 
         Returns:
-            Tuple of (content: str, tokens_used: int).
+            Tuple of (content: str, tokens_used: int), where tokens_used is
+            the provider-reported output token count.
 
         Raises:
             ValueError: If AI call fails or response is invalid.
@@ -86,25 +109,28 @@ class AIProvider(ABC):
     @abstractmethod
     async def generate_answer(
         self,
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         question: str,
         max_length: int,
         feedback: Optional[str] = None,
         previous_content: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int]:
         """Generate an answer to an application question.
 
         Args:
-            resume_data: Parsed resume data dictionary.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             question: The application question to answer.
             max_length: Target character length (150, 300, 500, 1000).
             feedback: Optional feedback for regeneration.
             previous_content: Previous answer (required with feedback).
+            usage: Filled with the provider-reported token counts.
 
         Returns:
-            Tuple of (content: str, tokens_used: int).
+            Tuple of (content: str, tokens_used: int), where tokens_used is
+            the provider-reported output token count.
 
         Raises:
             ValueError: If AI call fails or response is invalid.
@@ -114,29 +140,57 @@ class AIProvider(ABC):
     @abstractmethod
     async def generate_outreach(
         self,
-        resume_data: Dict[str, Any],
+        resume_data: ResumeInput,
         job_description: str,
         recipient_type: str,
         platform: str,
         recipient_name: Optional[str] = None,
         feedback: Optional[str] = None,
         previous_content: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
     ) -> Tuple[str, int]:
         """Generate an outreach message for a recruiter or hiring manager.
 
         Args:
-            resume_data: Parsed resume data dictionary.
+            resume_data: Resume prompt digest, or parsed resume data to digest.
             job_description: Job description text.
             recipient_type: Type of recipient (recruiter, hiring_manager, referral).
             platform: Target platform (linkedin, email, twitter).
             recipient_name: Optional recipient name for personalized greeting.
             feedback: Optional feedback for regeneration.
             previous_content: Previous message (required with feedback).
+            usage: Filled with the provider-reported token counts.
 
         Returns:
-            Tuple of (content: str, tokens_used: int).
+            Tuple of (content: str, tokens_used: int), where tokens_used is
+            the provider-reported output token count.
 
         Raises:
             ValueError: If AI call fails or response is invalid.
         """
         pass
+
+    @abstractmethod
+    def stream_text(
+        self,
+        prompt: ChatPrompt,
+        max_tokens: int,
+        timeout: float,
+        usage: Optional[TokenUsage] = None,
+    ) -> AsyncIterator[str]:
+        """Stream a plain-text completion as it is generated.
+
+        Args:
+            prompt: Generation prompt (asking for plain text, not JSON).
+            max_tokens: Maximum tokens to generate.
+            timeout: Request timeout in seconds.
+            usage: Filled with the provider-reported token counts once the
+                stream completes.
+
+        Yields:
+            Text deltas in order.
+
+        Raises:
+            ValueError: If the AI call fails.
+        """
+        pass
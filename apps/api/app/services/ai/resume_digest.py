@@ -0,0 +1,148 @@
+"""Compact, deterministic rendering of parsed resume data for prompts.
+
+Generation prompts used to embed `json.dumps(parsed_data, indent=2)`, which
+spends tokens on indentation, quotes, braces, key names and null fields on
+every call. The digest is plain labelled lines instead:
+
+    Name: Jane Doe
+    Location: Austin, TX
+    Summary: Backend engineer with 6 years of Python.
+    Experience:
+    - Senior Engineer @ Acme, 2020-01 to present: Led the payments API...
+    Education:
+    - BS Computer Science, UT Austin, 2016
+    Skills: Python, FastAPI, PostgreSQL
+
+Empty fields are dropped, whitespace is collapsed, long descriptions are
+capped at a word boundary and duplicate skills removed. Contact details other
+than name and location are left out; no generation prompt needs them.
+
+The digest is computed once when a resume is parsed and stored in
+resumes.prompt_digest; rows without one are digested on the fly.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+SUMMARY_MAX_CHARS = 600
+DESCRIPTION_MAX_CHARS = 400
+MAX_SKILLS = 60
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _clean(value: Any) -> str:
+    """Collapse whitespace in a scalar field; non-strings become ''."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    if not isinstance(value, str):
+        return ""
+    return _WHITESPACE.sub(" ", value).strip()
+
+
+def _cap(text: str, limit: int) -> str:
+    """Truncate text to at most `limit` characters at a word boundary."""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0].rstrip(" ,;:.-")
+    return f"{cut}..."
+
+
+def _join(*parts: str, sep: str = ", ") -> str:
+    """Join the non-empty parts."""
+    return sep.join(part for part in parts if part)
+
+
+def _entries(value: Any) -> List[Dict[str, Any]]:
+    """The dict items of a list field (tolerates unvalidated AI output)."""
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, dict)]
+
+
+def _experience_line(item: Dict[str, Any]) -> Optional[str]:
+    """Render one experience entry, or None if it is empty."""
+    title = _clean(item.get("title"))
+    company = _clean(item.get("company"))
+    role = _join(title, company, sep=" @ ")
+
+    start = _clean(item.get("start_date"))
+    end = _clean(item.get("end_date")) or ("present" if start else "")
+    dates = _join(start, end, sep=" to ")
+
+    heading = _join(role, dates)
+    description = _cap(_clean(item.get("description")), DESCRIPTION_MAX_CHARS)
+    if not heading and not description:
+        return None
+    if heading and description:
+        return f"- {heading}: {description}"
+    return f"- {heading or description}"
+
+
+def _education_line(item: Dict[str, Any]) -> Optional[str]:
+    """Render one education entry, or None if it is empty."""
+    line = _join(
+        _clean(item.get("degree")),
+        _clean(item.get("institution")),
+        _clean(item.get("graduation_year")),
+    )
+    return f"- {line}" if line else None
+
+
+def _skills(value: Any) -> List[str]:
+    """Cleaned skills with case-insensitive duplicates removed, in order."""
+    if not isinstance(value, list):
+        return []
+    seen = set()
+    skills = []
+    for raw in value:
+        skill = _clean(raw)
+        if skill and skill.lower() not in seen:
+            seen.add(skill.lower())
+            skills.append(skill)
+    return skills[:MAX_SKILLS]
+
+
+def build_resume_digest(parsed_data: Dict[str, Any]) -> str:
+    """Render parsed resume data as a compact prompt digest.
+
+    Args:
+        parsed_data: Parsed resume data (ParsedResumeData shape; unvalidated
+            AI output is tolerated).
+
+    Returns:
+        Digest text. The same input always produces the same text.
+    """
+    if not isinstance(parsed_data, dict):
+        return ""
+
+    lines: List[str] = []
+
+    contact = parsed_data.get("contact")
+    if isinstance(contact, dict):
+        name = _join(_clean(contact.get("first_name")), _clean(contact.get("last_name")), sep=" ")
+        location = _clean(contact.get("location"))
+        if name:
+            lines.append(f"Name: {name}")
+        if location:
+            lines.append(f"Location: {location}")
+
+    summary = _cap(_clean(parsed_data.get("summary")), SUMMARY_MAX_CHARS)
+    if summary:
+        lines.append(f"Summary: {summary}")
+
+    experience = [line for line in map(_experience_line, _entries(parsed_data.get("experience"))) if line]
+    if experience:
+        lines.append("Experience:")
+        lines.extend(experience)
+
+    education = [line for line in map(_education_line, _entries(parsed_data.get("education"))) if line]
+    if education:
+        lines.append("Education:")
+        lines.extend(education)
+
+    skills = _skills(parsed_data.get("skills"))
+    if skills:
+        lines.append(f"Skills: {', '.join(skills)}")
+
+    return "\n".join(lines)
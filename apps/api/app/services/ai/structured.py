@@ -0,0 +1,155 @@
+"""Schema-constrained outputs for the JSON-returning AI operations.
+
+Every operation that returns JSON has an OutputSchema built from the Pydantic
+model its result must satisfy. Providers send the schema natively (Claude as
+a forced tool whose input_schema it is, OpenAI as a strict json_schema
+response format), so the model cannot answer with markdown fences or
+trailing prose, and parse() validates what comes back against the same
+model.
+
+repair_json() is the last resort for a response that arrives as free text
+anyway (a provider ignoring the tool, an older model): it strips fences,
+cuts the outermost object out of surrounding prose and drops trailing
+commas before giving up. Each repair is logged so the rate stays visible.
+"""
+
+import copy
+import json
+import logging
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.models.ai import GeneratedContent, MatchAnalysisResult
+from app.models.resume import ParsedResumeData
+
+logger = logging.getLogger(__name__)
+
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+@dataclass(frozen=True)
+class OutputSchema:
+    """The structured result of one kind of AI operation."""
+
+    name: str
+    description: str
+    model: Type[BaseModel]
+
+    @cached_property
+    def json_schema(self) -> Dict[str, Any]:
+        """JSON Schema of the model, as Claude tool input_schema."""
+        return self.model.model_json_schema()
+
+    @cached_property
+    def strict_json_schema(self) -> Dict[str, Any]:
+        """JSON Schema for OpenAI strict mode.
+
+        Strict mode requires every property to be listed in required
+        (optional fields stay nullable) and additionalProperties to be
+        false on every object, and does not accept defaults.
+        """
+        return _strictify(copy.deepcopy(self.json_schema))
+
+    def parse(self, data: Any) -> Dict[str, Any]:
+        """Validate a decoded result against the model.
+
+        Args:
+            data: Tool input or decoded JSON from the provider.
+
+        Returns:
+            The validated result, without null optional fields.
+
+        Raises:
+            ValueError: If the result does not match the schema.
+        """
+        try:
+            return self.model.model_validate(data).model_dump(exclude_none=True)
+        except ValidationError as e:
+            logger.error(f"AI response does not match {self.name}: {e}")
+            raise ValueError(f"AI response does not match {self.name}: {e}") from e
+
+    def parse_text(self, text: str) -> Dict[str, Any]:
+        """Decode (repairing if needed) and validate a free-text JSON response.
+
+        Raises:
+            ValueError: If the text holds no usable JSON object or it does
+                not match the schema.
+        """
+        return self.parse(repair_json(text))
+
+
+def _strictify(node: Any) -> Any:
+    """Rewrite a JSON Schema in place for OpenAI strict mode."""
+    if isinstance(node, dict):
+        node.pop("default", None)
+        properties = node.get("properties")
+        if node.get("type") == "object" and isinstance(properties, dict):
+            node["required"] = list(properties)
+            node["additionalProperties"] = False
+        for value in node.values():
+            _strictify(value)
+    elif isinstance(node, list):
+        for item in node:
+            _strictify(item)
+    return node
+
+
+def repair_json(text: str) -> Dict[str, Any]:
+    """Decode a JSON object from a model's free-text response.
+
+    Tries, in order: the text as-is, without markdown fences, the outermost
+    {...} span, and that span without trailing commas.
+
+    Args:
+        text: Response text.
+
+    Returns:
+        The decoded object.
+
+    Raises:
+        ValueError: If no JSON object can be recovered.
+    """
+    text = (text or "").strip()
+    candidates = [text, _FENCE.sub("", text).strip()]
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        span = text[start : end + 1]
+        candidates += [span, _TRAILING_COMMA.sub(r"\1", span)]
+
+    error: Exception = ValueError("empty response")
+    for index, candidate in enumerate(candidates):
+        try:
+            parsed = json.loads(candidate)
+        except json.JSONDecodeError as e:
+            error = e
+            continue
+        if isinstance(parsed, dict):
+            if index > 0:
+                logger.warning("Repaired malformed JSON in AI response")
+            return parsed
+        error = ValueError(f"expected a JSON object, got {type(parsed).__name__}")
+
+    logger.error(f"AI returned invalid JSON: {error}")
+    raise ValueError(f"AI returned invalid JSON: {error}")
+
+
+RESUME_SCHEMA = OutputSchema(
+    name="record_parsed_resume",
+    description="Record the contact details, summary, experience, education and skills extracted from the resume.",
+    model=ParsedResumeData,
+)
+MATCH_SCHEMA = OutputSchema(
+    name="record_match_analysis",
+    description="Record the match score, strengths, gaps and recommendations for the resume against the job.",
+    model=MatchAnalysisResult,
+)
+CONTENT_SCHEMA = OutputSchema(
+    name="record_content",
+    description="Record the generated text (cover letter, application answer or outreach message).",
+    model=GeneratedContent,
+)
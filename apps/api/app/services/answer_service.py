@@ -2,18 +2,22 @@
 
 import hashlib
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
 from app.core.exceptions import (
     AIProviderUnavailableError,
-    CreditExhaustedError,
     JobNotFoundError,
     ResumeNotFoundError,
     ValidationError,
 )
 from app.db.client import get_supabase_admin_client
+from app.db.profile_cache import get_cached_profile
 from app.services.ai.factory import AIProviderFactory
+from app.services.ai.prompts import ResumeInput, as_plain_text_prompt, format_answer_prompt
+from app.services.ai.provider import TokenUsage
+from app.services.generation_stream import stream_with_reservation
 from app.services.job_service import JobService
+from app.services.job_text import prepare_job_description
 from app.services.resume_service import ResumeService
 from app.services.usage_service import UsageService
 
@@ -59,50 +63,28 @@ class AnswerService:
             Exception: Re-raised as-is for database connection errors.
         """
         try:
-            response = (
-                self.admin_client.table("profiles")
-                .select("active_resume_id, preferred_ai_provider")
-                .eq("id", user_id)
-                .maybe_single()
-                .execute()
-            )
-            return response.data if response and response.data else {}
+            return await get_cached_profile(user_id) or {}
         except Exception as e:
             logger.error(f"Database error fetching user profile: {e}")
             raise  # Re-raise to be handled by exception handler
 
-    async def generate_answer(
+    def _validate_request(
         self,
-        user_id: str,
-        job_id: str,
         question: str,
-        resume_id: Optional[str] = None,
-        max_length: int = 500,
-        feedback: Optional[str] = None,
-        previous_content: Optional[str] = None,
-        ai_provider: Optional[str] = None,
-    ) -> Dict[str, Any]:
-        """Generate AI answer for an application question.
+        max_length: int,
+        feedback: Optional[str],
+        previous_content: Optional[str],
+    ) -> None:
+        """Validate request fields before any credits are reserved.
 
         Args:
-            user_id: User's UUID.
-            job_id: Job's UUID.
             question: Application question to answer.
-            resume_id: Optional resume UUID (uses active resume if not provided).
-            max_length: Target character length (150, 300, 500, 1000). Default: 500.
+            max_length: Target character length.
             feedback: Optional feedback for regeneration.
             previous_content: Previous answer (required with feedback).
-            ai_provider: Optional AI provider override ("claude" or "gpt").
-
-        Returns:
-            Dictionary with content, ai_provider_used, and tokens_used.
 
         Raises:
-            CreditExhaustedError: If user has no credits.
             ValidationError: If validation fails.
-            ResumeNotFoundError: If resume not found or belongs to another user.
-            JobNotFoundError: If job not found or belongs to another user.
-            AIProviderUnavailableError: If both AI providers fail.
         """
         # Step 1: Validate question
         if not question or not question.strip():
@@ -133,14 +115,24 @@ class AnswerService:
             logger.warning(f"Previous content too long: {len(previous_content)} chars")
             raise ValidationError("previous_content too long. Maximum 5000 characters.")
 
-        # Step 4: Check credits (fail fast before expensive operations)
-        has_credits = await self.usage_service.check_credits(user_id)
-        if not has_credits:
-            logger.warning(
-                f"User {_hash_id(user_id)}... has no credits for answer generation"
-            )
-            raise CreditExhaustedError()
+    async def _load_inputs(
+        self, user_id: str, job_id: str, resume_id: Optional[str]
+    ) -> Tuple[ResumeInput, str, Optional[str]]:
+        """Fetch the resume, job description and user AI preference.
+
+        Args:
+            user_id: User's UUID.
+            job_id: Job's UUID.
+            resume_id: Optional resume UUID (uses active resume if not provided).
 
+        Returns:
+            Tuple of (resume prompt digest or parsed data, job description, preferred AI provider).
+
+        Raises:
+            ValidationError: If no resume is selected, or resume/job lack content.
+            ResumeNotFoundError: If resume not found or belongs to another user.
+            JobNotFoundError: If job not found or belongs to another user.
+        """
         # Step 5: Validate and fetch resume (before getting profile)
         # Resolve resume ID first
         if resume_id:
@@ -177,7 +169,8 @@ class AnswerService:
             )
             raise JobNotFoundError()
 
-        job_description = job.get("description", "").strip()
+        # Cleaned description, trimmed to the job description token budget
+        job_description = prepare_job_description(job, "answer")
         if not job_description:
             logger.warning(f"Job {_hash_id(job_id)} has no description")
             raise ValidationError("Job has no description to analyze.")
@@ -191,35 +184,84 @@ class AnswerService:
             profile = await self._get_user_profile(user_id)
             user_preference = profile.get("preferred_ai_provider")
 
-        # Step 8: Generate answer with AI
+        # Prompts use the digest stored at upload; older rows are digested on the fly
+        resume_data = resume.get("prompt_digest") or parsed_data
+        return resume_data, job_description, user_preference
+
+    async def generate_answer(
+        self,
+        user_id: str,
+        job_id: str,
+        question: str,
+        resume_id: Optional[str] = None,
+        max_length: int = 500,
+        feedback: Optional[str] = None,
+        previous_content: Optional[str] = None,
+        ai_provider: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Generate AI answer for an application question.
+
+        Args:
+            user_id: User's UUID.
+            job_id: Job's UUID.
+            question: Application question to answer.
+            resume_id: Optional resume UUID (uses active resume if not provided).
+            max_length: Target character length (150, 300, 500, 1000). Default: 500.
+            feedback: Optional feedback for regeneration.
+            previous_content: Previous answer (required with feedback).
+            ai_provider: Optional AI provider override ("claude" or "gpt").
+
+        Returns:
+            Dictionary with content, ai_provider_used, and tokens_used.
+
+        Raises:
+            CreditExhaustedError: If user has no credits.
+            ValidationError: If validation fails.
+            ResumeNotFoundError: If resume not found or belongs to another user.
+            JobNotFoundError: If job not found or belongs to another user.
+            AIProviderUnavailableError: If both AI providers fail.
+        """
+        # Steps 1-3: Validate request
+        self._validate_request(question, max_length, feedback, previous_content)
+
+        # Step 4: Reserve credits atomically (fail fast before expensive operations)
+        reservation_id = await self.usage_service.reserve_credits(user_id, "answer")
         try:
-            logger.info(
-                f"Answer generation - user: {_hash_id(user_id)}..., "
-                f"job: {_hash_id(job_id)}..., "
-                f"max_length: {max_length}, "
-                f"provider: {ai_provider or user_preference or 'claude'}"
-            )
-            content, tokens_used, provider_used = await AIProviderFactory.answer_with_fallback(
-                resume_data=parsed_data,
-                job_description=job_description,
-                question=question,
-                max_length=max_length,
-                feedback=feedback,
-                previous_content=previous_content,
-                preferred_provider=ai_provider,
-                user_preference=user_preference,
+            # Steps 5-7: Resolve resume, job and AI preference
+            resume_data, job_description, user_preference = await self._load_inputs(
+                user_id, job_id, resume_id
             )
-        except ValueError as e:
-            logger.error(f"All AI providers failed for answer generation: {e}")
-            raise AIProviderUnavailableError() from e
-
-        # Step 9: Record usage AFTER successful AI call
-        await self.usage_service.record_usage(
-            user_id=user_id,
-            operation_type="answer",
-            ai_provider=provider_used,
-            credits_used=1,
-        )
+
+            # Step 8: Generate answer with AI
+            usage = TokenUsage()
+            try:
+                logger.info(
+                    f"Answer generation - user: {_hash_id(user_id)}..., "
+                    f"job: {_hash_id(job_id)}..., "
+                    f"max_length: {max_length}, "
+                    f"provider: {ai_provider or user_preference or 'claude'}"
+                )
+                content, tokens_used, provider_used = await AIProviderFactory.answer_with_fallback(
+                    resume_data=resume_data,
+                    job_description=job_description,
+                    question=question,
+                    max_length=max_length,
+                    feedback=feedback,
+                    previous_content=previous_content,
+                    preferred_provider=ai_provider,
+                    user_preference=user_preference,
+                    usage=usage,
+                )
+            except ValueError as e:
+                logger.error(f"All AI providers failed for answer generation: {e}")
+                raise AIProviderUnavailableError() from e
+        except BaseException:
+            # Validation error, AI failure or cancellation: return the credits
+            await self.usage_service.release_reservation(reservation_id)
+            raise
+
+        # Step 9: Commit the reservation AFTER successful AI call
+        await self.usage_service.commit_reservation(reservation_id, ai_provider=provider_used, usage=usage)
 
         # Step 10: Return answer with provider info
         return {
@@ -227,3 +269,69 @@ class AnswerService:
             "ai_provider_used": provider_used,
             "tokens_used": tokens_used,
         }
+
+    async def stream_answer(
+        self,
+        user_id: str,
+        job_id: str,
+        question: str,
+        resume_id: Optional[str] = None,
+        max_length: int = 500,
+        feedback: Optional[str] = None,
+        previous_content: Optional[str] = None,
+        ai_provider: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream an AI answer as it is generated.
+
+        Validation, credit reservation and provider selection happen before
+        this returns, so those errors surface as normal API errors. The
+        reservation is committed when the stream completes.
+
+        Args:
+            user_id: User's UUID.
+            job_id: Job's UUID.
+            question: Application question to answer.
+            resume_id: Optional resume UUID (uses active resume if not provided).
+            max_length: Target character length (150, 300, 500, 1000). Default: 500.
+            feedback: Optional feedback for regeneration.
+            previous_content: Previous answer (required with feedback).
+            ai_provider: Optional AI provider override ("claude" or "gpt").
+
+        Returns:
+            Async iterator of start/delta/done/error events
+            (see stream_with_reservation).
+
+        Raises:
+            CreditExhaustedError: If user has no credits.
+            ValidationError: If validation fails.
+            ResumeNotFoundError: If resume not found or belongs to another user.
+            JobNotFoundError: If job not found or belongs to another user.
+            AIProviderUnavailableError: If no AI provider could start streaming.
+        """
+        self._validate_request(question, max_length, feedback, previous_content)
+
+        reservation_id = await self.usage_service.reserve_credits(user_id, "answer")
+        try:
+            resume_data, job_description, user_preference = await self._load_inputs(
+                user_id, job_id, resume_id
+            )
+            prompt = as_plain_text_prompt(
+                format_answer_prompt(resume_data, job_description, question, max_length, feedback, previous_content),
+                "answer",
+            )
+            try:
+                stream = await AIProviderFactory.stream(
+                    "answer",
+                    prompt,
+                    max_tokens=1500,
+                    preferred_provider=ai_provider,
+                    user_preference=user_preference,
+                )
+            except ValueError as e:
+                logger.error(f"All AI providers failed to stream answer: {e}")
+                raise AIProviderUnavailableError() from e
+        except BaseException:
+            await self.usage_service.release_reservation(reservation_id)
+            raise
+
+        return stream_with_reservation(self.usage_service, reservation_id, stream, "answer")
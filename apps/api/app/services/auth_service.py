@@ -8,10 +8,25 @@ from supabase import Client
 
 from app.core.config import settings
 from app.core.exceptions import ApiException, AuthenticationError, ErrorCode, InvalidTokenError, NotFoundError
-from app.db.client import get_supabase_client, get_supabase_admin_client
+from app.core.tokens import get_token_verifier, token_denylist, unverified_claims
+from app.db.client import get_supabase_admin_client, get_supabase_auth_client, get_supabase_client
+from app.db.executor import execute, run_sync
+from app.db.profile_cache import get_cached_profile, invalidate_profile
 
 logger = logging.getLogger(__name__)
 
+# Profile fields exposed by GET /v1/auth/me
+PROFILE_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "subscription_tier",
+    "subscription_status",
+    "active_resume_id",
+    "preferred_ai_provider",
+    "created_at",
+)
+
 
 class AuthService:
     """Service for authentication operations."""
@@ -19,15 +34,26 @@ class AuthService:
     def __init__(self):
         """Initialize the auth service."""
         self._client: Optional[Client] = None
+        self._oauth_client: Optional[Client] = None
         self._admin_client: Optional[Client] = None
 
     @property
     def client(self) -> Client:
-        """Get the Supabase client (anon key)."""
+        """Get the shared Supabase client (anon key) for stateless auth calls."""
         if self._client is None:
             self._client = get_supabase_client()
         return self._client
 
+    @property
+    def oauth_client(self) -> Client:
+        """Get a dedicated Supabase client for OAuth flows.
+
+        Code exchange signs the client in, so it must never be the shared client.
+        """
+        if self._oauth_client is None:
+            self._oauth_client = get_supabase_auth_client()
+        return self._oauth_client
+
     @property
     def admin_client(self) -> Client:
         """Get the Supabase admin client (service role key)."""
@@ -52,7 +78,7 @@ class AuthService:
             callback_url = redirect_url or f"http://localhost:{settings.port}/v1/auth/callback"
 
             # Use SDK's sign_in_with_oauth which handles PKCE automatically
-            response = self.client.auth.sign_in_with_oauth(
+            response = self.oauth_client.auth.sign_in_with_oauth(
                 {
                     "provider": "google",
                     "options": {
@@ -91,7 +117,9 @@ class AuthService:
         """
         try:
             # Use SDK's exchange_code_for_session (handles PKCE verification)
-            response = self.client.auth.exchange_code_for_session({"auth_code": code})
+            response = await run_sync(
+                self.oauth_client.auth.exchange_code_for_session, {"auth_code": code}
+            )
 
             if not response.session:
                 raise AuthenticationError(
@@ -136,30 +164,65 @@ class AuthService:
         """
         try:
             # Check if profile exists
-            result = (
+            result = await execute(
                 self.admin_client.table("profiles")
                 .select("id")
                 .eq("id", user.id)
-                .execute()
             )
 
             if not result.data:
                 # Create profile
-                self.admin_client.table("profiles").insert(
-                    {
-                        "id": user.id,
-                        "email": user.email,
-                        "full_name": user.user_metadata.get("full_name")
-                        or user.user_metadata.get("name")
-                        or "",
-                    }
-                ).execute()
+                await execute(
+                    self.admin_client.table("profiles").insert(
+                        {
+                            "id": user.id,
+                            "email": user.email,
+                            "full_name": user.user_metadata.get("full_name")
+                            or user.user_metadata.get("name")
+                            or "",
+                        }
+                    )
+                )
 
         except Exception as e:
             # Log error but don't fail - trigger should have created the profile
             logger.warning(f"Profile creation fallback failed: {e}")
             pass
 
+    async def _authenticate(self, token: str) -> Dict[str, Any]:
+        """Resolve the user behind an access token.
+
+        Tokens are verified locally (signature, expiry, audience) when
+        possible; otherwise Supabase Auth is asked. Tokens revoked by
+        logout are rejected either way.
+
+        Args:
+            token: The JWT access token.
+
+        Returns:
+            Dict with the user's id and email.
+
+        Raises:
+            InvalidTokenError: If the token is invalid, expired or revoked.
+        """
+        claims = None
+        if settings.auth_local_jwt_verification:
+            claims = await get_token_verifier().verify(token)
+
+        if claims is not None:
+            user_id, email = claims["sub"], claims.get("email")
+        else:
+            response = await run_sync(self.client.auth.get_user, token)
+            if not response or not response.user:
+                raise InvalidTokenError()
+            user_id, email = response.user.id, response.user.email
+            claims = unverified_claims(token)
+
+        if token_denylist.is_revoked(user_id, claims.get("iat")):
+            raise InvalidTokenError(message="Token has been revoked")
+
+        return {"id": user_id, "email": email}
+
     async def logout(self, access_token: str) -> bool:
         """Invalidate the user's session.
 
@@ -173,15 +236,17 @@ class AuthService:
             InvalidTokenError: If the token cannot be invalidated.
         """
         try:
-            # First get the user from the token to get their user_id
-            response = self.client.auth.get_user(access_token)
+            identity = await self._authenticate(access_token)
 
-            if not response.user:
-                raise InvalidTokenError(message="Cannot invalidate session: invalid token")
+            # Reject this user's outstanding tokens locally right away; locally
+            # verified tokens would otherwise stay valid until they expire.
+            # The denylist is per process: other workers that verify these
+            # tokens locally still accept them until they expire.
+            token_denylist.revoke_user(identity["id"])
 
             # Use admin client to sign out the user (invalidates all sessions)
             # This properly invalidates the session server-side
-            self.admin_client.auth.admin.sign_out(response.user.id)
+            await run_sync(self.admin_client.auth.admin.sign_out, access_token)
             return True
         except InvalidTokenError:
             raise
@@ -194,6 +259,9 @@ class AuthService:
     async def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify a JWT access token and return user data.
 
+        The token itself is checked locally against cached signing keys when
+        possible (see app.core.tokens); only the profile read hits the database.
+
         Args:
             token: The JWT access token.
 
@@ -204,28 +272,14 @@ class AuthService:
             InvalidTokenError: If the token is invalid or expired.
         """
         try:
-            # Get user from token
-            response = self.client.auth.get_user(token)
-
-            if not response.user:
-                raise InvalidTokenError()
-
-            user = response.user
+            user = await self._authenticate(token)
 
-            # Get profile data
-            profile_result = (
-                self.admin_client.table("profiles")
-                .select("*")
-                .eq("id", user.id)
-                .single()
-                .execute()
-            )
-
-            profile = profile_result.data if profile_result.data else {}
+            # Get profile data (cached for the rest of the request)
+            profile = await get_cached_profile(user["id"]) or {}
 
             return {
-                "id": user.id,
-                "email": user.email,
+                "id": user["id"],
+                "email": user["email"] or profile.get("email"),
                 "full_name": profile.get("full_name"),
                 "subscription_tier": profile.get("subscription_tier", "free"),
                 "subscription_status": profile.get("subscription_status", "active"),
@@ -252,21 +306,12 @@ class AuthService:
             NotFoundError: If the profile is not found.
         """
         try:
-            result = (
-                self.admin_client.table("profiles")
-                .select(
-                    "id, email, full_name, subscription_tier, subscription_status, "
-                    "active_resume_id, preferred_ai_provider, created_at"
-                )
-                .eq("id", user_id)
-                .single()
-                .execute()
-            )
+            profile = await get_cached_profile(user_id)
 
-            if not result.data:
+            if not profile:
                 raise NotFoundError(message="Profile not found")
 
-            return result.data
+            return {field: profile.get(field) for field in PROFILE_FIELDS}
 
         except NotFoundError:
             raise
@@ -299,7 +344,8 @@ class AuthService:
         """
         try:
             # Delete the Supabase auth user - CASCADE handles the rest
-            self.admin_client.auth.admin.delete_user(user_id)
+            await run_sync(self.admin_client.auth.admin.delete_user, user_id)
+            invalidate_profile(user_id)
 
             # Log deletion event with hashed identifier for audit (truncated for privacy)
             user_id_hash = hashlib.sha256(user_id.encode()).hexdigest()[:8]
@@ -8,6 +8,8 @@ from uuid import UUID
 
 from app.core.exceptions import ApiException, ErrorCode
 from app.db.client import get_supabase_admin_client, get_supabase_client
+from app.db.executor import execute, run_sync
+from app.db.profile_cache import get_cached_profile
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +51,7 @@ def _split_full_name(full_name: str) -> Tuple[str, str]:
     return (first_name, last_name)
 
 
-def _generate_signed_url(file_path: str) -> str:
+async def _generate_signed_url(file_path: str) -> str:
     """Generate a signed URL for resume download (1 hour expiry).
 
     Args:
@@ -63,7 +65,8 @@ def _generate_signed_url(file_path: str) -> str:
     """
     try:
         admin_client = get_supabase_admin_client()
-        result = admin_client.storage.from_("resumes").create_signed_url(
+        result = await run_sync(
+            admin_client.storage.from_("resumes").create_signed_url,
             path=file_path,
             expires_in=3600,  # 1 hour
         )
@@ -102,27 +105,18 @@ class AutofillService:
 
         try:
             # Get profile
-            profile_result = (
-                self.client.table("profiles")
-                .select("*")
-                .eq("id", str(user_id))
-                .single()
-                .execute()
-            )
-
-            profile = profile_result.data
+            profile = await get_cached_profile(str(user_id)) or {}
 
             # Get active resume if exists
             resume = None
             active_resume_id = profile.get("active_resume_id")
             if active_resume_id:
                 try:
-                    resume_result = (
+                    resume_result = await execute(
                         self.client.table("resumes")
                         .select("*")
                         .eq("id", active_resume_id)
                         .single()
-                        .execute()
                     )
                     resume = resume_result.data if resume_result.data else None
                 except Exception:
@@ -136,7 +130,7 @@ class AutofillService:
             resume_data = None
             if resume:
                 try:
-                    resume_data = self._build_resume_data(resume)
+                    resume_data = await self._build_resume_data(resume)
                 except Exception as e:
                     logger.error(
                         f"Failed to build resume data - user: {user_hash}..., "
@@ -210,7 +204,7 @@ class AutofillService:
             "portfolio_url": None,  # Not in current schema
         }
 
-    def _build_resume_data(self, resume: dict) -> dict:
+    async def _build_resume_data(self, resume: dict) -> dict:
         """Build resume data object with signed download URL.
 
         Args:
@@ -221,7 +215,7 @@ class AutofillService:
         """
         # Generate signed URL for resume download
         file_path = resume.get("file_path", "")
-        download_url = _generate_signed_url(file_path) if file_path else None
+        download_url = await _generate_signed_url(file_path) if file_path else None
 
         # Extract summary (first 200 chars if exists)
         parsed_data = resume.get("parsed_data") or {}
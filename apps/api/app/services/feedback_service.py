@@ -4,6 +4,7 @@ import logging
 from typing import Any, Dict, Optional
 
 from app.db.client import get_supabase_admin_client
+from app.db.executor import execute
 
 logger = logging.getLogger(__name__)
 
@@ -85,10 +86,9 @@ class FeedbackService:
             feedback_data["context"] = safe_context
 
         # Insert feedback
-        response = (
+        response = await execute(
             self.admin_client.table("feedback")
             .insert(feedback_data)
-            .execute()
         )
 
         if not response.data:
@@ -0,0 +1,131 @@
+"""Credit-aware event stream shared by the streaming generation endpoints."""
+
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.core.exceptions import AIProviderUnavailableError
+from app.services.ai.engine import ProviderStream
+from app.services.usage_service import UsageService
+
+logger = logging.getLogger(__name__)
+
+
+class ReservedStream:
+    """Relay a provider stream as events and settle the credit reservation.
+
+    Events, in order:
+    - start: {"ai_provider_used"}
+    - delta: {"text"} for each chunk
+    - done: {"content", "ai_provider_used", "tokens_used"} after the
+      reservation is committed
+    - error: {"code", "message"} if the provider fails mid-stream
+
+    The reservation is committed only when the stream completes; a provider
+    failure or a client disconnect releases it. The reservation and the
+    provider stream are already open when this object is created, so the
+    response must call aclose() when it is done with it, whether or not it
+    ever iterated the events.
+    """
+
+    def __init__(
+        self,
+        usage_service: UsageService,
+        reservation_id: str,
+        stream: ProviderStream,
+        operation: str,
+    ):
+        """Wrap an open provider stream and its reservation.
+
+        Args:
+            usage_service: Usage service holding the reservation.
+            reservation_id: Reservation taken before the stream was opened.
+            stream: Open provider stream.
+            operation: Operation name for logs.
+        """
+        self._usage_service = usage_service
+        self._reservation_id = reservation_id
+        self._stream = stream
+        self._operation = operation
+        self._events: Optional[AsyncIterator[Dict[str, Any]]] = None
+        self._started = False
+
+    def __aiter__(self) -> "ReservedStream":
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self._events is None:
+            self._events = self._relay()
+        return await self._events.__anext__()
+
+    async def aclose(self) -> None:
+        """Stop relaying and release the reservation if it was not settled.
+
+        Safe to call more than once, and after the stream completed.
+        """
+        if self._events is not None:
+            await self._events.aclose()
+        if not self._started:
+            # Never iterated (e.g. the client went away before the body started)
+            self._started = True
+            logger.info(f"{self._operation} stream never started, releasing credits")
+            await self._stream.aclose()
+            await self._usage_service.release_reservation(self._reservation_id)
+
+    async def _relay(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the events, settling the reservation exactly once."""
+        self._started = True
+        stream = self._stream
+        settled = False
+        parts = []
+        try:
+            yield {"event": "start", "data": {"ai_provider_used": stream.provider}}
+            try:
+                async for delta in stream:
+                    parts.append(delta)
+                    yield {"event": "delta", "data": {"text": delta}}
+            except Exception as e:
+                logger.error(f"{self._operation} stream from {stream.provider} failed: {e}")
+                settled = True
+                await self._usage_service.release_reservation(self._reservation_id)
+                error = AIProviderUnavailableError()
+                yield {"event": "error", "data": {"code": error.code, "message": error.message}}
+                return
+
+            content = "".join(parts).strip()
+            settled = True
+            await self._usage_service.commit_reservation(
+                self._reservation_id, ai_provider=stream.provider, usage=stream.usage
+            )
+            yield {
+                "event": "done",
+                "data": {
+                    "content": content,
+                    "ai_provider_used": stream.provider,
+                    "tokens_used": stream.usage.output_tokens or len(content) // 4,
+                },
+            }
+        finally:
+            if not settled:
+                # Client went away before the stream finished
+                logger.info(f"{self._operation} stream abandoned, releasing credits")
+                await self._usage_service.release_reservation(self._reservation_id)
+
+
+def stream_with_reservation(
+    usage_service: UsageService,
+    reservation_id: str,
+    stream: ProviderStream,
+    operation: str,
+) -> ReservedStream:
+    """Wrap an open provider stream and its reservation as an event stream.
+
+    Args:
+        usage_service: Usage service holding the reservation.
+        reservation_id: Reservation taken before the stream was opened.
+        stream: Open provider stream.
+        operation: Operation name for logs.
+
+    Returns:
+        ReservedStream yielding event dictionaries with "event" and "data" keys.
+    """
+    return ReservedStream(usage_service, reservation_id, stream, operation)
@@ -1,10 +1,15 @@
 """Job service for CRUD operations on scanned jobs."""
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+from app.core.config import settings
 from app.core.exceptions import DatabaseError
-from app.db.client import get_supabase_client
+from app.db.client import get_supabase_client, get_supabase_user_client
+from app.db.executor import execute
+from app.services.job_text import description_fields
+from app.services.quick_match import rank_jobs
+from app.services.skills import normalize_skills
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +20,16 @@ UUID_LOG_LENGTH = 8  # Number of characters to show in logs for privacy
 class JobService:
     """Service for managing job records."""
 
-    def __init__(self):
-        """Initialize job service."""
-        self.client = get_supabase_client()
+    def __init__(self, access_token: Optional[str] = None):
+        """Initialize job service.
+
+        Args:
+            access_token: Optional user JWT. When given, queries run in a
+                request-scoped RLS session; otherwise the shared anon client is used.
+        """
+        self.client: Any = (
+            get_supabase_user_client(access_token) if access_token else get_supabase_client()
+        )
 
     async def create_job(self, user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new job record.
@@ -43,9 +55,11 @@ class JobService:
                 "employment_type": job_data.get("employment_type"),
                 "source_url": job_data.get("source_url"),
                 "status": job_data.get("status", "saved"),  # Default to "saved" if not provided
+                # Boilerplate-free description and token estimate used by AI prompts
+                **description_fields(job_data["description"]),
             }
 
-            response = self.client.table("jobs").insert(insert_data).execute()
+            response = await execute(self.client.table("jobs").insert(insert_data))
 
             job = response.data[0]
             logger.info(f"Job created - user: {user_id[:UUID_LOG_LENGTH]}..., job_id: {job['id'][:UUID_LOG_LENGTH]}..., status: {insert_data['status']}")
@@ -69,12 +83,11 @@ class JobService:
             Exception: If database query fails.
         """
         try:
-            response = (
+            response = await execute(
                 self.client.table("jobs")
                 .select("*")
                 .eq("id", job_id)
                 .maybe_single()
-                .execute()
             )
 
             if not response or not response.data:
@@ -86,6 +99,33 @@ class JobService:
             logger.error(f"Failed to get job {job_id[:UUID_LOG_LENGTH]}... for user {user_id[:UUID_LOG_LENGTH]}...: {e}")
             raise DatabaseError("Failed to retrieve job. Please try again.")
 
+    async def get_jobs(self, user_id: str, job_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get several jobs by ID in one query.
+
+        Args:
+            user_id: User's UUID (for logging only; RLS enforces access).
+            job_ids: Job UUIDs.
+
+        Returns:
+            The jobs found, in no particular order (IDs not found or denied
+            by RLS are missing).
+
+        Raises:
+            Exception: If database query fails.
+        """
+        if not job_ids:
+            return []
+        try:
+            response = await execute(self.client.table("jobs").select("*").in_("id", job_ids))
+            jobs = response.data or []
+            logger.info(
+                f"Jobs retrieved - user: {user_id[:UUID_LOG_LENGTH]}..., requested: {len(job_ids)}, found: {len(jobs)}"
+            )
+            return jobs
+        except Exception as e:
+            logger.error(f"Failed to get jobs for user {user_id[:UUID_LOG_LENGTH]}...: {e}")
+            raise DatabaseError("Failed to retrieve jobs. Please try again.")
+
     async def update_job(
         self, user_id: str, job_id: str, updates: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
@@ -104,12 +144,11 @@ class JobService:
         """
         try:
             # Verify job exists and belongs to user (RLS auto-filters)
-            existing = (
+            existing = await execute(
                 self.client.table("jobs")
                 .select("*")
                 .eq("id", job_id)
                 .maybe_single()
-                .execute()
             )
 
             if not existing or not existing.data:
@@ -117,17 +156,18 @@ class JobService:
 
             # Filter out None values for partial update
             update_data = {k: v for k, v in updates.items() if v is not None}
+            if "description" in update_data:
+                update_data.update(description_fields(update_data["description"]))
 
             if not update_data:
                 # Nothing to update, return existing job (reuse from above)
                 return existing.data
 
             # Perform update (RLS ensures only owner can update)
-            result = (
+            result = await execute(
                 self.client.table("jobs")
                 .update(update_data)
                 .eq("id", job_id)
-                .execute()
             )
 
             if not result.data:
@@ -146,9 +186,17 @@ class JobService:
     ) -> Dict[str, Any]:
         """List jobs with pagination and filtering.
 
+        sort="match" with filters["resume_data"] (parsed resume data) ranks
+        the `quick_match_rank_max_jobs` most recently updated jobs by their
+        local match estimate (see app/services/quick_match.py) and pages
+        through that ranking; each item then carries its match_score. The
+        returned total is capped at that window, since older jobs are never
+        ranked.
+
         Args:
             user_id: User's UUID (for logging only; RLS enforces access).
-            filters: Dictionary with status, page, page_size, sort options.
+            filters: Dictionary with status, skills, page, page_size, sort
+                options (and resume_data when sorting by match).
 
         Returns:
             Paginated list of jobs with total count.
@@ -161,6 +209,8 @@ class JobService:
             page_size = filters.get("page_size", 20)
             sort_field = filters.get("sort", "updated_at")
             status_filter = filters.get("status")
+            skills_filter = filters.get("skills")
+            resume_data = filters.get("resume_data") if sort_field == "match" else None
 
             # Build query with count (RLS auto-filters by user_id)
             # NOTE: count="exact" triggers full table scan - for 10K+ jobs, use count="planned"
@@ -170,20 +220,34 @@ class JobService:
             if status_filter:
                 query = query.eq("status", status_filter)
 
-            # Apply sorting (descending by default for updated_at)
-            query = query.order(sort_field, desc=True)
+            # Jobs mentioning any of the skills (GIN-indexed array overlap)
+            if skills_filter:
+                query = query.overlaps("skills", normalize_skills(skills_filter))
 
-            # Apply pagination
             start = (page - 1) * page_size
-            end = start + page_size - 1
-            query = query.range(start, end)
-
-            # Execute query
-            result = query.execute()
+            if resume_data is not None:
+                # Rank recent jobs locally, then paginate the ranking
+                query = query.order("updated_at", desc=True).range(0, settings.quick_match_rank_max_jobs - 1)
+                result = await execute(query)
+                rows = rank_jobs(resume_data, result.data)[start : start + page_size]
+                # Only the ranked window can be paged through
+                total = len(result.data)
+            else:
+                # Apply sorting (descending by default for updated_at)
+                query = query.order(sort_field, desc=True)
+
+                # Apply pagination
+                end = start + page_size - 1
+                query = query.range(start, end)
+
+                # Execute query
+                result = await execute(query)
+                rows = result.data
+                total = result.count or 0
 
             # Build response items with notes_preview
             items = []
-            for job in result.data:
+            for job in rows:
                 notes = job.get("notes") or ""
                 notes_preview = notes[:100] if notes else None
 
@@ -193,17 +257,18 @@ class JobService:
                     "company": job["company"],
                     "status": job["status"],
                     "notes_preview": notes_preview,
+                    "match_score": job.get("match_score"),
                     "created_at": job["created_at"],
                     "updated_at": job["updated_at"],
                 })
 
             logger.info(
-                f"Jobs listed - user: {user_id[:UUID_LOG_LENGTH]}..., count: {len(items)}, total: {result.count}"
+                f"Jobs listed - user: {user_id[:UUID_LOG_LENGTH]}..., count: {len(items)}, total: {total}"
             )
 
             return {
                 "items": items,
-                "total": result.count or 0,
+                "total": total,
                 "page": page,
                 "page_size": page_size,
             }
@@ -255,7 +320,7 @@ class JobService:
                 return False
 
             # Delete the job (RLS ensures only owner can delete)
-            self.client.table("jobs").delete().eq("id", job_id).execute()
+            await execute(self.client.table("jobs").delete().eq("id", job_id))
 
             logger.info(f"Job deleted - job_id: {job_id[:UUID_LOG_LENGTH]}...")
             return True
@@ -0,0 +1,289 @@
+"""Job description preprocessing for AI prompts.
+
+Scraped job descriptions carry a lot that never helps a match or a cover
+letter: runs of whitespace, EEO and accommodation statements, benefits lists,
+privacy notices. clean_job_description() removes those once, when a job is
+saved (JobService stores the result in jobs.clean_description with its
+token estimate in jobs.description_tokens), and truncate_to_budget() fits
+what is left into a token budget by dropping the least useful sections
+first (requirements and responsibilities are kept longest, company blurbs
+go first).
+
+Every generation operation uses the same budget by default, so the job
+description in the shared prompt prefix (see prompts.ChatPrompt) is
+byte-identical across match, cover letter, answer and outreach.
+"""
+
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.skills import extract_skills
+
+logger = logging.getLogger(__name__)
+
+# Characters per token, the same rough estimate used for tokens_used elsewhere
+CHARS_PER_TOKEN = 4
+
+# Sections dropped entirely, matched against the start of a heading
+_BOILERPLATE_HEADING = re.compile(
+    r"(equal (employment )?opportunit|eeo\b|diversity|inclusion|accommodation|disabilit"
+    r"|(our |the )?benefits|perks|what we offer|why you'll love|privacy|e-verify"
+    r"|pay transparency|recruitment (fraud|scam))",
+    re.IGNORECASE,
+)
+# Paragraphs dropped wherever they appear (these statements often have no heading)
+_BOILERPLATE_PARAGRAPH = re.compile(
+    r"equal (employment )?opportunity employer|without regard to (race|color|religion|sex|age)"
+    r"|reasonable accommodation|participates in e-verify|affirmative action"
+    r"|we (do not|don't) discriminate|applicant privacy",
+    re.IGNORECASE,
+)
+
+# Section priority for truncation: lower is kept longer
+_PRIORITY_PATTERNS = [
+    (0, re.compile(
+        r"requirement|qualification|must have|what you('ll)? (need|bring)|skills|experience"
+        r"|responsibilit|what you('ll)? do|duties|the role|about the (role|job|position)",
+        re.IGNORECASE,
+    )),
+    (1, re.compile(r"preferred|nice to have|bonus|plus", re.IGNORECASE)),
+]
+_INTRO_PRIORITY = 1
+_OTHER_PRIORITY = 2
+
+_HEADING_MAX_CHARS = 60
+_SPACES = re.compile(r"[ \t\f\v]+")
+
+
+@dataclass
+class _Section:
+    """A heading (None for the text before the first heading) and its lines."""
+
+    heading: Optional[str]
+    lines: List[str] = field(default_factory=list)
+
+    def render(self) -> str:
+        body = "\n".join(self.lines).strip()
+        return "\n".join(part for part in (self.heading, body) if part)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text.
+
+    Args:
+        text: Any text.
+
+    Returns:
+        Approximate token count (characters / 4).
+    """
+    return len(text) // CHARS_PER_TOKEN
+
+
+def _heading_text(line: str) -> str:
+    """A line with markdown heading/bold markers and trailing colon removed."""
+    return line.strip("#*_ ").rstrip(":").strip()
+
+
+def _is_heading(line: str) -> bool:
+    """Whether a (whitespace-normalized) line is a marked section heading.
+
+    Only explicitly marked lines count: a trailing colon, a markdown "#",
+    **bold**, or ALL CAPS. Unmarked lines are content, even when they start
+    with a section word ("Experience with AWS").
+    """
+    if not line or len(line) > _HEADING_MAX_CHARS or line.startswith(("-", "•", "* ")):
+        return False
+    text = _heading_text(line)
+    if not text or text.endswith((".", "!", "?", ",")):
+        return False
+    if line.endswith(":") or line.startswith("#") or (line.startswith("**") and line.endswith("**")):
+        return True
+    return text.isupper() and any(c.isalpha() for c in text)
+
+
+def _normalize_lines(text: str) -> List[str]:
+    """Unicode-normalize, collapse spaces and squeeze blank lines."""
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+    lines: List[str] = []
+    for raw in text.split("\n"):
+        line = _SPACES.sub(" ", raw).strip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _split_sections(lines: List[str]) -> List[_Section]:
+    """Group lines under the headings that precede them."""
+    sections = [_Section(heading=None)]
+    for line in lines:
+        if _is_heading(line):
+            sections.append(_Section(heading=line))
+        else:
+            sections[-1].lines.append(line)
+    return [s for s in sections if s.heading or any(s.lines)]
+
+
+def _drop_boilerplate_paragraphs(lines: List[str], seen: set) -> List[str]:
+    """Remove boilerplate and repeated paragraphs from a section body."""
+    kept: List[str] = []
+    paragraph: List[str] = []
+
+    def flush() -> None:
+        text = "\n".join(paragraph)
+        if paragraph and not _BOILERPLATE_PARAGRAPH.search(text) and text not in seen:
+            seen.add(text)
+            if kept:
+                kept.append("")
+            kept.extend(paragraph)
+        paragraph.clear()
+
+    for line in lines:
+        if line:
+            paragraph.append(line)
+        else:
+            flush()
+    flush()
+    return kept
+
+
+def clean_job_description(text: str) -> str:
+    """Normalize a job description and strip boilerplate sections.
+
+    Args:
+        text: Raw job description.
+
+    Returns:
+        Cleaned description. If cleaning would remove everything, the
+        whitespace-normalized original is returned instead.
+    """
+    lines = _normalize_lines(text or "")
+    seen: set = set()
+    cleaned: List[str] = []
+    for index, section in enumerate(_split_sections(lines)):
+        # The first line is usually the job title ("BENEFITS ANALYST"), never boilerplate
+        is_title = index == 0 and section.heading == lines[0]
+        if section.heading and not is_title and _BOILERPLATE_HEADING.match(_heading_text(section.heading)):
+            continue
+        had_body = any(section.lines)
+        section.lines = _drop_boilerplate_paragraphs(section.lines, seen)
+        if section.lines or (section.heading and not had_body):
+            cleaned.append(section.render())
+    return "\n\n".join(cleaned) or "\n".join(lines)
+
+
+def description_fields(description: str) -> Dict[str, Any]:
+    """Derived columns stored with a job whenever its description is written.
+
+    Args:
+        description: Raw job description.
+
+    Returns:
+        {"clean_description", "description_tokens", "skills"} for the jobs
+        row (skills are canonical names, see app/services/skills.py).
+    """
+    clean = clean_job_description(description)
+    return {
+        "clean_description": clean,
+        "description_tokens": estimate_tokens(clean),
+        "skills": extract_skills(clean),
+    }
+
+
+def _priority(section: _Section) -> int:
+    """Truncation priority of a section (lower is kept longer)."""
+    if section.heading is None:
+        return _INTRO_PRIORITY
+    heading = _heading_text(section.heading)
+    for priority, pattern in _PRIORITY_PATTERNS:
+        if pattern.search(heading):
+            return priority
+    return _OTHER_PRIORITY
+
+
+def truncate_to_budget(text: str, max_tokens: int) -> str:
+    """Fit a (cleaned) description into a token budget, by section priority.
+
+    Whole sections are kept in priority order (requirements and
+    responsibilities first, then the intro and nice-to-haves, then
+    everything else) while they fit; the first one that does not fit is cut
+    at a line boundary. Kept sections stay in their original order.
+
+    Args:
+        text: Job description, ideally already cleaned.
+        max_tokens: Token budget.
+
+    Returns:
+        Text within the budget (unchanged if it already fits).
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sections = _split_sections(text.split("\n"))
+    remaining = max_tokens * CHARS_PER_TOKEN
+    kept: Dict[int, str] = {}
+    for index in sorted(range(len(sections)), key=lambda i: (_priority(sections[i]), i)):
+        rendered = sections[index].render()
+        cost = len(rendered) + 2  # section separator
+        if cost <= remaining:
+            kept[index] = rendered
+            remaining -= cost
+            continue
+
+        partial: List[str] = []
+        for line in rendered.split("\n"):
+            if len(line) + 1 > remaining:
+                break
+            partial.append(line)
+            remaining -= len(line) + 1
+        if partial and (sections[index].heading is None or len(partial) > 1):
+            kept[index] = "\n".join(partial).rstrip()
+        break
+
+    if not kept:
+        # A single huge paragraph: hard cut at a word boundary
+        return text[: max_tokens * CHARS_PER_TOKEN].rsplit(" ", 1)[0]
+    return "\n\n".join(kept[i] for i in sorted(kept))
+
+
+def token_budget(operation: str) -> int:
+    """Job description token budget for an operation.
+
+    Args:
+        operation: Operation name (match, cover_letter, answer, outreach).
+
+    Returns:
+        The operation's JOB_DESCRIPTION_TOKEN_BUDGETS entry, else the shared
+        JOB_DESCRIPTION_TOKEN_BUDGET.
+    """
+    return settings.job_description_token_budgets.get(operation, settings.job_description_token_budget)
+
+
+def prepare_job_description(job: Dict[str, Any], operation: str) -> str:
+    """The job description text to send to the AI for an operation.
+
+    Uses the clean_description stored when the job was saved (cleaning the
+    raw description for jobs saved before it existed) and truncates it to
+    the operation's token budget.
+
+    Args:
+        job: Job record.
+        operation: Operation name (match, cover_letter, answer, outreach).
+
+    Returns:
+        Prompt-ready description, or "" if the job has none.
+    """
+    text = job.get("clean_description") or clean_job_description(job.get("description") or "")
+    budget = token_budget(operation)
+    truncated = truncate_to_budget(text, budget)
+    if truncated != text:
+        logger.info(
+            f"Truncated job description for {operation}: "
+            f"{estimate_tokens(text)} -> {estimate_tokens(truncated)} tokens (budget {budget})"
+        )
+    return truncated.strip()
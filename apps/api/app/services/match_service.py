@@ -1,19 +1,30 @@
 """Match analysis service for AI-powered resume-job matching."""
 
+import asyncio
 import hashlib
 import logging
-from typing import Any, Dict, Optional
+import time
+from collections import Counter
+from dataclasses import asdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from app.core.config import settings
 from app.core.exceptions import (
     AIProviderUnavailableError,
-    CreditExhaustedError,
+    ApiException,
     JobNotFoundError,
     ResumeNotFoundError,
     ValidationError,
 )
 from app.db.client import get_supabase_admin_client
+from app.db.match_cache import get_cached_match, match_cache_key, store_match
+from app.db.profile_cache import get_cached_profile
 from app.services.ai.factory import AIProviderFactory
+from app.services.ai.prompts import ResumeInput
+from app.services.ai.provider import TokenUsage
 from app.services.job_service import JobService
+from app.services.job_text import prepare_job_description
+from app.services.quick_match import quick_match
 from app.services.resume_service import ResumeService
 from app.services.usage_service import UsageService
 
@@ -34,6 +45,17 @@ def _hash_id(id_value: str) -> str:
     return hashlib.sha256(id_value.encode()).hexdigest()[:UUID_LOG_LENGTH]
 
 
+def _match_result(analysis: Dict[str, Any], provider_used: str) -> Dict[str, Any]:
+    """Shape a provider's analysis as the cached and returned result."""
+    return {
+        "match_score": analysis["match_score"],
+        "strengths": analysis["strengths"],
+        "gaps": analysis["gaps"],
+        "recommendations": analysis["recommendations"],
+        "ai_provider_used": provider_used,
+    }
+
+
 class MatchService:
     """Service for generating AI match analysis between resumes and jobs."""
 
@@ -57,61 +79,38 @@ class MatchService:
             Exception: Re-raised as-is for database connection errors.
         """
         try:
-            response = (
-                self.admin_client.table("profiles")
-                .select("active_resume_id, preferred_ai_provider")
-                .eq("id", user_id)
-                .maybe_single()
-                .execute()
-            )
-            return response.data if response and response.data else {}
+            return await get_cached_profile(user_id) or {}
         except Exception as e:
             logger.error(f"Database error fetching user profile: {e}")
             raise  # Re-raise to be handled by exception handler
 
-    async def generate_match_analysis(
-        self,
-        user_id: str,
-        job_id: str,
-        resume_id: Optional[str] = None,
-        ai_provider: Optional[str] = None,
-    ) -> Dict[str, Any]:
-        """Generate AI match analysis between a resume and job.
+    async def _fetch_resume(
+        self, user_id: str, resume_id: Optional[str]
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Fetch and validate the resume to analyze.
 
         Args:
             user_id: User's UUID.
-            job_id: Job's UUID.
             resume_id: Optional resume UUID (uses active resume if not provided).
-            ai_provider: Optional AI provider override ("claude" or "gpt").
 
         Returns:
-            Match analysis dictionary with match_score, strengths, gaps,
-            recommendations, and ai_provider_used.
+            Tuple of (resume record with parsed data, user AI preference).
 
         Raises:
-            CreditExhaustedError: If user has no credits.
-            ValidationError: If no resume selected.
+            ValidationError: If no resume selected or resume unparsed.
             ResumeNotFoundError: If resume not found or belongs to another user.
-            JobNotFoundError: If job not found or belongs to another user.
-            AIProviderUnavailableError: If both AI providers fail.
         """
-        # Step 1: Check credits FIRST
-        has_credits = await self.usage_service.check_credits(user_id)
-        if not has_credits:
-            logger.warning(f"User {_hash_id(user_id)}... has no credits for match analysis")
-            raise CreditExhaustedError()
-
-        # Step 2: Get user profile for active resume and AI preference
+        # Get user profile for active resume and AI preference
         profile = await self._get_user_profile(user_id)
         user_preference = profile.get("preferred_ai_provider")
 
-        # Step 3: Resolve resume ID
+        # Resolve resume ID
         effective_resume_id = resume_id or profile.get("active_resume_id")
         if not effective_resume_id:
             logger.warning(f"User {_hash_id(user_id)}... has no resume selected")
             raise ValidationError("No resume selected. Upload or select a resume first.")
 
-        # Step 4: Validate and fetch resume
+        # Validate and fetch resume
         resume = await self.resume_service.get_resume(user_id, effective_resume_id)
         if not resume:
             logger.warning(
@@ -127,7 +126,53 @@ class MatchService:
             )
             raise ValidationError("Resume has not been parsed. Please re-upload your resume.")
 
-        # Step 5: Validate and fetch job
+        return resume, user_preference
+
+    async def _load_resume(
+        self, user_id: str, resume_id: Optional[str]
+    ) -> Tuple[ResumeInput, Optional[str]]:
+        """Load and validate the resume to analyze.
+
+        Args:
+            user_id: User's UUID.
+            resume_id: Optional resume UUID (uses active resume if not provided).
+
+        Returns:
+            Tuple of (resume prompt digest or parsed data, user AI preference).
+
+        Raises:
+            ValidationError: If no resume selected or resume unparsed.
+            ResumeNotFoundError: If resume not found or belongs to another user.
+        """
+        resume, user_preference = await self._fetch_resume(user_id, resume_id)
+        # Prompts use the digest stored at upload; older rows are digested on the fly
+        return resume.get("prompt_digest") or resume["parsed_data"], user_preference
+
+    async def _load_inputs(
+        self,
+        user_id: str,
+        job_id: str,
+        resume_id: Optional[str],
+    ) -> Tuple[ResumeInput, str, Optional[str]]:
+        """Load and validate the resume data and job description to analyze.
+
+        Args:
+            user_id: User's UUID.
+            job_id: Job's UUID.
+            resume_id: Optional resume UUID (uses active resume if not provided).
+
+        Returns:
+            Tuple of (resume prompt digest or parsed data, job description, user AI preference).
+
+        Raises:
+            ValidationError: If no resume selected, resume unparsed, or job
+                description missing.
+            ResumeNotFoundError: If resume not found or belongs to another user.
+            JobNotFoundError: If job not found or belongs to another user.
+        """
+        resume_data, user_preference = await self._load_resume(user_id, resume_id)
+
+        # Validate and fetch job
         job = await self.job_service.get_job(user_id, job_id)
         if not job:
             logger.warning(
@@ -135,52 +180,425 @@ class MatchService:
             )
             raise JobNotFoundError()
 
-        job_description = job.get("description", "").strip()
+        # Cleaned description, trimmed to the job description token budget
+        job_description = prepare_job_description(job, "match")
         if not job_description:
             logger.warning(f"Job {_hash_id(job_id)} has no description")
             raise ValidationError("Job has no description to analyze.")
 
-        # Validate job description length (max 10,000 chars to avoid AI API limits)
-        max_description_length = 10000
-        if len(job_description) > max_description_length:
-            logger.warning(
-                f"Job {_hash_id(job_id)} description too long: {len(job_description)} chars"
-            )
-            raise ValidationError(
-                f"Job description too long (max {max_description_length} characters). "
-                "Please shorten the description."
+        return resume_data, job_description, user_preference
+
+    async def _serve_cached(self, user_id: str, cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a cached analysis, charging `match_cache_hit_credits`.
+
+        Args:
+            user_id: User's UUID.
+            cached: Cached analysis.
+
+        Returns:
+            The cached analysis.
+
+        Raises:
+            CreditExhaustedError: If hits are charged and the user has no credits.
+        """
+        credits = settings.match_cache_hit_credits
+        if credits > 0:
+            reservation_id = await self.usage_service.reserve_credits(user_id, "match", credits=credits)
+            await self.usage_service.commit_reservation(
+                reservation_id, ai_provider=cached["ai_provider_used"]
             )
+        logger.info(f"Match analysis cache hit - user: {_hash_id(user_id)}...")
+        return dict(cached)
+
+    async def generate_match_analysis(
+        self,
+        user_id: str,
+        job_id: str,
+        resume_id: Optional[str] = None,
+        ai_provider: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Generate AI match analysis between a resume and job.
+
+        Results are cached by a hash of the resume data, job description,
+        requested provider and prompt version (see app/db/match_cache.py),
+        so repeat analyses of unchanged inputs skip the AI call and cost
+        `match_cache_hit_credits` (free by default).
+
+        Args:
+            user_id: User's UUID.
+            job_id: Job's UUID.
+            resume_id: Optional resume UUID (uses active resume if not provided).
+            ai_provider: Optional AI provider override ("claude" or "gpt").
+
+        Returns:
+            Match analysis dictionary with match_score, strengths, gaps,
+            recommendations, and ai_provider_used.
+
+        Raises:
+            CreditExhaustedError: If user has no credits.
+            ValidationError: If no resume selected.
+            ResumeNotFoundError: If resume not found or belongs to another user.
+            JobNotFoundError: If job not found or belongs to another user.
+            AIProviderUnavailableError: If both AI providers fail.
+        """
+        # Step 1: Load and validate inputs (no credits are held for bad requests)
+        resume_data, job_description, user_preference = await self._load_inputs(
+            user_id, job_id, resume_id
+        )
+        requested_provider = ai_provider or user_preference or "claude"
+
+        # Step 2: Serve unchanged inputs from the result cache
+        cache_key = match_cache_key(resume_data, job_description, requested_provider)
+        cached = await get_cached_match(user_id, cache_key)
+        if cached is not None:
+            return await self._serve_cached(user_id, cached)
 
-        # Step 6: Generate match analysis with AI
+        # Step 3: Reserve credits atomically before the AI call
+        reservation_id = await self.usage_service.reserve_credits(user_id, "match")
         try:
-            logger.info(
-                f"Match analysis - user: {_hash_id(user_id)}..., "
-                f"job: {_hash_id(job_id)}..., "
-                f"provider: {ai_provider or user_preference or 'claude'}"
-            )
-            analysis, provider_used = await AIProviderFactory.match_with_fallback(
-                resume_data=parsed_data,
-                job_description=job_description,
-                preferred_provider=ai_provider,
-                user_preference=user_preference,
+            # Step 4: Generate match analysis with AI
+            usage = TokenUsage()
+            try:
+                logger.info(
+                    f"Match analysis - user: {_hash_id(user_id)}..., "
+                    f"job: {_hash_id(job_id)}..., "
+                    f"provider: {requested_provider}"
+                )
+                analysis, provider_used = await AIProviderFactory.match_with_fallback(
+                    resume_data=resume_data,
+                    job_description=job_description,
+                    preferred_provider=ai_provider,
+                    user_preference=user_preference,
+                    usage=usage,
+                )
+            except ValueError as e:
+                logger.error(f"All AI providers failed for match analysis: {e}")
+                raise AIProviderUnavailableError() from e
+        except BaseException:
+            # AI failure or cancellation: return the credits
+            await self.usage_service.release_reservation(reservation_id)
+            raise
+
+        # Step 5: Commit the reservation AFTER successful AI call
+        await self.usage_service.commit_reservation(reservation_id, ai_provider=provider_used, usage=usage)
+
+        # Step 6: Cache and return analysis with provider info
+        result = _match_result(analysis, provider_used)
+        await store_match(user_id, cache_key, result)
+        return dict(result)
+
+    async def generate_quick_match(
+        self,
+        user_id: str,
+        job_id: str,
+        resume_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Estimate the match score locally, without an AI call or credits.
+
+        See app/services/quick_match.py for how the estimate is computed.
+
+        Args:
+            user_id: User's UUID.
+            job_id: Job's UUID.
+            resume_id: Optional resume UUID (uses active resume if not provided).
+
+        Returns:
+            Dictionary with match_score, matched_skills and missing_terms.
+
+        Raises:
+            ValidationError: If no resume selected, resume unparsed, or job
+                description missing.
+            ResumeNotFoundError: If resume not found or belongs to another user.
+            JobNotFoundError: If job not found or belongs to another user.
+        """
+        resume, _ = await self._fetch_resume(user_id, resume_id)
+
+        job = await self.job_service.get_job(user_id, job_id)
+        if not job:
+            logger.warning(f"Job {_hash_id(job_id)} not found for user {_hash_id(user_id)}...")
+            raise JobNotFoundError()
+        if not (job.get("clean_description") or job.get("description")):
+            logger.warning(f"Job {_hash_id(job_id)} has no description")
+            raise ValidationError("Job has no description to analyze.")
+
+        estimate = quick_match(resume["parsed_data"], job)
+        logger.info(f"Quick match - user: {_hash_id(user_id)}..., score: {estimate.match_score}")
+        return asdict(estimate)
+
+    async def generate_batch_match_analysis(
+        self,
+        user_id: str,
+        job_ids: Optional[List[str]] = None,
+        status: Optional[str] = None,
+        resume_id: Optional[str] = None,
+        ai_provider: Optional[str] = None,
+    ) -> "BatchMatchStream":
+        """Score one resume against many saved jobs, streaming a result per job.
+
+        The resume, profile and jobs are loaded once and credits are reserved
+        once for the whole batch (one per job). Analyses then run with at
+        most `match_batch_concurrency` provider calls in flight and share the
+        cached system+resume prompt prefix; the reservation is committed for
+        the analyses that ran, so failed jobs and free cache hits are not
+        charged.
+
+        Args:
+            user_id: User's UUID.
+            job_ids: Jobs to analyze.
+            status: Analyze the user's jobs with this status instead (most
+                recently updated first, up to `match_batch_max_jobs`).
+            resume_id: Optional resume UUID (uses active resume if not provided).
+            ai_provider: Optional AI provider override ("claude" or "gpt").
+
+        Returns:
+            Async iterator of start/result/error/done events (see BatchMatchStream).
+
+        Raises:
+            ValidationError: If no resume selected, no jobs match, or too many jobs.
+            ResumeNotFoundError: If resume not found or belongs to another user.
+            JobNotFoundError: If none of the jobs exist for this user.
+            CreditExhaustedError: If the user cannot cover the whole batch.
+        """
+        max_jobs = settings.match_batch_max_jobs
+        if job_ids is None:
+            listing = await self.job_service.list_jobs(
+                user_id, {"status": status, "page": 1, "page_size": max_jobs}
             )
-        except ValueError as e:
-            logger.error(f"All AI providers failed for match analysis: {e}")
-            raise AIProviderUnavailableError() from e
+            job_ids = [item["id"] for item in listing["items"]]
+        job_ids = list(dict.fromkeys(job_ids))
+        if not job_ids:
+            raise ValidationError("No jobs to analyze.")
+        if len(job_ids) > max_jobs:
+            raise ValidationError(f"At most {max_jobs} jobs can be analyzed at once.")
 
-        # Step 7: Record usage AFTER successful AI call
-        await self.usage_service.record_usage(
+        resume_data, user_preference = await self._load_resume(user_id, resume_id)
+        jobs = await self.job_service.get_jobs(user_id, job_ids)
+        if not jobs:
+            raise JobNotFoundError()
+        found = {job["id"] for job in jobs}
+        missing = [job_id for job_id in job_ids if job_id not in found]
+
+        # Hold enough for every job to run (or hit the cache) before streaming starts
+        credits = len(jobs) * max(1, settings.match_cache_hit_credits)
+        reservation_id = await self.usage_service.reserve_credits(user_id, "match", credits=credits)
+        logger.info(
+            f"Batch match analysis - user: {_hash_id(user_id)}..., jobs: {len(jobs)}, "
+            f"missing: {len(missing)}, provider: {ai_provider or user_preference or 'claude'}"
+        )
+        return BatchMatchStream(
+            service=self,
             user_id=user_id,
-            operation_type="match",
-            ai_provider=provider_used,
-            credits_used=1,
+            reservation_id=reservation_id,
+            resume_data=resume_data,
+            jobs=jobs,
+            missing_job_ids=missing,
+            ai_provider=ai_provider,
+            user_preference=user_preference,
+        )
+
+    async def _analyze_batch_job(
+        self,
+        user_id: str,
+        job: Dict[str, Any],
+        resume_data: ResumeInput,
+        ai_provider: Optional[str],
+        user_preference: Optional[str],
+        semaphore: asyncio.Semaphore,
+    ) -> Tuple[Dict[str, Any], int, Optional[TokenUsage]]:
+        """Analyze one job of a batch, never raising.
+
+        Returns:
+            Tuple of (result or error event, credits to charge, usage of the
+            AI call or None when no call was made).
+        """
+        job_id = job["id"]
+        job_description = prepare_job_description(job, "match")
+        if not job_description:
+            return _batch_error(job_id, ValidationError("Job has no description to analyze.")), 0, None
+
+        requested_provider = ai_provider or user_preference or "claude"
+        cache_key = match_cache_key(resume_data, job_description, requested_provider)
+        cached = await get_cached_match(user_id, cache_key)
+        if cached is not None:
+            event = {"event": "result", "data": {"job_id": job_id, **cached, "cached": True}}
+            return event, settings.match_cache_hit_credits, None
+
+        usage = TokenUsage()
+        try:
+            async with semaphore:
+                analysis, provider_used = await AIProviderFactory.match_with_fallback(
+                    resume_data=resume_data,
+                    job_description=job_description,
+                    preferred_provider=ai_provider,
+                    user_preference=user_preference,
+                    usage=usage,
+                )
+        except ValueError as e:
+            logger.error(f"All AI providers failed for batch match of job {_hash_id(job_id)}: {e}")
+            return _batch_error(job_id, AIProviderUnavailableError()), 0, None
+
+        result = _match_result(analysis, provider_used)
+        await store_match(user_id, cache_key, result)
+        return {"event": "result", "data": {"job_id": job_id, **result, "cached": False}}, 1, usage
+
+
+def _batch_error(job_id: str, error: ApiException) -> Dict[str, Any]:
+    """Per-job error event of a batch."""
+    return {"event": "error", "data": {"job_id": job_id, "code": error.code, "message": error.message}}
+
+
+class BatchMatchStream:
+    """Run a batch match analysis and relay its results as events.
+
+    Events, in order:
+    - start: {"total"}
+    - result: {"job_id", "match_score", "strengths", "gaps",
+      "recommendations", "ai_provider_used", "cached"} as each job finishes
+    - error: {"job_id", "code", "message"} for a job that could not be
+      analyzed (not found, no description, providers unavailable)
+    - done: {"completed", "failed", "credits_used"} after the reservation
+      is settled
+
+    The reservation is committed for the analyses that ran when the batch
+    finishes or the client goes away (finished analyses are cached, so the
+    work is kept), and released if nothing was charged. As with
+    ReservedStream, the response must call aclose() when it is done.
+    """
+
+    def __init__(
+        self,
+        service: MatchService,
+        user_id: str,
+        reservation_id: str,
+        resume_data: ResumeInput,
+        jobs: List[Dict[str, Any]],
+        missing_job_ids: List[str],
+        ai_provider: Optional[str],
+        user_preference: Optional[str],
+    ):
+        """Prepare a batch whose inputs are loaded and credits reserved.
+
+        Args:
+            service: Match service running the analyses.
+            user_id: User's UUID.
+            reservation_id: Reservation covering every job.
+            resume_data: Resume prompt digest or parsed data.
+            jobs: Job records to analyze.
+            missing_job_ids: Requested jobs that were not found.
+            ai_provider: Optional AI provider override.
+            user_preference: User's preferred provider from profile.
+        """
+        self._service = service
+        self._user_id = user_id
+        self._reservation_id = reservation_id
+        self._resume_data = resume_data
+        self._jobs = jobs
+        self._missing_job_ids = missing_job_ids
+        self._ai_provider = ai_provider
+        self._user_preference = user_preference
+        self._events: Optional[AsyncIterator[Dict[str, Any]]] = None
+        self._started = False
+        self._settled = False
+        self._charged = 0
+        self._usage = TokenUsage()
+        self._providers: Counter = Counter()
+        self._models: Counter = Counter()
+
+    def __aiter__(self) -> "BatchMatchStream":
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self._events is None:
+            self._events = self._relay()
+        return await self._events.__anext__()
+
+    async def aclose(self) -> None:
+        """Stop the batch and settle the reservation if it was not settled.
+
+        Safe to call more than once, and after the batch completed.
+        """
+        if self._events is not None:
+            await self._events.aclose()
+        if not self._started:
+            self._started = True
+            await self._settle()
+
+    def _record(self, credits: int, usage: Optional[TokenUsage]) -> None:
+        """Add one job's charge and metered usage to the batch totals."""
+        self._charged += credits
+        if usage is None:
+            return
+        self._usage.input_tokens += usage.input_tokens
+        self._usage.output_tokens += usage.output_tokens
+        self._usage.cached_input_tokens += usage.cached_input_tokens
+        if usage.model:
+            self._models[usage.model] += 1
+
+    async def _settle(self) -> None:
+        """Commit the credits charged so far, or release the reservation."""
+        if self._settled:
+            return
+        self._settled = True
+        if not self._charged:
+            await self._service.usage_service.release_reservation(self._reservation_id)
+            return
+        self._usage.model = self._models.most_common(1)[0][0] if self._models else None
+        provider = self._providers.most_common(1)[0][0] if self._providers else None
+        await self._service.usage_service.commit_reservation(
+            self._reservation_id,
+            ai_provider=provider,
+            usage=self._usage if self._models else None,
+            credits=self._charged,
         )
 
-        # Step 8: Return analysis with provider info
-        return {
-            "match_score": analysis["match_score"],
-            "strengths": analysis["strengths"],
-            "gaps": analysis["gaps"],
-            "recommendations": analysis["recommendations"],
-            "ai_provider_used": provider_used,
-        }
+    async def _relay(self) -> AsyncIterator[Dict[str, Any]]:
+        """Fan out the analyses and yield events as they finish."""
+        self._started = True
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(max(1, settings.match_batch_concurrency))
+        tasks = [
+            asyncio.create_task(
+                self._service._analyze_batch_job(
+                    self._user_id,
+                    job,
+                    self._resume_data,
+                    self._ai_provider,
+                    self._user_preference,
+                    semaphore,
+                )
+            )
+            for job in self._jobs
+        ]
+        completed = failed = 0
+        try:
+            yield {"event": "start", "data": {"total": len(self._jobs) + len(self._missing_job_ids)}}
+            for job_id in self._missing_job_ids:
+                failed += 1
+                yield _batch_error(job_id, JobNotFoundError())
+
+            for next_done in asyncio.as_completed(tasks):
+                event, credits, usage = await next_done
+                self._record(credits, usage)
+                if event["event"] == "result":
+                    completed += 1
+                    if usage is not None:
+                        self._providers[event["data"]["ai_provider_used"]] += 1
+                else:
+                    failed += 1
+                yield event
+
+            self._usage.latency_ms = int((time.monotonic() - started) * 1000)
+            await self._settle()
+            yield {
+                "event": "done",
+                "data": {"completed": completed, "failed": failed, "credits_used": self._charged},
+            }
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not self._settled:
+                # Client went away mid-batch: charge what already ran
+                logger.info(f"Batch match abandoned after {completed} results, settling credits")
+                self._usage.latency_ms = int((time.monotonic() - started) * 1000)
+                await self._settle()
@@ -1,18 +1,153 @@
-"""PDF text extraction service."""
+"""PDF text extraction service.
 
+Text comes from one of PDF_ENGINES (`pdf_extract_engine`, default PDFium):
+resume parsing only needs reading-order text, which PDFium's text layer
+gives many times faster than pdfplumber's layout analysis. pdfplumber stays
+the fallback whenever the fast engine fails or its text looks garbled
+(see _quality_problem()). benchmarks/pdf_engines.py compares the engines.
+
+Extraction is CPU-bound: a large or pathological PDF can still take seconds
+to minutes and hundreds of megabytes. With the extraction pool running
+(started in the app lifespan), documents are extracted in separate worker
+processes, each with:
+- a page cap (`pdf_max_pages`); later pages are ignored,
+- a wall-clock timeout (`pdf_extract_timeout`), enforced by an alarm inside
+  the worker and, if the worker does not return, by killing the pool,
+- an address-space limit (`pdf_extract_memory_mb`), so a decompression bomb
+  fails with MemoryError instead of exhausting the host.
+
+Without the pool (PDF_EXTRACT_WORKERS=0, or in tests) callers run
+extract_text_from_pdf() in a thread with the same page cap.
+"""
+
+import asyncio
 import io
 import logging
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional
 
 import pdfplumber
+import pypdfium2 as pdfium
+from pdfminer.high_level import extract_text as pdfminer_extract_text
+
+from app.core.config import settings
+
+try:
+    import resource
+except ImportError:  # Windows: no address-space limit
+    resource = None
 
 logger = logging.getLogger(__name__)
 
+# Extra seconds the parent waits past the in-worker alarm before killing the pool
+_KILL_GRACE = 5.0
+
+# PDFium is not thread-safe; serializes it when extraction runs in threads
+_PDFIUM_LOCK = threading.Lock()
+
+# Fast-engine text failing any of these is re-extracted with pdfplumber
+_MIN_CHARS_PER_PAGE = 40
+_MAX_UNMAPPED_RATIO = 0.02  # replacement glyphs / (cid:N) per visible character
+_MAX_AVERAGE_WORD_LENGTH = 15.0  # longer means the text layer lost its spaces
+
+# Worker processes are replaced after this many documents, returning any
+# memory pdfminer's caches held on to
+_TASKS_PER_WORKER = 50
+
+
+def _page_count(total: int, max_pages: Optional[int]) -> int:
+    """Pages to read, logging when the cap cuts the document short."""
+    if max_pages and total > max_pages:
+        logger.warning(f"PDF has {total} pages, extracting the first {max_pages}")
+        return max_pages
+    return total
+
+
+def _pdfium_pages(content: bytes, max_pages: Optional[int]) -> List[str]:
+    """Page texts from PDFium's text layer (reading order, no layout analysis)."""
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(content)
+        try:
+            pages = []
+            for index in range(_page_count(len(pdf), max_pages)):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_bounded().replace("\r\n", "\n"))
+                textpage.close()
+                page.close()
+            return pages
+        finally:
+            pdf.close()
+
+
+def _pdfminer_pages(content: bytes, max_pages: Optional[int]) -> List[str]:
+    """Page texts from pdfminer's text-only mode (no per-character objects kept)."""
+    text = pdfminer_extract_text(io.BytesIO(content), maxpages=max_pages or 0)
+    # Every page ends in a form feed, leaving an empty string at the end
+    return text.split("\f")[:-1] or [text]
+
 
-def extract_text_from_pdf(content: bytes) -> str:
+def _pdfplumber_pages(content: bytes, max_pages: Optional[int]) -> List[str]:
+    """Page texts from pdfplumber's layout analysis (slowest, most robust)."""
+    pages = []
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        for page in pdf.pages[: _page_count(len(pdf.pages), max_pages)]:
+            pages.append(page.extract_text() or "")
+            # Drop the page's parsed layout objects before the next one
+            page.close()
+    return pages
+
+
+# Engines by `pdf_extract_engine` name; anything but pdfplumber falls back
+# to pdfplumber when its text fails _quality_problem()
+PDF_ENGINES: Dict[str, Callable[[bytes, Optional[int]], List[str]]] = {
+    "pdfium": _pdfium_pages,
+    "pdfminer": _pdfminer_pages,
+    "pdfplumber": _pdfplumber_pages,
+}
+
+
+def _join_pages(pages: List[str]) -> str:
+    return "\n\n".join(text for text in pages if text and text.strip())
+
+
+def _quality_problem(text: str, pages: int) -> Optional[str]:
+    """Why extracted text looks unusable for parsing, or None if it looks fine.
+
+    Catches the ways fast text layers fail on real resumes: no text layer or
+    fonts without a Unicode map (little text, replacement glyphs) and
+    positioned glyphs without space characters (run-together words).
+    """
+    stripped = text.strip()
+    if len(stripped) < _MIN_CHARS_PER_PAGE * max(pages, 1):
+        return "too little text"
+
+    glyphs = sum(1 for char in stripped if not char.isspace())
+    unmapped = stripped.count("\ufffd") + stripped.count("(cid:")
+    unmapped += sum(1 for char in stripped if not char.isprintable() and not char.isspace())
+    if unmapped > glyphs * _MAX_UNMAPPED_RATIO:
+        return "unmapped glyphs"
+
+    words = stripped.split()
+    if glyphs / len(words) > _MAX_AVERAGE_WORD_LENGTH:
+        return "missing word spaces"
+    return None
+
+
+def extract_text_from_pdf(content: bytes, max_pages: Optional[int] = None, engine: Optional[str] = None) -> str:
     """Extract text content from a PDF file.
 
+    Uses the configured engine (`pdf_extract_engine`) and falls back to
+    pdfplumber if that engine fails or its text looks garbled.
+
     Args:
         content: Raw PDF file bytes.
+        max_pages: Read at most this many pages (None reads all).
+        engine: Engine name from PDF_ENGINES (default: the configured one).
 
     Returns:
         Extracted text from all pages concatenated.
@@ -20,16 +155,24 @@ def extract_text_from_pdf(content: bytes) -> str:
     Raises:
         ValueError: If the PDF cannot be parsed.
     """
+    engine = engine or settings.pdf_extract_engine
     try:
-        text_parts: list[str] = []
-
-        with pdfplumber.open(io.BytesIO(content)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
+        if engine != "pdfplumber":
+            try:
+                pages = PDF_ENGINES[engine](content, max_pages)
+                full_text = _join_pages(pages)
+                problem = _quality_problem(full_text, len(pages))
+            except (MemoryError, TimeoutError):
+                # Resource limits hit: falling back would only hit them again
+                raise
+            except Exception as e:
+                problem = f"{engine} failed: {e}"
+            if problem is None:
+                logger.info(f"Extracted {len(full_text)} characters from PDF with {engine}")
+                return full_text
+            logger.info(f"Falling back to pdfplumber: {problem}")
 
-        full_text = "\n\n".join(text_parts)
+        full_text = _join_pages(_pdfplumber_pages(content, max_pages))
 
         if not full_text.strip():
             raise ValueError("No text content found in PDF")
@@ -37,6 +180,140 @@ def extract_text_from_pdf(content: bytes) -> str:
         logger.info(f"Extracted {len(full_text)} characters from PDF")
         return full_text
 
+    except MemoryError as e:
+        logger.error("PDF extraction exceeded the memory limit")
+        raise ValueError("Failed to extract text from PDF: document too large to process") from e
     except Exception as e:
         logger.error(f"PDF extraction failed: {e}")
         raise ValueError(f"Failed to extract text from PDF: {e}") from e
+
+
+def _init_worker(memory_mb: int) -> None:
+    """Limit the worker process's address space (runs once per process)."""
+    if resource is not None and memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _raise_timeout(signum, frame) -> None:
+    raise TimeoutError("extraction timed out")
+
+
+def _extract_in_worker(content: bytes, max_pages: int, timeout: float) -> str:
+    """extract_text_from_pdf() under a wall-clock alarm (worker processes only)."""
+    if not hasattr(signal, "setitimer"):  # Windows: only the parent's timeout applies
+        return extract_text_from_pdf(content, max_pages)
+    signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_text_from_pdf(content, max_pages)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class PdfExtractionPool:
+    """A process pool running extract_text_from_pdf() under resource limits."""
+
+    def __init__(self, workers: int, max_pages: int, timeout: float, memory_mb: int):
+        """Create the pool; processes are spawned on first use.
+
+        Args:
+            workers: Number of extraction processes.
+            max_pages: Pages read per document.
+            timeout: Seconds allowed per document.
+            memory_mb: Address-space limit per process (0 = unlimited).
+        """
+        self._workers = workers
+        self._max_pages = max_pages
+        self._timeout = timeout
+        self._memory_mb = memory_mb
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the API process runs threads (DB executor, HTTP
+        # clients) that a forked child would inherit mid-operation
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._memory_mb,),
+            max_tasks_per_child=_TASKS_PER_WORKER,
+        )
+
+    def _replace_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a stuck or broken executor's processes and start a fresh one.
+
+        Documents in flight on the other processes fail with ValueError.
+        """
+        if executor is not self._executor:
+            return  # already replaced by a concurrent failure
+        self._executor = self._new_executor()
+        # ProcessPoolExecutor cannot cancel a running task; kill its processes
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def extract(self, content: bytes) -> str:
+        """Extract a PDF's text in a worker process.
+
+        Args:
+            content: Raw PDF file bytes.
+
+        Returns:
+            Extracted text (first `max_pages` pages).
+
+        Raises:
+            ValueError: If the PDF cannot be parsed, times out or exceeds the
+                memory limit.
+        """
+        executor = self._executor
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, _extract_in_worker, content, self._max_pages, self._timeout)
+        try:
+            return await asyncio.wait_for(future, self._timeout + _KILL_GRACE)
+        except asyncio.TimeoutError as e:
+            logger.error(f"PDF extraction worker unresponsive after {self._timeout}s, restarting pool")
+            self._replace_executor(executor)
+            raise ValueError("Failed to extract text from PDF: extraction timed out") from e
+        except BrokenProcessPool as e:
+            logger.error("PDF extraction worker died, restarting pool")
+            self._replace_executor(executor)
+            raise ValueError("Failed to extract text from PDF: extraction worker died") from e
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: Optional[PdfExtractionPool] = None
+
+
+def get_pdf_pool() -> Optional[PdfExtractionPool]:
+    """The running pool, or None when extraction runs in a thread."""
+    return _pool
+
+
+def start_pdf_pool() -> Optional[PdfExtractionPool]:
+    """Create the process-wide pool (from the app lifespan).
+
+    Returns:
+        The pool, or None if `pdf_extract_workers` is 0.
+    """
+    global _pool
+    if _pool is None and settings.pdf_extract_workers > 0:
+        _pool = PdfExtractionPool(
+            settings.pdf_extract_workers,
+            settings.pdf_max_pages,
+            settings.pdf_extract_timeout,
+            settings.pdf_extract_memory_mb,
+        )
+        logger.info(f"PDF extraction pool started with {settings.pdf_extract_workers} processes")
+    return _pool
+
+
+def shutdown_pdf_pool() -> None:
+    """Stop the process-wide pool (from the app lifespan)."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        pool.shutdown()
@@ -1,12 +1,123 @@
-"""PDF generation service for cover letters."""
+"""PDF generation service for cover letters.
 
+WeasyPrint is slow to start (import, fontconfig scan, first layout) and
+renders in pure Python, so a render inside the request handler stalls the
+event loop for hundreds of milliseconds. With the render pool running
+(started in the app lifespan when WeasyPrint is installed), letters are
+rendered in worker processes that imported WeasyPrint, loaded fonts and
+parsed the stylesheet at startup.
+
+Rendered PDFs are cached in process by a hash of (content, date, template),
+so downloading the same letter again on the same day costs nothing.
+"""
+
+import asyncio
+import hashlib
+import html
+import importlib.util
 import logging
+import multiprocessing
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+COVER_LETTER_CSS = """
+@page {
+  size: letter;
+  margin: 1in;
+}
+body {
+  font-family: 'Times New Roman', Times, serif;
+  font-size: 12pt;
+  line-height: 1.5;
+  color: #000;
+}
+.date {
+  margin-bottom: 2em;
+}
+p {
+  margin: 0 0 1em 0;
+  text-align: justify;
+}
+"""
+
+COVER_LETTER_HTML = """<!DOCTYPE html>
+<html>
+<body>
+  <div class="date">{date}</div>
+  {paragraphs}
+</body>
+</html>"""
+
+# Any template change is a cache miss
+_TEMPLATE_HASH = hashlib.sha256((COVER_LETTER_CSS + COVER_LETTER_HTML).encode()).hexdigest()
+
+_cache_lock = threading.Lock()
+_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+
+@lru_cache(maxsize=1)
+def _renderer() -> Tuple[Any, Any, Any]:
+    """Import WeasyPrint and parse the stylesheet once per process.
+
+    Returns:
+        (HTML class, parsed stylesheet, font configuration).
+
+    Raises:
+        ImportError: If WeasyPrint is not installed.
+    """
+    from weasyprint import CSS, HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    return HTML, CSS(string=COVER_LETTER_CSS, font_config=font_config), font_config
+
+
+def _cache_key(content: str, current_date: str) -> str:
+    payload = "\0".join((content, current_date, _TEMPLATE_HASH))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _get_cached(key: str) -> Optional[bytes]:
+    """Get a fresh cached PDF and mark it recently used."""
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        expires_at, pdf_bytes = entry
+        if time.monotonic() >= expires_at:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return pdf_bytes
+
+
+def _store(key: str, pdf_bytes: bytes) -> None:
+    """Cache a PDF, evicting the least recently used."""
+    if settings.pdf_render_cache_ttl <= 0:
+        return
+    with _cache_lock:
+        _cache[key] = (time.monotonic() + settings.pdf_render_cache_ttl, pdf_bytes)
+        _cache.move_to_end(key)
+        while len(_cache) > settings.pdf_render_cache_max_entries:
+            _cache.popitem(last=False)
+
+
+def clear_pdf_cache() -> None:
+    """Drop every cached PDF."""
+    with _cache_lock:
+        _cache.clear()
+
 
 class PDFService:
     """Service for generating PDF documents from cover letters."""
@@ -40,13 +151,14 @@ class PDFService:
 
     @staticmethod
     def generate_cover_letter_pdf(
-        content: str, file_name: Optional[str] = None
+        content: str, file_name: Optional[str] = None, current_date: Optional[str] = None
     ) -> bytes:
-        """Generate a professional PDF from cover letter content.
+        """Generate a professional PDF from cover letter content (blocking).
 
         Args:
             content: Cover letter text content.
             file_name: Optional filename (will be sanitized).
+            current_date: Date line, e.g. "January 5, 2026" (default: today).
 
         Returns:
             PDF file as bytes.
@@ -58,55 +170,177 @@ class PDFService:
             raise ValueError("Content cannot be empty")
 
         try:
-            from weasyprint import HTML
+            HTML, stylesheet, font_config = _renderer()
         except ImportError as e:
             logger.error("WeasyPrint not installed. Install with: uv add weasyprint")
             raise ValueError("PDF generation unavailable") from e
 
         # Get current date in professional format
-        current_date = datetime.now().strftime("%B %d, %Y")
+        current_date = current_date or datetime.now().strftime("%B %d, %Y")
 
-        # Convert \n\n to <p> tags for proper paragraph spacing
+        # Convert \n\n to <p> tags for proper paragraph spacing; the text is
+        # escaped so markup in the letter cannot load resources or alter layout
         paragraphs = content.split('\n\n')
         content_with_paragraphs = '\n'.join(
-            f"<p>{para.strip()}</p>" for para in paragraphs if para.strip()
+            f"<p>{html.escape(para.strip())}</p>" for para in paragraphs if para.strip()
         )
-
-        # HTML template with professional formatting
-        html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-  <style>
-    @page {{
-      size: letter;
-      margin: 1in;
-    }}
-    body {{
-      font-family: 'Times New Roman', Times, serif;
-      font-size: 12pt;
-      line-height: 1.5;
-      color: #000;
-    }}
-    .date {{
-      margin-bottom: 2em;
-    }}
-    p {{
-      margin: 0 0 1em 0;
-      text-align: justify;
-    }}
-  </style>
-</head>
-<body>
-  <div class="date">{current_date}</div>
-  {content_with_paragraphs}
-</body>
-</html>"""
+        html_content = COVER_LETTER_HTML.format(date=current_date, paragraphs=content_with_paragraphs)
 
         try:
             # Generate PDF from HTML
-            pdf_bytes = HTML(string=html_content).write_pdf()
+            pdf_bytes = HTML(string=html_content).write_pdf(stylesheets=[stylesheet], font_config=font_config)
             logger.info("Successfully generated cover letter PDF")
             return pdf_bytes
         except Exception as e:
             logger.error(f"WeasyPrint error generating PDF: {e}")
             raise ValueError("Failed to generate PDF") from e
+
+    async def render_cover_letter_pdf(self, content: str, file_name: Optional[str] = None) -> bytes:
+        """Generate a cover letter PDF off the event loop, from cache if possible.
+
+        Renders in the warmed pool when it is running, otherwise in a thread.
+
+        Args:
+            content: Cover letter text content.
+            file_name: Optional filename (will be sanitized).
+
+        Returns:
+            PDF file as bytes.
+
+        Raises:
+            ValueError: If content is empty or WeasyPrint fails.
+        """
+        if not content or not content.strip():
+            raise ValueError("Content cannot be empty")
+
+        current_date = datetime.now().strftime("%B %d, %Y")
+        key = _cache_key(content, current_date)
+        pdf_bytes = _get_cached(key)
+        if pdf_bytes is not None:
+            logger.info("Cover letter PDF served from cache")
+            return pdf_bytes
+
+        pool = get_render_pool()
+        if pool is not None:
+            pdf_bytes = await pool.render(content, current_date)
+        else:
+            pdf_bytes = await asyncio.to_thread(self.generate_cover_letter_pdf, content, file_name, current_date)
+        _store(key, pdf_bytes)
+        return pdf_bytes
+
+
+def _warm_worker() -> None:
+    """Load WeasyPrint, fonts and the stylesheet, then lay out one letter."""
+    PDFService.generate_cover_letter_pdf("Warm-up.", current_date="January 1, 2026")
+
+
+def _render_in_worker(content: str, current_date: str) -> bytes:
+    return PDFService.generate_cover_letter_pdf(content, current_date=current_date)
+
+
+class CoverLetterRenderPool:
+    """Worker processes with WeasyPrint loaded, rendering cover letters."""
+
+    def __init__(self, workers: int, timeout: float):
+        """Start the processes and warm each one.
+
+        Args:
+            workers: Number of render processes.
+            timeout: Seconds to wait for one render.
+        """
+        self._workers = workers
+        self._timeout = timeout
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the API process runs threads a fork would copy mid-operation
+        executor = ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+        # Processes start on demand; one task per worker brings them all up now
+        for _ in range(self._workers):
+            executor.submit(time.sleep, 0)
+        return executor
+
+    def _replace_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a stuck or broken executor's processes and start a fresh one.
+
+        Renders in flight on the other processes fail with ValueError.
+        """
+        if executor is not self._executor:
+            return  # already replaced by a concurrent failure
+        self._executor = self._new_executor()
+        # ProcessPoolExecutor cannot cancel a running task; kill its processes
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def render(self, content: str, current_date: str) -> bytes:
+        """Render a cover letter in a worker process.
+
+        If the pool is broken (a worker died or the warm-up failed), the pool
+        is restarted and this letter is rendered in a thread instead.
+
+        Args:
+            content: Cover letter text content.
+            current_date: Date line.
+
+        Returns:
+            PDF file as bytes.
+
+        Raises:
+            ValueError: If WeasyPrint fails or the render times out.
+        """
+        executor = self._executor
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, _render_in_worker, content, current_date)
+        try:
+            return await asyncio.wait_for(future, self._timeout)
+        except asyncio.TimeoutError as e:
+            logger.error(f"Cover letter PDF render exceeded {self._timeout}s, restarting pool")
+            self._replace_executor(executor)
+            raise ValueError("Failed to generate PDF") from e
+        except BrokenProcessPool as e:
+            # The warm-up failed (e.g. missing Pango) or a worker died
+            logger.error(f"Cover letter PDF render pool broken ({e}), restarting pool")
+            self._replace_executor(executor)
+        return await asyncio.to_thread(PDFService.generate_cover_letter_pdf, content, None, current_date)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: Optional[CoverLetterRenderPool] = None
+
+
+def get_render_pool() -> Optional[CoverLetterRenderPool]:
+    """The running pool, or None when PDFs are rendered in a thread."""
+    return _pool
+
+
+def start_render_pool() -> Optional[CoverLetterRenderPool]:
+    """Start the process-wide render pool (from the app lifespan).
+
+    Returns:
+        The pool, or None if `pdf_render_workers` is 0 or WeasyPrint is not
+        installed.
+    """
+    global _pool
+    if _pool is None and settings.pdf_render_workers > 0:
+        if importlib.util.find_spec("weasyprint") is None:
+            logger.warning("WeasyPrint not installed, cover letter PDF render pool not started")
+            return None
+        _pool = CoverLetterRenderPool(settings.pdf_render_workers, settings.pdf_render_timeout)
+        logger.info(f"Cover letter PDF render pool started with {settings.pdf_render_workers} processes")
+    return _pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the process-wide render pool (from the app lifespan)."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        pool.shutdown()
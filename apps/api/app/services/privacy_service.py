@@ -12,6 +12,10 @@ from app.core.exceptions import (
     PendingDeletionNotFoundError,
 )
 from app.db.client import get_supabase_admin_client
+from app.db.executor import execute, run_sync
+from app.db.match_cache import forget_user_matches
+from app.db.text_cache import forget_texts
+from app.db.profile_cache import invalidate_profile
 
 logger = logging.getLogger(__name__)
 
@@ -100,41 +104,24 @@ class PrivacyService:
             Dictionary containing complete data summary.
         """
         import asyncio
-        from functools import partial
 
         # Parallelize queries for performance (avoid N+1 pattern)
-        loop = asyncio.get_event_loop()
-
-        # Define query functions
-        def get_resumes():
-            return (
+        resume_response, job_response, usage_response = await asyncio.gather(
+            execute(
                 self.admin_client.table("resumes")
                 .select("id", count="exact")
                 .eq("user_id", user_id)
-                .execute()
-            )
-
-        def get_jobs():
-            return (
+            ),
+            execute(
                 self.admin_client.table("jobs")
                 .select("status")
                 .eq("user_id", user_id)
-                .execute()
-            )
-
-        def get_usage():
-            return (
+            ),
+            execute(
                 self.admin_client.table("usage_events")
                 .select("operation_type")
                 .eq("user_id", user_id)
-                .execute()
-            )
-
-        # Execute queries in parallel
-        resume_response, job_response, usage_response = await asyncio.gather(
-            loop.run_in_executor(None, get_resumes),
-            loop.run_in_executor(None, get_jobs),
-            loop.run_in_executor(None, get_usage),
+            ),
         )
 
         # Process resume count
@@ -221,12 +208,11 @@ class PrivacyService:
             email spam/abuse. Current implementation allows unlimited deletion requests.
         """
         # Check for existing pending deletion (prevent duplicate requests)
-        existing = (
+        existing = await execute(
             self.admin_client.table("profiles")
             .select("deletion_token_hash, deletion_token_expires")
             .eq("id", user_id)
             .single()
-            .execute()
         )
 
         if existing.data and existing.data.get("deletion_token_hash"):
@@ -250,12 +236,15 @@ class PrivacyService:
         expires_at = datetime.now(timezone.utc) + timedelta(hours=TOKEN_EXPIRY_HOURS)
 
         # Store token hash and expiry in profile
-        self.admin_client.table("profiles").update(
-            {
-                "deletion_token_hash": token_hash,
-                "deletion_token_expires": expires_at.isoformat(),
-            }
-        ).eq("id", user_id).execute()
+        await execute(
+            self.admin_client.table("profiles").update(
+                {
+                    "deletion_token_hash": token_hash,
+                    "deletion_token_expires": expires_at.isoformat(),
+                }
+            ).eq("id", user_id)
+        )
+        invalidate_profile(user_id)
 
         # Log deletion request (MVP: log token for testing)
         reason_log = f", reason: {reason}" if reason else ""
@@ -304,11 +293,10 @@ class PrivacyService:
         token_hash = self._hash_token(token)
 
         # Find profile with matching token hash
-        response = (
+        response = await execute(
             self.admin_client.table("profiles")
             .select("id, deletion_token_expires")
             .eq("deletion_token_hash", token_hash)
-            .execute()
         )
 
         if not response.data:
@@ -351,12 +339,11 @@ class PrivacyService:
             PendingDeletionNotFoundError: If no pending deletion exists.
         """
         # Check if there's a pending deletion
-        response = (
+        response = await execute(
             self.admin_client.table("profiles")
             .select("deletion_token_hash, deletion_token_expires")
             .eq("id", user_id)
             .single()
-            .execute()
         )
 
         if not response.data:
@@ -374,12 +361,15 @@ class PrivacyService:
             raise PendingDeletionNotFoundError()
 
         # Clear pending deletion
-        self.admin_client.table("profiles").update(
-            {
-                "deletion_token_hash": None,
-                "deletion_token_expires": None,
-            }
-        ).eq("id", user_id).execute()
+        await execute(
+            self.admin_client.table("profiles").update(
+                {
+                    "deletion_token_hash": None,
+                    "deletion_token_expires": None,
+                }
+            ).eq("id", user_id)
+        )
+        invalidate_profile(user_id)
 
         logger.warning(f"DELETION_CANCELLED - user: {user_id[:8]}...")
 
@@ -403,17 +393,17 @@ class PrivacyService:
         from app.core.exceptions import DatabaseError
 
         # 1. Delete resume files from storage (batch optimization)
-        resumes = (
+        resumes = await execute(
             self.admin_client.table("resumes")
-            .select("file_path")
+            .select("file_path, content_hash")
             .eq("user_id", user_id)
-            .execute()
         )
         file_paths = [r["file_path"] for r in resumes.data or [] if r.get("file_path")]
+        content_hashes = [r.get("content_hash") for r in resumes.data or []]
 
         if file_paths:
             try:
-                self.admin_client.storage.from_("resumes").remove(file_paths)
+                await run_sync(self.admin_client.storage.from_("resumes").remove, file_paths)
                 logger.info(
                     f"Deleted {len(file_paths)} resume files - user: {user_id[:8]}..."
                 )
@@ -428,23 +418,28 @@ class PrivacyService:
 
         # 2. Explicit DB deletions (despite CASCADE, for clarity and audit)
         # Note: feedback uses SET NULL, but we explicitly delete for GDPR
-        self.admin_client.table("feedback").delete().eq("user_id", user_id).execute()
-        self.admin_client.table("usage_events").delete().eq("user_id", user_id).execute()
-        self.admin_client.table("jobs").delete().eq("user_id", user_id).execute()
-        self.admin_client.table("resumes").delete().eq("user_id", user_id).execute()
-        self.admin_client.table("profiles").delete().eq("id", user_id).execute()
+        await execute(self.admin_client.table("feedback").delete().eq("user_id", user_id))
+        await execute(self.admin_client.table("usage_events").delete().eq("user_id", user_id))
+        await execute(self.admin_client.table("match_results").delete().eq("user_id", user_id))
+        # Extracted text cached under the user's resume files (shared cache)
+        await forget_texts(content_hashes)
+        await execute(self.admin_client.table("jobs").delete().eq("user_id", user_id))
+        await execute(self.admin_client.table("resumes").delete().eq("user_id", user_id))
+        await execute(self.admin_client.table("profiles").delete().eq("id", user_id))
+        invalidate_profile(user_id)
+        forget_user_matches(user_id)
 
         logger.warning(f"Deleted all DB records - user: {user_id[:8]}...")
 
         # 3. Delete auth user LAST (FK to profiles requires profile deletion first)
         try:
-            self.admin_client.auth.admin.delete_user(user_id)
+            await run_sync(self.admin_client.auth.admin.delete_user, user_id)
             logger.info(f"Deleted auth user - user: {user_id[:8]}...")
         except Exception as e:
             # Retry once (transient network failure)
             try:
                 await asyncio.sleep(2)
-                self.admin_client.auth.admin.delete_user(user_id)
+                await run_sync(self.admin_client.auth.admin.delete_user, user_id)
                 logger.info(f"Deleted auth user (retry) - user: {user_id[:8]}...")
             except Exception as retry_e:
                 logger.error(
@@ -472,12 +467,11 @@ class PrivacyService:
         Returns:
             ISO datetime string if pending deletion exists and not expired, else None.
         """
-        response = (
+        response = await execute(
             self.admin_client.table("profiles")
             .select("deletion_token_expires")
             .eq("id", user_id)
             .single()
-            .execute()
         )
 
         if not response.data:
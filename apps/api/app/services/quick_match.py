@@ -0,0 +1,221 @@
+"""Local, deterministic resume-job match estimates.
+
+An AI match analysis takes a provider round trip of several seconds and a
+credit. quick_match() estimates the match score locally in well under a
+millisecond, with no provider call, so it can be shown instantly, offered
+for free and used to rank a whole job list (see JobService.list_jobs).
+MatchService's AI analysis stays the deep, explained result.
+
+The estimate is the share of the job description's weighted vocabulary
+that the resume covers:
+
+- Both sides are normalized the same way: lowercased, split into terms
+  that keep tech spellings intact (c++, c#, node.js), stop words
+  and generic job-ad words dropped, plurals folded.
+- Each job term is weighted with BM25 term-frequency saturation and
+  length normalization, so a skill the job repeats counts more, but not
+  linearly, and a long ad does not dilute every term. There is no IDF
+  from a corpus: the estimate for a job must not change with whichever
+  other jobs happen to be scored alongside it, and the stop list does
+  the work IDF would do for common words.
+- Resume terms come from skills (full weight) and experience titles and
+  descriptions (partial weight).
+
+Coverage of FULL_COVERAGE or more is a score of 100: every real job ad
+contains terms no resume repeats (product names, team names), so the raw
+ratio never approaches 1.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence
+
+from app.services.job_text import clean_job_description
+
+# BM25 parameters (the usual defaults) and the job length they normalize to
+BM25_K1 = 1.2
+BM25_B = 0.75
+AVERAGE_JOB_TERMS = 250
+
+SKILL_WEIGHT = 1.0
+EXPERIENCE_WEIGHT = 0.6
+
+# Weighted coverage that counts as a perfect match
+FULL_COVERAGE = 0.6
+
+MAX_MISSING_TERMS = 5
+
+_TERM = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+_STOP_WORDS = frozenset(
+    """
+    a about above across after all also an and any are as at be been being both but by can
+    could do does each either etc for from had has have how i if in into is it its may more
+    most must not of on or other our out over per should so such than that the their them
+    then there these they this those through to under up us was we were what when where
+    which while who will with within without would you your
+    ability able across apply candidate candidates company day environment experience
+    experienced etc good great help ideal including job join knowledge looking new opportunity
+    plus position preferred required requirement requirements responsibilities responsibility
+    role skill skills strong team teams understanding use using work working year years
+    """.split()
+)
+
+# Names that end in "s" but are not plurals
+_KEEP_S = frozenset(
+    "aws devops ios jenkins kubernetes macos pandas postgres rails redis sales sas windows".split()
+)
+
+
+@dataclass
+class QuickMatch:
+    """A local match estimate."""
+
+    match_score: int
+    matched_skills: List[str] = field(default_factory=list)
+    missing_terms: List[str] = field(default_factory=list)
+
+
+def _fold(term: str) -> str:
+    """Fold simple English plurals (services -> service, apis -> api)."""
+    if term in _KEEP_S or not term.isalnum():
+        return term
+    if len(term) > 4 and term.endswith("ies"):
+        return f"{term[:-3]}y"
+    if len(term) > 3 and term.endswith("s") and not term.endswith(("ss", "us", "sis", "ics")):
+        return term[:-1]
+    return term
+
+
+def normalize_terms(text: str) -> List[str]:
+    """Split text into normalized match terms.
+
+    Args:
+        text: Any text.
+
+    Returns:
+        Terms in order of appearance, stop words removed.
+    """
+    if not isinstance(text, str):
+        return []
+    terms = []
+    for term in _TERM.findall(text.lower()):
+        term = _fold(term)
+        if term not in _STOP_WORDS and not term.isdigit():
+            terms.append(term)
+    return terms
+
+
+def _entries(value: Any) -> Iterable[Dict[str, Any]]:
+    """The dict items of a list field (tolerates unvalidated AI output)."""
+    if not isinstance(value, list):
+        return []
+    return (item for item in value if isinstance(item, dict))
+
+
+def _skills(parsed_data: Dict[str, Any]) -> List[str]:
+    """The resume's skills as strings."""
+    skills = parsed_data.get("skills")
+    if not isinstance(skills, list):
+        return []
+    return [skill for skill in skills if isinstance(skill, str) and skill.strip()]
+
+
+def resume_terms(parsed_data: Dict[str, Any]) -> Dict[str, float]:
+    """Weighted match terms from a resume's skills and experience.
+
+    Args:
+        parsed_data: Parsed resume data (ParsedResumeData shape; unvalidated
+            AI output is tolerated).
+
+    Returns:
+        Term -> weight (SKILL_WEIGHT for skill terms, EXPERIENCE_WEIGHT for
+        terms only found in experience).
+    """
+    if not isinstance(parsed_data, dict):
+        return {}
+    weights: Dict[str, float] = {}
+    for item in _entries(parsed_data.get("experience")):
+        for key in ("title", "description"):
+            for term in normalize_terms(item.get(key)):
+                weights[term] = EXPERIENCE_WEIGHT
+    for skill in _skills(parsed_data):
+        for term in normalize_terms(skill):
+            weights[term] = SKILL_WEIGHT
+    return weights
+
+
+def job_term_weights(description: str) -> Dict[str, float]:
+    """BM25-weighted terms of a job description.
+
+    Args:
+        description: Job description text.
+
+    Returns:
+        Term -> saturated, length-normalized term frequency.
+    """
+    counts = Counter(normalize_terms(description))
+    length = sum(counts.values())
+    if not length:
+        return {}
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / AVERAGE_JOB_TERMS)
+    return {term: tf * (BM25_K1 + 1) / (tf + norm) for term, tf in counts.items()}
+
+
+def score_terms(resume: Dict[str, float], job: Dict[str, float], skills: Sequence[str] = ()) -> QuickMatch:
+    """Score precomputed resume terms against precomputed job weights.
+
+    Args:
+        resume: Output of resume_terms().
+        job: Output of job_term_weights().
+        skills: The resume's skills, for reporting which ones the job mentions.
+
+    Returns:
+        The estimate.
+    """
+    total = sum(job.values())
+    if not total or not resume:
+        return QuickMatch(match_score=0)
+
+    covered = sum(weight * resume[term] for term, weight in job.items() if term in resume)
+    score = round(100 * min(1.0, covered / total / FULL_COVERAGE))
+
+    matched = [skill for skill in skills if (terms := normalize_terms(skill)) and all(t in job for t in terms)]
+    missing = sorted((term for term in job if term not in resume), key=lambda t: (-job[t], t))
+    return QuickMatch(match_score=score, matched_skills=matched, missing_terms=missing[:MAX_MISSING_TERMS])
+
+
+def quick_match(parsed_data: Dict[str, Any], job: Dict[str, Any]) -> QuickMatch:
+    """Estimate how well a resume matches a job, locally.
+
+    Args:
+        parsed_data: Parsed resume data.
+        job: Job record (uses clean_description, else the raw description).
+
+    Returns:
+        The estimate; a score of 0 if either side has no usable terms.
+    """
+    description = job.get("clean_description") or clean_job_description(job.get("description") or "")
+    return score_terms(resume_terms(parsed_data), job_term_weights(description), _skills(parsed_data))
+
+
+def rank_jobs(parsed_data: Dict[str, Any], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort jobs by quick match score, best first.
+
+    The resume is normalized once for the whole list. Ties keep the input
+    order, so callers can pre-sort by recency.
+
+    Args:
+        parsed_data: Parsed resume data.
+        jobs: Job records.
+
+    Returns:
+        New list of the jobs, each with a `match_score` key added.
+    """
+    resume = resume_terms(parsed_data)
+    scored = []
+    for job in jobs:
+        description = job.get("clean_description") or clean_job_description(job.get("description") or "")
+        scored.append({**job, "match_score": score_terms(resume, job_term_weights(description)).match_score})
+    return sorted(scored, key=lambda job: -job["match_score"])
@@ -0,0 +1,202 @@
+"""Background worker pool for resume parsing.
+
+Parsing a resume (PDF text extraction plus an AI call that can take tens of
+seconds) used to run inside the upload request. With the pool running,
+ResumeService.upload_resume() stores the file and a resume row with
+parse_status "pending", records a resume_parse_jobs row and submits the job
+here; the request returns 202 straight away and a worker finishes the parse.
+
+Durability comes from the resume_parse_jobs table, not from this queue:
+- A worker claims a job by moving its row from "queued" to "running", so a
+  job recovered by several processes is still parsed once.
+- The in-memory queue is bounded (`resume_parse_queue_size`). A job that
+  does not fit stays "queued" in the table.
+- At startup, and every `resume_parse_sweep_interval` seconds while the
+  queue is empty, ResumeService.requeue_parse_jobs() re-submits queued jobs
+  and those left "running" by a process that died.
+
+Clients follow progress by polling GET /v1/resumes/{id} or streaming
+GET /v1/resumes/{id}/events; wait() lets that stream wake as soon as a
+local worker finishes instead of at the next poll.
+"""
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ResumeParseJob:
+    """A queued resume parse (one resume_parse_jobs row)."""
+
+    id: str
+    resume_id: str
+    user_id: str
+    reservation_id: Optional[str]
+    file_path: str
+    attempts: int = 0
+    # The uploaded bytes when the job was queued by this process; recovered
+    # jobs download the file from storage instead
+    file_content: Optional[bytes] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "ResumeParseJob":
+        """Build a job from a resume_parse_jobs row."""
+        return cls(
+            id=row["id"],
+            resume_id=row["resume_id"],
+            user_id=row["user_id"],
+            reservation_id=row.get("reservation_id"),
+            file_path=row["file_path"],
+            attempts=row.get("attempts") or 0,
+        )
+
+
+ParseHandler = Callable[[ResumeParseJob], Awaitable[None]]
+Refill = Callable[["ParseWorkerPool"], Awaitable[Any]]
+
+
+class ParseWorkerPool:
+    """A fixed number of asyncio workers draining a bounded job queue."""
+
+    def __init__(
+        self,
+        handler: ParseHandler,
+        workers: int,
+        queue_size: int,
+        refill: Optional[Refill] = None,
+        refill_interval: float = 60.0,
+    ):
+        """Create the pool (call start() to run it).
+
+        Args:
+            handler: Coroutine that processes one job. Exceptions are logged.
+            workers: Number of concurrent workers.
+            queue_size: Jobs held in memory before submit() refuses more.
+            refill: Coroutine that submits jobs waiting in durable storage;
+                run at start and then every `refill_interval` seconds while
+                the queue is empty.
+            refill_interval: Seconds between refills.
+        """
+        self._handler = handler
+        self._refill = refill
+        self._refill_interval = refill_interval
+        self._workers = workers
+        self._queue: asyncio.Queue[ResumeParseJob] = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+        self._finished: Dict[str, asyncio.Event] = {}
+
+    def start(self) -> None:
+        """Start the worker tasks on the running loop."""
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"resume-parse-{index}") for index in range(self._workers)
+        ]
+        if self._refill is not None:
+            self._tasks.append(asyncio.create_task(self._sweep(), name="resume-parse-sweep"))
+        logger.info(f"Resume parse pool started with {self._workers} workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers. Jobs in flight stay "running" and are recovered later."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for event in self._finished.values():
+            event.set()
+        self._finished.clear()
+
+    def submit(self, job: ResumeParseJob) -> bool:
+        """Queue a job without waiting.
+
+        Returns:
+            False if the queue is full (the job stays queued in the table).
+        """
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            logger.warning(f"Resume parse queue full, job {job.id[:8]}... left for recovery")
+            return False
+        self._finished.setdefault(job.resume_id, asyncio.Event())
+        return True
+
+    async def wait(self, resume_id: str, timeout: float) -> None:
+        """Wait until a local worker finishes the resume, or `timeout` seconds.
+
+        Resumes queued by another process are not tracked here, so this is
+        just a sleep for them.
+        """
+        event = self._finished.get(resume_id)
+        if event is None:
+            await asyncio.sleep(timeout)
+            return
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(event.wait(), timeout)
+
+    async def _sweep(self) -> None:
+        """Refill from durable storage now and whenever the queue runs dry."""
+        while True:
+            if self._queue.empty():
+                try:
+                    await self._refill(self)
+                except Exception as e:
+                    logger.error(f"Resume parse refill failed: {e}")
+            await asyncio.sleep(self._refill_interval)
+
+    async def _work(self) -> None:
+        """Process jobs until cancelled."""
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._handler(job)
+            except Exception as e:
+                logger.error(f"Resume parse job {job.id[:8]}... crashed: {e}")
+            finally:
+                self._queue.task_done()
+                event = self._finished.pop(job.resume_id, None)
+                if event is not None:
+                    event.set()
+
+
+_pool: Optional[ParseWorkerPool] = None
+
+
+def get_parse_pool() -> Optional[ParseWorkerPool]:
+    """The running pool, or None when uploads are parsed inline."""
+    return _pool
+
+
+def start_parse_pool(handler: ParseHandler, refill: Optional[Refill] = None) -> Optional[ParseWorkerPool]:
+    """Start the process-wide pool (from the app lifespan).
+
+    Args:
+        handler: Coroutine that processes one job.
+        refill: Coroutine that submits jobs waiting in resume_parse_jobs.
+
+    Returns:
+        The pool, or None if `resume_parse_workers` is 0.
+    """
+    global _pool
+    if _pool is None and settings.resume_parse_workers > 0:
+        _pool = ParseWorkerPool(
+            handler,
+            settings.resume_parse_workers,
+            settings.resume_parse_queue_size,
+            refill=refill,
+            refill_interval=settings.resume_parse_sweep_interval,
+        )
+        _pool.start()
+    return _pool
+
+
+async def stop_parse_pool() -> None:
+    """Stop the process-wide pool (from the app lifespan)."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.stop()
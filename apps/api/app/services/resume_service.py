@@ -1,18 +1,39 @@
 """Resume service for upload, storage, and AI parsing."""
 
+import asyncio
+import hashlib
 import logging
+import time
 import uuid
-from typing import Any, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
-from app.core.exceptions import ApiException, CreditExhaustedError, ErrorCode, ResumeLimitReachedError
+from app.core.config import settings
+from app.core.exceptions import ApiException, ErrorCode, ResumeLimitReachedError
 from app.db.client import get_supabase_admin_client
+from app.db.executor import execute, run_sync
+from app.db.profile_cache import get_cached_profile, invalidate_profile
+from app.db.text_cache import get_cached_text, store_text
 from app.models.resume import ParsedResumeData
 from app.services.ai.factory import AIProviderFactory
-from app.services.pdf_parser import extract_text_from_pdf
+from app.services.ai.provider import TokenUsage
+from app.services.ai.resume_digest import build_resume_digest
+from app.services.pdf_parser import extract_text_from_pdf, get_pdf_pool
+from app.services.resume_ingest import ParseWorkerPool, ResumeParseJob, get_parse_pool, start_parse_pool
+from app.services.skills import normalize_skills
 from app.services.usage_service import UsageService
 
 logger = logging.getLogger(__name__)
 
+# A re-upload of a resume in one of these states returns it instead of a copy;
+# a failed parse is retried as a new upload
+_REUSABLE_PARSE_STATUSES = ["completed", "pending"]
+
+
+def resume_content_hash(content: bytes) -> str:
+    """Hex SHA-256 of a resume file (resumes.content_hash)."""
+    return hashlib.sha256(content).hexdigest()
+
 
 class ResumeService:
     """Service for managing resume uploads and parsing."""
@@ -31,11 +52,10 @@ class ResumeService:
         Returns:
             Number of resumes the user has.
         """
-        response = (
+        response = await execute(
             self.admin_client.table("resumes")
             .select("id", count="exact")
             .eq("user_id", user_id)
-            .execute()
         )
         return response.count or 0
 
@@ -48,13 +68,21 @@ class ResumeService:
         """Upload and parse a resume.
 
         Flow:
-        1. Check credits (fail fast if exhausted)
+        0. Hash the file; if the user already has a parsed (or pending)
+           resume with the same bytes, return it (no storage write, AI
+           call or credit)
+        1. Reserve a credit (fail fast if exhausted)
         2. Check resume limit (fail fast if at limit)
         3. Upload file to Supabase Storage
         4. Extract text with pdfplumber
         5. Parse with AI (Claude → GPT fallback)
         6. Insert resume record to database
-        7. Record usage event (credit deduction LAST)
+        7. Commit the reservation (credit deduction LAST), or release it
+
+        When the background parse pool is running (see resume_ingest.py),
+        steps 4-5 and 7 move to a worker: the record is inserted with
+        parse_status "pending", a resume_parse_jobs row is queued and this
+        returns immediately, still holding the reservation.
 
         Args:
             user_id: User's UUID.
@@ -62,7 +90,8 @@ class ResumeService:
             file_name: Original filename.
 
         Returns:
-            Dictionary with resume data and ai_provider_used.
+            Dictionary with resume data, ai_provider_used and duplicate
+            (True when an existing resume was returned).
 
         Raises:
             CreditExhaustedError: If user has no credits.
@@ -71,12 +100,96 @@ class ResumeService:
         """
         logger.info(f"Resume upload attempt by user {user_id[:8]}..., filename={file_name}, size={len(file_content)} bytes")
 
-        # Step 1: Check credits FIRST
-        has_credits = await self.usage_service.check_credits(user_id)
-        if not has_credits:
-            logger.warning(f"User {user_id[:8]}... has no credits")
-            raise CreditExhaustedError()
+        # Step 0: Same bytes uploaded before (another device, double submit)
+        content_hash = await asyncio.to_thread(resume_content_hash, file_content)
+        duplicate = await self._find_duplicate(user_id, content_hash)
+        if duplicate is not None:
+            logger.info(f"Resume upload by user {user_id[:8]}... matches resume {duplicate['resume']['id'][:8]}...")
+            return duplicate
+
+        # Step 1: Reserve a credit (atomic check + hold)
+        reservation_id = await self.usage_service.reserve_credits(user_id, "resume_parse")
+        pool = get_parse_pool()
+        usage = TokenUsage()
+        try:
+            if pool is not None:
+                # The worker settles the reservation when the parse finishes
+                return await self._store_and_enqueue(
+                    user_id=user_id,
+                    file_content=file_content,
+                    file_name=file_name,
+                    content_hash=content_hash,
+                    reservation_id=reservation_id,
+                    pool=pool,
+                )
+            result, parse_status, ai_provider_used = await self._store_and_parse(
+                user_id=user_id,
+                file_content=file_content,
+                file_name=file_name,
+                content_hash=content_hash,
+                usage=usage,
+            )
+        except BaseException:
+            await self.usage_service.release_reservation(reservation_id)
+            raise
+
+        # Step 7: Charge the credit ONLY if parsing succeeded
+        await self._settle_reservation(reservation_id, parse_status, ai_provider_used, usage)
+
+        return result
+
+    async def _find_duplicate(self, user_id: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Find the user's latest reusable resume with these file bytes.
+
+        Args:
+            user_id: User's UUID.
+            content_hash: Hex SHA-256 of the uploaded file.
+
+        Returns:
+            Upload result for the existing resume (duplicate=True), or None.
+        """
+        response = await execute(
+            self.admin_client.table("resumes")
+            .select("*")
+            .eq("user_id", user_id)
+            .eq("content_hash", content_hash)
+            .in_("parse_status", _REUSABLE_PARSE_STATUSES)
+            .order("created_at", desc=True)
+            .limit(1)
+        )
+        if not response.data:
+            return None
+        return self._upload_result(response.data[0], ai_provider_used=None, duplicate=True)
+
+    async def _settle_reservation(
+        self,
+        reservation_id: str,
+        parse_status: str,
+        ai_provider_used: Optional[str],
+        usage: TokenUsage,
+    ) -> None:
+        """Charge the parse credit if parsing completed, otherwise return it."""
+        if parse_status == "completed":
+            await self.usage_service.commit_reservation(
+                reservation_id, ai_provider=ai_provider_used, usage=usage
+            )
+        else:
+            await self.usage_service.release_reservation(reservation_id)
+
+    async def _store_file(self, user_id: str, file_content: bytes) -> Tuple[str, str]:
+        """Run upload steps 2-3: check the resume limit and store the PDF.
+
+        Args:
+            user_id: User's UUID.
+            file_content: Raw PDF bytes.
+
+        Returns:
+            Tuple of (new resume ID, storage path).
 
+        Raises:
+            ResumeLimitReachedError: If user is at the resume limit.
+            ApiException: If the storage upload fails.
+        """
         # Step 2: Check resume limit
         max_resumes = await self.usage_service.get_max_resumes(user_id)
         current_count = await self.get_resume_count(user_id)
@@ -93,7 +206,8 @@ class ResumeService:
         # Step 3: Upload file to Supabase Storage
         logger.info(f"Uploading resume to storage: {storage_path}, size={len(file_content)} bytes")
         try:
-            self.admin_client.storage.from_("resumes").upload(
+            await run_sync(
+                self.admin_client.storage.from_("resumes").upload,
                 path=storage_path,
                 file=file_content,
                 file_options={"content-type": "application/pdf"},
@@ -107,30 +221,57 @@ class ResumeService:
                 details={"error": str(e)},
             )
 
-        # Step 4: Extract text from PDF
-        try:
-            extracted_text = extract_text_from_pdf(file_content)
-        except ValueError as e:
-            # File uploaded but extraction failed - create record with failed status
-            logger.error(f"PDF extraction failed: {e}")
-            return await self._create_resume_record(
-                resume_id=resume_id,
-                user_id=user_id,
-                file_name=file_name,
-                file_path=storage_path,
-                parsed_data=None,
-                parse_status="failed",
-                ai_provider_used=None,
-            )
+        return resume_id, storage_path
+
+    async def _parse_file(
+        self,
+        file_content: bytes,
+        usage: Optional[TokenUsage] = None,
+        content_hash: Optional[str] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str], str, Optional[str]]:
+        """Run upload steps 4-5: extract the PDF text and parse it with AI.
+
+        Args:
+            file_content: Raw PDF bytes.
+            usage: Filled with the parse call's token counts, model and wall time.
+            content_hash: SHA-256 of file_content, the extracted-text cache key
+                (computed here if not given).
+
+        Returns:
+            Tuple of (parsed_data, prompt_digest, parse_status, ai_provider_used);
+            parse_status is "failed" (with no data) if extraction or every
+            provider failed.
+        """
+        # Step 4: Extract text from PDF (CPU-bound, kept off the event loop),
+        # unless the same file was extracted before (cross-user text cache)
+        if settings.resume_text_cache_ttl > 0 and content_hash is None:
+            content_hash = await asyncio.to_thread(resume_content_hash, file_content)
+        extracted_text = await get_cached_text(content_hash) if content_hash else None
+        if extracted_text is None:
+            try:
+                pdf_pool = get_pdf_pool()
+                if pdf_pool is not None:
+                    extracted_text = await pdf_pool.extract(file_content)
+                else:
+                    extracted_text = await asyncio.to_thread(
+                        extract_text_from_pdf, file_content, settings.pdf_max_pages
+                    )
+            except ValueError as e:
+                # File uploaded but extraction failed - record it with failed status
+                logger.error(f"PDF extraction failed: {e}")
+                return None, None, "failed", None
+            if content_hash:
+                await store_text(content_hash, extracted_text)
 
         # Step 5: Parse with AI (Claude primary, GPT fallback)
         parsed_data: Optional[Dict[str, Any]] = None
+        prompt_digest: Optional[str] = None
         ai_provider_used: Optional[str] = None
         parse_status = "failed"
 
         try:
             raw_parsed_data, ai_provider_used = await AIProviderFactory.parse_with_fallback(
-                extracted_text
+                extracted_text, usage=usage
             )
 
             # Validate parsed data against Pydantic schema
@@ -147,6 +288,45 @@ class ResumeService:
             # Both AI providers failed - still create record
             logger.error(f"AI parsing failed: {e}")
 
+        # Same canonical skill names as jobs.skills ("k8s" -> Kubernetes)
+        if parsed_data and isinstance(parsed_data.get("skills"), list):
+            parsed_data["skills"] = normalize_skills(parsed_data["skills"])
+
+        # Compact resume rendering used by every generation prompt
+        if parsed_data:
+            prompt_digest = build_resume_digest(parsed_data) or None
+
+        return parsed_data, prompt_digest, parse_status, ai_provider_used
+
+    async def _store_and_parse(
+        self,
+        user_id: str,
+        file_content: bytes,
+        file_name: str,
+        content_hash: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
+    ) -> Tuple[Dict[str, Any], str, Optional[str]]:
+        """Run upload steps 2-6 while the caller holds a credit reservation.
+
+        Args:
+            user_id: User's UUID.
+            file_content: Raw PDF bytes.
+            file_name: Original filename.
+            content_hash: SHA-256 of file_content.
+            usage: Filled with the parse call's token counts, model and wall time.
+
+        Returns:
+            Tuple of (upload result, parse_status, ai_provider_used).
+
+        Raises:
+            ResumeLimitReachedError: If user is at the resume limit.
+            ApiException: If the storage upload fails.
+        """
+        resume_id, storage_path = await self._store_file(user_id, file_content)
+        parsed_data, prompt_digest, parse_status, ai_provider_used = await self._parse_file(
+            file_content, usage=usage, content_hash=content_hash
+        )
+
         # Step 6: Insert resume record to database
         result = await self._create_resume_record(
             resume_id=resume_id,
@@ -156,19 +336,212 @@ class ResumeService:
             parsed_data=parsed_data,
             parse_status=parse_status,
             ai_provider_used=ai_provider_used,
+            prompt_digest=prompt_digest,
+            content_hash=content_hash,
         )
 
-        # Step 7: Record usage ONLY if parsing succeeded
-        if parse_status == "completed":
-            await self.usage_service.record_usage(
-                user_id=user_id,
-                operation_type="resume_parse",
-                ai_provider=ai_provider_used,
-                credits_used=1,
+        return result, parse_status, ai_provider_used
+
+    async def _store_and_enqueue(
+        self,
+        user_id: str,
+        file_content: bytes,
+        file_name: str,
+        reservation_id: str,
+        pool: ParseWorkerPool,
+        content_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Store the resume as pending and queue its parse.
+
+        Args:
+            user_id: User's UUID.
+            file_content: Raw PDF bytes.
+            file_name: Original filename.
+            reservation_id: Credit reservation the worker will settle.
+            pool: Running parse pool.
+            content_hash: SHA-256 of file_content.
+
+        Returns:
+            Upload result with parse_status "pending".
+
+        Raises:
+            ResumeLimitReachedError: If user is at the resume limit.
+            ApiException: If the storage upload fails.
+            Exception: If the parse job cannot be queued (the pending resume
+                and its file are removed first).
+        """
+        resume_id, storage_path = await self._store_file(user_id, file_content)
+        result = await self._create_resume_record(
+            resume_id=resume_id,
+            user_id=user_id,
+            file_name=file_name,
+            file_path=storage_path,
+            parsed_data=None,
+            parse_status="pending",
+            ai_provider_used=None,
+            content_hash=content_hash,
+        )
+
+        try:
+            response = await execute(
+                self.admin_client.table("resume_parse_jobs").insert(
+                    {
+                        "resume_id": resume_id,
+                        "user_id": user_id,
+                        "reservation_id": reservation_id,
+                        "file_path": storage_path,
+                    }
+                )
             )
+            job = ResumeParseJob.from_row(response.data[0])
+            job.file_content = file_content
+            pool.submit(job)
+        except Exception as e:
+            # The caller releases the reservation; without a job nothing would
+            # ever parse this resume, so don't leave it pending
+            logger.error(f"Failed to queue parse for resume {resume_id[:8]}...: {e}")
+            await self._discard_pending_resume(user_id, resume_id, storage_path)
+            raise
 
+        logger.info(f"Resume {resume_id[:8]}... queued for parsing (job {job.id[:8]}...)")
         return result
 
+    async def _discard_pending_resume(self, user_id: str, resume_id: str, storage_path: str) -> None:
+        """Delete a pending resume whose parse could not be queued.
+
+        Args:
+            user_id: User's UUID.
+            resume_id: Resume's UUID.
+            storage_path: Storage path of the uploaded PDF.
+        """
+        try:
+            # Also deletes a parse job row that was inserted (ON DELETE CASCADE)
+            await execute(self.admin_client.table("resumes").delete().eq("id", resume_id).eq("user_id", user_id))
+        except Exception as e:
+            logger.error(f"Failed to delete pending resume {resume_id[:8]}...: {e}")
+            return  # keep the file: the row still points at it
+
+        try:
+            await run_sync(self.admin_client.storage.from_("resumes").remove, [storage_path])
+        except Exception as e:
+            logger.error(f"Failed to delete storage file {storage_path}: {e}")
+
+    async def run_parse_job(self, job: ResumeParseJob) -> None:
+        """Parse a queued resume (called by the parse pool's workers).
+
+        Claims the job, parses the stored PDF, writes the result to the
+        resume row and settles the credit reservation. A job another worker
+        already claimed is skipped; one that has used up
+        `resume_parse_max_attempts` is failed without parsing.
+
+        Args:
+            job: Queued job.
+        """
+        jobs = self.admin_client.table("resume_parse_jobs")
+        claimed = await execute(
+            jobs.update({"status": "running", "attempts": job.attempts + 1})
+            .eq("id", job.id)
+            .eq("status", "queued")
+        )
+        if not claimed.data:
+            logger.info(f"Resume parse job {job.id[:8]}... already claimed, skipping")
+            return
+
+        usage = TokenUsage()
+        error: Optional[str] = None
+        try:
+            if job.attempts >= settings.resume_parse_max_attempts:
+                raise RuntimeError(f"gave up after {job.attempts} attempts")
+            content = job.file_content
+            if content is None:
+                content = await run_sync(self.admin_client.storage.from_("resumes").download, job.file_path)
+            parsed_data, prompt_digest, parse_status, ai_provider_used = await self._parse_file(content, usage=usage)
+        except Exception as e:
+            logger.error(f"Resume parse job {job.id[:8]}... failed: {e}")
+            parsed_data, prompt_digest, parse_status, ai_provider_used = None, None, "failed", None
+            error = str(e)
+
+        await execute(
+            self.admin_client.table("resumes")
+            .update({"parsed_data": parsed_data, "parse_status": parse_status, "prompt_digest": prompt_digest})
+            .eq("id", job.resume_id)
+        )
+        if job.reservation_id:
+            await self._settle_reservation(job.reservation_id, parse_status, ai_provider_used, usage)
+        await execute(
+            jobs.update({"status": "completed" if parse_status == "completed" else "failed", "error": error})
+            .eq("id", job.id)
+        )
+        logger.info(f"Resume {job.resume_id[:8]}... parsed in background: {parse_status}")
+
+    async def requeue_parse_jobs(self, pool: ParseWorkerPool) -> int:
+        """Re-submit parse jobs left over by a restart or a full queue.
+
+        Jobs "running" for longer than `resume_parse_stale_after` seconds
+        belonged to a process that died and are queued again first.
+
+        Args:
+            pool: Running parse pool.
+
+        Returns:
+            Number of jobs submitted.
+        """
+        jobs = self.admin_client.table("resume_parse_jobs")
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.resume_parse_stale_after)
+        await execute(
+            jobs.update({"status": "queued"}).eq("status", "running").lt("updated_at", stale_before.isoformat())
+        )
+        response = await execute(
+            jobs.select("*").eq("status", "queued").order("created_at").limit(settings.resume_parse_queue_size)
+        )
+        submitted = sum(pool.submit(ResumeParseJob.from_row(row)) for row in response.data or [])
+        if submitted:
+            logger.info(f"Requeued {submitted} resume parse jobs")
+        return submitted
+
+    async def parse_events(self, user_id: str, resume_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a resume's parse status until it is settled.
+
+        Events:
+        - status: {"parse_status": "pending"} while the parse is queued or running
+        - completed / failed: {"id", "parse_status", "parsed_data"} once settled
+
+        The stream ends after `resume_parse_events_timeout` seconds even if
+        the parse is still pending; clients reconnect or poll.
+
+        Args:
+            user_id: User's UUID.
+            resume_id: Resume's UUID.
+
+        Yields:
+            {"event", "data"} dictionaries.
+        """
+        deadline = time.monotonic() + settings.resume_parse_events_timeout
+        announced = False
+        while True:
+            resume = await self.get_resume(user_id, resume_id)
+            if not resume:
+                return
+            parse_status = resume["parse_status"]
+            if parse_status != "pending":
+                yield {
+                    "event": parse_status,
+                    "data": {"id": resume["id"], "parse_status": parse_status, "parsed_data": resume.get("parsed_data")},
+                }
+                return
+            if not announced:
+                yield {"event": "status", "data": {"parse_status": parse_status}}
+                announced = True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            timeout = min(settings.resume_parse_poll_interval, remaining)
+            pool = get_parse_pool()
+            if pool is not None:
+                await pool.wait(resume_id, timeout)
+            else:
+                await asyncio.sleep(timeout)
+
     async def _create_resume_record(
         self,
         resume_id: str,
@@ -178,6 +551,8 @@ class ResumeService:
         parsed_data: Optional[Dict[str, Any]],
         parse_status: str,
         ai_provider_used: Optional[str],
+        prompt_digest: Optional[str] = None,
+        content_hash: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Create resume record in database.
 
@@ -189,6 +564,8 @@ class ResumeService:
             parsed_data: Parsed resume data or None.
             parse_status: Status (pending, completed, failed).
             ai_provider_used: AI provider name or None.
+            prompt_digest: Compact resume rendering for prompts, or None.
+            content_hash: SHA-256 of the file, for duplicate detection.
 
         Returns:
             Dictionary with resume data and metadata.
@@ -200,14 +577,21 @@ class ResumeService:
             "file_path": file_path,
             "parsed_data": parsed_data,
             "parse_status": parse_status,
+            "prompt_digest": prompt_digest,
+            "content_hash": content_hash,
         }
 
         response = (
-            self.admin_client.table("resumes").insert(insert_data).execute()
+            await execute(self.admin_client.table("resumes").insert(insert_data))
         )
 
-        resume_record = response.data[0]
+        return self._upload_result(response.data[0], ai_provider_used)
 
+    @staticmethod
+    def _upload_result(
+        resume_record: Dict[str, Any], ai_provider_used: Optional[str], duplicate: bool = False
+    ) -> Dict[str, Any]:
+        """Shape a resumes row as the upload response."""
         return {
             "resume": {
                 "id": resume_record["id"],
@@ -220,6 +604,7 @@ class ResumeService:
                 "updated_at": resume_record["updated_at"],
             },
             "ai_provider_used": ai_provider_used,
+            "duplicate": duplicate,
         }
 
     async def list_resumes(self, user_id: str) -> list[dict]:
@@ -233,26 +618,15 @@ class ResumeService:
         """
         # Use admin client with manual user_id filtering (RLS requires user JWT in client)
         # Get user's active_resume_id
-        profile_response = (
-            self.admin_client.table("profiles")
-            .select("active_resume_id")
-            .eq("id", user_id)
-            .maybe_single()
-            .execute()
-        )
-        active_resume_id = (
-            profile_response.data.get("active_resume_id")
-            if profile_response and profile_response.data
-            else None
-        )
+        profile = await get_cached_profile(user_id)
+        active_resume_id = profile.get("active_resume_id") if profile else None
 
         # Get all resumes ordered by created_at DESC
-        resumes_response = (
+        resumes_response = await execute(
             self.admin_client.table("resumes")
             .select("*")
             .eq("user_id", user_id)
             .order("created_at", desc=True)
-            .execute()
         )
 
         # Add computed is_active field
@@ -275,27 +649,16 @@ class ResumeService:
         """
         # Use admin client with manual user_id filtering
         # Get user's active_resume_id
-        profile_response = (
-            self.admin_client.table("profiles")
-            .select("active_resume_id")
-            .eq("id", user_id)
-            .maybe_single()
-            .execute()
-        )
-        active_resume_id = (
-            profile_response.data.get("active_resume_id")
-            if profile_response and profile_response.data
-            else None
-        )
+        profile = await get_cached_profile(user_id)
+        active_resume_id = profile.get("active_resume_id") if profile else None
 
         # Get resume with user_id filtering
-        resume_response = (
+        resume_response = await execute(
             self.admin_client.table("resumes")
             .select("*")
             .eq("id", resume_id)
             .eq("user_id", user_id)
             .maybe_single()
-            .execute()
         )
 
         if not resume_response or not resume_response.data:
@@ -322,7 +685,8 @@ class ResumeService:
             ApiException: If signed URL generation fails.
         """
         try:
-            result = self.admin_client.storage.from_("resumes").create_signed_url(
+            result = await run_sync(
+                self.admin_client.storage.from_("resumes").create_signed_url,
                 path=file_path,
                 expires_in=expires_in,
             )
@@ -346,22 +710,24 @@ class ResumeService:
             True if successful, False if resume not found.
         """
         # Verify resume exists and belongs to user
-        resume_response = (
+        resume_response = await execute(
             self.admin_client.table("resumes")
             .select("id")
             .eq("id", resume_id)
             .eq("user_id", user_id)
             .maybe_single()
-            .execute()
         )
 
         if not resume_response or not resume_response.data:
             return False
 
         # Update profile's active_resume_id using admin client
-        self.admin_client.table("profiles").update(
-            {"active_resume_id": resume_id}
-        ).eq("id", user_id).execute()
+        await execute(
+            self.admin_client.table("profiles").update(
+                {"active_resume_id": resume_id}
+            ).eq("id", user_id)
+        )
+        invalidate_profile(user_id)
 
         return True
 
@@ -376,13 +742,12 @@ class ResumeService:
             True if successful, False if resume not found.
         """
         # 1. Verify resume exists and get file_path
-        resume_response = (
+        resume_response = await execute(
             self.admin_client.table("resumes")
             .select("id, file_path")
             .eq("id", resume_id)
             .eq("user_id", user_id)
             .maybe_single()
-            .execute()
         )
 
         if not resume_response or not resume_response.data:
@@ -391,31 +756,34 @@ class ResumeService:
         file_path = resume_response.data["file_path"]
 
         # 2. Check if this resume is active, clear if so
-        profile_response = (
-            self.admin_client.table("profiles")
-            .select("active_resume_id")
-            .eq("id", user_id)
-            .maybe_single()
-            .execute()
-        )
+        profile = await get_cached_profile(user_id)
 
-        if (
-            profile_response
-            and profile_response.data
-            and profile_response.data.get("active_resume_id") == resume_id
-        ):
-            self.admin_client.table("profiles").update(
-                {"active_resume_id": None}
-            ).eq("id", user_id).execute()
+        if profile and profile.get("active_resume_id") == resume_id:
+            await execute(
+                self.admin_client.table("profiles").update(
+                    {"active_resume_id": None}
+                ).eq("id", user_id)
+            )
+            invalidate_profile(user_id)
 
         # 3. Delete resume record
-        self.admin_client.table("resumes").delete().eq("id", resume_id).eq("user_id", user_id).execute()
+        await execute(self.admin_client.table("resumes").delete().eq("id", resume_id).eq("user_id", user_id))
 
         # 4. Delete storage file (handle errors gracefully)
         try:
-            self.admin_client.storage.from_("resumes").remove([file_path])
+            await run_sync(self.admin_client.storage.from_("resumes").remove, [file_path])
         except Exception as e:
             logger.error(f"Failed to delete storage file {file_path}: {e}")
             # Don't fail the request - record is deleted, storage will be orphaned
 
         return True
+
+
+def start_resume_parsing() -> None:
+    """Start the background parse pool (app lifespan).
+
+    The pool's sweep re-submits jobs left unfinished by a restart right away
+    and then whenever its queue runs dry.
+    """
+    service = ResumeService()
+    start_parse_pool(service.run_parse_job, refill=service.requeue_parse_jobs)
@@ -0,0 +1,230 @@
+"""Skill vocabulary and skill extraction.
+
+SKILL_TAXONOMY maps each canonical skill name to the other ways job ads and
+resumes write it ("k8s" and "kube" are Kubernetes). All names and synonyms
+are compiled once into an Aho-Corasick automaton, so extract_skills() finds
+every known skill in a job description in a single pass over the text,
+however large the vocabulary grows.
+
+Job skills are extracted when a job is saved or its description edited
+(description_fields() stores them in the indexed jobs.skills array) and
+resume skills are normalized to the same canonical names when a resume is
+parsed, so both sides compare by plain equality.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+SKILL_TAXONOMY: Dict[str, Tuple[str, ...]] = {
+    # Languages
+    "Python": ("python3",),
+    "Java": (),
+    "JavaScript": ("js", "ecmascript", "es6"),
+    "TypeScript": (),
+    "Go": ("golang",),
+    "Rust": (),
+    "C++": ("cpp",),
+    "C#": ("c sharp", "csharp"),
+    "Ruby": (),
+    "PHP": (),
+    "Kotlin": (),
+    "Swift": (),
+    "Scala": (),
+    "SQL": (),
+    "Bash": ("shell scripting",),
+    # Frameworks and runtimes
+    "Node.js": ("nodejs", "node js"),
+    "React": ("react.js", "reactjs"),
+    "React Native": (),
+    "Angular": ("angularjs", "angular.js"),
+    "Vue.js": ("vue", "vuejs"),
+    "Next.js": ("nextjs",),
+    "Django": (),
+    "Flask": (),
+    "FastAPI": ("fast api",),
+    "Spring": ("spring boot", "springboot"),
+    "Ruby on Rails": ("rails", "ror"),
+    ".NET": ("dotnet", "asp.net", ".net core"),
+    "GraphQL": (),
+    "REST APIs": ("restful", "rest api", "restful api", "restful apis"),
+    "gRPC": (),
+    # Data stores
+    "PostgreSQL": ("postgres", "psql"),
+    "MySQL": (),
+    "MongoDB": ("mongo",),
+    "Redis": (),
+    "Elasticsearch": ("elastic search", "opensearch"),
+    "DynamoDB": ("dynamo db",),
+    "Snowflake": (),
+    "Kafka": ("apache kafka",),
+    "Spark": ("apache spark", "pyspark"),
+    "Airflow": ("apache airflow",),
+    # Cloud and infrastructure
+    "AWS": ("amazon web services",),
+    "GCP": ("google cloud", "google cloud platform"),
+    "Azure": ("microsoft azure",),
+    "Docker": ("containers", "containerization"),
+    "Kubernetes": ("k8s", "kube"),
+    "Terraform": ("hcl",),
+    "Ansible": (),
+    "Linux": (),
+    "CI/CD": ("ci cd", "continuous integration", "continuous delivery", "continuous deployment"),
+    "GitHub Actions": (),
+    "Jenkins": (),
+    "Git": (),
+    "Microservices": ("micro services", "microservice architecture"),
+    "Serverless": ("aws lambda", "lambda functions"),
+    # Data and ML
+    "Machine Learning": ("ml",),
+    "Deep Learning": (),
+    "NLP": ("natural language processing",),
+    "Computer Vision": (),
+    "LLMs": ("llm", "large language models", "large language model"),
+    "PyTorch": ("torch",),
+    "TensorFlow": ("tf2",),
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "Pandas": (),
+    "NumPy": (),
+    "Data Analysis": ("data analytics",),
+    "Tableau": (),
+    "Power BI": ("powerbi",),
+    "Excel": ("microsoft excel", "ms excel"),
+    # Practices and roles
+    "Agile": ("scrum", "kanban"),
+    "Test Automation": ("automated testing",),
+    "Unit Testing": ("unit tests",),
+    "System Design": ("distributed systems",),
+    "Security": ("cybersecurity", "application security", "appsec"),
+    "UX Design": ("ux", "user experience"),
+    "UI Design": ("ui", "user interface design"),
+    "Figma": (),
+    "Product Management": ("product manager",),
+    "Project Management": ("project manager", "pmp"),
+    "Salesforce": ("sfdc",),
+    "SEO": ("search engine optimization",),
+}
+
+# Names that are ordinary words in prose ("go to market", "excel at"); they
+# are normalized in skill lists but only their unambiguous synonyms are
+# extracted from text
+_PROSE_WORDS = frozenset({"go", "swift", "excel"})
+
+_Automaton = Tuple[List[Dict[str, int]], List[int], List[List[Tuple[int, str]]]]
+
+
+def _build_automaton(taxonomy: Dict[str, Iterable[str]]) -> Tuple[_Automaton, Dict[str, str]]:
+    """Compile names and synonyms into an Aho-Corasick automaton.
+
+    Returns:
+        ((goto, fail, output), lowercased name or synonym -> canonical name).
+        output[state] lists (pattern length, canonical name) for every
+        pattern ending in that state, including via fail links.
+    """
+    canonical: Dict[str, str] = {}
+    for name, synonyms in taxonomy.items():
+        for pattern in (name, *synonyms):
+            canonical.setdefault(pattern.lower(), name)
+
+    goto: List[Dict[str, int]] = [{}]
+    output: List[List[Tuple[int, str]]] = [[]]
+    for pattern, name in canonical.items():
+        if pattern in _PROSE_WORDS:
+            continue
+        state = 0
+        for char in pattern:
+            if char not in goto[state]:
+                goto.append({})
+                output.append([])
+                goto[state][char] = len(goto) - 1
+            state = goto[state][char]
+        output[state].append((len(pattern), name))
+
+    # Breadth-first fail links: the longest proper suffix that is also a prefix
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, child in goto[state].items():
+            queue.append(child)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            target = goto[fallback].get(char, 0)
+            fail[child] = target if target != child else 0
+            output[child] = output[child] + output[fail[child]]
+    return (goto, fail, output), canonical
+
+
+_AUTOMATON, _CANONICAL = _build_automaton(SKILL_TAXONOMY)
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """Whether text[index] is outside a word (or past either end)."""
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+def extract_skills(text: str) -> List[str]:
+    """Find the known skills mentioned in text.
+
+    Matches are case-insensitive and whole-word; where matches overlap, the
+    longest wins ("React Native" is not also React).
+
+    Args:
+        text: Any text, e.g. a job description.
+
+    Returns:
+        Canonical skill names in order of first mention, without duplicates.
+    """
+    if not isinstance(text, str) or not text:
+        return []
+    goto, fail, output = _AUTOMATON
+    lowered = text.lower()
+
+    matches: List[Tuple[int, int, str]] = []
+    state = 0
+    for end, char in enumerate(lowered):
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        for length, name in output[state]:
+            start = end - length + 1
+            if _is_boundary(lowered, start - 1) and _is_boundary(lowered, end + 1):
+                matches.append((start, end, name))
+
+    # Leftmost-longest, non-overlapping
+    matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+    skills: List[str] = []
+    covered_to = -1
+    for start, end, name in matches:
+        if start <= covered_to:
+            continue
+        covered_to = end
+        if name not in skills:
+            skills.append(name)
+    return skills
+
+
+def normalize_skills(skills: Iterable[str]) -> List[str]:
+    """Map skills to their canonical names.
+
+    Known names and synonyms become the canonical name ("k8s" -> Kubernetes);
+    unknown skills are kept with whitespace trimmed. Duplicates (after
+    mapping, case-insensitive) are dropped.
+
+    Args:
+        skills: Skills as written, e.g. from a parsed resume.
+
+    Returns:
+        Normalized skills in their original order.
+    """
+    normalized: List[str] = []
+    seen = set()
+    for skill in skills:
+        if not isinstance(skill, str):
+            continue
+        cleaned = " ".join(skill.split())
+        name = _CANONICAL.get(cleaned.lower(), cleaned)
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            normalized.append(name)
+    return normalized
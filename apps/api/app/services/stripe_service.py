@@ -69,15 +69,20 @@ class MockStripeService(StripeService):
         db_tier = self.TIER_MAPPING.get(tier, "pro")
 
         from app.db.client import get_supabase_admin_client
+        from app.db.executor import execute
+        from app.db.profile_cache import invalidate_profile
 
         admin_client = get_supabase_admin_client()
-        admin_client.table("profiles").update(
-            {
-                "subscription_tier": db_tier,
-                "subscription_status": "active",
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-            }
-        ).eq("id", user_id).execute()
+        await execute(
+            admin_client.table("profiles").update(
+                {
+                    "subscription_tier": db_tier,
+                    "subscription_status": "active",
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                }
+            ).eq("id", user_id)
+        )
+        invalidate_profile(user_id)
 
         # Audit log for subscription tier changes (critical for billing reconciliation)
         logger.warning(
@@ -4,8 +4,19 @@ import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-from app.core.exceptions import AuthenticationError, ErrorCode
+from app.core.config import settings
+from app.core.exceptions import AuthenticationError, CreditExhaustedError, ErrorCode
 from app.db.client import get_supabase_admin_client
+from app.db.config_cache import (
+    DEFAULT_REFERRAL_BONUS_CREDITS,
+    get_referral_bonus_credits,
+    get_tier_limits as get_cached_tier_limits,
+)
+from app.db.executor import execute
+from app.db.profile_cache import get_cached_profile
+from app.models.usage import TierLimits
+from app.services.ai.metering import usage_columns
+from app.services.ai.provider import TokenUsage
 
 logger = logging.getLogger(__name__)
 
@@ -17,30 +28,13 @@ class UsageService:
         """Initialize usage service with admin client."""
         self.admin_client = get_supabase_admin_client()
 
-    async def get_tier_limits(self) -> Dict[str, Any]:
-        """Get tier limits from global_config.
+    async def get_tier_limits(self) -> TierLimits:
+        """Get tier limits from global_config (process-level cached).
 
         Returns:
-            Dictionary of tier configurations.
+            Typed tier configurations.
         """
-        response = (
-            self.admin_client.table("global_config")
-            .select("value")
-            .eq("key", "tier_limits")
-            .single()
-            .execute()
-        )
-
-        if response.data:
-            return response.data["value"]
-
-        # Fallback defaults if config not found
-        logger.warning("tier_limits not found in global_config, using defaults")
-        return {
-            "free": {"type": "lifetime", "credits": 5, "max_resumes": 5},
-            "pro": {"type": "monthly", "credits": 100, "max_resumes": 10},
-            "unlimited": {"type": "monthly", "credits": -1, "max_resumes": 25},
-        }
+        return await get_cached_tier_limits()
 
     async def get_user_tier(self, user_id: str) -> str:
         """Get user's subscription tier from profile.
@@ -54,19 +48,13 @@ class UsageService:
         Raises:
             AuthenticationError: If user profile not found.
         """
-        response = (
-            self.admin_client.table("profiles")
-            .select("subscription_tier")
-            .eq("id", user_id)
-            .single()
-            .execute()
-        )
+        profile = await get_cached_profile(user_id)
 
-        if not response.data:
+        if not profile:
             logger.error(f"User profile not found for user_id: {user_id[:8]}...")
             raise AuthenticationError()
 
-        return response.data.get("subscription_tier", "free")
+        return profile.get("subscription_tier", "free")
 
     def _get_period_key(self, period_type: str) -> str:
         """Get the period key for a given period type.
@@ -82,13 +70,44 @@ class UsageService:
         # Monthly format: YYYY-MM
         return datetime.now(timezone.utc).strftime("%Y-%m")
 
+    async def _get_period_balance(
+        self, user_id: str, period_type: str, period_key: str
+    ) -> Dict[str, Any]:
+        """Read the user's credit ledger row for a period.
+
+        credit_balances is maintained by trigger from usage_events, so this is
+        a single-row primary key lookup regardless of usage history size.
+
+        Args:
+            user_id: User's UUID.
+            period_type: Either 'lifetime' or 'monthly'.
+            period_key: Period key (see _get_period_key).
+
+        Returns:
+            Dict with credits_used and usage_by_type (zeros if no usage yet).
+        """
+        response = await execute(
+            self.admin_client.table("credit_balances")
+            .select("credits_used, usage_by_type")
+            .eq("user_id", user_id)
+            .eq("period_type", period_type)
+            .eq("period_key", period_key)
+            .maybe_single()
+        )
+
+        if not response or not response.data:
+            return {"credits_used": 0, "usage_by_type": {}}
+        return {
+            "credits_used": response.data.get("credits_used") or 0,
+            "usage_by_type": response.data.get("usage_by_type") or {},
+        }
+
     async def check_credits(self, user_id: str) -> bool:
         """Check if user has remaining credits.
 
-        WARNING: Race condition possible between check and record_usage.
-        In high-concurrency scenarios, multiple requests could pass this check
-        before any record_usage completes. Consider implementing optimistic locking
-        or database-level constraints for production use.
+        Advisory only: concurrent requests can all pass this check before any
+        usage is recorded. Gate credit-consuming operations with
+        reserve_credits() instead.
 
         Args:
             user_id: User's UUID.
@@ -98,33 +117,121 @@ class UsageService:
         """
         tier = await self.get_user_tier(user_id)
         limits = await self.get_tier_limits()
-        tier_config = limits.get(tier, limits["free"])
+        tier_config = limits.for_tier(tier)
 
         # Unlimited credits
-        if tier_config["credits"] == -1:
+        if tier_config.is_unlimited:
             return True
 
-        period_type = tier_config["type"]
+        period_type = tier_config.type
         period_key = self._get_period_key(period_type)
 
-        # Sum credits used in current period
-        response = (
-            self.admin_client.table("usage_events")
-            .select("credits_used")
-            .eq("user_id", user_id)
-            .eq("period_type", period_type)
-            .eq("period_key", period_key)
-            .execute()
+        balance = await self._get_period_balance(user_id, period_type, period_key)
+        used = balance["credits_used"]
+        remaining = tier_config.credits - used
+
+        logger.info(
+            f"Credit check for user {user_id[:8]}...: {used}/{tier_config.credits} used, {remaining} remaining"
         )
 
-        used = sum(row["credits_used"] for row in response.data) if response.data else 0
-        remaining = tier_config["credits"] - used
+        return remaining > 0
+
+    async def reserve_credits(
+        self, user_id: str, operation_type: str, credits: int = 1
+    ) -> str:
+        """Atomically check and hold credits for an operation.
+
+        Runs the reserve_credits Postgres function, which resolves the tier,
+        locks the user's credit_balances row and holds the credits in one
+        transaction, so concurrent requests cannot overspend. Follow with
+        commit_reservation() on success or release_reservation() on failure;
+        abandoned reservations expire after `credit_reservation_ttl` seconds.
+
+        Args:
+            user_id: User's UUID.
+            operation_type: Type of operation (resume_parse, match, etc.).
+            credits: Number of credits to hold.
+
+        Returns:
+            Reservation ID.
+
+        Raises:
+            CreditExhaustedError: If the user does not have enough credits.
+        """
+        response = await execute(
+            self.admin_client.rpc(
+                "reserve_credits",
+                {
+                    "p_user_id": user_id,
+                    "p_operation_type": operation_type,
+                    "p_credits": credits,
+                    "p_ttl_seconds": settings.credit_reservation_ttl,
+                },
+            )
+        )
+
+        reservation_id = response.data if response else None
+        if not reservation_id:
+            logger.warning(
+                f"Credit reservation refused for user {user_id[:8]}...: op={operation_type}, credits={credits}"
+            )
+            raise CreditExhaustedError()
 
         logger.info(
-            f"Credit check for user {user_id[:8]}...: {used}/{tier_config['credits']} used, {remaining} remaining"
+            f"Reserved credits: user={user_id[:8]}..., op={operation_type}, "
+            f"credits={credits}, reservation={reservation_id[:8]}..."
         )
+        return reservation_id
 
-        return remaining > 0
+    async def commit_reservation(
+        self,
+        reservation_id: str,
+        ai_provider: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
+        credits: Optional[int] = None,
+    ) -> None:
+        """Charge a reservation, recording its usage event.
+
+        Args:
+            reservation_id: ID returned by reserve_credits().
+            ai_provider: AI provider used (claude, gpt).
+            usage: Metered tokens, latency and model of the AI call.
+            credits: Credits to charge, at most the reserved amount; the rest
+                is returned. None charges the whole reservation.
+        """
+        params = {"p_reservation_id": reservation_id, "p_ai_provider": ai_provider}
+        params.update({f"p_{column}": value for column, value in usage_columns(usage).items()})
+        if credits is not None:
+            params["p_credits"] = credits
+        response = await execute(self.admin_client.rpc("commit_credit_reservation", params))
+
+        if not response or not response.data:
+            logger.warning(f"Reservation {reservation_id[:8]}... was not pending, nothing committed")
+            return
+
+        logger.info(
+            f"Committed reservation {reservation_id[:8]}..., provider={ai_provider}"
+            + (f", tokens={usage.input_tokens}/{usage.output_tokens}" if usage else "")
+        )
+
+    async def release_reservation(self, reservation_id: str) -> None:
+        """Return a reservation's credits without charging.
+
+        Failures are logged and swallowed: the reservation then expires on
+        its own, and the caller is usually already handling another error.
+
+        Args:
+            reservation_id: ID returned by reserve_credits().
+        """
+        try:
+            await execute(
+                self.admin_client.rpc(
+                    "release_credit_reservation", {"p_reservation_id": reservation_id}
+                )
+            )
+            logger.info(f"Released reservation {reservation_id[:8]}...")
+        except Exception as e:
+            logger.error(f"Failed to release reservation {reservation_id[:8]}...: {e}")
 
     async def get_max_resumes(self, user_id: str) -> int:
         """Get maximum resumes allowed for user's tier.
@@ -137,8 +244,8 @@ class UsageService:
         """
         tier = await self.get_user_tier(user_id)
         limits = await self.get_tier_limits()
-        tier_config = limits.get(tier, limits["free"])
-        return tier_config.get("max_resumes", 5)
+        tier_config = limits.for_tier(tier)
+        return tier_config.max_resumes
 
     async def record_usage(
         self,
@@ -146,6 +253,7 @@ class UsageService:
         operation_type: str,
         ai_provider: Optional[str] = None,
         credits_used: int = 1,
+        usage: Optional[TokenUsage] = None,
     ) -> None:
         """Record a usage event.
 
@@ -154,24 +262,28 @@ class UsageService:
             operation_type: Type of operation (resume_parse, match, etc.).
             ai_provider: AI provider used (claude, gpt).
             credits_used: Number of credits consumed.
+            usage: Metered tokens, latency and model of the AI call.
         """
         tier = await self.get_user_tier(user_id)
         limits = await self.get_tier_limits()
-        tier_config = limits.get(tier, limits["free"])
+        tier_config = limits.for_tier(tier)
 
-        period_type = tier_config["type"]
+        period_type = tier_config.type
         period_key = self._get_period_key(period_type)
 
-        self.admin_client.table("usage_events").insert(
-            {
-                "user_id": user_id,
-                "operation_type": operation_type,
-                "ai_provider": ai_provider,
-                "credits_used": credits_used,
-                "period_type": period_type,
-                "period_key": period_key,
-            }
-        ).execute()
+        await execute(
+            self.admin_client.table("usage_events").insert(
+                {
+                    "user_id": user_id,
+                    "operation_type": operation_type,
+                    "ai_provider": ai_provider,
+                    "credits_used": credits_used,
+                    "period_type": period_type,
+                    "period_key": period_key,
+                    **usage_columns(usage),
+                }
+            )
+        )
 
         logger.info(
             f"Recorded usage: user={user_id[:8]}..., op={operation_type}, credits={credits_used}"
@@ -194,23 +306,15 @@ class UsageService:
 
         tier = await self.get_user_tier(user_id)
         limits = await self.get_tier_limits()
-        tier_config = limits.get(tier, limits["free"])
+        tier_config = limits.for_tier(tier)
 
-        period_type = tier_config["type"]
+        period_type = tier_config.type
         period_key = self._get_period_key(period_type)
-        credits_limit = tier_config["credits"]
+        credits_limit = tier_config.credits
 
-        # Query all usage events for current period
-        response = (
-            self.admin_client.table("usage_events")
-            .select("credits_used, operation_type")
-            .eq("user_id", user_id)
-            .eq("period_type", period_type)
-            .eq("period_key", period_key)
-            .execute()
-        )
+        balance = await self._get_period_balance(user_id, period_type, period_key)
 
-        # Aggregate by operation type
+        # Breakdown by operation type (known types only)
         usage_by_type = {
             "match": 0,
             "cover_letter": 0,
@@ -219,14 +323,10 @@ class UsageService:
             "resume_parse": 0,
             "referral_bonus": 0,
         }
-        total_used = 0
-
-        for event in response.data or []:
-            op_type = event.get("operation_type", "")
-            credits = event.get("credits_used", 0)
-            total_used += credits
+        for op_type, credits in balance["usage_by_type"].items():
             if op_type in usage_by_type:
                 usage_by_type[op_type] += credits
+        total_used = balance["credits_used"]
 
         # Handle unlimited tier
         if credits_limit == -1:
@@ -235,24 +335,16 @@ class UsageService:
             credits_remaining = credits_limit - total_used
 
         # Get subscription info and deletion status from profile
-        profile_response = (
-            self.admin_client.table("profiles")
-            .select("subscription_status, deletion_token_expires")
-            .eq("id", user_id)
-            .single()
-            .execute()
-        )
+        profile = await get_cached_profile(user_id)
 
         subscription_status = (
-            profile_response.data.get("subscription_status", "active")
-            if profile_response.data
-            else "active"
+            profile.get("subscription_status", "active") if profile else "active"
         )
 
         # Check for pending deletion
         pending_deletion_expires = None
-        if profile_response.data:
-            expires_str = profile_response.data.get("deletion_token_expires")
+        if profile:
+            expires_str = profile.get("deletion_token_expires")
             if expires_str and isinstance(expires_str, str):
                 # Check if not expired
                 try:
@@ -311,13 +403,12 @@ class UsageService:
         start = (page - 1) * page_size
         end = start + page_size - 1
 
-        response = (
+        response = await execute(
             self.admin_client.table("usage_events")
             .select("*", count="exact")
             .eq("user_id", user_id)
             .order("created_at", desc=True)
             .range(start, end)
-            .execute()
         )
 
         return {
@@ -334,22 +425,13 @@ class UsageService:
             Referral bonus credits (default 5 if not configured).
         """
         try:
-            response = (
-                self.admin_client.table("global_config")
-                .select("value")
-                .eq("key", "referral_bonus_credits")
-                .single()
-                .execute()
-            )
-
-            if response.data:
-                return int(response.data["value"])
+            return await get_referral_bonus_credits()
         except Exception as e:
             logger.warning(
                 f"Failed to get referral_bonus_credits from config: {e}, using default"
             )
 
-        return 5
+        return DEFAULT_REFERRAL_BONUS_CREDITS
 
     async def add_referral_credits(
         self, user_id: str, bonus_credits: int | None = None
@@ -369,16 +451,18 @@ class UsageService:
         if bonus_credits is None:
             bonus_credits = await self.get_referral_bonus_amount()
 
-        self.admin_client.table("usage_events").insert(
-            {
-                "user_id": user_id,
-                "operation_type": "referral_bonus",
-                "ai_provider": "system",
-                "credits_used": -bonus_credits,  # Negative = add credits
-                "period_type": "lifetime",
-                "period_key": "lifetime",
-            }
-        ).execute()
+        await execute(
+            self.admin_client.table("usage_events").insert(
+                {
+                    "user_id": user_id,
+                    "operation_type": "referral_bonus",
+                    "ai_provider": "system",
+                    "credits_used": -bonus_credits,  # Negative = add credits
+                    "period_type": "lifetime",
+                    "period_key": "lifetime",
+                }
+            )
+        )
 
         logger.info(
             f"Referral credits added - user: {user_id[:8]}..., amount: {bonus_credits}"
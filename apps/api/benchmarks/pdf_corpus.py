@@ -0,0 +1,156 @@
+"""Synthetic PDF documents for the extraction benchmarks and tests.
+
+build_pdf() writes plain multi-page text; sample_resumes() lays the
+benchmark resume (prompt_tokens.SAMPLE_RESUME) out the ways real resumes
+are typeset: single column, a two-column sidebar layout, small dense type,
+several pages, and words placed individually with no space characters (as
+many design tools export them).
+"""
+
+import textwrap
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.prompt_tokens import SAMPLE_RESUME
+
+# (x, y, font size, text, bold)
+Run = Tuple[float, float, float, str, bool]
+
+_LINE = (
+    "Led the redesign of the payments ledger API in FastAPI and PostgreSQL, cutting p99 latency "
+    "from 480ms to 95ms and mentoring four engineers."
+)
+_PAGE_TOP = 800.0
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_from_pages(pages: List[List[Run]]) -> bytes:
+    """A minimal valid PDF drawing the given text runs (Helvetica / Helvetica-Bold)."""
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>",
+    ]
+    kids = []
+    for runs in pages:
+        ops = [
+            f"BT /{'F2' if bold else 'F1'} {size:g} Tf {x:g} {y:g} Td ({_escape(text)}) Tj ET"
+            for x, y, size, text, bold in runs
+        ]
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(pages))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def build_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """A PDF with `pages` pages of numbered 9pt lines ("Page 2, line 3: ...")."""
+    return pdf_from_pages(
+        [
+            [(40, _PAGE_TOP - 11 * line, 9, f"Page {page + 1}, line {line + 1}: {_LINE[:90]}", False)
+             for line in range(lines_per_page)]
+            for page in range(pages)
+        ]
+    )
+
+
+class _Column:
+    """Flows wrapped lines down a column, starting new pages as needed."""
+
+    def __init__(self, pages: List[List[Run]], x: float, width: float, size: float, page: int = 0):
+        self.pages, self.x, self.size, self.page = pages, x, size, page
+        self.chars = int(width / (size * 0.5))  # Helvetica averages ~0.5em per character
+        self.y = _PAGE_TOP
+
+    def write(self, text: str, bold: bool = False, size: float = 0.0, gap: float = 0.0) -> None:
+        size = size or self.size
+        self.y -= gap
+        for line in textwrap.wrap(text, self.chars) or [""]:
+            if self.y < 50:
+                self.page += 1
+                self.y = _PAGE_TOP
+            while len(self.pages) <= self.page:
+                self.pages.append([])
+            self.pages[self.page].append((self.x, self.y, size, line, bold))
+            self.y -= size * 1.3
+
+
+def _write_resume(main: _Column, side: _Column, resume: Dict[str, Any]) -> None:
+    contact = resume["contact"]
+    main.write(f"{contact['first_name']} {contact['last_name']}", bold=True, size=main.size * 2)
+    side.y = main.y
+    side.write("Contact", bold=True)
+    for key in ("email", "phone", "location", "linkedin_url"):
+        side.write(contact[key])
+    main.write("Summary", bold=True, gap=8)
+    main.write(resume["summary"])
+    main.write("Experience", bold=True, gap=8)
+    for job in resume["experience"]:
+        dates = f"{job['start_date']} - {job['end_date'] or 'Present'}"
+        main.write(f"{job['title']}, {job['company']} ({dates})", bold=True, gap=4)
+        for sentence in job["description"].split(". "):
+            main.write(f"- {sentence.rstrip('.')}.")
+    side.write("Education", bold=True, gap=8)
+    for school in resume["education"]:
+        side.write(f"{school['degree']}, {school['institution']} {school['graduation_year']}")
+    side.write("Skills", bold=True, gap=8)
+    side.write(", ".join(dict.fromkeys(resume["skills"])))
+
+
+def _word_positioned(pages: List[List[Run]]) -> List[List[Run]]:
+    """Each word as its own run, placed by x offset with no space characters."""
+    placed = []
+    for runs in pages:
+        words = []
+        for x, y, size, text, bold in runs:
+            for word in text.split():
+                words.append((x, y, size, word, bold))
+                x += (len(word) + 1) * size * 0.5
+        placed.append(words)
+    return placed
+
+
+def sample_resumes() -> Dict[str, bytes]:
+    """The benchmark resume typeset in several common layouts."""
+    corpus = {}
+
+    pages: List[List[Run]] = []
+    column = _Column(pages, 50, 510, 10)
+    _write_resume(column, column, SAMPLE_RESUME)
+    corpus["single-column"] = pdf_from_pages(pages)
+    corpus["word-positioned"] = pdf_from_pages(_word_positioned(pages))
+
+    pages = []
+    _write_resume(_Column(pages, 200, 360, 10), _Column(pages, 40, 140, 9), SAMPLE_RESUME)
+    corpus["two-column"] = pdf_from_pages(pages)
+
+    pages = []
+    column = _Column(pages, 40, 530, 7)
+    _write_resume(column, column, SAMPLE_RESUME)
+    corpus["dense-7pt"] = pdf_from_pages(pages)
+
+    # Three pages: the experience section repeated as an older-roles history
+    long_resume = {**SAMPLE_RESUME, "experience": SAMPLE_RESUME["experience"] * 5}
+    pages = []
+    column = _Column(pages, 50, 510, 11)
+    _write_resume(column, column, long_resume)
+    corpus["multi-page"] = pdf_from_pages(pages)
+    return corpus
@@ -0,0 +1,83 @@
+"""PDF extraction engines compared on a resume corpus: speed and agreement.
+
+For each document and engine in PDF_ENGINES, reports pages per second and
+character-level agreement with pdfplumber (difflib ratio over the text with
+whitespace collapsed, 100% = identical), and whether the quality checks in
+extract_text_from_pdf() would send that engine's output to the pdfplumber
+fallback.
+
+Usage (from apps/api):
+    uv run python -m benchmarks.pdf_engines [--repeat 5] [path/to/resume.pdf | directory ...]
+
+Without paths the synthetic layouts from benchmarks/pdf_corpus.py are used;
+pass a directory of real resumes for numbers that mean something.
+"""
+
+import argparse
+import difflib
+import os
+import time
+from typing import Dict, List
+
+from app.services.pdf_parser import PDF_ENGINES, _join_pages, _quality_problem
+from benchmarks.pdf_corpus import sample_resumes
+
+REFERENCE = "pdfplumber"
+
+
+def _agreement(text: str, reference: str) -> float:
+    """Character-level similarity (0-1) ignoring whitespace differences."""
+    return difflib.SequenceMatcher(None, " ".join(text.split()), " ".join(reference.split()), autojunk=False).ratio()
+
+
+def _load(paths: List[str]) -> Dict[str, bytes]:
+    documents = {}
+    for path in paths:
+        files = (
+            [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.lower().endswith(".pdf")]
+            if os.path.isdir(path)
+            else [path]
+        )
+        for file in files:
+            with open(file, "rb") as f:
+                documents[os.path.basename(file)] = f.read()
+    return documents
+
+
+def main() -> None:
+    """Print pages/sec and agreement with pdfplumber per engine and document."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="PDF files or directories (default: synthetic corpus)")
+    parser.add_argument("--repeat", type=int, default=5, help="extractions per document and engine")
+    args = parser.parse_args()
+
+    documents = _load(args.paths) if args.paths else sample_resumes()
+    totals = {engine: [0, 0.0, 0] for engine in PDF_ENGINES}  # pages, seconds, fallbacks
+
+    print(f"  {'document':<22}{'engine':<12}{'pages/s':>9}{'agreement':>11}  fallback")
+    for name, content in documents.items():
+        texts = {}
+        # The reference first, so the others can be compared with it
+        for engine in sorted(PDF_ENGINES, key=lambda engine: engine != REFERENCE):
+            extract = PDF_ENGINES[engine]
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                pages = extract(content, None)
+            elapsed = (time.perf_counter() - start) / args.repeat
+            texts[engine] = _join_pages(pages)
+            problem = _quality_problem(texts[engine], len(pages)) if engine != REFERENCE else None
+            totals[engine][0] += len(pages)
+            totals[engine][1] += elapsed
+            totals[engine][2] += problem is not None
+            agreement = _agreement(texts[engine], texts[REFERENCE])
+            print(f"  {name:<22}{engine:<12}{len(pages) / elapsed:>9.1f}{agreement:>10.1%}  {problem or '-'}")
+
+    print(f"\n  {'all documents':<22}{'engine':<12}{'pages/s':>9}{'speedup':>11}  fallbacks")
+    reference_rate = totals[REFERENCE][0] / totals[REFERENCE][1]
+    for engine, (pages, seconds, fallbacks) in totals.items():
+        rate = pages / seconds
+        print(f"  {'':<22}{engine:<12}{rate:>9.1f}{rate / reference_rate:>10.1f}x  {fallbacks}/{len(documents)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""PDF text extraction throughput with 1, 4 and 8 worker processes.
+
+Extracts a batch of documents concurrently through PdfExtractionPool and
+reports documents per second and the worst event-loop stall seen while the
+batch ran, next to the in-thread baseline (PDF_EXTRACT_WORKERS=0). The
+stall column is what other requests on the same API worker experience.
+
+Usage (from apps/api):
+    uv run python -m benchmarks.pdf_extract [--documents 32] [--pages 3] [path/to/file.pdf ...]
+
+Without paths, synthetic text PDFs of --pages pages are generated. Worker
+processes are spawned and warmed before timing starts.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from app.services.pdf_parser import PdfExtractionPool, extract_text_from_pdf
+from benchmarks.pdf_corpus import build_pdf
+
+
+async def _timed(extract: Callable[[bytes], Awaitable[str]], documents: List[bytes]) -> Tuple[float, float]:
+    """(seconds for the batch, longest event-loop stall in seconds)."""
+    stall = 0.0
+    done = False
+
+    async def probe() -> None:
+        nonlocal stall
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stall = max(stall, time.perf_counter() - before - 0.005)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(extract(document) for document in documents))
+    elapsed = time.perf_counter() - start
+    done = True
+    await probe_task
+    return elapsed, stall
+
+
+async def _run(documents: List[bytes], worker_counts: List[int], max_pages: int) -> None:
+    print(f"{len(documents)} documents, {os.cpu_count()} CPUs")
+    print(f"  {'mode':<14}{'seconds':>9}{'docs/s':>9}{'max stall':>11}")
+
+    def thread_extract(document: bytes) -> Awaitable[str]:
+        return asyncio.to_thread(extract_text_from_pdf, document, max_pages)
+
+    rows = [("thread", thread_extract, None)]
+    for workers in worker_counts:
+        pool = PdfExtractionPool(workers, max_pages, timeout=120.0, memory_mb=1024)
+        rows.append((f"{workers} process(es)", pool.extract, pool))
+
+    for label, extract, pool in rows:
+        # Warm-up: spawn the processes and import pdfplumber outside the timing
+        await asyncio.gather(*(extract(document) for document in documents[: pool._workers if pool else 1]))
+        elapsed, stall = await _timed(extract, documents)
+        print(f"  {label:<14}{elapsed:>9.2f}{len(documents) / elapsed:>9.1f}{stall * 1000:>9.0f}ms")
+        if pool is not None:
+            pool.shutdown()
+
+
+def main() -> None:
+    """Print extraction throughput per worker count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="PDF files to extract (default: synthetic)")
+    parser.add_argument("--documents", type=int, default=32, help="documents per batch")
+    parser.add_argument("--pages", type=int, default=3, help="pages per synthetic document")
+    parser.add_argument("--max-pages", type=int, default=20, help="page cap per document")
+    args = parser.parse_args()
+
+    if args.paths:
+        sources = []
+        for path in args.paths:
+            with open(path, "rb") as f:
+                sources.append(f.read())
+        documents = [sources[index % len(sources)] for index in range(args.documents)]
+    else:
+        documents = [build_pdf(args.pages)] * args.documents
+    asyncio.run(_run(documents, [1, 4, 8], args.max_pages))
+
+
+if __name__ == "__main__":
+    main()
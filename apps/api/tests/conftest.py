@@ -3,7 +3,31 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.db.config_cache import invalidate_config
+from app.db.match_cache import clear_match_cache
+from app.db.profile_cache import clear_profile_cache
+from app.db.text_cache import clear_text_cache
 from app.main import app
+from app.services.pdf_service import clear_pdf_cache
+from app.services.ai.engine import get_engine
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    """Keep cached profiles, config and AI provider health from leaking between tests."""
+    clear_profile_cache()
+    invalidate_config()
+    clear_match_cache()
+    clear_text_cache()
+    clear_pdf_cache()
+    yield
+    clear_profile_cache()
+    invalidate_config()
+    clear_match_cache()
+    clear_text_cache()
+    clear_pdf_cache()
+    get_engine().breakers.clear()
+    get_engine().latency.clear()
 
 
 @pytest.fixture
@@ -339,7 +339,7 @@ class TestAnswerUsageTracking:
         from app.services.answer_service import AnswerService
         from app.services.usage_service import UsageService
 
-        # Track if record_usage was called
+        # Track which reservation was committed
         usage_recorded = {"called": False, "operation_type": None}
 
         original_init = AnswerService.__init__
@@ -347,13 +347,16 @@ class TestAnswerUsageTracking:
         def mock_init(self):
             original_init(self)
             self.usage_service = MagicMock(spec=UsageService)
-            self.usage_service.check_credits = AsyncMock(return_value=True)
 
-            async def mock_record(user_id, operation_type, ai_provider, credits_used):
-                usage_recorded["called"] = True
+            async def mock_reserve(user_id, operation_type, credits=1):
                 usage_recorded["operation_type"] = operation_type
+                return "reservation-1"
 
-            self.usage_service.record_usage = mock_record
+            async def mock_commit(reservation_id, ai_provider=None, usage=None):
+                usage_recorded["called"] = reservation_id == "reservation-1"
+
+            self.usage_service.reserve_credits = mock_reserve
+            self.usage_service.commit_reservation = mock_commit
             self._get_user_profile = AsyncMock(return_value={"active_resume_id": "test-id"})
             self.resume_service.get_resume = AsyncMock(return_value={"parsed_data": {"skills": ["Python"]}})
             self.job_service.get_job = AsyncMock(return_value={"description": "Test job"})
@@ -380,10 +383,9 @@ class TestAnswerUsageTracking:
         from app.services.answer_service import AnswerService
         from app.services.usage_service import UsageService
 
-        # Track if record_usage was called
+        # Track whether the reservation was committed or released
         mock_usage_service = MagicMock(spec=UsageService)
-        mock_usage_service.check_credits = AsyncMock(return_value=True)
-        mock_usage_service.record_usage = AsyncMock()
+        mock_usage_service.reserve_credits = AsyncMock(return_value="reservation-1")
 
         # Create service with mocked dependencies
         service = AnswerService()
@@ -398,7 +400,7 @@ class TestAnswerUsageTracking:
 
             import asyncio
             with pytest.raises(AIProviderUnavailableError):
-                asyncio.get_event_loop().run_until_complete(
+                asyncio.run(
                     service.generate_answer(
                         user_id="test-user",
                         job_id="test-job",
@@ -406,5 +408,6 @@ class TestAnswerUsageTracking:
                     )
                 )
 
-        # Verify record_usage was NOT called
-        mock_usage_service.record_usage.assert_not_called()
+        # Verify the credit was released, never committed
+        mock_usage_service.commit_reservation.assert_not_called()
+        mock_usage_service.release_reservation.assert_awaited_once_with("reservation-1")
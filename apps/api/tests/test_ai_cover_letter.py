@@ -434,10 +434,9 @@ class TestCoverLetterErrors:
         from app.services.cover_letter_service import CoverLetterService
         from app.services.usage_service import UsageService
 
-        # Create a mock usage service to verify record_usage is NOT called
+        # Create a mock usage service to verify the reservation is released, not committed
         mock_usage_service = MagicMock(spec=UsageService)
-        mock_usage_service.check_credits = AsyncMock(return_value=True)
-        mock_usage_service.record_usage = AsyncMock()
+        mock_usage_service.reserve_credits = AsyncMock(return_value="reservation-1")
 
         # Create service with mocked dependencies
         service = CoverLetterService()
@@ -455,7 +454,7 @@ class TestCoverLetterErrors:
             # Call the service directly (not through HTTP to test internal behavior)
             import asyncio
             with pytest.raises(AIProviderUnavailableError):
-                asyncio.get_event_loop().run_until_complete(
+                asyncio.run(
                     service.generate_cover_letter(
                         user_id="test-user",
                         job_id="test-job",
@@ -463,8 +462,9 @@ class TestCoverLetterErrors:
                     )
                 )
 
-        # Verify record_usage was NOT called
-        mock_usage_service.record_usage.assert_not_called()
+        # Verify the credit was released, never committed
+        mock_usage_service.commit_reservation.assert_not_called()
+        mock_usage_service.release_reservation.assert_awaited_once_with("reservation-1")
 
 
 class TestPDFExport:
@@ -474,13 +474,13 @@ class TestPDFExport:
         """Successful PDF generation should return PDF file."""
         from app.services.pdf_service import PDFService
 
-        def mock_generate(self, content, file_name):
+        async def mock_generate(self, content, file_name):
             return b"%PDF-1.4 fake pdf bytes"
 
         def mock_sanitize(self, filename):
             return "cover_letter_acme"
 
-        with patch.object(PDFService, "generate_cover_letter_pdf", mock_generate):
+        with patch.object(PDFService, "render_cover_letter_pdf", mock_generate):
             with patch.object(PDFService, "_sanitize_filename", mock_sanitize):
                 response = authenticated_client.post(
                     "/v1/ai/cover-letter/pdf",
@@ -499,13 +499,13 @@ class TestPDFExport:
         """Default filename should be used when not provided."""
         from app.services.pdf_service import PDFService
 
-        def mock_generate(self, content, file_name):
+        async def mock_generate(self, content, file_name):
             return b"%PDF-1.4 fake pdf bytes"
 
         def mock_sanitize(self, filename):
             return "cover_letter"
 
-        with patch.object(PDFService, "generate_cover_letter_pdf", mock_generate):
+        with patch.object(PDFService, "render_cover_letter_pdf", mock_generate):
             with patch.object(PDFService, "_sanitize_filename", mock_sanitize):
                 response = authenticated_client.post(
                     "/v1/ai/cover-letter/pdf",
@@ -521,13 +521,13 @@ class TestPDFExport:
         """Invalid characters in filename should be sanitized."""
         from app.services.pdf_service import PDFService
 
-        def mock_generate(self, content, file_name):
+        async def mock_generate(self, content, file_name):
             return b"%PDF-1.4 fake pdf bytes"
 
         def mock_sanitize(self, filename):
             return "Cover_Letter_Acme_Corp"
 
-        with patch.object(PDFService, "generate_cover_letter_pdf", mock_generate):
+        with patch.object(PDFService, "render_cover_letter_pdf", mock_generate):
             with patch.object(PDFService, "_sanitize_filename", mock_sanitize):
                 response = authenticated_client.post(
                     "/v1/ai/cover-letter/pdf",
@@ -544,10 +544,10 @@ class TestPDFExport:
         """Empty content should return 400."""
         from app.services.pdf_service import PDFService
 
-        def mock_generate(content, file_name):
+        async def mock_generate(content, file_name):
             raise ValueError("Content cannot be empty")
 
-        with patch.object(PDFService, "generate_cover_letter_pdf", mock_generate):
+        with patch.object(PDFService, "render_cover_letter_pdf", mock_generate):
             response = authenticated_client.post(
                 "/v1/ai/cover-letter/pdf",
                 json={
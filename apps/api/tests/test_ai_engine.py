@@ -0,0 +1,415 @@
+"""Tests for the AI provider execution engine."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.services.ai.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.services.ai.engine import OperationPolicy, ProviderEngine, get_policy
+from app.services.ai.latency import LatencyTracker
+
+
+class FakeProvider:
+    """Provider stub whose match call sleeps, then returns or raises."""
+
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def generate_match_analysis(self, resume_data, job_description):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return {"match_score": 80, "by": self.name}
+
+
+def _call(provider, usage):
+    return provider.generate_match_analysis({}, "job")
+
+
+def _policy(**kwargs):
+    return patch("app.services.ai.engine.get_policy", return_value=OperationPolicy(**kwargs))
+
+
+class TestSequentialMode:
+    """Tests for the default primary → fallback behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_primary_success_skips_fallback(self):
+        """The fallback is not called when the primary succeeds."""
+        primary, fallback = FakeProvider("claude"), FakeProvider("gpt")
+
+        with _policy(mode="sequential"):
+            result, name = await ProviderEngine().run(
+                "match", [("Claude", primary), ("OpenAI", fallback)], _call
+            )
+
+        assert name == "claude"
+        assert result["by"] == "claude"
+        assert fallback.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_attempt_timeout_falls_back(self):
+        """A primary exceeding the attempt timeout falls through to the fallback."""
+        primary, fallback = FakeProvider("claude", delay=1.0), FakeProvider("gpt")
+
+        with _policy(mode="sequential", timeout=0.05):
+            _, name = await ProviderEngine().run(
+                "match", [("Claude", primary), ("OpenAI", fallback)], _call
+            )
+
+        assert name == "gpt"
+        assert primary.cancelled is True
+
+    @pytest.mark.asyncio
+    async def test_all_failed_raises_value_error(self):
+        """Errors from every provider are summarised in one ValueError."""
+        primary = FakeProvider("claude", error=ValueError("rate limited"))
+
+        with _policy(mode="sequential"):
+            with pytest.raises(ValueError) as exc_info:
+                await ProviderEngine().run("match", [("Claude", primary), ("OpenAI", None)], _call)
+
+        message = str(exc_info.value)
+        assert message.startswith("All AI providers failed")
+        assert "claude: rate limited" in message
+        assert "OpenAI: Not configured" in message
+
+
+class TestConcurrentModes:
+    """Tests for hedged and race execution."""
+
+    @pytest.mark.asyncio
+    async def test_hedge_fires_after_delay_and_cancels_loser(self):
+        """A slow primary triggers the hedge; the faster hedge wins."""
+        primary, fallback = FakeProvider("claude", delay=1.0), FakeProvider("gpt", delay=0.01)
+
+        with _policy(mode="hedged", timeout=5.0, hedge_delay=0.05):
+            _, name = await ProviderEngine().run(
+                "match", [("Claude", primary), ("OpenAI", fallback)], _call
+            )
+
+        assert name == "gpt"
+        assert primary.cancelled is True
+
+    @pytest.mark.asyncio
+    async def test_hedge_not_fired_when_primary_is_fast(self):
+        """A primary answering before the delay never starts the fallback."""
+        primary, fallback = FakeProvider("claude", delay=0.01), FakeProvider("gpt")
+
+        with _policy(mode="hedged", hedge_delay=0.5):
+            _, name = await ProviderEngine().run(
+                "match", [("Claude", primary), ("OpenAI", fallback)], _call
+            )
+
+        assert name == "claude"
+        assert fallback.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_hedge_starts_fallback_immediately_on_fast_failure(self):
+        """A primary error does not wait out the hedge delay."""
+        primary = FakeProvider("claude", error=ValueError("boom"))
+        fallback = FakeProvider("gpt")
+
+        with _policy(mode="hedged", hedge_delay=10.0, deadline=1.0):
+            _, name = await ProviderEngine().run(
+                "match", [("Claude", primary), ("OpenAI", fallback)], _call
+            )
+
+        assert name == "gpt"
+
+    @pytest.mark.asyncio
+    async def test_race_starts_all_providers(self):
+        """Race mode calls every provider at once."""
+        primary, fallback = FakeProvider("claude", delay=0.2), FakeProvider("gpt", delay=0.01)
+
+        with _policy(mode="race"):
+            _, name = await ProviderEngine().run(
+                "match", [("Claude", primary), ("OpenAI", fallback)], _call
+            )
+
+        assert name == "gpt"
+        assert primary.calls == 1
+        assert primary.cancelled is True
+
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_the_operation(self):
+        """The operation deadline fails the call even if attempts are still running."""
+        primary, fallback = FakeProvider("claude", delay=1.0), FakeProvider("gpt", delay=1.0)
+
+        with _policy(mode="hedged", timeout=5.0, hedge_delay=0.01, deadline=0.1):
+            with pytest.raises(ValueError, match="deadline"):
+                await ProviderEngine().run("match", [("Claude", primary), ("OpenAI", fallback)], _call)
+
+        assert primary.cancelled is True
+        assert fallback.cancelled is True
+
+
+class TestHedgeThreshold:
+    """Tests for the p95-based hedge delay."""
+
+    def test_percentile_nearest_rank(self):
+        """LatencyTracker returns the nearest-rank percentile."""
+        tracker = LatencyTracker(window=100)
+        for ms in range(1, 101):
+            tracker.record("claude", "match", ms / 100)
+
+        assert tracker.percentile("claude", "match", 0.95) == 0.95
+        assert tracker.percentile("claude", "match", 0.95, min_samples=101) is None
+        assert tracker.percentile("gpt", "match", 0.95) is None
+
+    def test_window_keeps_recent_samples(self):
+        """Old samples fall out of the window."""
+        tracker = LatencyTracker(window=3)
+        for seconds in (9.0, 1.0, 1.0, 1.0):
+            tracker.record("claude", "answer", seconds)
+
+        assert tracker.percentile("claude", "answer", 1.0) == 1.0
+
+    def test_static_delay_until_enough_samples(self, monkeypatch):
+        """The policy hedge_delay applies while history is thin."""
+        monkeypatch.setattr(settings, "ai_hedge_min_samples", 5)
+        engine = ProviderEngine()
+        policy = OperationPolicy(mode="hedged", timeout=15.0, hedge_delay=6.0)
+        engine.latency.record("claude", "cover_letter", 2.0)
+
+        assert engine.hedge_delay("cover_letter", policy, FakeProvider("claude")) == 6.0
+
+    def test_observed_p95_clamped(self, monkeypatch):
+        """The observed p95 is used, floored by AI_HEDGE_MIN_DELAY and capped by the timeout."""
+        monkeypatch.setattr(settings, "ai_hedge_min_samples", 3)
+        monkeypatch.setattr(settings, "ai_hedge_percentile", 0.95)
+        monkeypatch.setattr(settings, "ai_hedge_min_delay", 1.0)
+        engine = ProviderEngine()
+        policy = OperationPolicy(mode="hedged", timeout=15.0, hedge_delay=6.0)
+        claude = FakeProvider("claude")
+
+        for seconds in (2.0, 2.5, 3.0):
+            engine.latency.record("claude", "cover_letter", seconds)
+        assert engine.hedge_delay("cover_letter", policy, claude) == 3.0
+
+        for seconds in (0.1, 0.1, 0.1):
+            engine.latency.record("claude", "match", seconds)
+        assert engine.hedge_delay("match", policy, claude) == 1.0
+
+        for seconds in (40.0, 40.0, 40.0):
+            engine.latency.record("claude", "answer", seconds)
+        assert engine.hedge_delay("answer", policy, claude) == 15.0
+
+    @pytest.mark.asyncio
+    async def test_hedge_uses_observed_threshold(self, monkeypatch):
+        """A fast observed p95 hedges well before the static delay."""
+        monkeypatch.setattr(settings, "ai_hedge_min_samples", 3)
+        monkeypatch.setattr(settings, "ai_hedge_min_delay", 0.01)
+        engine = ProviderEngine()
+        for _ in range(3):
+            engine.latency.record("claude", "match", 0.02)
+        primary, fallback = FakeProvider("claude", delay=1.0), FakeProvider("gpt", delay=0.01)
+
+        with _policy(mode="hedged", timeout=5.0, hedge_delay=10.0, deadline=0.5):
+            _, name = await engine.run("match", [("Claude", primary), ("OpenAI", fallback)], _call)
+
+        assert name == "gpt"
+        assert primary.cancelled is True
+        # The cancelled primary still counts as a (lower-bound) sample
+        assert engine.latency.percentile("claude", "match", 1.0) >= 0.02
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def breaker_settings(monkeypatch):
+    """Small, deterministic breaker thresholds."""
+    monkeypatch.setattr(settings, "ai_breaker_window", 60.0)
+    monkeypatch.setattr(settings, "ai_breaker_min_calls", 4)
+    monkeypatch.setattr(settings, "ai_breaker_failure_rate", 0.5)
+    monkeypatch.setattr(settings, "ai_breaker_slow_call_rate", 0.8)
+    monkeypatch.setattr(settings, "ai_breaker_open_seconds", 30.0)
+    monkeypatch.setattr(settings, "ai_breaker_half_open_probes", 1)
+
+
+class TestCircuitBreaker:
+    """Tests for the per-provider circuit breaker."""
+
+    def test_opens_on_failure_rate(self, breaker_settings):
+        """Half the calls failing in the window opens the breaker."""
+        breaker = CircuitBreaker("claude:match", FakeClock())
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED  # below min_calls
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.acquire() is False
+
+    def test_opens_on_slow_calls(self, breaker_settings):
+        """Mostly slow successes also open the breaker."""
+        breaker = CircuitBreaker("claude:match", FakeClock())
+        for _ in range(4):
+            breaker.record_success(slow=True)
+
+        assert breaker.state == OPEN
+
+    def test_old_outcomes_leave_the_window(self, breaker_settings):
+        """Failures older than the window no longer count."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("claude:match", clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now += 61
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+        assert breaker.snapshot()["calls"] == 3
+
+    def test_half_open_probe_closes_on_success(self, breaker_settings):
+        """After the cooldown one probe is let through; success closes."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("claude:match", clock)
+        for _ in range(4):
+            breaker.record_failure()
+        assert breaker.allows_requests() is False
+
+        clock.now += 31
+        assert breaker.acquire() is True
+        assert breaker.state == HALF_OPEN
+        assert breaker.acquire() is False  # only one probe at a time
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.snapshot()["calls"] == 0
+
+    def test_half_open_probe_failure_reopens(self, breaker_settings):
+        """A failed probe reopens the breaker for another cooldown."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("claude:match", clock)
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now += 31
+        breaker.acquire()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.allows_requests() is False
+
+    @pytest.mark.asyncio
+    async def test_engine_skips_open_provider(self, breaker_settings):
+        """With Claude's breaker open, the engine goes straight to OpenAI."""
+        engine = ProviderEngine()
+        for _ in range(4):
+            engine.breakers.get("claude", "match").record_failure()
+        primary, fallback = FakeProvider("claude"), FakeProvider("gpt")
+
+        with _policy(mode="sequential"):
+            _, name = await engine.run("match", [("Claude", primary), ("OpenAI", fallback)], _call)
+
+        assert name == "gpt"
+        assert primary.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_engine_feeds_breaker(self, breaker_settings):
+        """Provider failures are recorded on that provider's breaker."""
+        engine = ProviderEngine()
+        primary = FakeProvider("claude", error=ValueError("overloaded"))
+        fallback = FakeProvider("gpt")
+
+        with _policy(mode="sequential"):
+            for _ in range(4):
+                await engine.run("match", [("Claude", primary), ("OpenAI", fallback)], _call)
+
+        assert engine.breakers.get("claude", "match").state == OPEN
+        assert engine.breakers.get("gpt", "match").state == CLOSED
+        assert primary.calls == 4
+
+    @pytest.mark.asyncio
+    async def test_hedged_out_slow_primary_opens_breaker(self, breaker_settings, monkeypatch):
+        """A primary that is always slow, and always hedged away, still opens its breaker."""
+        monkeypatch.setattr(settings, "ai_breaker_slow_call_fraction", 0.05)  # 50ms of a 1s timeout
+        monkeypatch.setattr(settings, "ai_hedge_min_samples", 100)  # keep the static hedge delay
+        engine = ProviderEngine()
+        primary, fallback = FakeProvider("claude", delay=1.0), FakeProvider("gpt", delay=0.01)
+
+        with _policy(mode="hedged", timeout=1.0, hedge_delay=0.06):
+            for _ in range(4):
+                _, name = await engine.run("match", [("Claude", primary), ("OpenAI", fallback)], _call)
+                assert name == "gpt"
+            await engine.run("match", [("Claude", primary), ("OpenAI", fallback)], _call)
+
+        assert engine.breakers.get("claude", "match").state == OPEN
+        assert engine.breakers.get("gpt", "match").state == CLOSED
+        assert primary.calls == 4
+
+
+class TestPolicyResolution:
+    """Tests for get_policy() and config overrides."""
+
+    def test_defaults_per_operation(self, monkeypatch):
+        """Operations keep their own timeouts with the global mode."""
+        monkeypatch.setattr(settings, "ai_execution_mode", "sequential")
+        monkeypatch.setattr(settings, "ai_operation_policies", {})
+
+        assert get_policy("cover_letter").timeout == 15.0
+        assert get_policy("match").mode == "sequential"
+
+    def test_generation_hedged_by_default(self, monkeypatch):
+        """Without AI_EXECUTION_MODE, generation hedges and parsing stays sequential."""
+        monkeypatch.setattr(settings, "ai_execution_mode", "")
+        monkeypatch.setattr(settings, "ai_operation_policies", {})
+
+        assert get_policy("cover_letter").mode == "hedged"
+        assert get_policy("parse").mode == "sequential"
+
+    def test_per_operation_override(self, monkeypatch):
+        """AI_OPERATION_POLICIES switches one operation to hedging."""
+        monkeypatch.setattr(settings, "ai_execution_mode", "sequential")
+        monkeypatch.setattr(
+            settings,
+            "ai_operation_policies",
+            {"cover_letter": {"mode": "hedged", "hedge_delay": 3, "unknown": 1}},
+        )
+
+        policy = get_policy("cover_letter")
+        assert policy.mode == "hedged"
+        assert policy.hedge_delay == 3
+        assert get_policy("answer").mode == "sequential"
+
+    def test_unknown_mode_ignored(self, monkeypatch):
+        """An invalid mode override keeps the default."""
+        monkeypatch.setattr(settings, "ai_execution_mode", "sequential")
+        monkeypatch.setattr(settings, "ai_operation_policies", {"match": {"mode": "fastest"}})
+
+        assert get_policy("match").mode == "sequential"
+
+
+class TestProviderSingletons:
+    """Providers are built once per API key."""
+
+    def test_provider_reused_across_calls(self):
+        """get_claude_provider() returns the same instance for the same key."""
+        from app.services.ai.factory import AIProviderFactory
+
+        with patch("app.services.ai.factory.settings") as mock_settings:
+            mock_settings.anthropic_api_key = "test-key"
+
+            assert AIProviderFactory.get_claude_provider() is AIProviderFactory.get_claude_provider()
@@ -0,0 +1,161 @@
+"""Tests for AI token, latency and cost metering."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.ai import claude, openai
+from app.services.ai.engine import OperationPolicy, ProviderEngine
+from app.services.ai.metering import estimate_cost_usd, token_count, usage_columns
+from app.services.ai.provider import TokenUsage
+from app.services.usage_service import UsageService
+
+RESUME = {"summary": "Backend engineer.", "skills": ["Python"]}
+JOB = "Looking for a Python developer."
+
+
+def _claude_usage(input_tokens=100, output_tokens=50, cache_read=0, cache_write=0):
+    return SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_input_tokens=cache_read,
+        cache_creation_input_tokens=cache_write,
+    )
+
+
+def _openai_usage(prompt_tokens=100, completion_tokens=50, cached_tokens=0):
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens),
+    )
+
+
+class TestProviderUsage:
+    """Tests for reading usage metadata from provider responses."""
+
+    def test_claude_counts_cache_reads_and_writes_as_input(self):
+        """Anthropic's separate cache counters add up to the prompt size."""
+        usage = claude._fill_usage(None, _claude_usage(input_tokens=20, cache_read=900, cache_write=80))
+        assert (usage.input_tokens, usage.cached_input_tokens, usage.output_tokens) == (1000, 900, 50)
+
+    def test_openai_reads_cached_tokens(self):
+        """OpenAI's prompt_tokens already include the cached tokens."""
+        usage = openai._fill_usage(TokenUsage(model="gpt-4o-mini"), _openai_usage(1000, 40, 768))
+        assert (usage.input_tokens, usage.cached_input_tokens, usage.output_tokens) == (1000, 768, 40)
+        assert usage.model == "gpt-4o-mini"
+
+    def test_missing_metadata_counts_as_zero(self):
+        """Absent or non-integer counters (e.g. mocks) are treated as 0."""
+        usage = openai._fill_usage(None, SimpleNamespace(prompt_tokens=None, completion_tokens=MagicMock()))
+        assert (usage.input_tokens, usage.output_tokens, usage.cached_input_tokens) == (0, 0, 0)
+        assert token_count(True) == 0
+
+    @pytest.mark.asyncio
+    async def test_tokens_used_comes_from_reported_usage(self):
+        """tokens_used is the provider's output count, not the model's own claim."""
+        provider = claude.ClaudeProvider("test-key")
+        provider.client = MagicMock()
+        provider.client.messages.create = AsyncMock(
+            return_value=SimpleNamespace(
+                content=[SimpleNamespace(text='{"content": "Hello", "tokens_used": 9999}')],
+                usage=_claude_usage(output_tokens=37),
+            )
+        )
+        usage = TokenUsage()
+
+        content, tokens_used = await provider.generate_answer(RESUME, JOB, "Why us?", 300, usage=usage)
+
+        assert content == "Hello"
+        assert tokens_used == 37
+        assert usage.output_tokens == 37
+
+
+class TestCost:
+    """Tests for cost estimation and usage_events columns."""
+
+    def test_cached_input_is_priced_separately(self):
+        """Cached prompt tokens use the cached_input price."""
+        prices = {"m": {"input": 3.0, "cached_input": 0.3, "output": 15.0}}
+        usage = TokenUsage(input_tokens=1_000_000, output_tokens=100_000, cached_input_tokens=500_000, model="m")
+        with patch("app.services.ai.metering.settings.ai_token_prices", prices):
+            assert estimate_cost_usd(usage) == pytest.approx(1.5 + 0.15 + 1.5)
+
+    def test_unpriced_model_has_no_cost(self):
+        """Models missing from AI_TOKEN_PRICES are metered without a cost."""
+        assert estimate_cost_usd(TokenUsage(input_tokens=10, model="unknown-model")) is None
+
+    def test_usage_columns(self):
+        """usage_columns() maps a TokenUsage onto the usage_events columns."""
+        usage = TokenUsage(input_tokens=10, output_tokens=5, latency_ms=1200, model="gpt-4o-mini")
+        columns = usage_columns(usage)
+        assert columns["input_tokens"] == 10
+        assert columns["latency_ms"] == 1200
+        assert columns["cost_usd"] == estimate_cost_usd(usage)
+        assert set(usage_columns(None).values()) == {None}
+
+
+class _MeteredProvider:
+    """Provider stub that reports fixed usage after a delay."""
+
+    def __init__(self, name, model, delay=0.0, error=None):
+        self.name = name
+        self.model = model
+        self.delay = delay
+        self.error = error
+
+    async def generate_match_analysis(self, resume_data, job_description, usage=None):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        usage.input_tokens, usage.output_tokens = 120, 30
+        return {"match_score": 80}
+
+
+class TestEngineMetering:
+    """Tests for the engine filling the caller's TokenUsage."""
+
+    @pytest.mark.asyncio
+    async def test_usage_reflects_winner_and_operation_wall_time(self):
+        """The winner's tokens and model are reported with the whole call's wall time."""
+        primary = _MeteredProvider("claude", "claude-model", delay=0.02, error=RuntimeError("down"))
+        fallback = _MeteredProvider("gpt", "gpt-model", delay=0.02)
+        usage = TokenUsage()
+
+        with patch("app.services.ai.engine.get_policy", return_value=OperationPolicy(mode="sequential")):
+            _, name = await ProviderEngine().run(
+                "match",
+                [("Claude", primary), ("OpenAI", fallback)],
+                lambda p, u: p.generate_match_analysis({}, "job", usage=u),
+                usage,
+            )
+
+        assert name == "gpt"
+        assert (usage.model, usage.input_tokens, usage.output_tokens) == ("gpt-model", 120, 30)
+        assert usage.latency_ms >= 40
+
+
+class TestCommitMetering:
+    """Tests for persisting metered usage with the reservation."""
+
+    @pytest.mark.asyncio
+    async def test_commit_sends_metering_params(self):
+        """commit_reservation passes tokens, latency, model and cost to the RPC."""
+        service = UsageService()
+        usage = TokenUsage(
+            input_tokens=1000, output_tokens=200, cached_input_tokens=800, latency_ms=950, model="gpt-4o-mini"
+        )
+        with patch.object(service.admin_client, "rpc") as mock_rpc:
+            mock_rpc.return_value.execute.return_value = MagicMock(data=True)
+            await service.commit_reservation("res-1", ai_provider="gpt", usage=usage)
+
+        name, params = mock_rpc.call_args[0]
+        assert name == "commit_credit_reservation"
+        assert params["p_input_tokens"] == 1000
+        assert params["p_cached_input_tokens"] == 800
+        assert params["p_output_tokens"] == 200
+        assert params["p_latency_ms"] == 950
+        assert params["p_model"] == "gpt-4o-mini"
+        assert params["p_cost_usd"] == estimate_cost_usd(usage) > 0
@@ -0,0 +1,249 @@
+"""Tests for streaming (SSE) generation."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.ai.engine import OperationPolicy, ProviderEngine
+from app.services.generation_stream import stream_with_reservation
+from app.services.usage_service import UsageService
+
+
+class FakeStreamingProvider:
+    """Provider stub whose stream_text yields fixed chunks."""
+
+    def __init__(self, name, chunks=("Hello", " world"), fail_before=False, fail_after=None):
+        self.name = name
+        self.chunks = chunks
+        self.fail_before = fail_before
+        self.fail_after = fail_after
+        self.closed = False
+
+    async def stream_text(self, prompt, max_tokens, timeout, usage=None):
+        try:
+            if self.fail_before:
+                raise ValueError("overloaded")
+            for index, chunk in enumerate(self.chunks):
+                if self.fail_after is not None and index == self.fail_after:
+                    raise ValueError("connection reset")
+                await asyncio.sleep(0)
+                yield chunk
+            if usage is not None:
+                usage.output_tokens = 42
+        finally:
+            self.closed = True
+
+
+def _policy(**kwargs):
+    return patch("app.services.ai.engine.get_policy", return_value=OperationPolicy(**kwargs))
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+class TestOpenStream:
+    """Tests for ProviderEngine.open_stream()."""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_before_first_token(self):
+        """A provider failing before its first token falls through to the next."""
+        engine = ProviderEngine()
+        primary = FakeStreamingProvider("claude", fail_before=True)
+        fallback = FakeStreamingProvider("gpt", chunks=("Hi", "!"))
+
+        with _policy(timeout=1.0):
+            stream = await engine.open_stream(
+                "cover_letter", [("Claude", primary), ("OpenAI", fallback)], "prompt", 100
+            )
+            text = "".join([delta async for delta in stream])
+
+        assert stream.provider == "gpt"
+        assert text == "Hi!"
+        assert stream.usage.output_tokens == 42
+        assert engine.breakers.get("claude", "cover_letter").snapshot()["failure_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_no_provider_raises_value_error(self):
+        """With every provider failing, open_stream raises ValueError."""
+        engine = ProviderEngine()
+        primary = FakeStreamingProvider("claude", fail_before=True)
+
+        with _policy(timeout=1.0):
+            with pytest.raises(ValueError, match="All AI providers failed"):
+                await engine.open_stream("answer", [("Claude", primary), ("OpenAI", None)], "prompt", 100)
+
+        assert primary.closed is True
+
+
+class TestStreamWithReservation:
+    """Tests for credit settlement around a stream."""
+
+    async def _open(self, provider):
+        with _policy(timeout=1.0):
+            return await ProviderEngine().open_stream("answer", [("Claude", provider)], "prompt", 100)
+
+    @pytest.mark.asyncio
+    async def test_commits_when_stream_completes(self):
+        """start, deltas, then done after the reservation is committed."""
+        usage_service = MagicMock(spec=UsageService)
+        stream = await self._open(FakeStreamingProvider("claude", chunks=("Dear", " team")))
+
+        events = await _collect(stream_with_reservation(usage_service, "res-1", stream, "answer"))
+
+        assert [e["event"] for e in events] == ["start", "delta", "delta", "done"]
+        assert events[-1]["data"] == {"content": "Dear team", "ai_provider_used": "claude", "tokens_used": 42}
+        usage_service.commit_reservation.assert_awaited_once_with("res-1", ai_provider="claude", usage=stream.usage)
+        usage_service.release_reservation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_failure_releases(self):
+        """A provider error after the first token ends with an error event and no charge."""
+        usage_service = MagicMock(spec=UsageService)
+        stream = await self._open(FakeStreamingProvider("claude", chunks=("a", "b", "c"), fail_after=1))
+
+        events = await _collect(stream_with_reservation(usage_service, "res-1", stream, "answer"))
+
+        assert events[-1]["event"] == "error"
+        assert events[-1]["data"]["code"] == "AI_PROVIDER_UNAVAILABLE"
+        usage_service.release_reservation.assert_awaited_once_with("res-1")
+        usage_service.commit_reservation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_releases(self):
+        """Closing the stream early (client disconnect) releases the credit."""
+        usage_service = MagicMock(spec=UsageService)
+        provider = FakeStreamingProvider("claude", chunks=("a", "b", "c"))
+        stream = await self._open(provider)
+
+        events = stream_with_reservation(usage_service, "res-1", stream, "answer")
+        await events.__anext__()  # start
+        await events.__anext__()  # first delta
+        await events.aclose()
+
+        usage_service.release_reservation.assert_awaited_once_with("res-1")
+        usage_service.commit_reservation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_never_iterated_stream_releases_on_close(self):
+        """Closing a stream whose events were never read releases the credit and the provider."""
+        usage_service = MagicMock(spec=UsageService)
+        provider = FakeStreamingProvider("claude", chunks=("a", "b"))
+        stream = await self._open(provider)
+
+        events = stream_with_reservation(usage_service, "res-1", stream, "answer")
+        await events.aclose()
+        await events.aclose()
+
+        usage_service.release_reservation.assert_awaited_once_with("res-1")
+        usage_service.commit_reservation.assert_not_called()
+        assert provider.closed is True
+
+    @pytest.mark.asyncio
+    async def test_response_dropped_before_body_releases(self):
+        """A response that fails before its body starts still releases the reservation."""
+        from starlette.requests import ClientDisconnect
+
+        from app.core.sse import sse_response
+
+        usage_service = MagicMock(spec=UsageService)
+        stream = await self._open(FakeStreamingProvider("claude"))
+        response = sse_response(stream_with_reservation(usage_service, "res-1", stream, "answer"))
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            raise OSError("client went away")
+
+        with pytest.raises(ClientDisconnect):
+            await response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+
+        usage_service.release_reservation.assert_awaited_once_with("res-1")
+        usage_service.commit_reservation.assert_not_called()
+
+
+@pytest.fixture
+def authenticated_client():
+    """Create a test client with mocked authentication."""
+    from app.core.deps import get_current_user
+
+    async def mock_get_current_user():
+        return {"id": "test-user-id-1234567890", "email": "test@example.com"}
+
+    app.dependency_overrides[get_current_user] = mock_get_current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreamingEndpoints:
+    """Tests for the /stream endpoints."""
+
+    def test_cover_letter_stream_returns_sse(self, authenticated_client):
+        """The endpoint relays service events as text/event-stream."""
+        from app.services.cover_letter_service import CoverLetterService
+
+        async def events():
+            yield {"event": "start", "data": {"ai_provider_used": "claude"}}
+            yield {"event": "delta", "data": {"text": "Dear\nteam"}}
+            yield {"event": "done", "data": {"content": "Dear\nteam", "ai_provider_used": "claude", "tokens_used": 3}}
+
+        with patch.object(CoverLetterService, "stream_cover_letter", AsyncMock(return_value=events())):
+            response = authenticated_client.post(
+                "/v1/ai/cover-letter/stream",
+                json={"job_id": "00000000-0000-0000-0000-000000000000"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        parsed = _parse_sse(response.text)
+        assert [name for name, _ in parsed] == ["start", "delta", "done"]
+        assert parsed[1][1]["text"] == "Dear\nteam"
+
+    def test_errors_before_stream_use_json_envelope(self, authenticated_client):
+        """Credit exhaustion is reported as a normal error response."""
+        from app.core.exceptions import CreditExhaustedError
+        from app.services.answer_service import AnswerService
+
+        with patch.object(AnswerService, "stream_answer", AsyncMock(side_effect=CreditExhaustedError())):
+            response = authenticated_client.post(
+                "/v1/ai/answer/stream",
+                json={
+                    "job_id": "00000000-0000-0000-0000-000000000000",
+                    "question": "Why do you want to work here?",
+                },
+            )
+
+        assert response.status_code == 422
+        assert response.json()["error"]["code"] == "CREDIT_EXHAUSTED"
+
+    @pytest.mark.asyncio
+    async def test_outreach_stream_validates_before_reserving(self):
+        """Invalid input fails before any credit is reserved."""
+        from app.core.exceptions import ValidationError
+        from app.services.outreach_service import OutreachService
+
+        service = OutreachService()
+        service.usage_service = MagicMock(spec=UsageService)
+
+        with pytest.raises(ValidationError):
+            await service.stream_outreach(
+                user_id="test-user",
+                job_id="test-job",
+                recipient_type="stranger",
+                platform="linkedin",
+            )
+
+        service.usage_service.reserve_credits.assert_not_called()
@@ -1,7 +1,16 @@
 """Tests for authentication endpoints."""
 
+import time
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import jwt
 import pytest
 
+from app.core.config import settings
+from app.core.exceptions import InvalidTokenError
+from app.core.tokens import TokenDenylist, TokenVerifier
+
 
 class TestHealthEndpoint:
     """Tests for the health check endpoint."""
@@ -18,6 +27,19 @@ class TestHealthEndpoint:
         assert data["status"] == "ok"
         assert data["version"] == "1.0.0"
 
+    def test_health_reports_ai_circuit_breakers(self, client):
+        """Health endpoint should expose AI circuit breaker state."""
+        from app.services.ai.engine import get_engine
+
+        get_engine().breakers.get("claude", "match").record_failure()
+        try:
+            data = client.get("/health").json()
+        finally:
+            get_engine().breakers.clear()
+
+        assert data["ai_providers"]["claude:match"]["state"] == "closed"
+        assert data["ai_providers"]["claude:match"]["calls"] == 1
+
     def test_health_no_auth_required(self, client):
         """Health endpoint should not require authentication."""
         response = client.get("/health")
@@ -152,3 +174,180 @@ class TestDeleteAccountEndpoint:
         data = response.json()
         assert data["success"] is False
         assert data["error"]["code"] == "INVALID_TOKEN"
+
+
+# ============================================================================
+# Local JWT Verification Tests
+# ============================================================================
+
+TEST_JWT_SECRET = "test-jwt-secret-with-at-least-32-bytes!"
+
+
+def _make_token(user_id: str, **overrides) -> str:
+    """Build an HS256 access token shaped like Supabase's."""
+    now = int(time.time())
+    claims = {
+        "sub": user_id,
+        "email": "user@example.com",
+        "aud": "authenticated",
+        "iss": f"{settings.supabase_url}/auth/v1",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, TEST_JWT_SECRET, algorithm="HS256")
+
+
+class TestTokenVerifier:
+    """Tests for local token verification."""
+
+    @pytest.fixture
+    def verifier(self, monkeypatch):
+        monkeypatch.setattr(settings, "supabase_jwt_secret", TEST_JWT_SECRET)
+        return TokenVerifier()
+
+    @pytest.mark.asyncio
+    async def test_valid_token_returns_claims(self, verifier):
+        """A correctly signed token is verified without calling Supabase."""
+        user_id = str(uuid4())
+
+        claims = await verifier.verify(_make_token(user_id))
+
+        assert claims["sub"] == user_id
+        assert claims["email"] == "user@example.com"
+
+    @pytest.mark.asyncio
+    async def test_expired_token_raises(self, verifier):
+        """An expired token is rejected."""
+        token = _make_token(str(uuid4()), iat=int(time.time()) - 7200, exp=int(time.time()) - 3600)
+
+        with pytest.raises(InvalidTokenError, match="expired"):
+            await verifier.verify(token)
+
+    @pytest.mark.asyncio
+    async def test_wrong_signature_raises(self, verifier):
+        """A token signed with another secret is rejected."""
+        token = jwt.encode(
+            jwt.decode(_make_token(str(uuid4())), options={"verify_signature": False}),
+            "some-other-secret-with-at-least-32-bytes",
+            algorithm="HS256",
+        )
+
+        with pytest.raises(InvalidTokenError):
+            await verifier.verify(token)
+
+    @pytest.mark.asyncio
+    async def test_wrong_audience_raises(self, verifier):
+        """Tokens for other audiences (e.g. anon) are rejected."""
+        with pytest.raises(InvalidTokenError):
+            await verifier.verify(_make_token(str(uuid4()), aud="anon"))
+
+    @pytest.mark.asyncio
+    async def test_hs256_without_secret_defers_to_supabase(self, monkeypatch):
+        """Without a secret, HS256 tokens cannot be checked locally."""
+        monkeypatch.setattr(settings, "supabase_jwt_secret", "")
+
+        assert await TokenVerifier().verify(_make_token(str(uuid4()))) is None
+
+    @pytest.mark.asyncio
+    async def test_asymmetric_token_uses_cached_jwks(self, verifier):
+        """ES256 tokens are verified with the key resolved from JWKS."""
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        user_id = str(uuid4())
+        claims = jwt.decode(_make_token(user_id), options={"verify_signature": False})
+        token = jwt.encode(claims, private_key, algorithm="ES256", headers={"kid": "key-1"})
+
+        signing_key = MagicMock(key=private_key.public_key())
+        with patch.object(
+            verifier._jwks_client, "get_signing_key_from_jwt", return_value=signing_key
+        ) as mock_get_key:
+            result = await verifier.verify(token)
+
+        mock_get_key.assert_called_once_with(token)
+        assert result["sub"] == user_id
+
+
+class TestTokenDenylist:
+    """Tests for logout revocation."""
+
+    def test_tokens_issued_before_logout_are_revoked(self):
+        """Tokens issued before revoke_user() are rejected."""
+        denylist = TokenDenylist(ttl=3600)
+        issued_at = time.time() - 60
+
+        assert denylist.is_revoked("user-1", issued_at) is False
+        denylist.revoke_user("user-1")
+
+        assert denylist.is_revoked("user-1", issued_at) is True
+        assert denylist.is_revoked("user-1", time.time() + 5) is False
+        assert denylist.is_revoked("user-2", issued_at) is False
+
+    def test_login_right_after_logout_is_accepted(self):
+        """A token issued in the same second as the logout (re-login) is valid."""
+        denylist = TokenDenylist(ttl=3600)
+        with patch("app.core.tokens.time.time", return_value=1_700_000_000.9):
+            denylist.revoke_user("user-1")
+
+            assert denylist.is_revoked("user-1", 1_700_000_000) is False
+            assert denylist.is_revoked("user-1", 1_699_999_999) is True
+
+    def test_revocation_expires_after_ttl(self):
+        """Entries are forgotten once every revoked token has expired."""
+        denylist = TokenDenylist(ttl=0)
+        denylist.revoke_user("user-1")
+        time.sleep(0.01)
+
+        assert denylist.is_revoked("user-1", time.time() - 60) is False
+
+
+class TestVerifyTokenLocally:
+    """Tests for AuthService.verify_token with local verification."""
+
+    @pytest.fixture(autouse=True)
+    def local_secret(self, monkeypatch):
+        monkeypatch.setattr(settings, "supabase_jwt_secret", TEST_JWT_SECRET)
+        monkeypatch.setattr("app.core.tokens._verifier", None)
+        yield
+        from app.core.tokens import token_denylist
+
+        token_denylist.clear()
+
+    def _service(self, user_id, monkeypatch):
+        from app.services.auth_service import AuthService
+
+        service = AuthService()
+        service._client = MagicMock()
+        service._admin_client = MagicMock()
+        profile = MagicMock(data={"id": user_id, "full_name": "Test User", "subscription_tier": "pro"})
+        service._admin_client.table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = profile
+        monkeypatch.setattr(
+            "app.db.profile_cache.get_supabase_admin_client", lambda: service._admin_client
+        )
+        return service
+
+    @pytest.mark.asyncio
+    async def test_verify_token_skips_supabase_auth(self, monkeypatch):
+        """A locally verifiable token never calls auth.get_user."""
+        user_id = str(uuid4())
+        service = self._service(user_id, monkeypatch)
+
+        user = await service.verify_token(_make_token(user_id))
+
+        assert user["id"] == user_id
+        assert user["subscription_tier"] == "pro"
+        service._client.auth.get_user.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_logout_revokes_token_locally(self, monkeypatch):
+        """After logout the same token is rejected without a network check."""
+        user_id = str(uuid4())
+        service = self._service(user_id, monkeypatch)
+        token = _make_token(user_id, iat=int(time.time()) - 5)
+
+        assert await service.logout(token) is True
+        service._admin_client.auth.admin.sign_out.assert_called_once_with(token)
+
+        with pytest.raises(InvalidTokenError, match="revoked"):
+            await service.verify_token(token)
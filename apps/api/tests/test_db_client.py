@@ -0,0 +1,71 @@
+"""Tests for the shared Supabase clients."""
+
+from unittest.mock import patch
+
+import httpx
+
+from app.db import client
+from app.routers.jobs import get_job_service
+
+
+class TestSharedClients:
+    """Tests for the process-wide clients and connection pool."""
+
+    def teardown_method(self):
+        client.close_supabase_clients()
+
+    def test_anon_and_admin_clients_are_singletons(self):
+        """Repeated getters return the same client objects."""
+        assert client.get_supabase_client() is client.get_supabase_client()
+        assert client.get_supabase_admin_client() is client.get_supabase_admin_client()
+        assert client.get_supabase_client() is not client.get_supabase_admin_client()
+
+    def test_close_closes_the_shared_pool(self):
+        """close_supabase_clients() closes the httpx pool and drops the clients."""
+        anon = client.get_supabase_client()
+        pool = client._get_http_client()
+
+        client.close_supabase_clients()
+
+        assert pool.is_closed
+        assert client.get_supabase_client() is not anon
+        assert client._get_http_client() is not pool
+
+
+class TestUserClient:
+    """Tests for get_supabase_user_client()."""
+
+    def test_sends_bearer_token_and_anon_api_key(self):
+        """Queries carry the user's JWT and the anon apiKey over the shared pool."""
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.update(request.headers)
+            return httpx.Response(200, json=[])
+
+        pool = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch.object(client, "_get_http_client", return_value=pool):
+            client.get_supabase_user_client("user-jwt").table("jobs").select("*").execute()
+
+        assert seen["authorization"] == "Bearer user-jwt"
+        assert seen["apikey"] == client.settings.supabase_anon_key
+
+
+class TestGetJobService:
+    """Tests for the jobs router dependency."""
+
+    def test_bearer_header_selects_rls_session(self):
+        """A bearer token scopes the service to a per-request user session."""
+        with patch("app.services.job_service.get_supabase_user_client") as user_client:
+            service = get_job_service(authorization="Bearer user-jwt")
+
+        user_client.assert_called_once_with("user-jwt")
+        assert service.client is user_client.return_value
+
+    def test_missing_header_uses_shared_client(self):
+        """Without a bearer token the shared anon client is used."""
+        with patch("app.services.job_service.get_supabase_user_client") as user_client:
+            service = get_job_service(authorization=None)
+
+        user_client.assert_not_called()
+        assert service.client is client.get_supabase_client()
@@ -0,0 +1,67 @@
+"""Tests for the async Supabase executor."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.db import executor
+
+
+class TestDbExecutor:
+    """Tests for run_sync() and execute()."""
+
+    @pytest.mark.asyncio
+    async def test_execute_runs_query_off_event_loop_thread(self):
+        """execute() calls the blocking .execute() in a worker thread."""
+        loop_thread = threading.get_ident()
+        seen = {}
+
+        def blocking_execute():
+            seen["thread"] = threading.get_ident()
+            return "response"
+
+        query = MagicMock()
+        query.execute.side_effect = blocking_execute
+
+        result = await executor.execute(query)
+
+        assert result == "response"
+        assert seen["thread"] != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_run_sync_passes_arguments_and_propagates_errors(self):
+        """run_sync() forwards args/kwargs and re-raises exceptions."""
+        func = MagicMock(return_value={"signedURL": "https://x"})
+
+        result = await executor.run_sync(func, "a", path="p")
+
+        func.assert_called_once_with("a", path="p")
+        assert result == {"signedURL": "https://x"}
+
+        with pytest.raises(RuntimeError):
+            await executor.run_sync(MagicMock(side_effect=RuntimeError("db down")))
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, monkeypatch):
+        """No more than db_max_concurrency calls run at once."""
+        executor.shutdown_db_executor()
+        monkeypatch.setattr(executor.settings, "db_max_concurrency", 2)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def blocking_call():
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            threading.Event().wait(0.02)
+            with lock:
+                state["active"] -= 1
+
+        try:
+            await asyncio.gather(*(executor.run_sync(blocking_call) for _ in range(6)))
+        finally:
+            executor.shutdown_db_executor()
+
+        assert state["peak"] == 2
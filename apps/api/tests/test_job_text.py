@@ -0,0 +1,226 @@
+"""Tests for job description cleaning and truncation."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.ai.prompts import (
+    format_answer_prompt,
+    format_cover_letter_prompt,
+    format_match_prompt,
+    format_outreach_prompt,
+)
+from app.services.job_service import JobService
+from app.services.job_text import (
+    clean_job_description,
+    description_fields,
+    estimate_tokens,
+    prepare_job_description,
+    truncate_to_budget,
+)
+from app.services.match_service import MatchService
+from app.services.resume_service import ResumeService
+from app.services.usage_service import UsageService
+
+POSTING = """Senior Backend Engineer
+
+
+About Us:
+Acme   builds\tbilling software.
+
+Requirements:
+- 5+ years of Python
+- PostgreSQL
+
+Benefits:
+- Unlimited PTO
+- 401(k) match
+
+Acme is an equal opportunity employer. We consider all applicants without regard to race, color or religion.
+"""
+
+
+def _long_posting(repeat: int) -> str:
+    """A posting with a long company blurb and a short requirements list."""
+    return "\n".join(
+        [
+            "Staff Engineer",
+            "",
+            "About the Company:",
+            *["Acme has been building delightful billing software since 2009."] * repeat,
+            "",
+            "Requirements:",
+            "- 8+ years of Python",
+            "- Kubernetes",
+            "",
+            "Nice to have:",
+            "- Go",
+        ]
+    )
+
+
+class TestCleanJobDescription:
+    """Tests for clean_job_description()."""
+
+    def test_normalizes_whitespace(self):
+        """Runs of spaces and tabs collapse and blank lines are squeezed."""
+        cleaned = clean_job_description("Engineer\r\n\r\n\r\n\tBuild  APIs   in Python.  \n\n")
+        assert cleaned == "Engineer\n\nBuild APIs in Python."
+
+    def test_removes_boilerplate_sections_and_paragraphs(self):
+        """Benefits sections and EEO statements are dropped; requirements stay."""
+        cleaned = clean_job_description(POSTING)
+
+        assert "Acme builds billing software." in cleaned
+        assert "Requirements:\n- 5+ years of Python\n- PostgreSQL" in cleaned
+        assert "Unlimited PTO" not in cleaned
+        assert "equal opportunity" not in cleaned
+
+    def test_unmarked_lines_are_not_headings(self):
+        """A content line starting with a section word stays in its section."""
+        cleaned = clean_job_description("Skills\n- Python\nExperience with AWS\n")
+        assert cleaned == "Skills\n- Python\nExperience with AWS"
+
+    def test_title_is_never_boilerplate(self):
+        """A job title that looks like a boilerplate heading keeps the intro."""
+        cleaned = clean_job_description("BENEFITS ANALYST\nYou will run our benefits enrollment.\n")
+        assert cleaned == "BENEFITS ANALYST\nYou will run our benefits enrollment."
+
+    def test_heading_only_sections_are_kept(self):
+        """A heading with no body is not silently dropped."""
+        assert "Requirements:" in clean_job_description("Intro text.\n\nRequirements:\n")
+
+    def test_all_boilerplate_falls_back_to_original(self):
+        """Cleaning never returns an empty description."""
+        text = "We are an equal opportunity employer."
+        assert clean_job_description(text) == text
+
+    def test_description_fields(self):
+        """The stored columns are the cleaned text and its token estimate."""
+        fields = description_fields(POSTING)
+        assert fields["clean_description"] == clean_job_description(POSTING)
+        assert fields["description_tokens"] == estimate_tokens(fields["clean_description"])
+
+
+class TestTruncateToBudget:
+    """Tests for truncate_to_budget()."""
+
+    def test_text_within_budget_is_unchanged(self):
+        """Short descriptions are returned as-is."""
+        assert truncate_to_budget("Short role.", 100) == "Short role."
+
+    def test_low_priority_sections_go_first(self):
+        """Requirements are kept over a long company blurb, in original order."""
+        text = _long_posting(repeat=60)
+        truncated = truncate_to_budget(text, 100)
+
+        assert estimate_tokens(truncated) <= 100
+        assert "Requirements:\n- 8+ years of Python\n- Kubernetes" in truncated
+        assert "Nice to have:\n- Go" in truncated
+        assert truncated.index("Staff Engineer") < truncated.index("Requirements:")
+        assert truncated.count("delightful billing") < 60
+
+    def test_single_paragraph_is_cut_at_word_boundary(self):
+        """Text with no sections is hard-cut without splitting a word."""
+        truncated = truncate_to_budget("word " * 100, 10)
+        assert len(truncated) <= 40
+        assert truncated.endswith("word")
+
+
+class TestPrepareJobDescription:
+    """Tests for prepare_job_description() and the token budgets."""
+
+    def test_prefers_stored_clean_description(self):
+        """The stored clean_description is used instead of re-cleaning."""
+        job = {"description": POSTING, "clean_description": "Stored clean text."}
+        assert prepare_job_description(job, "match") == "Stored clean text."
+
+    def test_cleans_older_jobs_on_the_fly(self):
+        """Jobs saved before clean_description existed are cleaned per call."""
+        assert prepare_job_description({"description": POSTING}, "match") == clean_job_description(POSTING)
+
+    def test_operations_share_one_budget(self):
+        """Every operation embeds the same text, so the prompt prefix is shared."""
+        job = {"description": _long_posting(repeat=350)}
+        assert estimate_tokens(job["description"]) > 5000
+
+        operations = ("match", "cover_letter", "answer", "outreach")
+        descriptions = {op: prepare_job_description(job, op) for op in operations}
+        assert len(set(descriptions.values())) == 1
+        assert estimate_tokens(descriptions["match"]) <= 2500
+
+        resume = "Name: Jane Doe\nSkills: Python"
+        prompts = [
+            format_match_prompt(resume, descriptions["match"]),
+            format_cover_letter_prompt(resume, descriptions["cover_letter"], "confident"),
+            format_answer_prompt(resume, descriptions["answer"], "Why us?", 500),
+            format_outreach_prompt(resume, descriptions["outreach"], "recruiter", "email"),
+        ]
+        assert len({prompt.prefix_key for prompt in prompts}) == 1
+
+    def test_per_operation_override(self):
+        """JOB_DESCRIPTION_TOKEN_BUDGETS overrides the shared budget for one operation."""
+        job = {"description": _long_posting(repeat=60)}
+        with patch("app.services.job_text.settings.job_description_token_budgets", {"match": 100}):
+            match = prepare_job_description(job, "match")
+            cover_letter = prepare_job_description(job, "cover_letter")
+
+        assert estimate_tokens(match) <= 100
+        assert cover_letter == clean_job_description(job["description"])
+
+
+class TestJobServiceStoresCleanDescription:
+    """Tests for the clean_description write path in JobService."""
+
+    def _service(self):
+        service = JobService.__new__(JobService)
+        service.client = MagicMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_create_job_stores_clean_description(self):
+        """Saving a job (including /v1/jobs/scan) stores the cleaned text and token count."""
+        service = self._service()
+        insert = service.client.table.return_value.insert
+        with patch("app.services.job_service.execute", AsyncMock(return_value=MagicMock(data=[{"id": "job-1"}]))):
+            await service.create_job("user-1", {"title": "Engineer", "company": "Acme", "description": POSTING})
+
+        row = insert.call_args.args[0]
+        assert row["clean_description"] == clean_job_description(POSTING)
+        assert row["description_tokens"] == estimate_tokens(row["clean_description"])
+
+    @pytest.mark.asyncio
+    async def test_update_job_recomputes_on_description_change(self):
+        """Editing the description refreshes the derived columns."""
+        service = self._service()
+        update = service.client.table.return_value.update
+        with patch("app.services.job_service.execute", AsyncMock(return_value=MagicMock(data=[{"id": "job-1"}]))):
+            await service.update_job("user-1", "job-1", {"description": POSTING})
+            await service.update_job("user-1", "job-1", {"status": "applied"})
+
+        assert update.call_args_list[0].args[0]["clean_description"] == clean_job_description(POSTING)
+        assert "clean_description" not in update.call_args_list[1].args[0]
+
+
+class TestMatchServiceLongDescriptions:
+    """Tests for long descriptions reaching MatchService."""
+
+    @pytest.mark.asyncio
+    async def test_long_description_is_accepted_and_trimmed(self):
+        """Descriptions over the old 10,000 character cap are trimmed, not rejected."""
+        service = MatchService.__new__(MatchService)
+        service.usage_service = MagicMock(spec=UsageService)
+        service.resume_service = MagicMock(spec=ResumeService)
+        service.resume_service.get_resume.return_value = {"parsed_data": {"skills": ["Python"]}}
+        service.job_service = MagicMock(spec=JobService)
+        service.job_service.get_job.return_value = {"description": _long_posting(repeat=350)}
+        assert len(service.job_service.get_job.return_value["description"]) > 10000
+
+        with patch(
+            "app.services.match_service.get_cached_profile",
+            AsyncMock(return_value={"active_resume_id": "resume-1"}),
+        ):
+            _, job_description, _ = await service._load_inputs("user-1", "job-1", None)
+
+        assert estimate_tokens(job_description) <= 2500
+        assert "Requirements:\n- 8+ years of Python" in job_description
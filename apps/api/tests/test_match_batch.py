@@ -0,0 +1,260 @@
+"""Tests for batch match analysis (POST /v1/ai/match/batch)."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.exceptions import CreditExhaustedError, ValidationError
+from app.db.match_cache import match_cache_key, store_match
+from app.main import app
+from app.services.ai.prompts import format_match_prompt
+from app.services.job_service import JobService
+from app.services.match_service import MatchService
+from app.services.usage_service import UsageService
+
+RESUME = "Name: Jane Doe\nSkills: Python, FastAPI"
+ANALYSIS = {"match_score": 80, "strengths": ["Python"], "gaps": ["Go"], "recommendations": ["Learn Go"]}
+
+
+def _job(job_id, description="Python developer wanted."):
+    return {"id": job_id, "description": description}
+
+
+def _service(jobs):
+    service = MatchService.__new__(MatchService)
+    service.usage_service = MagicMock(spec=UsageService)
+    service.usage_service.reserve_credits.return_value = "res-1"
+    service.job_service = MagicMock(spec=JobService)
+    service.job_service.get_jobs.return_value = jobs
+    service._load_resume = AsyncMock(return_value=(RESUME, None))
+    return service
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+def _ai(delay=0.0, fail_for=()):
+    """match_with_fallback stub that tracks how many calls run at once."""
+    state = {"active": 0, "peak": 0}
+
+    async def match_with_fallback(resume_data, job_description, preferred_provider, user_preference, usage):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            state["active"] -= 1
+        if job_description in fail_for:
+            raise ValueError("All AI providers failed")
+        usage.input_tokens, usage.output_tokens, usage.model = 100, 20, "claude-model"
+        return ANALYSIS, "claude"
+
+    return match_with_fallback, state
+
+
+class TestBatchMatchService:
+    """Tests for MatchService.generate_batch_match_analysis()."""
+
+    @pytest.mark.asyncio
+    async def test_reserves_once_and_charges_completed_analyses(self):
+        """One reservation covers the batch; failed jobs are not charged."""
+        jobs = [_job("job-1"), _job("job-2", "Go developer wanted."), _job("job-3", "")]
+        service = _service(jobs)
+        ai, _ = _ai(fail_for=("Go developer wanted.",))
+
+        with patch("app.services.match_service.AIProviderFactory.match_with_fallback", ai):
+            stream = await service.generate_batch_match_analysis("user-1", job_ids=["job-1", "job-2", "job-3"])
+            events = await _collect(stream)
+
+        service.job_service.get_jobs.assert_awaited_once_with("user-1", ["job-1", "job-2", "job-3"])
+        service.usage_service.reserve_credits.assert_awaited_once_with("user-1", "match", credits=3)
+        by_job = {e["data"]["job_id"]: e for e in events if "job_id" in e["data"]}
+        assert by_job["job-1"]["event"] == "result"
+        assert by_job["job-1"]["data"]["match_score"] == 80
+        assert by_job["job-2"]["data"]["code"] == "AI_PROVIDER_UNAVAILABLE"
+        assert by_job["job-3"]["data"]["code"] == "VALIDATION_ERROR"
+        assert events[-1] == {"event": "done", "data": {"completed": 1, "failed": 2, "credits_used": 1}}
+
+        commit = service.usage_service.commit_reservation.await_args
+        assert commit.args == ("res-1",)
+        assert commit.kwargs["credits"] == 1
+        assert commit.kwargs["ai_provider"] == "claude"
+        assert commit.kwargs["usage"].input_tokens == 100
+
+    @pytest.mark.asyncio
+    async def test_provider_calls_are_bounded(self):
+        """No more than match_batch_concurrency analyses run at once."""
+        jobs = [_job(f"job-{i}", f"Role {i}") for i in range(10)]
+        service = _service(jobs)
+        ai, state = _ai(delay=0.01)
+
+        with patch("app.services.match_service.AIProviderFactory.match_with_fallback", ai), patch(
+            "app.services.match_service.settings.match_batch_concurrency", 3
+        ):
+            stream = await service.generate_batch_match_analysis("user-1", job_ids=[j["id"] for j in jobs])
+            events = await _collect(stream)
+
+        assert state["peak"] == 3
+        assert sum(e["event"] == "result" for e in events) == 10
+
+    @pytest.mark.asyncio
+    async def test_cached_jobs_are_free_and_missing_jobs_reported(self):
+        """Cache hits skip the AI and credits; unknown job IDs get an error event."""
+        service = _service([_job("job-1")])
+        key = match_cache_key(RESUME, "Python developer wanted.", "claude")
+        await store_match("user-1", key, {**ANALYSIS, "ai_provider_used": "gpt"})
+        ai = AsyncMock()
+
+        with patch("app.services.match_service.AIProviderFactory.match_with_fallback", ai):
+            stream = await service.generate_batch_match_analysis("user-1", job_ids=["job-1", "job-9"])
+            events = await _collect(stream)
+
+        ai.assert_not_awaited()
+        assert [e["event"] for e in events] == ["start", "error", "result", "done"]
+        assert events[1]["data"] == {"job_id": "job-9", "code": "JOB_NOT_FOUND", "message": "Job not found"}
+        assert events[2]["data"]["cached"] is True
+        service.usage_service.commit_reservation.assert_not_awaited()
+        service.usage_service.release_reservation.assert_awaited_once_with("res-1")
+
+    @pytest.mark.asyncio
+    async def test_status_filter_uses_list_jobs(self):
+        """A status filter selects the user's jobs through JobService.list_jobs."""
+        service = _service([_job("job-1")])
+        service.job_service.list_jobs.return_value = {"items": [{"id": "job-1"}], "total": 1}
+        ai, _ = _ai()
+
+        with patch("app.services.match_service.AIProviderFactory.match_with_fallback", ai):
+            await _collect(await service.generate_batch_match_analysis("user-1", status="saved"))
+
+        filters = service.job_service.list_jobs.await_args.args[1]
+        assert filters["status"] == "saved"
+        service.job_service.get_jobs.assert_awaited_once_with("user-1", ["job-1"])
+
+    @pytest.mark.asyncio
+    async def test_too_many_jobs_rejected_before_reserving(self):
+        """Oversized batches fail validation without holding credits."""
+        service = _service([])
+        with patch("app.services.match_service.settings.match_batch_max_jobs", 2):
+            with pytest.raises(ValidationError):
+                await service.generate_batch_match_analysis("user-1", job_ids=["a", "b", "c"])
+
+        service.usage_service.reserve_credits.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_abandoned_batch_charges_finished_work(self):
+        """A client leaving mid-batch is charged only for the analyses that finished."""
+        jobs = [_job("job-1", "Role 1"), _job("job-2", "Role 2")]
+        service = _service(jobs)
+        ai, _ = _ai(delay=0.01)
+
+        with patch("app.services.match_service.AIProviderFactory.match_with_fallback", ai), patch(
+            "app.services.match_service.settings.match_batch_concurrency", 1
+        ):
+            stream = await service.generate_batch_match_analysis("user-1", job_ids=["job-1", "job-2"])
+            assert (await stream.__anext__())["event"] == "start"
+            assert (await stream.__anext__())["event"] == "result"
+            await stream.aclose()
+
+        assert service.usage_service.commit_reservation.await_args.kwargs["credits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_never_iterated_batch_releases(self):
+        """Closing a batch that never started returns the reservation."""
+        service = _service([_job("job-1")])
+        stream = await service.generate_batch_match_analysis("user-1", job_ids=["job-1"])
+
+        await stream.aclose()
+
+        service.usage_service.release_reservation.assert_awaited_once_with("res-1")
+        service.usage_service.commit_reservation.assert_not_awaited()
+
+
+class TestPartialCommit:
+    """Tests for committing part of a reservation."""
+
+    @pytest.mark.asyncio
+    async def test_credits_passed_only_when_given(self):
+        """p_credits charges part of the hold; omitting it charges all of it."""
+        service = UsageService()
+        with patch.object(service.admin_client, "rpc") as mock_rpc:
+            mock_rpc.return_value.execute.return_value = MagicMock(data=True)
+            await service.commit_reservation("res-1", credits=2)
+            await service.commit_reservation("res-2")
+
+        partial, full = (call.args[1] for call in mock_rpc.call_args_list)
+        assert partial["p_credits"] == 2
+        assert "p_credits" not in full
+
+
+class TestResumePrefixReuse:
+    """Tests for the resume prefix shared across the jobs of a batch."""
+
+    def test_jobs_share_the_resume_prefix(self):
+        """Match prompts for different jobs share system+resume but not the job block."""
+        first = format_match_prompt(RESUME, "Python developer wanted.")
+        second = format_match_prompt(RESUME, "Go developer wanted.")
+
+        assert first.resume_key == second.resume_key
+        assert first.resume_context == second.resume_context
+        assert first.prefix_key != second.prefix_key
+
+
+@pytest.fixture
+def authenticated_client():
+    """Create a test client with mocked authentication."""
+    from app.core.deps import get_current_user
+
+    async def mock_get_current_user():
+        return {"id": "test-user-id-1234567890", "email": "test@example.com"}
+
+    app.dependency_overrides[get_current_user] = mock_get_current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+class TestBatchMatchEndpoint:
+    """Tests for POST /v1/ai/match/batch."""
+
+    def test_streams_results_as_sse(self, authenticated_client):
+        """Service events are relayed as text/event-stream."""
+
+        async def events():
+            yield {"event": "start", "data": {"total": 1}}
+            yield {"event": "result", "data": {"job_id": "job-1", **ANALYSIS, "ai_provider_used": "claude", "cached": False}}
+            yield {"event": "done", "data": {"completed": 1, "failed": 0, "credits_used": 1}}
+
+        job_id = "00000000-0000-0000-0000-000000000001"
+        with patch.object(MatchService, "generate_batch_match_analysis", AsyncMock(return_value=events())) as batch:
+            response = authenticated_client.post("/v1/ai/match/batch", json={"job_ids": [job_id]})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        names = [block.split("\n")[0] for block in response.text.strip().split("\n\n")]
+        assert names == ["event: start", "event: result", "event: done"]
+        assert json.loads(response.text.split("\n")[1][len("data: "):]) == {"total": 1}
+        assert batch.await_args.kwargs["job_ids"] == [job_id]
+
+    def test_requires_exactly_one_selector(self, authenticated_client):
+        """job_ids and status are mutually exclusive, and one is required."""
+        both = authenticated_client.post(
+            "/v1/ai/match/batch",
+            json={"job_ids": ["00000000-0000-0000-0000-000000000001"], "status": "saved"},
+        )
+        neither = authenticated_client.post("/v1/ai/match/batch", json={})
+
+        assert both.status_code in (400, 422)
+        assert neither.status_code in (400, 422)
+
+    def test_credit_exhaustion_is_a_json_error(self, authenticated_client):
+        """Not enough credits for the batch fails before streaming."""
+        with patch.object(
+            MatchService, "generate_batch_match_analysis", AsyncMock(side_effect=CreditExhaustedError())
+        ):
+            response = authenticated_client.post("/v1/ai/match/batch", json={"status": "saved"})
+
+        assert response.status_code == 422
+        assert response.json()["error"]["code"] == "CREDIT_EXHAUSTED"
@@ -0,0 +1,178 @@
+"""Tests for the match analysis result cache."""
+
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.exceptions import AIProviderUnavailableError
+from app.db import match_cache
+from app.db.match_cache import (
+    forget_user_matches,
+    get_cached_match,
+    match_cache_key,
+    store_match,
+)
+from app.services.match_service import MatchService
+from app.services.usage_service import UsageService
+
+RESUME = {"skills": ["Python", "FastAPI"], "summary": "Backend engineer."}
+JOB = "Looking for a Python developer with FastAPI experience."
+ANALYSIS = {
+    "match_score": 80,
+    "strengths": ["Python"],
+    "gaps": ["Kubernetes"],
+    "recommendations": ["Mention Docker"],
+}
+
+
+class TestMatchCacheKey:
+    """Tests for match_cache_key()."""
+
+    def test_key_ignores_dict_ordering(self):
+        """Equal resume data hashes the same regardless of key order."""
+        reordered = {"summary": RESUME["summary"], "skills": RESUME["skills"]}
+        assert match_cache_key(RESUME, JOB, "claude") == match_cache_key(reordered, JOB, "claude")
+
+    def test_key_changes_with_inputs(self):
+        """Any changed input, provider or prompt version is a different key."""
+        key = match_cache_key(RESUME, JOB, "claude")
+
+        assert match_cache_key(RESUME, JOB + " Remote.", "claude") != key
+        assert match_cache_key({**RESUME, "skills": ["Go"]}, JOB, "claude") != key
+        assert match_cache_key(RESUME, JOB, "gpt") != key
+        with patch.object(match_cache, "MATCH_PROMPT_VERSION", "next"):
+            assert match_cache_key(RESUME, JOB, "claude") != key
+
+
+class TestInProcessTier:
+    """Tests for the in-process LRU."""
+
+    @pytest.mark.asyncio
+    async def test_entries_are_scoped_per_user(self):
+        """One user's cached analysis is never served to another."""
+        await store_match("user-a", "k", {**ANALYSIS, "ai_provider_used": "claude"})
+
+        assert (await get_cached_match("user-a", "k"))["match_score"] == 80
+        assert await get_cached_match("user-b", "k") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss(self):
+        """Entries past their TTL are not served."""
+        with patch.object(match_cache.time, "monotonic", return_value=1000.0):
+            await store_match("user-a", "k", ANALYSIS)
+        with patch.object(match_cache.time, "monotonic", return_value=1000.0 + 86400.0):
+            assert await get_cached_match("user-a", "k") is None
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_is_evicted(self):
+        """The LRU stays within match_cache_max_entries."""
+        with patch.object(match_cache.settings, "match_cache_max_entries", 2):
+            await store_match("user-a", "k1", ANALYSIS)
+            await store_match("user-a", "k2", ANALYSIS)
+            await get_cached_match("user-a", "k1")
+            await store_match("user-a", "k3", ANALYSIS)
+
+        assert await get_cached_match("user-a", "k1") is not None
+        assert await get_cached_match("user-a", "k2") is None
+
+    @pytest.mark.asyncio
+    async def test_forget_user_matches(self):
+        """Account deletion drops only that user's entries."""
+        await store_match("user-a", "k", ANALYSIS)
+        await store_match("user-b", "k", ANALYSIS)
+
+        forget_user_matches("user-a")
+
+        assert await get_cached_match("user-a", "k") is None
+        assert await get_cached_match("user-b", "k") is not None
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_cache(self):
+        """match_cache_ttl=0 turns caching off."""
+        with patch.object(match_cache.settings, "match_cache_ttl", 0):
+            await store_match("user-a", "k", ANALYSIS)
+            assert await get_cached_match("user-a", "k") is None
+
+
+class TestPersistentTier:
+    """Tests for the match_results table tier."""
+
+    @pytest.mark.asyncio
+    async def test_database_errors_are_misses(self):
+        """A failing match_results lookup falls through to the AI."""
+        with patch.object(match_cache.settings, "match_cache_persistent", True), patch(
+            "app.db.match_cache.execute", AsyncMock(side_effect=RuntimeError("relation does not exist"))
+        ):
+            assert await get_cached_match("user-a", "k") is None
+            await store_match("user-a", "k", ANALYSIS)  # does not raise
+
+    @pytest.mark.asyncio
+    async def test_database_hit_fills_local_tier(self):
+        """A row found in match_results is served and kept in process."""
+        row = MagicMock(data={"result": {**ANALYSIS, "ai_provider_used": "gpt"}})
+        lookup = AsyncMock(return_value=row)
+        with patch.object(match_cache.settings, "match_cache_persistent", True), patch(
+            "app.db.match_cache.execute", lookup
+        ), patch("app.db.match_cache.get_supabase_admin_client"):
+            assert (await get_cached_match("user-a", "k"))["ai_provider_used"] == "gpt"
+            assert (await get_cached_match("user-a", "k"))["ai_provider_used"] == "gpt"
+
+        assert lookup.await_count == 1
+
+
+def _service():
+    service = MatchService.__new__(MatchService)
+    service.usage_service = MagicMock(spec=UsageService)
+    service.usage_service.reserve_credits.return_value = "res-1"
+    service._load_inputs = AsyncMock(return_value=(RESUME, JOB, None))
+    return service
+
+
+class TestMatchServiceCaching:
+    """Tests for MatchService.generate_match_analysis() with the cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_analysis_skips_ai_and_credits(self):
+        """The second identical request is served from cache without a charge."""
+        service = _service()
+        ai = AsyncMock(return_value=(ANALYSIS, "claude"))
+
+        with patch("app.services.match_service.AIProviderFactory.match_with_fallback", ai):
+            first = await service.generate_match_analysis("user-a", "job-1")
+            second = await service.generate_match_analysis("user-a", "job-1")
+
+        assert first == second == {**ANALYSIS, "ai_provider_used": "claude"}
+        assert ai.await_count == 1
+        service.usage_service.reserve_credits.assert_awaited_once_with("user-a", "match")
+        service.usage_service.commit_reservation.assert_awaited_once_with("res-1", ai_provider="claude", usage=ANY)
+
+    @pytest.mark.asyncio
+    async def test_hit_credits_are_charged_when_configured(self):
+        """match_cache_hit_credits > 0 charges cache hits."""
+        service = _service()
+        ai = AsyncMock(return_value=(ANALYSIS, "gpt"))
+
+        with patch("app.services.match_service.AIProviderFactory.match_with_fallback", ai), patch(
+            "app.services.match_service.settings.match_cache_hit_credits", 1
+        ):
+            await service.generate_match_analysis("user-a", "job-1")
+            await service.generate_match_analysis("user-a", "job-1")
+
+        assert ai.await_count == 1
+        assert service.usage_service.reserve_credits.await_count == 2
+        service.usage_service.reserve_credits.assert_awaited_with("user-a", "match", credits=1)
+        service.usage_service.commit_reservation.assert_awaited_with("res-1", ai_provider="gpt")
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        """An AI failure releases the credit and leaves nothing cached."""
+        service = _service()
+        ai = AsyncMock(side_effect=[ValueError("All AI providers failed"), (ANALYSIS, "claude")])
+
+        with patch("app.services.match_service.AIProviderFactory.match_with_fallback", ai):
+            with pytest.raises(AIProviderUnavailableError):
+                await service.generate_match_analysis("user-a", "job-1")
+            await service.generate_match_analysis("user-a", "job-1")
+
+        assert ai.await_count == 2
+        service.usage_service.release_reservation.assert_awaited_once_with("res-1")
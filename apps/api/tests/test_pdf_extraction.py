@@ -0,0 +1,142 @@
+"""Tests for PDF text extraction limits and the extraction process pool."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.pdf_parser import (
+    PDF_ENGINES,
+    PdfExtractionPool,
+    _extract_in_worker,
+    _quality_problem,
+    extract_text_from_pdf,
+)
+from benchmarks.pdf_corpus import build_pdf, sample_resumes
+
+
+class TestExtractionLimits:
+    """Tests for the per-document limits."""
+
+    def test_page_cap_ignores_later_pages(self):
+        """Only the first max_pages pages are read."""
+        text = extract_text_from_pdf(build_pdf(5, lines_per_page=2), max_pages=2)
+
+        assert "Page 2, line 2" in text
+        assert "Page 3" not in text
+
+    def test_alarm_stops_slow_extraction(self):
+        """The in-worker alarm turns a slow document into a ValueError."""
+        with pytest.raises(ValueError, match="timed out"):
+            _extract_in_worker(build_pdf(40), max_pages=40, timeout=0.001)
+
+    def test_memory_error_is_a_value_error(self):
+        """Hitting the memory limit is reported like any unreadable PDF."""
+        with patch("app.services.pdf_parser.pdfplumber.open", side_effect=MemoryError):
+            with pytest.raises(ValueError, match="too large"):
+                extract_text_from_pdf(b"%PDF")
+
+
+class TestExtractionEngines:
+    """Tests for the engine choice and the pdfplumber fallback."""
+
+    @pytest.mark.parametrize("engine", sorted(PDF_ENGINES))
+    def test_every_engine_reads_the_sample_resume(self, engine):
+        """Each engine returns the resume text and respects the page cap."""
+        corpus = sample_resumes()
+        text = extract_text_from_pdf(corpus["single-column"], engine=engine)
+        assert "Jordan Rivera" in text
+        assert "Senior Software Engineer, Ledgerline" in text
+
+        capped = extract_text_from_pdf(build_pdf(4, lines_per_page=2), max_pages=1, engine=engine)
+        assert "Page 1, line 2" in capped
+        assert "Page 2" not in capped
+
+    def test_good_fast_text_skips_pdfplumber(self):
+        """Text that passes the quality checks is returned as is."""
+        with patch("app.services.pdf_parser._pdfplumber_pages") as pdfplumber_pages:
+            text = extract_text_from_pdf(sample_resumes()["single-column"], engine="pdfium")
+
+        pdfplumber_pages.assert_not_called()
+        assert "Jordan Rivera" in text
+
+    @pytest.mark.parametrize(
+        "fast_engine",
+        [
+            MagicMock(return_value=["\ufffd" * 300]),
+            MagicMock(side_effect=RuntimeError("bad xref")),
+        ],
+        ids=["garbled", "crashed"],
+    )
+    def test_falls_back_to_pdfplumber(self, fast_engine):
+        """Garbled or failed fast extraction is redone with pdfplumber."""
+        content = sample_resumes()["single-column"]
+        with patch.dict(PDF_ENGINES, {"pdfium": fast_engine}):
+            text = extract_text_from_pdf(content, engine="pdfium")
+
+        assert text == extract_text_from_pdf(content, engine="pdfplumber")
+
+    def test_quality_problems(self):
+        """The heuristics flag missing text, unmapped glyphs and lost spaces."""
+        sentence = "Senior backend engineer with eight years of Python experience. " * 3
+
+        assert _quality_problem(sentence, pages=1) is None
+        assert _quality_problem("Jordan Rivera", pages=1) == "too little text"
+        assert _quality_problem(sentence, pages=5) == "too little text"
+        assert _quality_problem(sentence + "(cid:3)" * 10, pages=1) == "unmapped glyphs"
+        assert _quality_problem(sentence.replace(" ", ""), pages=1) == "missing word spaces"
+
+
+class TestPdfExtractionPool:
+    """Tests for PdfExtractionPool (spawns real worker processes)."""
+
+    @pytest.mark.asyncio
+    async def test_extracts_in_worker_process(self):
+        """Text comes back from the worker; bad input is a ValueError."""
+        pool = PdfExtractionPool(workers=1, max_pages=1, timeout=30.0, memory_mb=1024)
+        try:
+            text = await pool.extract(build_pdf(3, lines_per_page=1))
+            assert text.startswith("Page 1, line 1")
+            assert "Page 2" not in text
+            with pytest.raises(ValueError, match="Failed to extract"):
+                await pool.extract(b"not a valid pdf")
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unresponsive_worker_is_replaced(self):
+        """A worker that outlives the timeout is killed and the pool keeps working."""
+        pool = PdfExtractionPool(workers=1, max_pages=5, timeout=0.5, memory_mb=0)
+        try:
+            # Give up long before the freshly spawned worker can answer
+            with patch("app.services.pdf_parser._KILL_GRACE", -0.45):
+                with pytest.raises(ValueError, match="timed out"):
+                    await pool.extract(build_pdf(1))
+            replacement = pool._executor
+            with patch.object(pool, "_timeout", 30.0):
+                assert "Page 1" in await pool.extract(build_pdf(1))
+            assert pool._executor is replacement
+        finally:
+            pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_upload_parse_uses_pool_when_running():
+    """_parse_file() hands extraction to the pool instead of a thread."""
+    from app.services.resume_service import ResumeService
+
+    service = ResumeService.__new__(ResumeService)
+    pool = MagicMock(spec=PdfExtractionPool)
+    pool.extract = AsyncMock(return_value="Jane Doe, engineer")
+    thread_extract = MagicMock()
+
+    with patch("app.services.resume_service.get_pdf_pool", return_value=pool), patch(
+        "app.services.resume_service.extract_text_from_pdf", thread_extract
+    ), patch(
+        "app.services.resume_service.AIProviderFactory.parse_with_fallback",
+        AsyncMock(return_value=({"skills": ["Python"]}, "claude")),
+    ):
+        parsed_data, _, parse_status, _ = await service._parse_file(b"%PDF")
+
+    pool.extract.assert_awaited_once_with(b"%PDF")
+    thread_extract.assert_not_called()
+    assert (parse_status, parsed_data["skills"]) == ("completed", ["Python"])
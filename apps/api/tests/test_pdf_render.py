@@ -0,0 +1,159 @@
+"""Tests for cover letter PDF rendering, its cache and the render pool."""
+
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import pdf_service
+from app.services.pdf_service import CoverLetterRenderPool, PDFService, _cache_key
+
+LETTER = "Dear Hiring Manager,\n\nI am writing to apply."
+
+
+def _fake_renderer():
+    """A stand-in for (HTML, stylesheet, font_config) that records the HTML."""
+    html_class = MagicMock()
+    html_class.return_value.write_pdf.return_value = b"%PDF-1.7 rendered"
+    return html_class, "parsed-stylesheet", "font-config"
+
+
+class TestGenerateCoverLetterPdf:
+    """Tests for the blocking renderer."""
+
+    def test_uses_preparsed_stylesheet_and_escapes_content(self):
+        """The shared stylesheet is passed in and letter text cannot inject markup."""
+        renderer = _fake_renderer()
+        with patch("app.services.pdf_service._renderer", return_value=renderer):
+            pdf_bytes = PDFService.generate_cover_letter_pdf(
+                'Hi <img src="file:///etc/passwd"> & co.\n\nThanks', current_date="May 4, 2026"
+            )
+
+        html_class = renderer[0]
+        html = html_class.call_args.kwargs["string"]
+        assert pdf_bytes == b"%PDF-1.7 rendered"
+        assert '<div class="date">May 4, 2026</div>' in html
+        assert "<p>Hi &lt;img src=&quot;file:///etc/passwd&quot;&gt; &amp; co.</p>" in html
+        assert "<p>Thanks</p>" in html
+        html_class.return_value.write_pdf.assert_called_once_with(
+            stylesheets=["parsed-stylesheet"], font_config="font-config"
+        )
+
+    def test_missing_weasyprint_is_a_value_error(self):
+        """Without WeasyPrint the error is the same as before."""
+        with patch("app.services.pdf_service._renderer", side_effect=ImportError("weasyprint")):
+            with pytest.raises(ValueError, match="unavailable"):
+                PDFService.generate_cover_letter_pdf(LETTER)
+
+
+class TestRenderCoverLetterPdf:
+    """Tests for the async, cached render path."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_download_is_served_from_cache(self):
+        """The same letter on the same day is rendered once."""
+        generate = MagicMock(return_value=b"%PDF-1.7 rendered")
+        with patch.object(PDFService, "generate_cover_letter_pdf", generate):
+            first = await PDFService().render_cover_letter_pdf(LETTER, "letter")
+            second = await PDFService().render_cover_letter_pdf(LETTER, "other-name")
+            await PDFService().render_cover_letter_pdf(LETTER + " Regards.")
+
+        assert first == second == b"%PDF-1.7 rendered"
+        assert generate.call_count == 2
+        # Rendered with the same date that keyed the cache
+        assert generate.call_args_list[0].args[2] == generate.call_args_list[1].args[2]
+
+    @pytest.mark.asyncio
+    async def test_cache_can_be_disabled(self):
+        """With no TTL every download renders."""
+        generate = MagicMock(return_value=b"%PDF")
+        with patch.object(PDFService, "generate_cover_letter_pdf", generate), patch(
+            "app.services.pdf_service.settings.pdf_render_cache_ttl", 0
+        ):
+            await PDFService().render_cover_letter_pdf(LETTER)
+            await PDFService().render_cover_letter_pdf(LETTER)
+
+        assert generate.call_count == 2
+
+    def test_cache_key_covers_content_date_and_template(self):
+        """Any input change is a different key."""
+        key = _cache_key(LETTER, "May 4, 2026")
+
+        assert key == _cache_key(LETTER, "May 4, 2026")
+        assert key != _cache_key(LETTER, "May 5, 2026")
+        assert key != _cache_key(LETTER + ".", "May 4, 2026")
+        with patch("app.services.pdf_service._TEMPLATE_HASH", "edited"):
+            assert key != _cache_key(LETTER, "May 4, 2026")
+
+    @pytest.mark.asyncio
+    async def test_renders_in_pool_when_running(self):
+        """The warmed pool renders instead of a thread in this process."""
+        pool = MagicMock(spec=CoverLetterRenderPool)
+        pool.render = AsyncMock(return_value=b"%PDF-pool")
+        generate = MagicMock()
+
+        with patch("app.services.pdf_service.get_render_pool", return_value=pool), patch.object(
+            PDFService, "generate_cover_letter_pdf", generate
+        ):
+            assert await PDFService().render_cover_letter_pdf(LETTER) == b"%PDF-pool"
+
+        generate.assert_not_called()
+        assert pool.render.await_args.args[0] == LETTER
+
+    @pytest.mark.asyncio
+    async def test_empty_content_rejected(self):
+        """Blank letters are rejected before any rendering."""
+        with pytest.raises(ValueError, match="empty"):
+            await PDFService().render_cover_letter_pdf("  \n ")
+
+
+def _executor(exception=None):
+    """A stand-in executor whose renders fail with `exception` or never finish."""
+    executor = MagicMock()
+    executor._processes = {1: MagicMock()}
+    future = Future()
+    if exception is not None:
+        future.set_exception(exception)
+    executor.submit.return_value = future
+    return executor
+
+
+class TestCoverLetterRenderPool:
+    """Tests for CoverLetterRenderPool recovery."""
+
+    @pytest.mark.asyncio
+    async def test_hung_worker_is_replaced(self):
+        """A render past the timeout kills the worker and starts a fresh executor."""
+        hung, replacement = _executor(), _executor()
+        with patch.object(CoverLetterRenderPool, "_new_executor", side_effect=[hung, replacement]):
+            pool = CoverLetterRenderPool(workers=1, timeout=0.01)
+            with pytest.raises(ValueError, match="Failed to generate PDF"):
+                await pool.render(LETTER, "May 4, 2026")
+
+        assert pool._executor is replacement
+        hung._processes[1].kill.assert_called_once()
+        hung.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_is_replaced_and_render_falls_back_to_thread(self):
+        """A dead worker or failed warm-up does not disable PDF rendering."""
+        broken, replacement = _executor(BrokenProcessPool("warm-up failed")), _executor()
+        generate = MagicMock(return_value=b"%PDF-thread")
+        with patch.object(CoverLetterRenderPool, "_new_executor", side_effect=[broken, replacement]), patch.object(
+            PDFService, "generate_cover_letter_pdf", generate
+        ):
+            pool = CoverLetterRenderPool(workers=1, timeout=5.0)
+            assert await pool.render(LETTER, "May 4, 2026") == b"%PDF-thread"
+
+        assert pool._executor is replacement
+        generate.assert_called_once_with(LETTER, None, "May 4, 2026")
+
+
+def test_pool_not_started_without_weasyprint():
+    """No WeasyPrint means no pool; requests keep the thread path."""
+    with patch("app.services.pdf_service.importlib.util.find_spec", return_value=None), patch(
+        "app.services.pdf_service.settings.pdf_render_workers", 2
+    ):
+        assert pdf_service.start_render_pool() is None
+    assert pdf_service.get_render_pool() is None
@@ -0,0 +1,112 @@
+"""Tests for the request-scoped / TTL profile cache."""
+
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.core.request_context import RequestContext, _request_context
+from app.db import profile_cache
+
+
+@pytest.fixture
+def mock_admin_client():
+    """Patch the admin client used by the profile cache."""
+    client = MagicMock()
+    with patch("app.db.profile_cache.get_supabase_admin_client", return_value=client):
+        yield client
+
+
+def _profile_query(client):
+    return client.table.return_value.select.return_value.eq.return_value.maybe_single.return_value
+
+
+@pytest.fixture
+def request_scope():
+    """Run the test inside a RequestContext, like the middleware does."""
+    token = _request_context.set(RequestContext())
+    yield
+    _request_context.reset(token)
+
+
+class TestProfileCache:
+    """Tests for get_cached_profile() and invalidate_profile()."""
+
+    @pytest.mark.asyncio
+    async def test_profile_fetched_once_per_request(self, mock_admin_client, request_scope, monkeypatch):
+        """Repeated reads in one request hit the database once."""
+        monkeypatch.setattr(settings, "profile_cache_ttl", 0)
+        user_id = str(uuid4())
+        _profile_query(mock_admin_client).execute.return_value = MagicMock(
+            data={"id": user_id, "subscription_tier": "pro"}
+        )
+
+        for _ in range(4):
+            profile = await profile_cache.get_cached_profile(user_id)
+
+        assert profile["subscription_tier"] == "pro"
+        assert _profile_query(mock_admin_client).execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_process_cache_shared_across_requests(self, mock_admin_client, monkeypatch):
+        """With a TTL, a second request reuses the cached row."""
+        monkeypatch.setattr(settings, "profile_cache_ttl", 60)
+        user_id = str(uuid4())
+        _profile_query(mock_admin_client).execute.return_value = MagicMock(data={"id": user_id})
+
+        for _ in range(2):
+            token = _request_context.set(RequestContext())
+            await profile_cache.get_cached_profile(user_id)
+            _request_context.reset(token)
+
+        assert _profile_query(mock_admin_client).execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_refetch(self, mock_admin_client, request_scope, monkeypatch):
+        """invalidate_profile() drops both the request and process entries."""
+        monkeypatch.setattr(settings, "profile_cache_ttl", 60)
+        user_id = str(uuid4())
+        _profile_query(mock_admin_client).execute.side_effect = [
+            MagicMock(data={"id": user_id, "subscription_tier": "free"}),
+            MagicMock(data={"id": user_id, "subscription_tier": "pro"}),
+        ]
+
+        assert (await profile_cache.get_cached_profile(user_id))["subscription_tier"] == "free"
+        profile_cache.invalidate_profile(user_id)
+
+        assert (await profile_cache.get_cached_profile(user_id))["subscription_tier"] == "pro"
+
+    @pytest.mark.asyncio
+    async def test_missing_profile_not_cached(self, mock_admin_client, request_scope):
+        """A missing profile is looked up again on the next read."""
+        _profile_query(mock_admin_client).execute.return_value = MagicMock(data=None)
+
+        assert await profile_cache.get_cached_profile("missing-user") is None
+        assert await profile_cache.get_cached_profile("missing-user") is None
+        assert _profile_query(mock_admin_client).execute.call_count == 2
+
+
+class TestProfileCacheInvalidation:
+    """Writes to profiles invalidate the cache."""
+
+    def test_mock_cancel_invalidates_profile(self):
+        """POST /subscriptions/mock-cancel drops the cached profile."""
+        from fastapi.testclient import TestClient
+
+        from app.core.deps import get_current_user
+        from app.main import app
+
+        user_id = str(uuid4())
+        app.dependency_overrides[get_current_user] = lambda: {"id": user_id}
+        try:
+            with patch("app.routers.subscriptions.get_supabase_admin_client"), patch(
+                "app.routers.subscriptions.invalidate_profile"
+            ) as mock_invalidate, patch("app.routers.subscriptions.settings") as mock_settings:
+                mock_settings.stripe_mock_mode = True
+                response = TestClient(app).post("/v1/subscriptions/mock-cancel", json={})
+
+            assert response.status_code == 200
+            mock_invalidate.assert_called_once_with(user_id)
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,102 @@
+"""Tests for the cacheable prompt prefix shared by generation operations."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.ai.claude import ClaudeProvider
+from app.services.ai.openai import OpenAIProvider
+from app.services.ai.prompts import (
+    as_plain_text_prompt,
+    format_answer_prompt,
+    format_cover_letter_prompt,
+    format_match_prompt,
+    format_outreach_prompt,
+)
+
+RESUME = {"summary": "Backend engineer.", "skills": ["Python", "FastAPI"]}
+JOB = "Looking for a Python developer with FastAPI experience."
+
+
+def _all_prompts(resume=RESUME):
+    return [
+        format_match_prompt(resume, JOB),
+        format_cover_letter_prompt(resume, JOB, "confident"),
+        format_answer_prompt(resume, JOB, "Why this role?", 300),
+        format_outreach_prompt(resume, JOB, "recruiter", "linkedin"),
+        as_plain_text_prompt(format_cover_letter_prompt(resume, JOB, "friendly"), "cover letter"),
+    ]
+
+
+class TestSharedPrefix:
+    """Tests for ChatPrompt prefix stability."""
+
+    def test_every_operation_shares_the_prefix(self):
+        """System and context are identical across operations on one resume and job."""
+        prompts = _all_prompts()
+
+        assert len({(p.system, p.context) for p in prompts}) == 1
+        assert len({p.prefix_key for p in prompts}) == 1
+        assert len({p.task for p in prompts}) == len(prompts)
+
+    def test_prefix_independent_of_key_order(self):
+        """Resume dicts loaded in a different key order serialize identically."""
+        reordered = {"skills": RESUME["skills"], "summary": RESUME["summary"]}
+        assert format_match_prompt(reordered, JOB).context == format_match_prompt(RESUME, JOB).context
+
+    def test_request_parameters_stay_out_of_prefix(self):
+        """Per-request inputs appear only in the task."""
+        prompt = format_answer_prompt(RESUME, JOB, "Why this role?", 300, "Shorter", "Old answer")
+
+        for value in ("Why this role?", "Shorter", "Old answer"):
+            assert value in prompt.task
+            assert value not in prompt.context
+
+
+def _response(text):
+    response = MagicMock()
+    response.content = [MagicMock(text=text)]
+    response.choices = [MagicMock(message=MagicMock(content=text))]
+    return response
+
+
+class TestProviderRequests:
+    """Tests for how providers send the prefix."""
+
+    @pytest.mark.asyncio
+    async def test_claude_marks_context_with_cache_control(self):
+        """Claude sends system separately and a cache breakpoint after the context."""
+        provider = ClaudeProvider("test-key")
+        provider.client = MagicMock()
+        provider.client.messages.create = AsyncMock(
+            return_value=_response('{"content": "Hi", "tokens_used": 1}')
+        )
+
+        await provider.generate_answer(RESUME, JOB, "Why this role?", 300)
+
+        kwargs = provider.client.messages.create.await_args.kwargs
+        prompt = format_answer_prompt(RESUME, JOB, "Why this role?", 300)
+        assert kwargs["system"] == prompt.system
+        resume_block, job_block, task_block = kwargs["messages"][0]["content"]
+        assert resume_block == {"type": "text", "text": prompt.resume_context, "cache_control": {"type": "ephemeral"}}
+        assert job_block == {"type": "text", "text": prompt.job_context, "cache_control": {"type": "ephemeral"}}
+        assert task_block == {"type": "text", "text": prompt.task}
+
+    @pytest.mark.asyncio
+    async def test_openai_orders_prefix_first(self):
+        """OpenAI gets the system prompt, then context before the task, plus a cache key."""
+        provider = OpenAIProvider("test-key")
+        provider.client = MagicMock()
+        provider.client.chat.completions.create = AsyncMock(
+            return_value=_response('{"content": "Hi", "tokens_used": 1}')
+        )
+
+        await provider.generate_outreach(RESUME, JOB, "recruiter", "linkedin")
+
+        kwargs = provider.client.chat.completions.create.await_args.kwargs
+        prompt = format_outreach_prompt(RESUME, JOB, "recruiter", "linkedin")
+        system, user = kwargs["messages"]
+        assert system == {"role": "system", "content": prompt.system}
+        assert user["content"].startswith(prompt.context)
+        assert user["content"].endswith(prompt.task)
+        assert kwargs["extra_body"] == {"prompt_cache_key": prompt.resume_key}
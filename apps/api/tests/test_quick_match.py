@@ -0,0 +1,194 @@
+"""Tests for local match estimates (quick match)."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.job_service import JobService
+from app.services.match_service import MatchService
+from app.services.quick_match import normalize_terms, quick_match, rank_jobs
+from app.services.usage_service import UsageService
+
+RESUME = {
+    "skills": ["Python", "FastAPI", "PostgreSQL", "C++"],
+    "experience": [{"title": "Backend Engineer", "description": "Built REST APIs on AWS."}],
+}
+PYTHON_JOB = {
+    "id": "job-py",
+    "description": "Backend Engineer with strong Python and PostgreSQL experience. "
+    "You will build REST APIs on AWS. Kubernetes is a plus.",
+}
+NURSE_JOB = {"id": "job-rn", "description": "Registered nurse for ICU night shifts. BLS certification required."}
+
+
+class TestNormalizeTerms:
+    """Tests for normalize_terms()."""
+
+    def test_keeps_tech_spellings_and_folds_plurals(self):
+        """c++, c# and node.js survive; plurals fold; stop words drop."""
+        assert normalize_terms("We use Node.js, C++ and C# for our APIs and services") == [
+            "node.js", "c++", "c#", "api", "service",
+        ]
+
+    def test_names_ending_in_s_are_not_folded(self):
+        """Kubernetes, AWS and analysis keep their trailing s."""
+        assert normalize_terms("Kubernetes AWS analysis") == ["kubernetes", "aws", "analysis"]
+
+
+class TestQuickMatch:
+    """Tests for quick_match() and rank_jobs()."""
+
+    def test_relevant_job_scores_high(self):
+        """A job asking for the resume's skills scores high and lists them."""
+        estimate = quick_match(RESUME, PYTHON_JOB)
+
+        assert estimate.match_score >= 70
+        assert estimate.matched_skills == ["Python", "PostgreSQL"]
+        assert "kubernetes" in estimate.missing_terms
+
+    def test_unrelated_job_scores_low(self):
+        """A job sharing no vocabulary with the resume scores 0."""
+        assert quick_match(RESUME, NURSE_JOB).match_score == 0
+
+    def test_empty_inputs_score_zero(self):
+        """No usable terms on either side is a 0, not an error."""
+        assert quick_match({}, PYTHON_JOB).match_score == 0
+        assert quick_match(RESUME, {"description": ""}).match_score == 0
+        assert quick_match({"skills": "not a list", "experience": [None]}, PYTHON_JOB).match_score == 0
+
+    def test_deterministic(self):
+        """The same inputs always give the same estimate."""
+        assert quick_match(RESUME, PYTHON_JOB) == quick_match(RESUME, PYTHON_JOB)
+
+    def test_rank_jobs_orders_by_score_and_keeps_ties_stable(self):
+        """Best match first; equal scores keep their input order."""
+        other_nurse = {**NURSE_JOB, "id": "job-rn-2"}
+        ranked = rank_jobs(RESUME, [NURSE_JOB, PYTHON_JOB, other_nurse])
+
+        assert [job["id"] for job in ranked] == ["job-py", "job-rn", "job-rn-2"]
+        assert ranked[0]["match_score"] == quick_match(RESUME, PYTHON_JOB).match_score
+
+
+class TestQuickMatchService:
+    """Tests for MatchService.generate_quick_match()."""
+
+    @pytest.mark.asyncio
+    async def test_no_credits_or_ai(self):
+        """The estimate is computed locally without touching credits."""
+        service = MatchService.__new__(MatchService)
+        service.usage_service = MagicMock(spec=UsageService)
+        service.job_service = MagicMock(spec=JobService)
+        service.job_service.get_job.return_value = PYTHON_JOB
+        service._fetch_resume = AsyncMock(return_value=({"parsed_data": RESUME}, None))
+
+        with patch("app.services.match_service.AIProviderFactory.match_with_fallback") as ai:
+            result = await service.generate_quick_match("user-1", "job-py")
+
+        ai.assert_not_called()
+        service.usage_service.reserve_credits.assert_not_called()
+        assert result == {
+            "match_score": quick_match(RESUME, PYTHON_JOB).match_score,
+            "matched_skills": ["Python", "PostgreSQL"],
+            "missing_terms": quick_match(RESUME, PYTHON_JOB).missing_terms,
+        }
+
+
+class TestListJobsByMatch:
+    """Tests for JobService.list_jobs() with sort=match."""
+
+    @pytest.mark.asyncio
+    async def test_ranks_recent_jobs_then_paginates(self):
+        """Recent jobs are ranked by estimate and the page is cut from the ranking."""
+        rows = [
+            {**job, "title": "t", "company": "c", "status": "saved", "created_at": "x", "updated_at": "x"}
+            for job in (NURSE_JOB, PYTHON_JOB)
+        ]
+        service = JobService.__new__(JobService)
+        service.client = MagicMock()
+        query = service.client.table.return_value.select.return_value
+        query.order.return_value = query
+        query.range.return_value = query
+
+        with patch("app.services.job_service.execute", AsyncMock(return_value=MagicMock(data=rows, count=2))):
+            result = await service.list_jobs(
+                "user-1", {"sort": "match", "page": 1, "page_size": 1, "resume_data": RESUME}
+            )
+
+        query.order.assert_called_once_with("updated_at", desc=True)
+        query.range.assert_called_once_with(0, 499)
+        assert [item["id"] for item in result["items"]] == ["job-py"]
+        assert result["items"][0]["match_score"] >= 70
+        assert result["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_total_is_capped_at_ranked_window(self):
+        """Jobs outside the ranked window are not counted, so no page comes back empty."""
+        rows = [
+            {**PYTHON_JOB, "id": f"job-{i}", "title": "t", "company": "c", "status": "saved",
+             "created_at": "x", "updated_at": "x"}
+            for i in range(3)
+        ]
+        service = JobService.__new__(JobService)
+        service.client = MagicMock()
+        query = service.client.table.return_value.select.return_value
+        query.order.return_value = query
+        query.range.return_value = query
+
+        with patch("app.services.job_service.settings.quick_match_rank_max_jobs", 3), patch(
+            "app.services.job_service.execute", AsyncMock(return_value=MagicMock(data=rows, count=40))
+        ):
+            result = await service.list_jobs(
+                "user-1", {"sort": "match", "page": 1, "page_size": 2, "resume_data": RESUME}
+            )
+
+        assert result["total"] == 3
+
+
+@pytest.fixture
+def authenticated_client():
+    """Create a test client with mocked authentication."""
+    from app.core.deps import get_current_user
+
+    async def mock_get_current_user():
+        return {"id": "test-user-id-1234567890", "email": "test@example.com"}
+
+    app.dependency_overrides[get_current_user] = mock_get_current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+class TestQuickMatchEndpoints:
+    """Tests for POST /v1/ai/match/quick and GET /v1/jobs?sort=match."""
+
+    def test_quick_match_endpoint(self, authenticated_client):
+        """The estimate is returned in the standard envelope."""
+        estimate = {"match_score": 72, "matched_skills": ["Python"], "missing_terms": ["go"]}
+        with patch.object(MatchService, "generate_quick_match", AsyncMock(return_value=estimate)):
+            response = authenticated_client.post(
+                "/v1/ai/match/quick", json={"job_id": "00000000-0000-0000-0000-000000000001"}
+            )
+
+        assert response.status_code == 200
+        assert response.json()["data"] == estimate
+
+    def test_sort_by_match_needs_a_parsed_resume(self, authenticated_client):
+        """Ranking without an active resume is a validation error."""
+        with patch("app.routers.jobs.get_cached_profile", AsyncMock(return_value={})):
+            response = authenticated_client.get("/v1/jobs?sort=match")
+
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_sort_by_match_passes_resume_to_service(self, authenticated_client):
+        """The active resume's parsed data is handed to list_jobs."""
+        list_jobs = AsyncMock(return_value={"items": [], "total": 0, "page": 1, "page_size": 20})
+        with patch("app.routers.jobs.get_cached_profile", AsyncMock(return_value={"active_resume_id": "r-1"})), \
+                patch("app.routers.jobs.ResumeService") as resume_service, \
+                patch.object(JobService, "list_jobs", list_jobs):
+            resume_service.return_value.get_resume = AsyncMock(return_value={"parsed_data": RESUME})
+            response = authenticated_client.get("/v1/jobs?sort=match")
+
+        assert response.status_code == 200
+        assert list_jobs.await_args.args[1]["resume_data"] == RESUME
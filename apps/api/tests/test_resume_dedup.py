@@ -0,0 +1,185 @@
+"""Tests for duplicate resume uploads and the extracted-text cache."""
+
+import hashlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db import text_cache
+from app.main import app
+from app.services.resume_service import ResumeService
+from app.services.usage_service import UsageService
+
+PDF = b"%PDF-1.4 same bytes"
+PDF_HASH = hashlib.sha256(PDF).hexdigest()
+EXISTING = {
+    "id": "resume-1",
+    "user_id": "user-1",
+    "file_name": "resume.pdf",
+    "file_path": "user-1/resume-1.pdf",
+    "parsed_data": {"skills": ["Python"]},
+    "parse_status": "completed",
+    "created_at": "2026-01-01T00:00:00+00:00",
+    "updated_at": "2026-01-01T00:00:00+00:00",
+}
+
+
+def _service():
+    service = ResumeService.__new__(ResumeService)
+    service.admin_client = MagicMock()
+    service.usage_service = MagicMock(spec=UsageService)
+    service.usage_service.reserve_credits.return_value = "res-1"
+    service.usage_service.get_max_resumes.return_value = 5
+    service.get_resume_count = AsyncMock(return_value=0)
+    return service
+
+
+class TestDuplicateUpload:
+    """Tests for content-hash duplicate detection in upload_resume()."""
+
+    @pytest.mark.asyncio
+    async def test_same_bytes_return_existing_resume(self):
+        """A re-upload returns the existing resume without storage, AI or credit."""
+        service = _service()
+        query = service.admin_client.table.return_value.select.return_value
+        run_sync = AsyncMock()
+        parse = AsyncMock()
+
+        with patch("app.services.resume_service.execute", AsyncMock(return_value=MagicMock(data=[EXISTING]))), patch(
+            "app.services.resume_service.run_sync", run_sync
+        ), patch("app.services.resume_service.AIProviderFactory.parse_with_fallback", parse):
+            result = await service.upload_resume("user-1", PDF, "copy.pdf")
+
+        assert result["duplicate"] is True
+        assert result["resume"]["id"] == "resume-1"
+        assert result["resume"]["parsed_data"] == {"skills": ["Python"]}
+        query.eq.return_value.eq.assert_called_once_with("content_hash", PDF_HASH)
+        query.eq.return_value.eq.return_value.in_.assert_called_once_with("parse_status", ["completed", "pending"])
+        service.usage_service.reserve_credits.assert_not_awaited()
+        run_sync.assert_not_awaited()
+        parse.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_new_file_stores_its_hash(self):
+        """A miss goes through the normal upload and records the hash."""
+        service = _service()
+        service._find_duplicate = AsyncMock(return_value=None)
+        service._create_resume_record = AsyncMock(return_value={"resume": {"id": "resume-2"}})
+
+        with patch("app.services.resume_service.run_sync", AsyncMock()), patch(
+            "app.services.resume_service.extract_text_from_pdf", return_value="Jane Doe, engineer"
+        ), patch(
+            "app.services.resume_service.AIProviderFactory.parse_with_fallback",
+            AsyncMock(return_value=({"skills": ["Python"]}, "claude")),
+        ):
+            await service.upload_resume("user-1", PDF, "resume.pdf")
+
+        service._find_duplicate.assert_awaited_once_with("user-1", PDF_HASH)
+        assert service._create_resume_record.await_args.kwargs["content_hash"] == PDF_HASH
+        service.usage_service.commit_reservation.assert_awaited_once()
+
+
+class TestExtractedTextCache:
+    """Tests for the cross-user extracted-text cache."""
+
+    @pytest.mark.asyncio
+    async def test_second_parse_of_same_file_skips_extraction(self):
+        """Same bytes (any user) are extracted once; each upload is still parsed."""
+        service = _service()
+        extract = MagicMock(return_value="Jane Doe, engineer")
+        parse = AsyncMock(return_value=({"skills": []}, "claude"))
+
+        with patch("app.services.resume_service.settings.resume_text_cache_ttl", 60.0), patch(
+            "app.db.text_cache.settings.resume_text_cache_ttl", 60.0
+        ), patch("app.services.resume_service.extract_text_from_pdf", extract), patch(
+            "app.services.resume_service.AIProviderFactory.parse_with_fallback", parse
+        ):
+            await service._parse_file(PDF)
+            await service._parse_file(PDF, content_hash=PDF_HASH)
+
+        extract.assert_called_once()
+        assert parse.await_count == 2
+        assert parse.await_args.args[0] == "Jane Doe, engineer"
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """With no TTL nothing is cached."""
+        await text_cache.store_text(PDF_HASH, "text")
+
+        assert await text_cache.get_cached_text(PDF_HASH) is None
+
+    @pytest.mark.asyncio
+    async def test_persistent_tier(self):
+        """A local miss reads the table and warms the local tier."""
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.gt.return_value.maybe_single.return_value = (
+            "lookup"
+        )
+        execute = AsyncMock(return_value=MagicMock(data={"extracted_text": "from table"}))
+
+        with patch("app.db.text_cache.settings.resume_text_cache_ttl", 60.0), patch(
+            "app.db.text_cache.settings.resume_text_cache_persistent", True
+        ), patch("app.db.text_cache.get_supabase_admin_client", return_value=client), patch(
+            "app.db.text_cache.execute", execute
+        ):
+            assert await text_cache.get_cached_text(PDF_HASH) == "from table"
+            assert await text_cache.get_cached_text(PDF_HASH) == "from table"
+            await text_cache.store_text("other-hash", "text")
+
+        assert execute.await_count == 2
+        upserted = client.table.return_value.upsert.call_args.args[0]
+        assert (upserted["content_hash"], upserted["extracted_text"]) == ("other-hash", "text")
+
+    @pytest.mark.asyncio
+    async def test_account_deletion_forgets_user_texts(self):
+        """Deleting an account drops the cached text of the user's resume files."""
+        from app.services.privacy_service import PrivacyService
+
+        service = PrivacyService.__new__(PrivacyService)
+        service.admin_client = MagicMock()
+        resumes = MagicMock(data=[{"file_path": "u/r.pdf", "content_hash": PDF_HASH}, {"file_path": "u/s.pdf"}])
+        forget = AsyncMock()
+
+        with patch("app.services.privacy_service.execute", AsyncMock(return_value=resumes)), patch(
+            "app.services.privacy_service.run_sync", AsyncMock()
+        ), patch("app.services.privacy_service.forget_texts", forget):
+            await service._delete_all_user_data("user-1")
+
+        forget.assert_awaited_once_with([PDF_HASH, None])
+
+    @pytest.mark.asyncio
+    async def test_forget_texts_drops_local_entries(self):
+        """forget_texts() removes the hashes from the in-process tier and the table."""
+        with patch("app.db.text_cache.settings.resume_text_cache_ttl", 60.0), patch(
+            "app.db.text_cache.execute", AsyncMock()
+        ) as execute, patch("app.db.text_cache.get_supabase_admin_client"):
+            await text_cache.store_text(PDF_HASH, "text")
+            await text_cache.forget_texts([PDF_HASH, None])
+
+            assert await text_cache.get_cached_text(PDF_HASH) is None
+        execute.assert_awaited_once()
+
+
+@pytest.fixture
+def authenticated_client():
+    """Create a test client with mocked authentication."""
+    from app.core.deps import get_current_user
+
+    async def mock_get_current_user():
+        return {"id": "test-user-id-1234567890", "email": "test@example.com"}
+
+    app.dependency_overrides[get_current_user] = mock_get_current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_duplicate_upload_endpoint(authenticated_client):
+    """The existing resume is returned with duplicate=true."""
+    duplicate = ResumeService._upload_result(EXISTING, ai_provider_used=None, duplicate=True)
+    with patch.object(ResumeService, "upload_resume", AsyncMock(return_value=duplicate)):
+        response = authenticated_client.post("/v1/resumes", files={"file": ("test.pdf", PDF, "application/pdf")})
+
+    assert response.status_code == 200
+    assert response.json()["data"]["duplicate"] is True
+    assert response.json()["data"]["resume"]["id"] == "resume-1"
@@ -0,0 +1,93 @@
+"""Tests for the resume prompt digest."""
+
+import json
+
+from app.services.ai.prompts import format_match_prompt
+from app.services.ai.resume_digest import DESCRIPTION_MAX_CHARS, build_resume_digest
+
+PARSED = {
+    "contact": {
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "email": "jane@example.com",
+        "phone": "555-0100",
+        "location": "Austin, TX",
+        "linkedin_url": None,
+    },
+    "summary": "Backend   engineer.\n\nLoves Python.",
+    "experience": [
+        {
+            "title": "Senior Engineer",
+            "company": "Acme",
+            "start_date": "2020-01",
+            "end_date": None,
+            "description": "Led the payments API.",
+        },
+        {"title": None, "company": None, "start_date": None, "end_date": None, "description": None},
+    ],
+    "education": [{"degree": "BS CS", "institution": "UT Austin", "graduation_year": "2016"}],
+    "skills": ["Python", "FastAPI", "python", " Docker "],
+}
+
+
+class TestBuildResumeDigest:
+    """Tests for build_resume_digest()."""
+
+    def test_renders_compact_lines(self):
+        """Fields become labelled lines with nulls, empty entries and duplicates dropped."""
+        assert build_resume_digest(PARSED) == "\n".join(
+            [
+                "Name: Jane Doe",
+                "Location: Austin, TX",
+                "Summary: Backend engineer. Loves Python.",
+                "Experience:",
+                "- Senior Engineer @ Acme, 2020-01 to present: Led the payments API.",
+                "Education:",
+                "- BS CS, UT Austin, 2016",
+                "Skills: Python, FastAPI, Docker",
+            ]
+        )
+
+    def test_omits_contact_details(self):
+        """Email and phone never reach prompts."""
+        digest = build_resume_digest(PARSED)
+        assert "jane@example.com" not in digest
+        assert "555-0100" not in digest
+
+    def test_caps_long_descriptions_at_word_boundary(self):
+        """Experience descriptions are truncated to the cap."""
+        long = {"experience": [{"title": "Engineer", "description": "word " * 200}]}
+
+        line = build_resume_digest(long).splitlines()[1]
+        description = line.split(": ", 1)[1]
+
+        assert len(description) <= DESCRIPTION_MAX_CHARS + 3
+        assert description.endswith("word...")
+
+    def test_deterministic_and_smaller_than_json(self):
+        """The same data always renders the same, in fewer characters than indented JSON."""
+        reordered = dict(reversed(list(PARSED.items())))
+
+        assert build_resume_digest(reordered) == build_resume_digest(PARSED)
+        assert len(build_resume_digest(PARSED)) < len(json.dumps(PARSED, indent=2)) / 2
+
+    def test_tolerates_unvalidated_data(self):
+        """Raw AI output with unexpected types does not raise."""
+        raw = {"contact": "Jane", "experience": ["not a dict"], "skills": "Python", "summary": 42}
+        assert build_resume_digest(raw) == "Summary: 42"
+        assert build_resume_digest(None) == ""
+
+
+class TestPromptsUseDigest:
+    """Tests for digest use in generation prompts."""
+
+    def test_stored_digest_used_verbatim(self):
+        """A stored digest string is embedded as-is."""
+        prompt = format_match_prompt("Name: Jane Doe\nSkills: Python", "Python role")
+        assert "RESUME:\nName: Jane Doe\nSkills: Python\n" in prompt.context
+
+    def test_parsed_data_digested_on_the_fly(self):
+        """Rows without a stored digest render the same as if they had one."""
+        assert format_match_prompt(PARSED, "Python role") == format_match_prompt(
+            build_resume_digest(PARSED), "Python role"
+        )
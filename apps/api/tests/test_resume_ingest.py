@@ -0,0 +1,294 @@
+"""Tests for background resume parsing."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.resume_ingest import ParseWorkerPool, ResumeParseJob
+from app.services.resume_service import ResumeService
+from app.services.usage_service import UsageService
+
+
+def _job(job_id="job-1", resume_id="resume-1", attempts=0, file_content=b"%PDF"):
+    return ResumeParseJob(
+        id=job_id,
+        resume_id=resume_id,
+        user_id="user-1",
+        reservation_id="res-1",
+        file_path=f"user-1/{resume_id}.pdf",
+        attempts=attempts,
+        file_content=file_content,
+    )
+
+
+def _service():
+    service = ResumeService.__new__(ResumeService)
+    service.admin_client = MagicMock()
+    service.usage_service = MagicMock(spec=UsageService)
+    service.usage_service.reserve_credits.return_value = "res-1"
+    service.usage_service.get_max_resumes.return_value = 5
+    service.get_resume_count = AsyncMock(return_value=0)
+    service._find_duplicate = AsyncMock(return_value=None)
+    return service
+
+
+class TestParseWorkerPool:
+    """Tests for ParseWorkerPool."""
+
+    @pytest.mark.asyncio
+    async def test_runs_at_most_workers_jobs_at_once(self):
+        """Jobs are processed concurrently up to the worker count."""
+        active, peak, done = 0, 0, []
+
+        async def handler(job):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            done.append(job.id)
+
+        pool = ParseWorkerPool(handler, workers=2, queue_size=10)
+        pool.start()
+        for index in range(6):
+            assert pool.submit(_job(f"job-{index}", f"resume-{index}"))
+        await asyncio.wait_for(pool._queue.join(), 1)
+        await pool.stop()
+
+        assert peak == 2
+        assert sorted(done) == [f"job-{index}" for index in range(6)]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_refuses(self):
+        """submit() refuses jobs past queue_size instead of blocking."""
+        pool = ParseWorkerPool(AsyncMock(), workers=1, queue_size=1)
+
+        assert pool.submit(_job("job-1")) is True
+        assert pool.submit(_job("job-2")) is False
+
+    @pytest.mark.asyncio
+    async def test_wait_wakes_when_job_finishes_and_survives_errors(self):
+        """wait() returns as soon as the job is done, even if the handler raised."""
+        pool = ParseWorkerPool(AsyncMock(side_effect=RuntimeError("boom")), workers=1, queue_size=5)
+        pool.start()
+        pool.submit(_job())
+
+        await asyncio.wait_for(pool.wait("resume-1", timeout=5), 1)
+        # The worker is still alive after the crash
+        pool.submit(_job("job-2", "resume-2"))
+        await asyncio.wait_for(pool.wait("resume-2", timeout=5), 1)
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_sweep_refills_when_empty(self):
+        """The sweep asks for stored jobs at start."""
+        refill = AsyncMock()
+        pool = ParseWorkerPool(AsyncMock(), workers=1, queue_size=5, refill=refill, refill_interval=60)
+        pool.start()
+        await asyncio.sleep(0)
+        await pool.stop()
+
+        refill.assert_awaited_once_with(pool)
+
+
+class TestBackgroundUpload:
+    """Tests for upload_resume() with the parse pool running."""
+
+    @pytest.mark.asyncio
+    async def test_upload_returns_pending_and_queues_job(self):
+        """The upload stores a pending resume, queues the parse and keeps the credit held."""
+        service = _service()
+        service._create_resume_record = AsyncMock(
+            return_value={"resume": {"id": "resume-1", "parse_status": "pending"}, "ai_provider_used": None}
+        )
+        pool = MagicMock(spec=ParseWorkerPool)
+        job_row = {"id": "job-1", "resume_id": "resume-1", "user_id": "user-1", "reservation_id": "res-1",
+                   "file_path": "user-1/resume-1.pdf", "attempts": 0}
+        parse = AsyncMock()
+
+        with patch("app.services.resume_service.get_parse_pool", return_value=pool), patch(
+            "app.services.resume_service.run_sync", AsyncMock()
+        ), patch("app.services.resume_service.execute", AsyncMock(return_value=MagicMock(data=[job_row]))), patch(
+            "app.services.resume_service.AIProviderFactory.parse_with_fallback", parse
+        ):
+            result = await service.upload_resume("user-1", b"%PDF", "resume.pdf")
+
+        assert result["resume"]["parse_status"] == "pending"
+        assert service._create_resume_record.await_args.kwargs["parse_status"] == "pending"
+        parse.assert_not_awaited()
+        job = pool.submit.call_args.args[0]
+        assert (job.id, job.reservation_id, job.file_content) == ("job-1", "res-1", b"%PDF")
+        service.usage_service.commit_reservation.assert_not_awaited()
+        service.usage_service.release_reservation.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_enqueue_removes_pending_resume(self):
+        """If the job cannot be queued, the pending row and stored file are deleted and the credit released."""
+        service = _service()
+        service._create_resume_record = AsyncMock(
+            return_value={"resume": {"id": "resume-1", "parse_status": "pending"}, "ai_provider_used": None}
+        )
+        resumes = service.admin_client.table.return_value
+        execute = AsyncMock(side_effect=[RuntimeError("insert failed"), MagicMock()])
+        run_sync = AsyncMock()
+
+        with patch("app.services.resume_service.get_parse_pool", return_value=MagicMock(spec=ParseWorkerPool)), patch(
+            "app.services.resume_service.run_sync", run_sync
+        ), patch("app.services.resume_service.execute", execute):
+            with pytest.raises(RuntimeError, match="insert failed"):
+                await service.upload_resume("user-1", b"%PDF", "resume.pdf")
+
+        resume_id = service._create_resume_record.await_args.kwargs["resume_id"]
+        resumes.delete.return_value.eq.assert_called_once_with("id", resume_id)
+        storage_path = f"user-1/{resume_id}.pdf"
+        assert run_sync.await_args.args[1] == [storage_path]
+        service.usage_service.release_reservation.assert_awaited_once()
+
+
+class TestRunParseJob:
+    """Tests for ResumeService.run_parse_job()."""
+
+    @pytest.mark.asyncio
+    async def test_parses_updates_resume_and_commits(self):
+        """A claimed job writes the parse result and charges the reservation."""
+        service = _service()
+        execute = AsyncMock(return_value=MagicMock(data=[{"id": "job-1"}]))
+
+        with patch("app.services.resume_service.execute", execute), patch(
+            "app.services.resume_service.extract_text_from_pdf", return_value="Jane Doe, engineer"
+        ), patch(
+            "app.services.resume_service.AIProviderFactory.parse_with_fallback",
+            AsyncMock(return_value=({"skills": ["k8s"]}, "claude")),
+        ):
+            await service.run_parse_job(_job())
+
+        updates = [call.args[0] for call in service.admin_client.table.return_value.update.call_args_list]
+        assert updates[0] == {"status": "running", "attempts": 1}
+        assert updates[1]["parse_status"] == "completed"
+        assert updates[1]["parsed_data"] == {"skills": ["Kubernetes"]}
+        assert updates[2] == {"status": "completed", "error": None}
+        service.usage_service.commit_reservation.assert_awaited_once()
+        assert service.usage_service.commit_reservation.await_args.args == ("res-1",)
+
+    @pytest.mark.asyncio
+    async def test_job_claimed_elsewhere_is_skipped(self):
+        """A job another worker already took is left alone."""
+        service = _service()
+        parse = AsyncMock()
+
+        with patch("app.services.resume_service.execute", AsyncMock(return_value=MagicMock(data=[]))), patch(
+            "app.services.resume_service.AIProviderFactory.parse_with_fallback", parse
+        ):
+            await service.run_parse_job(_job())
+
+        parse.assert_not_awaited()
+        service.usage_service.commit_reservation.assert_not_awaited()
+        service.usage_service.release_reservation.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_recovered_job_downloads_file(self):
+        """A job recovered from the table reads the PDF back from storage."""
+        service = _service()
+        run_sync = AsyncMock(return_value=b"%PDF-stored")
+        extract = MagicMock(return_value="Jane Doe")
+
+        with patch("app.services.resume_service.execute", AsyncMock(return_value=MagicMock(data=[{}]))), patch(
+            "app.services.resume_service.run_sync", run_sync
+        ), patch("app.services.resume_service.extract_text_from_pdf", extract), patch(
+            "app.services.resume_service.AIProviderFactory.parse_with_fallback",
+            AsyncMock(return_value=({"skills": []}, "gpt")),
+        ):
+            await service.run_parse_job(_job(file_content=None))
+
+        assert run_sync.await_args.args[1] == "user-1/resume-1.pdf"
+        assert extract.call_args.args[0] == b"%PDF-stored"
+
+    @pytest.mark.asyncio
+    async def test_exhausted_attempts_fail_and_release(self):
+        """A job that keeps getting orphaned is failed and its credit returned."""
+        service = _service()
+        parse = AsyncMock()
+
+        with patch("app.services.resume_service.execute", AsyncMock(return_value=MagicMock(data=[{}]))), patch(
+            "app.services.resume_service.settings.resume_parse_max_attempts", 3
+        ), patch("app.services.resume_service.AIProviderFactory.parse_with_fallback", parse):
+            await service.run_parse_job(_job(attempts=3))
+
+        parse.assert_not_awaited()
+        updates = [call.args[0] for call in service.admin_client.table.return_value.update.call_args_list]
+        assert updates[1]["parse_status"] == "failed"
+        assert updates[2]["status"] == "failed"
+        service.usage_service.release_reservation.assert_awaited_once_with("res-1")
+
+    @pytest.mark.asyncio
+    async def test_requeue_submits_stored_jobs(self):
+        """Stale running jobs are reset and queued rows submitted."""
+        service = _service()
+        rows = [{"id": f"job-{i}", "resume_id": f"r-{i}", "user_id": "u", "file_path": "p"} for i in range(3)]
+        pool = MagicMock(spec=ParseWorkerPool)
+        pool.submit.side_effect = [True, True, False]
+
+        with patch("app.services.resume_service.execute", AsyncMock(return_value=MagicMock(data=rows))):
+            submitted = await service.requeue_parse_jobs(pool)
+
+        assert submitted == 2
+        table = service.admin_client.table.return_value
+        table.update.assert_called_once_with({"status": "queued"})
+
+
+@pytest.fixture
+def authenticated_client():
+    """Create a test client with mocked authentication."""
+    from app.core.deps import get_current_user
+
+    async def mock_get_current_user():
+        return {"id": "test-user-id-1234567890", "email": "test@example.com"}
+
+    app.dependency_overrides[get_current_user] = mock_get_current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+class TestResumeParseEndpoints:
+    """Tests for the 202 upload response and the parse events stream."""
+
+    RESUME_ID = "00000000-0000-0000-0000-000000000001"
+
+    def test_pending_upload_returns_202(self, authenticated_client):
+        """A queued parse is acknowledged with 202 Accepted."""
+        pending = {"resume": {"id": "resume-1", "parse_status": "pending"}, "ai_provider_used": None}
+        with patch.object(ResumeService, "upload_resume", AsyncMock(return_value=pending)):
+            response = authenticated_client.post(
+                "/v1/resumes", files={"file": ("test.pdf", b"%PDF", "application/pdf")}
+            )
+
+        assert response.status_code == 202
+        assert response.json()["data"]["resume"]["parse_status"] == "pending"
+
+    def test_events_stream_until_settled(self, authenticated_client):
+        """The stream reports pending, then the final status with the parsed data."""
+        pending = {"id": self.RESUME_ID, "parse_status": "pending", "parsed_data": None}
+        completed = {"id": self.RESUME_ID, "parse_status": "completed", "parsed_data": {"skills": ["Python"]}}
+        get_resume = AsyncMock(side_effect=[pending, pending, completed])
+
+        with patch.object(ResumeService, "get_resume", get_resume), patch(
+            "app.services.resume_service.settings.resume_parse_poll_interval", 0.01
+        ):
+            response = authenticated_client.get(f"/v1/resumes/{self.RESUME_ID}/events")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        names = [block.split("\n")[0] for block in response.text.strip().split("\n\n")]
+        assert names == ["event: status", "event: completed"]
+        assert '"skills": ["Python"]' in response.text
+
+    def test_events_for_unknown_resume_is_404(self, authenticated_client):
+        """The stream is not opened for another user's or a missing resume."""
+        with patch.object(ResumeService, "get_resume", AsyncMock(return_value=None)):
+            response = authenticated_client.get(f"/v1/resumes/{self.RESUME_ID}/events")
+
+        assert response.status_code == 404
+        assert response.json()["error"]["code"] == "RESUME_NOT_FOUND"
@@ -1,6 +1,6 @@
 """Tests for resume endpoints."""
 
-from unittest.mock import patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -519,3 +519,82 @@ class TestDeleteResumeEndpoint:
         assert data["success"] is True
         # Verify the delete method was called (which handles clearing active)
         assert cleared_active["called"] is True
+
+
+def _upload_service(resume_count=0):
+    """A ResumeService with mocked storage, database and usage service."""
+    from app.services.resume_service import ResumeService
+    from app.services.usage_service import UsageService
+
+    service = ResumeService.__new__(ResumeService)
+    service.admin_client = MagicMock()
+    service.usage_service = MagicMock(spec=UsageService)
+    service.usage_service.reserve_credits.return_value = "res-1"
+    service.usage_service.get_max_resumes.return_value = 5
+    service.get_resume_count = AsyncMock(return_value=resume_count)
+    service._find_duplicate = AsyncMock(return_value=None)
+    service._create_resume_record = AsyncMock(return_value={"resume": {"id": "resume-1"}})
+    return service
+
+
+class TestUploadResumeReservation:
+    """Tests for the credit reservation held by ResumeService.upload_resume()."""
+
+    @pytest.mark.asyncio
+    async def test_completed_parse_commits_reservation(self):
+        """A parsed resume charges the reserved credit."""
+        service = _upload_service()
+        with patch("app.services.resume_service.run_sync", AsyncMock()), patch(
+            "app.services.resume_service.extract_text_from_pdf", return_value="Jane Doe, engineer"
+        ), patch(
+            "app.services.resume_service.AIProviderFactory.parse_with_fallback",
+            AsyncMock(return_value=({"skills": ["Python"]}, "claude")),
+        ):
+            await service.upload_resume("user-1", b"%PDF", "resume.pdf")
+
+        service.usage_service.commit_reservation.assert_awaited_once_with("res-1", ai_provider="claude", usage=ANY)
+        service.usage_service.release_reservation.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_parse_releases_reservation(self):
+        """A resume stored with parse_status=failed is not charged."""
+        service = _upload_service()
+        with patch("app.services.resume_service.run_sync", AsyncMock()), patch(
+            "app.services.resume_service.extract_text_from_pdf", return_value="Jane Doe, engineer"
+        ), patch(
+            "app.services.resume_service.AIProviderFactory.parse_with_fallback",
+            AsyncMock(side_effect=ValueError("All AI providers failed")),
+        ):
+            await service.upload_resume("user-1", b"%PDF", "resume.pdf")
+
+        assert service._create_resume_record.await_args.kwargs["parse_status"] == "failed"
+        service.usage_service.release_reservation.assert_awaited_once_with("res-1")
+        service.usage_service.commit_reservation.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_resume_limit_releases_reservation(self):
+        """Hitting the resume limit releases the credit and re-raises."""
+        from app.core.exceptions import ResumeLimitReachedError
+
+        service = _upload_service(resume_count=5)
+        with pytest.raises(ResumeLimitReachedError):
+            await service.upload_resume("user-1", b"%PDF", "resume.pdf")
+
+        service.usage_service.release_reservation.assert_awaited_once_with("res-1")
+        service.usage_service.commit_reservation.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_storage_error_releases_reservation(self):
+        """A failed storage upload releases the credit and surfaces an API error."""
+        from app.core.exceptions import ApiException
+
+        service = _upload_service()
+        with patch(
+            "app.services.resume_service.run_sync", AsyncMock(side_effect=RuntimeError("bucket unavailable"))
+        ):
+            with pytest.raises(ApiException):
+                await service.upload_resume("user-1", b"%PDF", "resume.pdf")
+
+        service.usage_service.release_reservation.assert_awaited_once_with("res-1")
+        service.usage_service.commit_reservation.assert_not_awaited()
+        service._create_resume_record.assert_not_awaited()
@@ -0,0 +1,113 @@
+"""Tests for the skill taxonomy and skill extraction."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.job_service import JobService
+from app.services.job_text import description_fields
+from app.services.skills import SKILL_TAXONOMY, extract_skills, normalize_skills
+
+
+class TestExtractSkills:
+    """Tests for extract_skills()."""
+
+    def test_synonyms_map_to_canonical_names(self):
+        """k8s, Postgres and Golang are reported by their canonical names."""
+        assert extract_skills("Experience with k8s, Postgres and Golang.") == ["Kubernetes", "PostgreSQL", "Go"]
+
+    def test_case_insensitive_and_in_order_of_first_mention(self):
+        """Mentions are matched in any case and deduplicated."""
+        assert extract_skills("PYTHON, then aws, then python again and AWS.") == ["Python", "AWS"]
+
+    def test_whole_words_only(self):
+        """Skills inside other words are not matched."""
+        assert extract_skills("Scalable javascript; the uiux team; scalar kubes") == ["JavaScript"]
+
+    def test_longest_overlapping_match_wins(self):
+        """React Native is not also React; CI/CD is not also a bare term."""
+        assert extract_skills("React Native, CI/CD, and some React.js") == ["React Native", "CI/CD", "React"]
+
+    def test_symbols_in_names(self):
+        """Names ending or starting in symbols still match at word edges."""
+        assert extract_skills("C++ and C# on .NET, plus Node.js") == ["C++", "C#", ".NET", "Node.js"]
+
+    def test_prose_words_need_an_unambiguous_form(self):
+        """'go to market' and 'excel at' are not skills; Golang and MS Excel are."""
+        assert extract_skills("Go to market fast and excel at communication.") == []
+        assert extract_skills("Golang services, reporting in MS Excel") == ["Go", "Excel"]
+
+    def test_every_taxonomy_name_is_found(self):
+        """Each canonical name (other than prose words) extracts as itself."""
+        for name in SKILL_TAXONOMY:
+            if name.lower() in ("go", "swift", "excel"):
+                continue
+            assert extract_skills(f"We use {name} daily.") == [name]
+
+    def test_non_text_returns_empty(self):
+        """Empty or missing descriptions have no skills."""
+        assert extract_skills("") == []
+        assert extract_skills(None) == []
+
+
+class TestNormalizeSkills:
+    """Tests for normalize_skills()."""
+
+    def test_maps_synonyms_and_deduplicates(self):
+        """Synonyms become canonical, duplicates after mapping are dropped."""
+        assert normalize_skills(["python", "Python3", " k8s ", "Kubernetes", "Go"]) == ["Python", "Kubernetes", "Go"]
+
+    def test_unknown_skills_are_kept(self):
+        """Skills outside the taxonomy keep their own (trimmed) spelling."""
+        assert normalize_skills(["  Stakeholder   Management ", 42, "stakeholder management"]) == [
+            "Stakeholder Management"
+        ]
+
+
+class TestSkillsStorage:
+    """Tests for storing job skills and normalizing resume skills."""
+
+    def test_description_fields_include_skills(self):
+        """Skills are stored alongside the cleaned description."""
+        assert description_fields("Senior engineer. Python, k8s, AWS.")["skills"] == ["Python", "Kubernetes", "AWS"]
+
+    @pytest.mark.asyncio
+    async def test_list_jobs_filters_by_skill_overlap(self):
+        """A skills filter is normalized and sent as an array overlap."""
+        service = JobService.__new__(JobService)
+        service.client = MagicMock()
+        query = service.client.table.return_value.select.return_value
+        query.overlaps.return_value = query
+        query.order.return_value = query
+        query.range.return_value = query
+
+        with patch("app.services.job_service.execute", AsyncMock(return_value=MagicMock(data=[], count=0))):
+            await service.list_jobs("user-1", {"skills": ["k8s", "golang"]})
+
+        query.overlaps.assert_called_once_with("skills", ["Kubernetes", "Go"])
+
+    @pytest.mark.asyncio
+    async def test_parsed_resume_skills_are_normalized(self):
+        """Resume skills are stored under the canonical names."""
+        from app.services.resume_service import ResumeService
+        from app.services.usage_service import UsageService
+
+        service = ResumeService.__new__(ResumeService)
+        service.admin_client = MagicMock()
+        service.usage_service = MagicMock(spec=UsageService)
+        service.usage_service.reserve_credits.return_value = "res-1"
+        service.usage_service.get_max_resumes.return_value = 5
+        service.get_resume_count = AsyncMock(return_value=0)
+        service._find_duplicate = AsyncMock(return_value=None)
+        service._create_resume_record = AsyncMock(return_value={"resume": {"id": "resume-1"}})
+
+        with patch("app.services.resume_service.run_sync", AsyncMock()), patch(
+            "app.services.resume_service.extract_text_from_pdf", return_value="Jane Doe, engineer"
+        ), patch(
+            "app.services.resume_service.AIProviderFactory.parse_with_fallback",
+            AsyncMock(return_value=({"skills": ["python", "K8s", "Kubernetes"]}, "claude")),
+        ):
+            await service.upload_resume("user-1", b"%PDF", "resume.pdf")
+
+        parsed = service._create_resume_record.await_args.kwargs["parsed_data"]
+        assert parsed["skills"] == ["Python", "Kubernetes"]
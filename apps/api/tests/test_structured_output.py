@@ -0,0 +1,167 @@
+"""Tests for schema-constrained AI outputs."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.ai.claude import ClaudeProvider
+from app.services.ai.openai import OpenAIProvider
+from app.services.ai.structured import CONTENT_SCHEMA, MATCH_SCHEMA, RESUME_SCHEMA, repair_json
+
+RESUME = {"summary": "Backend engineer.", "skills": ["Python"]}
+JOB = "Looking for a Python developer."
+ANALYSIS = {"match_score": 82, "strengths": ["Python"], "gaps": ["Go"], "recommendations": ["Learn Go"]}
+
+
+def _claude_response(*blocks):
+    return SimpleNamespace(content=list(blocks), usage=None)
+
+
+def _tool_use(name, data):
+    return SimpleNamespace(type="tool_use", name=name, input=data)
+
+
+def _openai_response(content, refusal=None):
+    message = SimpleNamespace(content=content, refusal=refusal)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def _claude(response):
+    provider = ClaudeProvider("test-key")
+    provider.client = MagicMock()
+    provider.client.messages.create = AsyncMock(return_value=response)
+    return provider
+
+
+def _openai(response):
+    provider = OpenAIProvider("test-key")
+    provider.client = MagicMock()
+    provider.client.chat.completions.create = AsyncMock(return_value=response)
+    return provider
+
+
+class TestRepairJson:
+    """Tests for repair_json()."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            '{"content": "Hi"}',
+            '```json\n{"content": "Hi"}\n```',
+            'Here is the letter:\n{"content": "Hi"}\nLet me know if you need changes.',
+            '{"content": "Hi", "tags": ["a", "b",],}',
+        ],
+    )
+    def test_recovers_common_damage(self, text):
+        """Fences, surrounding prose and trailing commas are repaired."""
+        assert repair_json(text)["content"] == "Hi"
+
+    @pytest.mark.parametrize("text", ["", "no json here", '["a list"]', '{"content": '])
+    def test_unrecoverable_text_raises(self, text):
+        """Anything that is not a JSON object raises ValueError."""
+        with pytest.raises(ValueError, match="invalid JSON"):
+            repair_json(text)
+
+
+class TestOutputSchemas:
+    """Tests for the schemas derived from the Pydantic models."""
+
+    def test_strict_schema_requires_every_property(self):
+        """OpenAI strict mode: all properties required, no extras, no defaults."""
+        schema = RESUME_SCHEMA.strict_json_schema
+        assert schema["required"] == ["contact", "summary", "experience", "education", "skills"]
+        assert schema["additionalProperties"] is False
+        contact = schema["$defs"]["ContactInfo"]
+        assert contact["additionalProperties"] is False
+        assert "default" not in json.dumps(schema)
+        # The Claude schema keeps the model's own optional fields
+        assert "required" not in RESUME_SCHEMA.json_schema
+
+    def test_parse_validates_against_model(self):
+        """Out-of-range or missing fields are rejected."""
+        assert MATCH_SCHEMA.parse(ANALYSIS) == ANALYSIS
+        with pytest.raises(ValueError, match="record_match_analysis"):
+            MATCH_SCHEMA.parse({**ANALYSIS, "match_score": 140})
+        with pytest.raises(ValueError):
+            CONTENT_SCHEMA.parse({"text": "wrong key"})
+
+    def test_parse_drops_null_optionals(self):
+        """Nulls that strict mode forces into the output are not stored."""
+        parsed = RESUME_SCHEMA.parse(
+            {"contact": None, "summary": "Engineer", "experience": None, "education": None, "skills": ["Python"]}
+        )
+        assert parsed == {"summary": "Engineer", "skills": ["Python"]}
+
+
+class TestClaudeToolUse:
+    """Tests for Claude structured outputs via a forced tool."""
+
+    @pytest.mark.asyncio
+    async def test_match_forces_tool_and_reads_its_input(self):
+        """The match call forces the schema tool and returns its validated input."""
+        provider = _claude(_claude_response(_tool_use(MATCH_SCHEMA.name, ANALYSIS)))
+
+        result = await provider.generate_match_analysis(RESUME, JOB)
+
+        kwargs = provider.client.messages.create.await_args.kwargs
+        assert kwargs["tools"][0]["name"] == MATCH_SCHEMA.name
+        assert kwargs["tools"][0]["input_schema"] == MATCH_SCHEMA.json_schema
+        assert kwargs["tool_choice"] == {"type": "tool", "name": MATCH_SCHEMA.name}
+        assert result == ANALYSIS
+
+    @pytest.mark.asyncio
+    async def test_text_operations_share_one_tool(self):
+        """Cover letters, answers and outreach send identical tools (one cached prefix)."""
+        provider = _claude(_claude_response(_tool_use(CONTENT_SCHEMA.name, {"content": "Dear team"})))
+
+        await provider.generate_cover_letter(RESUME, JOB, "friendly")
+        await provider.generate_answer(RESUME, JOB, "Why us?", 300)
+        content, _ = await provider.generate_outreach(RESUME, JOB, "recruiter", "email")
+
+        tools = [call.kwargs["tools"] for call in provider.client.messages.create.await_args_list]
+        assert tools[0] == tools[1] == tools[2]
+        assert content == "Dear team"
+
+    @pytest.mark.asyncio
+    async def test_fenced_text_without_tool_call_is_repaired(self):
+        """A text answer is repaired instead of failing over to the other provider."""
+        text = SimpleNamespace(type="text", text='```json\n{"skills": ["Python"]}\n```')
+        provider = _claude(_claude_response(text))
+
+        assert await provider.parse_resume("resume text") == {"skills": ["Python"]}
+
+    @pytest.mark.asyncio
+    async def test_invalid_tool_input_raises(self):
+        """A tool call that violates the schema raises ValueError (triggers fallback)."""
+        provider = _claude(_claude_response(_tool_use(MATCH_SCHEMA.name, {"match_score": 82})))
+
+        with pytest.raises(ValueError):
+            await provider.generate_match_analysis(RESUME, JOB)
+
+
+class TestOpenAIJsonSchema:
+    """Tests for OpenAI structured outputs via json_schema response formats."""
+
+    @pytest.mark.asyncio
+    async def test_sends_strict_json_schema(self):
+        """Requests carry the operation's strict schema."""
+        provider = _openai(_openai_response(json.dumps(ANALYSIS)))
+
+        result = await provider.generate_match_analysis(RESUME, JOB)
+
+        response_format = provider.client.chat.completions.create.await_args.kwargs["response_format"]
+        assert response_format["type"] == "json_schema"
+        assert response_format["json_schema"]["name"] == MATCH_SCHEMA.name
+        assert response_format["json_schema"]["strict"] is True
+        assert response_format["json_schema"]["schema"] == MATCH_SCHEMA.strict_json_schema
+        assert result == ANALYSIS
+
+    @pytest.mark.asyncio
+    async def test_refusal_raises(self):
+        """A refusal is a provider failure, not an empty result."""
+        provider = _openai(_openai_response(None, refusal="I can't help with that."))
+
+        with pytest.raises(ValueError, match="refused"):
+            await provider.generate_answer(RESUME, JOB, "Why us?", 300)
@@ -7,6 +7,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.models.usage import TierLimits
 
 
 @pytest.fixture
@@ -428,7 +429,7 @@ class TestGetUserTier:
         with patch.object(service.admin_client, "table") as mock_table:
             mock_response = MagicMock()
             mock_response.data = None  # No user found
-            mock_table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = (
+            mock_table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
                 mock_response
             )
 
@@ -451,17 +452,17 @@ class TestCalculateBalance:
             return "free"
 
         async def mock_get_tier_limits():
-            return {"free": {"type": "lifetime", "credits": 5, "max_resumes": 5}}
+            return TierLimits.model_validate({"free": {"type": "lifetime", "credits": 5, "max_resumes": 5}})
 
         with patch.object(service, "get_user_tier", mock_get_user_tier):
             with patch.object(service, "get_tier_limits", mock_get_tier_limits):
                 with patch.object(service.admin_client, "table") as mock_table:
                     mock_response = MagicMock()
-                    mock_response.data = [
-                        {"operation_type": "match", "credits_used": 1},
-                        {"operation_type": "cover_letter", "credits_used": 2},
-                    ]
-                    mock_table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = (
+                    mock_response.data = {
+                        "credits_used": 3,
+                        "usage_by_type": {"match": 1, "cover_letter": 2},
+                    }
+                    mock_table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
                         mock_response
                     )
 
@@ -483,17 +484,19 @@ class TestCalculateBalance:
             return "unlimited"
 
         async def mock_get_tier_limits():
-            return {
-                "free": {"type": "lifetime", "credits": 5, "max_resumes": 5},
-                "unlimited": {"type": "monthly", "credits": -1, "max_resumes": 25},
-            }
+            return TierLimits.model_validate(
+                {
+                    "free": {"type": "lifetime", "credits": 5, "max_resumes": 5},
+                    "unlimited": {"type": "monthly", "credits": -1, "max_resumes": 25},
+                }
+            )
 
         with patch.object(service, "get_user_tier", mock_get_user_tier):
             with patch.object(service, "get_tier_limits", mock_get_tier_limits):
                 with patch.object(service.admin_client, "table") as mock_table:
                     mock_response = MagicMock()
                     mock_response.data = []
-                    mock_table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = (
+                    mock_table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
                         mock_response
                     )
 
@@ -503,6 +506,118 @@ class TestCalculateBalance:
                     assert result["credits_remaining"] == -1
 
 
+class TestCheckCreditsLedger:
+    """Tests for check_credits reading the credit_balances ledger."""
+
+    async def _check(self, ledger_row):
+        from app.services.usage_service import UsageService
+
+        service = UsageService()
+
+        async def mock_get_user_tier(user_id):
+            return "free"
+
+        async def mock_get_tier_limits():
+            return TierLimits.model_validate({"free": {"type": "lifetime", "credits": 5, "max_resumes": 5}})
+
+        with patch.object(service, "get_user_tier", mock_get_user_tier):
+            with patch.object(service, "get_tier_limits", mock_get_tier_limits):
+                with patch.object(service.admin_client, "table") as mock_table:
+                    mock_table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
+                        MagicMock(data=ledger_row)
+                    )
+                    result = await service.check_credits("user-123")
+                    mock_table.assert_called_with("credit_balances")
+                    return result
+
+    @pytest.mark.asyncio
+    async def test_reads_single_ledger_row(self):
+        """check_credits compares the ledger total against the tier limit."""
+        assert await self._check({"credits_used": 4, "usage_by_type": {"match": 4}}) is True
+        assert await self._check({"credits_used": 5, "usage_by_type": {"match": 5}}) is False
+
+    @pytest.mark.asyncio
+    async def test_missing_ledger_row_means_no_usage(self):
+        """A user without usage in the period has full credits."""
+        assert await self._check(None) is True
+
+
+class TestCreditReservations:
+    """Tests for reserve/commit/release against the credit RPCs."""
+
+    @pytest.mark.asyncio
+    async def test_reserve_returns_reservation_id(self):
+        """A granted reservation returns the ID from reserve_credits()."""
+        from app.services.usage_service import UsageService
+
+        service = UsageService()
+        with patch.object(service.admin_client, "rpc") as mock_rpc:
+            mock_rpc.return_value.execute.return_value = MagicMock(data="3f1c7e0a-0000-0000-0000-000000000000")
+
+            reservation_id = await service.reserve_credits("user-123", "match")
+
+        assert reservation_id == "3f1c7e0a-0000-0000-0000-000000000000"
+        name, params = mock_rpc.call_args[0]
+        assert name == "reserve_credits"
+        assert params["p_user_id"] == "user-123"
+        assert params["p_operation_type"] == "match"
+        assert params["p_credits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reserve_refused_raises_credit_exhausted(self):
+        """A NULL result from reserve_credits() means no credits left."""
+        from app.core.exceptions import CreditExhaustedError
+        from app.services.usage_service import UsageService
+
+        service = UsageService()
+        with patch.object(service.admin_client, "rpc") as mock_rpc:
+            mock_rpc.return_value.execute.return_value = MagicMock(data=None)
+
+            with pytest.raises(CreditExhaustedError):
+                await service.reserve_credits("user-123", "match")
+
+    @pytest.mark.asyncio
+    async def test_commit_and_release_call_rpcs(self):
+        """commit/release map onto their Postgres functions."""
+        from app.services.usage_service import UsageService
+
+        service = UsageService()
+        with patch.object(service.admin_client, "rpc") as mock_rpc:
+            mock_rpc.return_value.execute.return_value = MagicMock(data=True)
+
+            await service.commit_reservation("res-1", ai_provider="claude")
+            await service.release_reservation("res-2")
+
+        assert mock_rpc.call_args_list[0][0] == (
+            "commit_credit_reservation",
+            {
+                "p_reservation_id": "res-1",
+                "p_ai_provider": "claude",
+                "p_input_tokens": None,
+                "p_output_tokens": None,
+                "p_cached_input_tokens": None,
+                "p_latency_ms": None,
+                "p_model": None,
+                "p_cost_usd": None,
+            },
+        )
+        assert mock_rpc.call_args_list[1][0] == (
+            "release_credit_reservation",
+            {"p_reservation_id": "res-2"},
+        )
+
+    @pytest.mark.asyncio
+    async def test_release_failure_is_swallowed(self):
+        """A failed release is logged; the reservation expires on its own."""
+        from app.services.usage_service import UsageService
+
+        service = UsageService()
+        with patch.object(service.admin_client, "rpc") as mock_rpc:
+            mock_rpc.return_value.execute.side_effect = Exception("connection reset")
+
+            await service.release_reservation("res-1")
+
+
 class TestAddReferralCredits:
     """Tests for referral credit addition."""
 
@@ -621,17 +736,17 @@ class TestNegativeCreditsHandling:
             return "free"
 
         async def mock_get_tier_limits():
-            return {"free": {"type": "lifetime", "credits": 5, "max_resumes": 5}}
+            return TierLimits.model_validate({"free": {"type": "lifetime", "credits": 5, "max_resumes": 5}})
 
         with patch.object(service, "get_user_tier", mock_get_user_tier):
             with patch.object(service, "get_tier_limits", mock_get_tier_limits):
                 with patch.object(service.admin_client, "table") as mock_table:
                     mock_response = MagicMock()
-                    mock_response.data = [
-                        {"operation_type": "match", "credits_used": 3},
-                        {"operation_type": "referral_bonus", "credits_used": -5},
-                    ]
-                    mock_table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = (
+                    mock_response.data = {
+                        "credits_used": -2,
+                        "usage_by_type": {"match": 3, "referral_bonus": -5},
+                    }
+                    mock_table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.maybe_single.return_value.execute.return_value = (
                         mock_response
                     )
 
@@ -643,3 +758,89 @@ class TestNegativeCreditsHandling:
                     # Verify referral_bonus appears in usage breakdown
                     assert result["usage_by_type"]["referral_bonus"] == -5
                     assert result["usage_by_type"]["match"] == 3
+
+
+class TestGlobalConfigCache:
+    """Tests for the process-level global_config cache."""
+
+    @pytest.fixture
+    def mock_config_client(self):
+        client = MagicMock()
+        client.table.return_value.select.return_value.execute.return_value = MagicMock(
+            data=[
+                {
+                    "key": "tier_limits",
+                    "value": {
+                        "free": {"type": "lifetime", "credits": 5, "max_resumes": 5},
+                        "pro": {"type": "monthly", "credits": 100, "max_resumes": 10},
+                    },
+                },
+                {"key": "referral_bonus_credits", "value": 7},
+            ]
+        )
+        with patch("app.db.config_cache.get_supabase_admin_client", return_value=client):
+            yield client
+
+    @pytest.mark.asyncio
+    async def test_config_loaded_once_within_ttl(self, mock_config_client):
+        """Repeated reads are served from the cache."""
+        from app.services.usage_service import UsageService
+
+        service = UsageService()
+        limits = await service.get_tier_limits()
+        await service.get_tier_limits()
+        bonus = await service.get_referral_bonus_amount()
+
+        assert limits.for_tier("pro").credits == 100
+        assert bonus == 7
+        assert mock_config_client.table.return_value.select.return_value.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_tier_falls_back_to_free(self, mock_config_client):
+        """for_tier() falls back to the free tier config."""
+        from app.db.config_cache import get_tier_limits
+
+        limits = await get_tier_limits()
+
+        assert limits.for_tier("enterprise").type == "lifetime"
+        assert limits.for_tier("enterprise").max_resumes == 5
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reload(self, mock_config_client):
+        """invalidate_config() makes the next read hit the database."""
+        from app.db.config_cache import get_tier_limits, invalidate_config
+
+        await get_tier_limits()
+        invalidate_config()
+        await get_tier_limits()
+
+        assert mock_config_client.table.return_value.select.return_value.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_serves_stale_values_when_refresh_fails(self, mock_config_client, monkeypatch):
+        """A failed refresh keeps the last loaded values."""
+        from app.core.config import settings
+        from app.db.config_cache import get_tier_limits
+
+        await get_tier_limits()
+        monkeypatch.setattr(settings, "global_config_cache_ttl", 0)
+        mock_config_client.table.return_value.select.return_value.execute.side_effect = Exception(
+            "connection reset"
+        )
+
+        limits = await get_tier_limits()
+
+        assert limits.for_tier("pro").credits == 100
+
+    @pytest.mark.asyncio
+    async def test_missing_tier_limits_uses_defaults(self):
+        """Without a tier_limits row the seeded defaults apply."""
+        from app.db.config_cache import get_tier_limits
+        from app.models.usage import DEFAULT_TIER_LIMITS
+
+        client = MagicMock()
+        client.table.return_value.select.return_value.execute.return_value = MagicMock(data=[])
+        with patch("app.db.config_cache.get_supabase_admin_client", return_value=client):
+            limits = await get_tier_limits()
+
+        assert limits == DEFAULT_TIER_LIMITS
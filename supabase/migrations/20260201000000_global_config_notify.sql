@@ -0,0 +1,21 @@
+-- Migration: 20260201000000_global_config_notify
+-- Description: Notify API workers when global_config changes
+-- Context: The API caches global_config in process (tier_limits,
+-- referral_bonus_credits). Workers started with GLOBAL_CONFIG_LISTEN_DSN
+-- LISTEN on this channel and drop their cache as soon as a row changes.
+
+CREATE OR REPLACE FUNCTION notify_global_config_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM pg_notify('global_config_changed', COALESCE(NEW.key, OLD.key));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER global_config_changed_notify
+  AFTER INSERT OR UPDATE OR DELETE ON global_config
+  FOR EACH ROW
+  EXECUTE FUNCTION notify_global_config_changed();
+
+-- Comment
+COMMENT ON FUNCTION notify_global_config_changed() IS 'Publishes the changed key on the global_config_changed channel';
@@ -0,0 +1,100 @@
+-- Migration: 20260201001000_create_credit_balances
+-- Description: Materialized per-period credit ledger maintained from usage_events
+-- Context: check_credits / calculate_balance summed every usage_events row of the
+-- period in the API, which grows linearly with a heavy user's history. The
+-- ledger keeps one row per (user_id, period_type, period_key), updated by
+-- trigger in the same transaction as the usage_events write.
+
+CREATE TABLE credit_balances (
+  user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  period_type TEXT NOT NULL,
+  period_key TEXT NOT NULL,
+  credits_used INTEGER NOT NULL DEFAULT 0,
+  usage_by_type JSONB NOT NULL DEFAULT '{}'::jsonb,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (user_id, period_type, period_key)
+);
+
+-- Add comments for documentation
+COMMENT ON TABLE credit_balances IS 'Per-period credit totals, maintained by trigger from usage_events';
+COMMENT ON COLUMN credit_balances.credits_used IS 'Net credits used in the period (referral bonuses are negative)';
+COMMENT ON COLUMN credit_balances.usage_by_type IS 'Net credits per operation_type, e.g. {"match": 3, "referral_bonus": -5}';
+
+-- Trigger for updated_at
+CREATE TRIGGER update_credit_balances_updated_at
+  BEFORE UPDATE ON credit_balances
+  FOR EACH ROW
+  EXECUTE FUNCTION update_updated_at_column();
+
+-- Enable Row Level Security
+ALTER TABLE credit_balances ENABLE ROW LEVEL SECURITY;
+
+-- RLS Policy: Users can view their own balances (writes happen via trigger only)
+CREATE POLICY "Users can view own credit balances"
+  ON credit_balances FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- Apply a credit delta for one usage event to the ledger
+CREATE OR REPLACE FUNCTION apply_credit_delta(
+  p_user_id UUID,
+  p_period_type TEXT,
+  p_period_key TEXT,
+  p_operation_type TEXT,
+  p_delta INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+  INSERT INTO credit_balances (user_id, period_type, period_key, credits_used, usage_by_type)
+  VALUES (
+    p_user_id,
+    p_period_type,
+    p_period_key,
+    p_delta,
+    jsonb_build_object(p_operation_type, p_delta)
+  )
+  ON CONFLICT (user_id, period_type, period_key) DO UPDATE SET
+    credits_used = credit_balances.credits_used + p_delta,
+    usage_by_type = credit_balances.usage_by_type || jsonb_build_object(
+      p_operation_type,
+      COALESCE((credit_balances.usage_by_type ->> p_operation_type)::INTEGER, 0) + p_delta
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_credit_balances()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM apply_credit_delta(
+      OLD.user_id, OLD.period_type, OLD.period_key, OLD.operation_type, -OLD.credits_used
+    );
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM apply_credit_delta(
+      NEW.user_id, NEW.period_type, NEW.period_key, NEW.operation_type, NEW.credits_used
+    );
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER usage_events_sync_credit_balances
+  AFTER INSERT OR UPDATE OR DELETE ON usage_events
+  FOR EACH ROW
+  EXECUTE FUNCTION sync_credit_balances();
+
+-- Backfill from existing usage
+INSERT INTO credit_balances (user_id, period_type, period_key, credits_used, usage_by_type)
+SELECT
+  user_id,
+  period_type,
+  period_key,
+  SUM(op_credits)::INTEGER,
+  jsonb_object_agg(operation_type, op_credits)
+FROM (
+  SELECT user_id, period_type, period_key, operation_type, SUM(credits_used)::INTEGER AS op_credits
+  FROM usage_events
+  GROUP BY user_id, period_type, period_key, operation_type
+) per_type
+GROUP BY user_id, period_type, period_key;
@@ -0,0 +1,216 @@
+-- Migration: 20260201002000_create_credit_reservations
+-- Description: Atomic credit reservation (reserve -> commit / release)
+-- Context: check_credits + record_usage raced under concurrent AI requests
+-- (several requests could pass the check before any usage was recorded) and
+-- cost three or four round trips. reserve_credits() checks and holds credits
+-- in one locked transaction; the API commits the reservation after the AI
+-- call succeeds (writing the usage_events row) or releases it on failure.
+
+-- Credits currently held by pending reservations
+ALTER TABLE credit_balances ADD COLUMN credits_reserved INTEGER NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN credit_balances.credits_reserved IS 'Credits held by pending credit_reservations';
+
+CREATE TABLE credit_reservations (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  operation_type TEXT NOT NULL,
+  credits INTEGER NOT NULL CHECK (credits > 0),
+  period_type TEXT NOT NULL,
+  period_key TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'committed', 'released')),
+  expires_at TIMESTAMPTZ NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Add comments for documentation
+COMMENT ON TABLE credit_reservations IS 'Credits held for in-flight AI operations';
+COMMENT ON COLUMN credit_reservations.expires_at IS 'Pending reservations past this time are released by the next reserve_credits call';
+
+-- Index for sweeping a user's pending reservations
+CREATE INDEX idx_credit_reservations_pending
+  ON credit_reservations(user_id, period_type, period_key)
+  WHERE status = 'pending';
+
+-- Trigger for updated_at
+CREATE TRIGGER update_credit_reservations_updated_at
+  BEFORE UPDATE ON credit_reservations
+  FOR EACH ROW
+  EXECUTE FUNCTION update_updated_at_column();
+
+-- Enable Row Level Security (service role only, no user policies)
+ALTER TABLE credit_reservations ENABLE ROW LEVEL SECURITY;
+
+-- Reserve credits for an operation.
+-- Returns the reservation id, or NULL if the user does not have enough credits.
+CREATE OR REPLACE FUNCTION reserve_credits(
+  p_user_id UUID,
+  p_operation_type TEXT,
+  p_credits INTEGER DEFAULT 1,
+  p_ttl_seconds INTEGER DEFAULT 600
+)
+RETURNS UUID AS $$
+DECLARE
+  v_tier TEXT;
+  v_config JSONB;
+  v_limit INTEGER;
+  v_period_type TEXT;
+  v_period_key TEXT;
+  v_used INTEGER;
+  v_reserved INTEGER;
+  v_expired INTEGER;
+  v_reservation_id UUID;
+BEGIN
+  SELECT COALESCE(subscription_tier, 'free') INTO v_tier
+  FROM profiles WHERE id = p_user_id;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Profile not found for user %', p_user_id USING ERRCODE = 'P0002';
+  END IF;
+
+  SELECT COALESCE(value -> v_tier, value -> 'free') INTO v_config
+  FROM global_config WHERE key = 'tier_limits';
+  -- Mirrors DEFAULT_TIER_LIMITS["free"] in the API
+  v_config := COALESCE(v_config, '{"type": "lifetime", "credits": 5}'::jsonb);
+
+  v_limit := (v_config ->> 'credits')::INTEGER;
+  v_period_type := v_config ->> 'type';
+  v_period_key := CASE
+    WHEN v_period_type = 'lifetime' THEN 'lifetime'
+    ELSE to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM')
+  END;
+
+  -- Ensure the ledger row exists, then lock it to serialize this user's reservations
+  INSERT INTO credit_balances (user_id, period_type, period_key)
+  VALUES (p_user_id, v_period_type, v_period_key)
+  ON CONFLICT (user_id, period_type, period_key) DO NOTHING;
+
+  SELECT credits_used, credits_reserved INTO v_used, v_reserved
+  FROM credit_balances
+  WHERE user_id = p_user_id AND period_type = v_period_type AND period_key = v_period_key
+  FOR UPDATE;
+
+  -- Release reservations abandoned by crashed requests
+  WITH expired AS (
+    UPDATE credit_reservations
+    SET status = 'released'
+    WHERE user_id = p_user_id
+      AND period_type = v_period_type
+      AND period_key = v_period_key
+      AND status = 'pending'
+      AND expires_at < now()
+    RETURNING credits
+  )
+  SELECT COALESCE(SUM(credits), 0)::INTEGER INTO v_expired FROM expired;
+  v_reserved := GREATEST(v_reserved - v_expired, 0);
+
+  IF v_limit <> -1 AND v_used + v_reserved + p_credits > v_limit THEN
+    IF v_expired > 0 THEN
+      UPDATE credit_balances SET credits_reserved = v_reserved
+      WHERE user_id = p_user_id AND period_type = v_period_type AND period_key = v_period_key;
+    END IF;
+    RETURN NULL;
+  END IF;
+
+  UPDATE credit_balances SET credits_reserved = v_reserved + p_credits
+  WHERE user_id = p_user_id AND period_type = v_period_type AND period_key = v_period_key;
+
+  INSERT INTO credit_reservations (
+    user_id, operation_type, credits, period_type, period_key, expires_at
+  )
+  VALUES (
+    p_user_id, p_operation_type, p_credits, v_period_type, v_period_key,
+    now() + make_interval(secs => p_ttl_seconds)
+  )
+  RETURNING id INTO v_reservation_id;
+
+  RETURN v_reservation_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Commit a reservation: record the usage event and drop the hold.
+-- Returns FALSE if the reservation was already committed or released explicitly.
+CREATE OR REPLACE FUNCTION commit_credit_reservation(
+  p_reservation_id UUID,
+  p_ai_provider TEXT DEFAULT NULL
+)
+RETURNS BOOLEAN AS $$
+DECLARE
+  v_reservation credit_reservations%ROWTYPE;
+BEGIN
+  SELECT * INTO v_reservation FROM credit_reservations
+  WHERE id = p_reservation_id
+  FOR UPDATE;
+
+  IF NOT FOUND OR v_reservation.status = 'committed' THEN
+    RETURN FALSE;
+  END IF;
+
+  -- A released reservation past expires_at was swept while the operation was
+  -- still running; the work was done, so it is still charged
+  IF v_reservation.status = 'released' AND v_reservation.expires_at >= now() THEN
+    RETURN FALSE;
+  END IF;
+
+  IF v_reservation.status = 'pending' THEN
+    UPDATE credit_balances
+    SET credits_reserved = GREATEST(credits_reserved - v_reservation.credits, 0)
+    WHERE user_id = v_reservation.user_id
+      AND period_type = v_reservation.period_type
+      AND period_key = v_reservation.period_key;
+  END IF;
+
+  UPDATE credit_reservations SET status = 'committed' WHERE id = p_reservation_id;
+
+  -- usage_events trigger adds the credits to credit_balances.credits_used
+  INSERT INTO usage_events (
+    user_id, operation_type, ai_provider, credits_used, period_type, period_key
+  )
+  VALUES (
+    v_reservation.user_id,
+    v_reservation.operation_type,
+    p_ai_provider,
+    v_reservation.credits,
+    v_reservation.period_type,
+    v_reservation.period_key
+  );
+
+  RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Release a pending reservation without charging.
+CREATE OR REPLACE FUNCTION release_credit_reservation(p_reservation_id UUID)
+RETURNS BOOLEAN AS $$
+DECLARE
+  v_reservation credit_reservations%ROWTYPE;
+BEGIN
+  UPDATE credit_reservations SET status = 'released'
+  WHERE id = p_reservation_id AND status = 'pending'
+  RETURNING * INTO v_reservation;
+
+  IF NOT FOUND THEN
+    RETURN FALSE;
+  END IF;
+
+  UPDATE credit_balances
+  SET credits_reserved = GREATEST(credits_reserved - v_reservation.credits, 0)
+  WHERE user_id = v_reservation.user_id
+    AND period_type = v_reservation.period_type
+    AND period_key = v_reservation.period_key;
+
+  RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only the API (service role) may move credits
+REVOKE EXECUTE ON FUNCTION reserve_credits(UUID, TEXT, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION commit_credit_reservation(UUID, TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION release_credit_reservation(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION reserve_credits(UUID, TEXT, INTEGER, INTEGER) TO service_role;
+GRANT EXECUTE ON FUNCTION commit_credit_reservation(UUID, TEXT) TO service_role;
+GRANT EXECUTE ON FUNCTION release_credit_reservation(UUID) TO service_role;
+
+-- The ledger helper from 20260201001000_create_credit_balances must not be
+-- reachable through PostgREST either
+REVOKE EXECUTE ON FUNCTION apply_credit_delta(UUID, TEXT, TEXT, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,25 @@
+-- Migration: 20260201003000_create_match_results
+-- Description: Persistent tier of the match analysis result cache
+-- Context: MatchService re-ran the LLM whenever the same parsed resume was
+-- analyzed against the same job description. Results are keyed by a SHA-256
+-- of (resume data, job description, provider, prompt version) per user and
+-- read by the API when MATCH_CACHE_PERSISTENT is on.
+
+CREATE TABLE match_results (
+  user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  cache_key TEXT NOT NULL,
+  result JSONB NOT NULL,
+  expires_at TIMESTAMPTZ NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (user_id, cache_key)
+);
+
+-- Add comments for documentation
+COMMENT ON TABLE match_results IS 'Cached match analyses keyed by content hash (written by the API service role)';
+COMMENT ON COLUMN match_results.cache_key IS 'SHA-256 of resume data, job description, provider and prompt version';
+
+-- Expired rows are ignored on read; this index supports periodic cleanup
+CREATE INDEX idx_match_results_expires_at ON match_results(expires_at);
+
+-- Enable Row Level Security (no policies: only the service role reads or writes)
+ALTER TABLE match_results ENABLE ROW LEVEL SECURITY;
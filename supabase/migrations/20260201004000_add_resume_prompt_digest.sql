@@ -0,0 +1,10 @@
+-- Migration: 20260201004000_add_resume_prompt_digest
+-- Description: Store a compact prompt rendering of each parsed resume
+-- Context: Generation prompts embedded the parsed resume as indented JSON on
+-- every call. The API now computes a token-minimized digest once, when the
+-- resume is parsed, and sends that instead.
+
+ALTER TABLE resumes
+ADD COLUMN IF NOT EXISTS prompt_digest TEXT;
+
+COMMENT ON COLUMN resumes.prompt_digest IS 'Compact rendering of parsed_data used in AI prompts (NULL for unparsed or older resumes; the API derives it on the fly)';
@@ -0,0 +1,12 @@
+-- Migration: 20260201005000_add_job_clean_description
+-- Description: Store a boilerplate-free job description and its token estimate
+-- Context: AI prompts sent scraped descriptions verbatim, EEO statements,
+-- benefits lists and all. The API now cleans the description once, when a
+-- job is saved or its description edited, and prompts use the cleaned text.
+
+ALTER TABLE jobs
+ADD COLUMN IF NOT EXISTS clean_description TEXT,
+ADD COLUMN IF NOT EXISTS description_tokens INTEGER;
+
+COMMENT ON COLUMN jobs.clean_description IS 'Description with whitespace normalized and boilerplate sections removed, used in AI prompts (NULL for older jobs; the API cleans on the fly)';
+COMMENT ON COLUMN jobs.description_tokens IS 'Approximate token count of clean_description (characters / 4)';
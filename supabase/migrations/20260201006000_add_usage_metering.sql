@@ -0,0 +1,116 @@
+-- Migration: 20260201006000_add_usage_metering
+-- Description: Record token counts, latency, model and cost on usage events
+-- Context: usage_events only knew that a credit was spent. The API now reads
+-- the token usage each provider reports, times the call, and passes both to
+-- commit_credit_reservation; ai_usage_summary aggregates them for cost and
+-- latency reporting.
+
+ALTER TABLE usage_events
+ADD COLUMN IF NOT EXISTS input_tokens INTEGER,
+ADD COLUMN IF NOT EXISTS output_tokens INTEGER,
+ADD COLUMN IF NOT EXISTS cached_input_tokens INTEGER,
+ADD COLUMN IF NOT EXISTS latency_ms INTEGER,
+ADD COLUMN IF NOT EXISTS model TEXT,
+ADD COLUMN IF NOT EXISTS cost_usd NUMERIC(12, 6);
+
+COMMENT ON COLUMN usage_events.input_tokens IS 'Prompt tokens reported by the provider, including cached tokens (NULL if not metered)';
+COMMENT ON COLUMN usage_events.output_tokens IS 'Completion tokens reported by the provider';
+COMMENT ON COLUMN usage_events.cached_input_tokens IS 'Prompt tokens served from the provider prompt cache';
+COMMENT ON COLUMN usage_events.latency_ms IS 'Wall time of the AI call, including fallbacks and hedges';
+COMMENT ON COLUMN usage_events.model IS 'Model that produced the result';
+COMMENT ON COLUMN usage_events.cost_usd IS 'Estimated cost from AI_TOKEN_PRICES (NULL if the model has no price)';
+
+-- Adding parameters changes the signature, so the old function is replaced
+DROP FUNCTION IF EXISTS commit_credit_reservation(UUID, TEXT);
+
+-- Commit a reservation: record the usage event and drop the hold.
+-- Returns FALSE if the reservation was already committed or released explicitly.
+CREATE OR REPLACE FUNCTION commit_credit_reservation(
+  p_reservation_id UUID,
+  p_ai_provider TEXT DEFAULT NULL,
+  p_input_tokens INTEGER DEFAULT NULL,
+  p_output_tokens INTEGER DEFAULT NULL,
+  p_cached_input_tokens INTEGER DEFAULT NULL,
+  p_latency_ms INTEGER DEFAULT NULL,
+  p_model TEXT DEFAULT NULL,
+  p_cost_usd NUMERIC DEFAULT NULL
+)
+RETURNS BOOLEAN AS $$
+DECLARE
+  v_reservation credit_reservations%ROWTYPE;
+BEGIN
+  SELECT * INTO v_reservation FROM credit_reservations
+  WHERE id = p_reservation_id
+  FOR UPDATE;
+
+  IF NOT FOUND OR v_reservation.status = 'committed' THEN
+    RETURN FALSE;
+  END IF;
+
+  -- A released reservation past expires_at was swept while the operation was
+  -- still running; the work was done, so it is still charged
+  IF v_reservation.status = 'released' AND v_reservation.expires_at >= now() THEN
+    RETURN FALSE;
+  END IF;
+
+  IF v_reservation.status = 'pending' THEN
+    UPDATE credit_balances
+    SET credits_reserved = GREATEST(credits_reserved - v_reservation.credits, 0)
+    WHERE user_id = v_reservation.user_id
+      AND period_type = v_reservation.period_type
+      AND period_key = v_reservation.period_key;
+  END IF;
+
+  UPDATE credit_reservations SET status = 'committed' WHERE id = p_reservation_id;
+
+  -- usage_events trigger adds the credits to credit_balances.credits_used
+  INSERT INTO usage_events (
+    user_id, operation_type, ai_provider, credits_used, period_type, period_key,
+    input_tokens, output_tokens, cached_input_tokens, latency_ms, model, cost_usd
+  )
+  VALUES (
+    v_reservation.user_id,
+    v_reservation.operation_type,
+    p_ai_provider,
+    v_reservation.credits,
+    v_reservation.period_type,
+    v_reservation.period_key,
+    p_input_tokens,
+    p_output_tokens,
+    p_cached_input_tokens,
+    p_latency_ms,
+    p_model,
+    p_cost_usd
+  );
+
+  RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION commit_credit_reservation(UUID, TEXT, INTEGER, INTEGER, INTEGER, INTEGER, TEXT, NUMERIC) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION commit_credit_reservation(UUID, TEXT, INTEGER, INTEGER, INTEGER, INTEGER, TEXT, NUMERIC) TO service_role;
+
+-- Daily token, latency and cost totals per operation, provider and model
+-- (metered events only; cache hits and referral credits have no tokens)
+CREATE OR REPLACE VIEW ai_usage_summary AS
+SELECT
+  date_trunc('day', created_at) AS day,
+  operation_type,
+  ai_provider,
+  model,
+  count(*) AS calls,
+  sum(input_tokens) AS input_tokens,
+  sum(cached_input_tokens) AS cached_input_tokens,
+  sum(output_tokens) AS output_tokens,
+  round(avg(latency_ms)) AS avg_latency_ms,
+  percentile_cont(0.95) WITHIN GROUP (ORDER BY latency_ms) AS p95_latency_ms,
+  sum(cost_usd) AS cost_usd
+FROM usage_events
+WHERE input_tokens IS NOT NULL
+GROUP BY 1, 2, 3, 4;
+
+COMMENT ON VIEW ai_usage_summary IS 'Daily AI token, latency and cost totals per operation, provider and model';
+
+-- Usage across all users is for operators only
+REVOKE ALL ON ai_usage_summary FROM PUBLIC, anon, authenticated;
+GRANT SELECT ON ai_usage_summary TO service_role;
@@ -0,0 +1,84 @@
+-- Migration: 20260201007000_partial_reservation_commit
+-- Description: Let a reservation be committed for fewer credits than it holds
+-- Context: Batch match analysis reserves one credit per job up front, then
+-- charges only for the analyses that actually ran (failed jobs and free
+-- cache hits are not charged). p_credits charges part of the hold and
+-- returns the rest; NULL keeps the old behaviour of charging all of it.
+
+DROP FUNCTION IF EXISTS commit_credit_reservation(UUID, TEXT, INTEGER, INTEGER, INTEGER, INTEGER, TEXT, NUMERIC);
+
+-- Commit a reservation: record the usage event and drop the hold.
+-- Returns FALSE if the reservation was already committed or released explicitly.
+CREATE OR REPLACE FUNCTION commit_credit_reservation(
+  p_reservation_id UUID,
+  p_ai_provider TEXT DEFAULT NULL,
+  p_input_tokens INTEGER DEFAULT NULL,
+  p_output_tokens INTEGER DEFAULT NULL,
+  p_cached_input_tokens INTEGER DEFAULT NULL,
+  p_latency_ms INTEGER DEFAULT NULL,
+  p_model TEXT DEFAULT NULL,
+  p_cost_usd NUMERIC DEFAULT NULL,
+  p_credits INTEGER DEFAULT NULL
+)
+RETURNS BOOLEAN AS $$
+DECLARE
+  v_reservation credit_reservations%ROWTYPE;
+  v_charged INTEGER;
+BEGIN
+  SELECT * INTO v_reservation FROM credit_reservations
+  WHERE id = p_reservation_id
+  FOR UPDATE;
+
+  IF NOT FOUND OR v_reservation.status = 'committed' THEN
+    RETURN FALSE;
+  END IF;
+
+  -- A released reservation past expires_at was swept while the operation was
+  -- still running; the work was done, so it is still charged
+  IF v_reservation.status = 'released' AND v_reservation.expires_at >= now() THEN
+    RETURN FALSE;
+  END IF;
+
+  -- Never charge more than was held
+  v_charged := LEAST(GREATEST(COALESCE(p_credits, v_reservation.credits), 0), v_reservation.credits);
+
+  IF v_reservation.status = 'pending' THEN
+    UPDATE credit_balances
+    SET credits_reserved = GREATEST(credits_reserved - v_reservation.credits, 0)
+    WHERE user_id = v_reservation.user_id
+      AND period_type = v_reservation.period_type
+      AND period_key = v_reservation.period_key;
+  END IF;
+
+  UPDATE credit_reservations SET status = 'committed' WHERE id = p_reservation_id;
+
+  IF v_charged = 0 THEN
+    RETURN TRUE;
+  END IF;
+
+  -- usage_events trigger adds the credits to credit_balances.credits_used
+  INSERT INTO usage_events (
+    user_id, operation_type, ai_provider, credits_used, period_type, period_key,
+    input_tokens, output_tokens, cached_input_tokens, latency_ms, model, cost_usd
+  )
+  VALUES (
+    v_reservation.user_id,
+    v_reservation.operation_type,
+    p_ai_provider,
+    v_charged,
+    v_reservation.period_type,
+    v_reservation.period_key,
+    p_input_tokens,
+    p_output_tokens,
+    p_cached_input_tokens,
+    p_latency_ms,
+    p_model,
+    p_cost_usd
+  );
+
+  RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+REVOKE EXECUTE ON FUNCTION commit_credit_reservation(UUID, TEXT, INTEGER, INTEGER, INTEGER, INTEGER, TEXT, NUMERIC, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION commit_credit_reservation(UUID, TEXT, INTEGER, INTEGER, INTEGER, INTEGER, TEXT, NUMERIC, INTEGER) TO service_role;
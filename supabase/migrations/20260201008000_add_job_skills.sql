@@ -0,0 +1,16 @@
+-- Migration: 20260201008000_add_job_skills
+-- Description: Store the canonical skills mentioned in each job description
+-- Context: jobs.description is free text, so skill overlap between a job and
+-- a resume could only be found by scanning descriptions. The API now
+-- extracts skills (normalized through its skill taxonomy, e.g. "k8s" is
+-- Kubernetes) when a job is saved or its description edited, and resumes
+-- store their skills under the same canonical names. Older jobs keep an
+-- empty array until their description is next written.
+
+ALTER TABLE jobs
+ADD COLUMN IF NOT EXISTS skills TEXT[] NOT NULL DEFAULT '{}';
+
+-- Array overlap/containment queries (skills && ARRAY[...], skills @> ARRAY[...])
+CREATE INDEX IF NOT EXISTS idx_jobs_skills ON jobs USING GIN (skills);
+
+COMMENT ON COLUMN jobs.skills IS 'Canonical skill names extracted from the description by the API (see apps/api/app/services/skills.py)';
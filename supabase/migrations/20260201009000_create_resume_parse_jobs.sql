@@ -0,0 +1,41 @@
+-- Migration: 20260201009000_create_resume_parse_jobs
+-- Description: Durable queue for background resume parsing
+-- Context: Uploads used to extract and AI-parse the resume inside the HTTP
+-- request, holding the connection for tens of seconds on a slow provider.
+-- The API now stores the resume with parse_status 'pending', records a job
+-- here and returns 202; a worker pool in each API process claims queued
+-- jobs ('queued' -> 'running'), writes the parse result to the resume and
+-- settles the credit reservation. Jobs survive restarts: queued jobs and
+-- jobs left 'running' by a dead process are picked up again.
+
+CREATE TABLE resume_parse_jobs (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  resume_id UUID NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+  user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  reservation_id UUID REFERENCES credit_reservations(id) ON DELETE SET NULL,
+  file_path TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'completed', 'failed')),
+  attempts INTEGER NOT NULL DEFAULT 0,
+  error TEXT,
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Add comments for documentation
+COMMENT ON TABLE resume_parse_jobs IS 'Resume parses waiting for or running in a background worker';
+COMMENT ON COLUMN resume_parse_jobs.reservation_id IS 'Credit reservation held for the parse; committed on success, released on failure';
+COMMENT ON COLUMN resume_parse_jobs.attempts IS 'Times a worker claimed the job; capped by RESUME_PARSE_MAX_ATTEMPTS';
+
+-- Index for workers looking for queued and orphaned running jobs
+CREATE INDEX idx_resume_parse_jobs_open
+  ON resume_parse_jobs(status, created_at)
+  WHERE status IN ('queued', 'running');
+
+-- Trigger for updated_at (a running job's updated_at is when it was claimed)
+CREATE TRIGGER update_resume_parse_jobs_updated_at
+  BEFORE UPDATE ON resume_parse_jobs
+  FOR EACH ROW
+  EXECUTE FUNCTION update_updated_at_column();
+
+-- Enable Row Level Security (service role only, no user policies)
+ALTER TABLE resume_parse_jobs ENABLE ROW LEVEL SECURITY;
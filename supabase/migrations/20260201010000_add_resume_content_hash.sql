@@ -0,0 +1,36 @@
+-- Migration: 20260201010000_add_resume_content_hash
+-- Description: Detect re-uploaded resume files and cache extracted text by file hash
+-- Context: Re-uploading the same PDF (another device, a double submit) stored
+-- it again and paid a full AI parse and a credit. The API now stores the
+-- SHA-256 of each uploaded file and returns the user's existing parsed or
+-- pending resume when the hash matches. Resumes uploaded before this
+-- migration have no hash and are never matched.
+-- resume_text_cache is the optional persistent tier of the cross-user
+-- extracted-text cache (RESUME_TEXT_CACHE_PERSISTENT); parsed data is never
+-- shared between users.
+
+ALTER TABLE resumes
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMENT ON COLUMN resumes.content_hash IS 'Hex SHA-256 of the uploaded file, for duplicate upload detection';
+
+-- Per-user duplicate lookup on upload
+CREATE INDEX IF NOT EXISTS idx_resumes_user_content_hash
+  ON resumes(user_id, content_hash)
+  WHERE content_hash IS NOT NULL;
+
+CREATE TABLE resume_text_cache (
+  content_hash TEXT PRIMARY KEY,
+  extracted_text TEXT NOT NULL,
+  expires_at TIMESTAMPTZ NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Add comments for documentation
+COMMENT ON TABLE resume_text_cache IS 'Extracted text of resume PDFs keyed by file hash, shared across users (written by the API service role)';
+
+-- Expired rows are ignored on read; this index supports periodic cleanup
+CREATE INDEX idx_resume_text_cache_expires_at ON resume_text_cache(expires_at);
+
+-- Enable Row Level Security (no policies: only the service role reads or writes)
+ALTER TABLE resume_text_cache ENABLE ROW LEVEL SECURITY;